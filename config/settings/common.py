@@ -148,6 +148,8 @@ if set(EXTRA_DJANGO_APPS) & set(INSTALLED_APPS):
 INSTALLED_APPS += EXTRA_DJANGO_APPS
 
 MIDDLEWARE = [
+    'datahub.core.metrics.RequestMetricsMiddleware',
+    'datahub.core.query_instrumentation.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -188,6 +190,37 @@ DATABASES = {
     },
 }
 
+# Read-only workloads (marked using datahub.core.replica.use_replica()) are sent to this
+# database when it is configured
+if env('DATABASE_REPLICA_URL', default=''):
+    DATABASES['replica'] = {
+        **env.db('DATABASE_REPLICA_URL'),
+        'ATOMIC_REQUESTS': False,
+        'CONN_MAX_AGE': env.int('DATABASE_CONN_MAX_AGE', 0),
+        'DISABLE_SERVER_SIDE_CURSORS': False,
+    }
+
+DATABASE_ROUTERS = ['datahub.core.replica.ReplicaRouter']
+# Reads fall back to the default database when the replica is behind by more than this
+# (in seconds)
+DATABASE_REPLICA_MAX_LAG = env.int('DATABASE_REPLICA_MAX_LAG', 30)
+
+# Connections are checked out of a process-wide pool (shared by all greenlets in a gevent
+# Gunicorn worker) when this is enabled (see datahub.core.postgresql_pool)
+if env.bool('DATABASE_CONNECTION_POOL_ENABLED', False):
+    for _database in DATABASES.values():
+        _database.update(
+            ENGINE='datahub.core.postgresql_pool',
+            # Connections are returned to the pool (rather than closed) at the end of each
+            # request
+            CONN_MAX_AGE=0,
+            POOL={
+                'MAX_SIZE': env.int('DATABASE_CONNECTION_POOL_MAX_SIZE', 10),
+                'MAX_LIFETIME': env.int('DATABASE_CONNECTION_POOL_MAX_LIFETIME', 3600),
+                'TIMEOUT': env.int('DATABASE_CONNECTION_POOL_TIMEOUT', 30),
+            },
+        )
+
 FIXTURE_DIRS = [
     str(ROOT_DIR('fixtures'))
 ]
@@ -254,7 +287,17 @@ STAFF_SSO_USER_TOKEN_CACHING_PERIOD = env.int(
     'STAFF_SSO_USER_TOKEN_CACHING_PERIOD',
     default=60 * 60,  # One hour
 )
+# In-process cache of token data and advisers held by each worker in front of the shared cache
+STAFF_SSO_LOCAL_CACHE_MAX_SIZE = env.int('STAFF_SSO_LOCAL_CACHE_MAX_SIZE', default=1000)
+STAFF_SSO_LOCAL_CACHE_TIMEOUT = env.int('STAFF_SSO_LOCAL_CACHE_TIMEOUT', default=60)  # seconds
 ENABLE_ADMIN_ADD_ACCESS_TOKEN_VIEW = env.bool('ENABLE_ADMIN_ADD_ACCESS_TOKEN_VIEW', default=True)
+# Maximum age of the in-process copy of feature flags held by each worker
+FEATURE_FLAG_LOCAL_CACHE_TIMEOUT = env.int('FEATURE_FLAG_LOCAL_CACHE_TIMEOUT', default=60)  # seconds
+# How often each worker checks the shared cache for changes to feature flags
+FEATURE_FLAG_GENERATION_CHECK_INTERVAL = env.int(
+    'FEATURE_FLAG_GENERATION_CHECK_INTERVAL',
+    default=2,
+)  # seconds
 
 # Internationalization
 # https://docs.djangoproject.com/en/1.9/topics/i18n/
@@ -339,10 +382,31 @@ ES_SEARCH_REQUEST_WARNING_THRESHOLD = env.int(
     'ES_SEARCH_REQUEST_WARNING_THRESHOLD',
     default=10,  # seconds
 )
+# Search queries taking at least this long are added to the slow query log (which is viewable
+# in the admin site)
+SEARCH_SLOW_QUERY_LOG_THRESHOLD = env.int(
+    'SEARCH_SLOW_QUERY_LOG_THRESHOLD',
+    default=1000,  # milliseconds
+)
+SEARCH_SLOW_QUERY_LOG_SIZE = env.int('SEARCH_SLOW_QUERY_LOG_SIZE', default=50)
+# Whether to re-run queries added to the slow query log with profiling enabled (in a Celery task)
+SEARCH_PROFILE_SLOW_QUERIES = env.bool('SEARCH_PROFILE_SLOW_QUERIES', default=False)
+# How long to cache the results of search aggregations for (0 disables caching). Cached
+# aggregations are also invalidated when documents are synced to Elasticsearch.
+SEARCH_AGGREGATION_CACHE_TIMEOUT = env.int(
+    'SEARCH_AGGREGATION_CACHE_TIMEOUT',
+    default=300,  # seconds
+)
+# Whether to serve aggregations for searches not filtered by the user from periodically
+# refreshed rollups
+SEARCH_AGGREGATION_ROLLUPS_ENABLED = env.bool('ENABLE_SEARCH_AGGREGATION_ROLLUPS', default=False)
 SEARCH_EXPORT_MAX_RESULTS = 5000
 SEARCH_EXPORT_SCROLL_CHUNK_SIZE = 1000
 SEARCH_CONFIGURE_CONNECTION_ON_READY = True
 SEARCH_CONNECT_SIGNAL_RECEIVERS_ON_READY = True
+# Whether to skip writing documents to Elasticsearch if they haven't changed since they were
+# last written (determined using hashes of documents stored in the database)
+SEARCH_SKIP_UNCHANGED_DOCUMENTS = env.bool('SEARCH_SKIP_UNCHANGED_DOCUMENTS', default=True)
 CHAR_FIELD_MAX_LENGTH = 255
 
 AV_V2_SERVICE_URL = env('AV_V2_SERVICE_URL', default=None)
@@ -455,12 +519,28 @@ if REDIS_BASE_URL:
             'schedule': crontab(minute=0, hour=1),
         }
 
+    if SEARCH_AGGREGATION_ROLLUPS_ENABLED:
+        CELERY_BEAT_SCHEDULE['refresh_search_aggregation_rollups'] = {
+            'task': 'datahub.search.tasks.refresh_search_aggregation_rollups',
+            'schedule': crontab(minute='*/15'),
+        }
+
     if env.bool('ENABLE_SPI_REPORT_GENERATION', False):
         CELERY_BEAT_SCHEDULE['spi_report'] = {
             'task': 'datahub.investment.project.report.tasks.generate_spi_report',
             'schedule': crontab(minute=0, hour=8),
         }
 
+    if env.bool('ENABLE_ORPHANED_VERSIONS_CLEANUP', False):
+        CELERY_BEAT_SCHEDULE['delete_orphaned_versions'] = {
+            'task': 'datahub.cleanup.tasks.delete_orphaned_versions',
+            'schedule': crontab(minute=0, hour=2),
+            'kwargs': {
+                # Any remaining versions are cleaned up by the next run
+                'max_duration': int(timedelta(hours=4).total_seconds()),
+            },
+        }
+
     if env.bool('ENABLE_EMAIL_INGESTION', False):
         CELERY_BEAT_SCHEDULE['email_ingestion'] = {
             'task': 'datahub.email_ingestion.tasks.ingest_emails',
@@ -477,6 +557,9 @@ if REDIS_BASE_URL:
     )
 
 CELERY_TASK_ALWAYS_EAGER = env.bool('CELERY_TASK_ALWAYS_EAGER', False)
+# Tasks are routed to queues (lanes) and given priorities by datahub.core.task_routing
+CELERY_TASK_ROUTES = ('datahub.core.task_routing.route_task',)
+CELERY_TASK_DEFAULT_QUEUE = 'realtime'
 CELERY_TASK_SEND_SENT_EVENT = env.bool('CELERY_TASK_SEND_SENT_EVENT', True)
 CELERY_WORKER_TASK_EVENTS = env.bool('CELERY_WORKER_TASK_EVENTS', True)
 
@@ -675,6 +758,26 @@ DATAHUB_SUPPORT_EMAIL_ADDRESS = env('DATAHUB_SUPPORT_EMAIL_ADDRESS', default=Non
 STATSD_HOST = env('STATSD_HOST', default='localhost')
 STATSD_PORT = env('STATSD_PORT', default='9125')
 STATSD_PREFIX = env('STATSD_PREFIX', default='datahub-api')
+# Whether to count the SQL queries run by each request and Celery task (not for production)
+QUERY_INSTRUMENTATION_ENABLED = env.bool('QUERY_INSTRUMENTATION_ENABLED', default=False)
+
+# How long to cache advisers' investment project summaries for (0 disables caching). Cached
+# summaries are also invalidated when the advisers' projects or project teams change.
+INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT = env.int(
+    'INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT',
+    default=60,  # seconds
+)
+
+# Whether user events are written to the database in batches (outside of the request that
+# recorded them) instead of immediately (see datahub.user_event_log.buffer)
+USER_EVENT_BUFFER_ENABLED = env.bool('USER_EVENT_BUFFER_ENABLED', default=True)
+
+# Fraction of time that the orphaned versions clean-up spends running queries (it sleeps
+# between batches for the rest of the time)
+ORPHANED_VERSIONS_CLEANUP_LOAD_BUDGET = env.float(
+    'ORPHANED_VERSIONS_CLEANUP_LOAD_BUDGET',
+    default=0.5,
+)
 
 # Settings for CSRF cookie.
 CSRF_COOKIE_SECURE = env('CSRF_COOKIE_SECURE', default=False)
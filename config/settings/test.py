@@ -11,6 +11,12 @@ SEARCH_CONFIGURE_CONNECTION_ON_READY = False
 # We need to prevent Django from connecting signal receivers when the search app is initialised
 # to stop them from firing during non-search tests
 SEARCH_CONNECT_SIGNAL_RECEIVERS_ON_READY = False
+# Many search tests use mock search apps without database access, so this is only enabled in the
+# tests for this feature
+SEARCH_SKIP_UNCHANGED_DOCUMENTS = False
+# Search indices are recreated between tests without the aggregation generation being bumped, so
+# this is only enabled in the tests for this feature
+SEARCH_AGGREGATION_CACHE_TIMEOUT = 0
 INSTALLED_APPS += [
     'datahub.core.test.support',
     'datahub.documents.test.my_entity_document',
@@ -58,6 +64,27 @@ PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',
 ]
 
+# A second database on the same server stands in for a read replica. It is not kept in sync
+# with the default database (so tests can tell which database a query ran against).
+DATABASES['replica'] = {
+    **DATABASES['default'],
+    'ATOMIC_REQUESTS': False,
+    'TEST': {
+        'NAME': f"test_{DATABASES['default']['NAME']}_replica",
+    },
+}
+
+# Many tests check that user events were recorded, so buffering is only enabled in the tests
+# for this feature
+USER_EVENT_BUFFER_ENABLED = False
+
+# Projects are modified in some tests without signals being sent, so this is only enabled in the
+# tests for this feature
+INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT = 0
+
+# Avoid sleeping between batches in tests
+ORPHANED_VERSIONS_CLEANUP_LOAD_BUDGET = 1
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'
@@ -22,6 +22,7 @@ unversioned_urls = [
     path('', include('datahub.admin_report.urls')),
     path('', include('datahub.investment.project.report.urls')),
     path('', include('datahub.oauth.admin.urls')),
+    path('', include('datahub.search.admin.urls')),
     *admin_oauth2_urls,
     path('admin/', admin.site.urls),
     path('ping.xml', ping, name='ping'),
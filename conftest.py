@@ -1,3 +1,4 @@
+import socket
 from unittest.mock import Mock
 
 import factory
@@ -11,10 +12,13 @@ from elasticsearch.helpers.test import get_test_client
 from pytest_django.lazy_django import skip_if_no_django
 
 from datahub.core.constants import AdministrativeArea
+from datahub.core.statsd import BufferedStatsClient
 from datahub.core.test_utils import HawkAPITestClient
 from datahub.dnb_api.utils import format_dnb_company
 from datahub.documents.utils import get_s3_client_for_bucket
+from datahub.feature_flag.registry import feature_flag_registry
 from datahub.metadata.test.factories import SectorFactory
+from datahub.oauth.cache import clear_local_caches as clear_local_oauth_caches
 from datahub.search.apps import get_search_app_by_model, get_search_apps
 from datahub.search.bulk_sync import sync_objects
 from datahub.search.elasticsearch import (
@@ -111,6 +115,34 @@ def s3_stubber():
         yield s3_stubber
 
 
+@pytest.fixture()
+def statsd_sink(monkeypatch):
+    """
+    Local UDP server that StatsD stats are sent to (instead of the configured StatsD host).
+
+    Returns a function that returns the datagrams received since it was last called.
+    """
+    sink = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sink.bind(('127.0.0.1', 0))
+    sink.settimeout(0.1)
+    _, port = sink.getsockname()
+    client = BufferedStatsClient(host='127.0.0.1', port=port)
+    monkeypatch.setattr('datahub.core.statsd._client', client)
+
+    def get_received_datagrams():
+        datagrams = []
+        while True:
+            try:
+                datagrams.append(sink.recv(65535).decode('ascii'))
+            except socket.timeout:
+                return datagrams
+
+    yield get_received_datagrams
+
+    client.close()
+    sink.close()
+
+
 @pytest.fixture()
 def local_memory_cache():
     """Get local memory cache."""
@@ -119,6 +151,35 @@ def local_memory_cache():
     cache.clear()
 
 
+@pytest.fixture(autouse=True)
+def local_oauth_caches():
+    """Clear the in-process OAuth caches after each test so that entries don't leak."""
+    yield
+
+    clear_local_oauth_caches()
+
+
+@pytest.fixture(autouse=True)
+def local_feature_flag_registry():
+    """
+    Clear the in-process feature flag registry before each test.
+
+    (Feature flags created in a test are rolled back without a signal being sent.)
+    """
+    feature_flag_registry.clear()
+
+
+@pytest.fixture(autouse=True)
+def replica_routing(monkeypatch):
+    """
+    Route all reads to the default database, even inside use_replica().
+
+    (The database standing in for the replica is not kept in sync with the default database.
+    Tests of replica routing override this fixture.)
+    """
+    monkeypatch.setattr('datahub.core.replica.is_replica_configured', lambda: False)
+
+
 @pytest.fixture
 def synchronous_thread_pool(monkeypatch):
     """Run everything submitted to thread pools executor in sync."""
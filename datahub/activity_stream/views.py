@@ -5,6 +5,7 @@ from datahub.core.hawk_receiver import (
     HawkResponseSigningMixin,
     HawkScopePermission,
 )
+from datahub.core.replica import replica_view
 from datahub.core.viewsets import CoreViewSet
 
 
@@ -18,3 +19,8 @@ class ActivityViewSet(HawkResponseSigningMixin, CoreViewSet):
     authentication_classes = (PaaSIPAuthentication, HawkAuthentication)
     permission_classes = (HawkScopePermission,)
     required_hawk_scope = HawkScope.activity_stream
+
+    @replica_view
+    def list(self, request, *args, **kwargs):
+        """Lists activities (reading them from the replica database, if one is configured)."""
+        return super().list(request, *args, **kwargs)
@@ -6,6 +6,7 @@ from django.template.response import TemplateResponse
 
 from datahub.admin_report.report import get_report_by_id, get_reports_by_model, report_exists
 from datahub.core.csv import create_csv_response
+from datahub.core.replica import replica_view
 
 REPORT_INDEX_TEMPLATE = 'admin/reports/index.html'
 
@@ -28,8 +29,9 @@ def list_reports(request):
     return TemplateResponse(request, REPORT_INDEX_TEMPLATE, context)
 
 
+@replica_view
 def download_report(request, report_id=None):
-    """Downloads a report."""
+    """Downloads a report (reading it from the replica database, if one is configured)."""
     if not report_exists(report_id):
         raise Http404
 
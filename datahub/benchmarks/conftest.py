@@ -0,0 +1,53 @@
+import random
+
+import factory.random
+import pytest
+from django.db import connection
+
+from datahub.benchmarks.utils import InMemoryElasticsearch, RANDOM_SEED
+from datahub.search.views import SearchExportAPIView
+
+
+@pytest.fixture(autouse=True)
+def seed_random():
+    """Seeds all random number generators used when creating test data."""
+    factory.random.reseed_random(RANDOM_SEED)
+    random.seed(RANDOM_SEED)
+
+
+@pytest.fixture
+def seed_database_random(seed_random, db):
+    """
+    Seeds PostgreSQL's random() function (used by order_by('?') in
+    datahub.core.test_utils.random_obj_for_queryset()).
+    """
+    with connection.cursor() as cursor:
+        # setseed() takes a value between -1 and 1
+        cursor.execute('SELECT setseed(%s)', [RANDOM_SEED / 10000])
+
+
+@pytest.fixture
+def in_memory_es(monkeypatch):
+    """
+    Replaces Elasticsearch with an in-memory stand-in for bulk indexing and search exports.
+
+    Search exports return the IDs of all the documents indexed (for the relevant search app).
+    """
+    in_memory_es = InMemoryElasticsearch()
+
+    def _get_ids(view, es_query):
+        return in_memory_es.get_ids(view.search_app.es_model.get_write_alias())
+
+    monkeypatch.setattr('datahub.search.bulk_sync.bulk', in_memory_es.bulk)
+    monkeypatch.setattr(SearchExportAPIView, '_get_ids', _get_ids)
+    yield in_memory_es
+
+
+@pytest.fixture
+def data_flow_api_client(hawk_api_client):
+    """Hawk API client fixture configured to use credentials with the data_flow_api scope."""
+    hawk_api_client.set_credentials(
+        'data-flow-api-id',
+        'data-flow-api-key',
+    )
+    yield hawk_api_client
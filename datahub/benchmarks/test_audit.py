@@ -0,0 +1,59 @@
+"""Benchmarks for audit log views."""
+import pytest
+import reversion
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from datahub.company.test.factories import AdviserFactory, CompanyFactory, ContactFactory
+from datahub.core.test_utils import APITestMixin
+
+# Number of versions created for each object
+NUM_VERSIONS = 50
+
+
+def _create_versions(obj, field_name, value_factory):
+    with reversion.create_revision():
+        obj.save()
+
+    for _ in range(NUM_VERSIONS - 1):
+        with reversion.create_revision():
+            setattr(obj, field_name, value_factory())
+            obj.save()
+            reversion.set_user(AdviserFactory())
+
+
+@pytest.mark.usefixtures('seed_database_random')
+class TestAuditBenchmarks(APITestMixin):
+    """Benchmarks for AuditViewSet subclasses."""
+
+    @pytest.mark.benchmark(group='audit')
+    @pytest.mark.parametrize(
+        'factory,url_name,field_name,value_factory',
+        (
+            (
+                CompanyFactory,
+                'api-v4:company:audit-item',
+                'one_list_account_owner',
+                AdviserFactory,
+            ),
+            (ContactFactory, 'api-v3:contact:audit-item', 'company', CompanyFactory),
+        ),
+        ids=('company', 'contact'),
+    )
+    def test_benchmark_audit_log(self, benchmark, factory, url_name, field_name, value_factory):
+        """
+        Benchmark an audit log response (where a foreign key changes in each version, so that
+        related object names are looked up).
+        """
+        obj = factory()
+        _create_versions(obj, field_name, value_factory)
+        url = reverse(url_name, kwargs={'pk': obj.pk})
+
+        def _get_audit_log():
+            response = self.api_client.get(url, data={'limit': NUM_VERSIONS})
+            assert response.status_code == status.HTTP_200_OK
+            return response.json()
+
+        response_data = benchmark(_get_audit_log)
+
+        assert len(response_data['results']) == NUM_VERSIONS - 1
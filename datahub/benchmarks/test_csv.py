@@ -0,0 +1,52 @@
+"""Benchmarks for CSV generation."""
+from datetime import timezone
+
+import pytest
+from faker import Faker
+
+from datahub.benchmarks.utils import RANDOM_SEED
+from datahub.core.csv import csv_iterator
+
+# Number of rows in each generated CSV file
+NUM_ROWS = 10000
+
+FIELD_TITLES = {
+    'name': 'Name',
+    'email': 'Email',
+    'notes': 'Notes',
+    'amount': 'Amount',
+    'created_on': 'Created on',
+    'link': 'Link',
+    'empty': 'Empty',
+}
+
+
+@pytest.fixture
+def rows():
+    """Returns NUM_ROWS rows with a variety of value types (as returned by QuerySet.values())."""
+    faker = Faker('en_GB')
+    faker.seed_instance(RANDOM_SEED)
+    return [
+        {
+            'name': faker.company(),
+            'email': faker.email(),
+            'notes': faker.sentence(),
+            'amount': faker.pydecimal(left_digits=6, right_digits=2, positive=True),
+            'created_on': faker.date_time(tzinfo=timezone.utc),
+            'link': f'https://datahub.example.com/companies/{faker.uuid4()}',
+            'empty': None,
+        }
+        for _ in range(NUM_ROWS)
+    ]
+
+
+@pytest.mark.benchmark(group='csv')
+def test_benchmark_csv_iterator(benchmark, rows):
+    """Benchmark generating a CSV file using csv_iterator()."""
+    def _generate():
+        return b''.join(csv_iterator(rows, FIELD_TITLES))
+
+    content = benchmark(_generate)
+
+    # Byte order mark, header and a line per row
+    assert content.count(b'\r\n') == NUM_ROWS + 1
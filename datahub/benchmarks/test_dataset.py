@@ -0,0 +1,42 @@
+"""Benchmarks for dataset views."""
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from datahub.company.test.factories import CompanyFactory, ContactFactory
+from datahub.interaction.test.factories import CompanyInteractionFactory
+from datahub.investment.project.test.factories import InvestmentProjectFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('seed_database_random'),
+]
+
+# Number of objects created for each benchmark (all returned in one page)
+NUM_OBJECTS = 100
+
+
+@pytest.mark.benchmark(group='dataset')
+@pytest.mark.parametrize(
+    'factory,url_name',
+    (
+        (CompanyFactory, 'api-v4:dataset:companies-dataset'),
+        (ContactFactory, 'api-v4:dataset:contacts-dataset'),
+        (CompanyInteractionFactory, 'api-v4:dataset:interactions-dataset'),
+        (InvestmentProjectFactory, 'api-v4:dataset:investment-projects-dataset'),
+    ),
+    ids=('companies', 'contacts', 'interactions', 'investment-projects'),
+)
+def test_benchmark_dataset_page(benchmark, data_flow_api_client, factory, url_name):
+    """Benchmark rendering a page of a dataset."""
+    factory.create_batch(NUM_OBJECTS)
+    url = reverse(url_name)
+
+    def _get_page():
+        response = data_flow_api_client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        return response.json()
+
+    response_data = benchmark(_get_page)
+
+    assert len(response_data['results']) >= NUM_OBJECTS
@@ -0,0 +1,52 @@
+"""Benchmarks for opening database connections (with and without a connection pool)."""
+import psycopg2
+import pytest
+from django.db import connection
+
+from datahub.core.postgresql_pool.pool import ConnectionPool
+
+pytestmark = pytest.mark.django_db
+
+# Number of simulated requests (each running one query) in each benchmark round
+NUM_REQUESTS = 20
+
+
+@pytest.fixture
+def connect():
+    """Returns a function that opens a new connection to the test database."""
+    conn_params = connection.get_connection_params()
+    return lambda: psycopg2.connect(**conn_params)
+
+
+def _run_query(db_connection):
+    with db_connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+
+
+@pytest.mark.benchmark(group='db-connection')
+def test_benchmark_unpooled_connections(benchmark, connect):
+    """Benchmark opening a new connection for each request (as with CONN_MAX_AGE=0)."""
+    def _run_requests():
+        for _ in range(NUM_REQUESTS):
+            db_connection = connect()
+            _run_query(db_connection)
+            db_connection.close()
+
+    benchmark(_run_requests)
+
+
+@pytest.mark.benchmark(group='db-connection')
+def test_benchmark_pooled_connections(benchmark, connect):
+    """Benchmark checking a connection out of a pool for each request."""
+    pool = ConnectionPool(connect, max_size=1, max_lifetime=3600, timeout=1)
+
+    def _run_requests():
+        for _ in range(NUM_REQUESTS):
+            db_connection = pool.acquire()
+            _run_query(db_connection)
+            pool.release(db_connection)
+
+    try:
+        benchmark(_run_requests)
+    finally:
+        pool.close()
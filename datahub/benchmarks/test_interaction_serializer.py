@@ -0,0 +1,69 @@
+"""Benchmarks for interaction serializer validation."""
+from datetime import date
+
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from datahub.company.test.factories import AdviserFactory, CompanyFactory, ContactFactory
+from datahub.core.test_utils import get_default_test_user, random_obj_for_model
+from datahub.interaction.models import (
+    CommunicationChannel,
+    Interaction,
+    PolicyArea,
+    PolicyIssueType,
+)
+from datahub.interaction.serializers import InteractionSerializer
+from datahub.interaction.test.utils import random_service
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('seed_database_random'),
+]
+
+# Numbers of related objects in the data being validated
+NUM_CONTACTS = 20
+NUM_DIT_PARTICIPANTS = 20
+NUM_POLICY_AREAS = 5
+
+
+@pytest.fixture
+def interaction_data():
+    """Returns valid data (with many related objects) for a new interaction."""
+    company = CompanyFactory()
+    contacts = ContactFactory.create_batch(NUM_CONTACTS, company=company)
+    advisers = AdviserFactory.create_batch(NUM_DIT_PARTICIPANTS)
+    policy_areas = PolicyArea.objects.order_by('pk')[:NUM_POLICY_AREAS]
+
+    return {
+        'kind': Interaction.Kind.INTERACTION,
+        'theme': Interaction.Theme.EXPORT,
+        'communication_channel': {'id': random_obj_for_model(CommunicationChannel).pk},
+        'subject': 'Benchmark interaction',
+        'date': date(2020, 1, 1).isoformat(),
+        'company': {'id': company.pk},
+        'contacts': [{'id': contact.pk} for contact in contacts],
+        'dit_participants': [{'adviser': {'id': adviser.pk}} for adviser in advisers],
+        'service': {'id': random_service().pk},
+        'was_policy_feedback_provided': True,
+        'policy_areas': [{'id': policy_area.pk} for policy_area in policy_areas],
+        'policy_feedback_notes': 'Policy feedback notes',
+        'policy_issue_types': [{'id': random_obj_for_model(PolicyIssueType).pk}],
+    }
+
+
+@pytest.mark.benchmark(group='interaction-serializer')
+def test_benchmark_interaction_serializer_validation(benchmark, interaction_data):
+    """Benchmark validating data for a new interaction using InteractionSerializer."""
+    request = Request(APIRequestFactory().post('/'))
+    request.user = get_default_test_user()
+
+    def _validate():
+        serializer = InteractionSerializer(data=interaction_data, context={'request': request})
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    validated_data = benchmark(_validate)
+
+    assert len(validated_data['contacts']) == NUM_CONTACTS
+    assert len(validated_data['dit_participants']) == NUM_DIT_PARTICIPANTS
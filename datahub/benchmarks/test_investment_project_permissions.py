@@ -0,0 +1,110 @@
+"""
+Benchmarks for restricting investment projects to those associated with a user's team.
+
+These compare IsAssociatedToInvestmentProjectFilter (which checks to-many associations using
+EXISTS subqueries) with the previous approach of joining the to-many relations and removing
+duplicate projects using DISTINCT.
+"""
+from unittest.mock import Mock
+
+import pytest
+from django.db.models import Q
+
+from datahub.company.test.factories import AdviserFactory
+from datahub.investment.project.models import InvestmentProject
+from datahub.investment.project.permissions import (
+    get_association_filters,
+    IsAssociatedToInvestmentProjectFilter,
+)
+from datahub.investment.project.test.factories import (
+    InvestmentProjectFactory,
+    InvestmentProjectTeamMemberFactory,
+)
+from datahub.metadata.test.factories import TeamFactory
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('seed_database_random'),
+]
+
+# Number of projects associated with the user's team (and of projects not associated with it)
+NUM_PROJECTS = 100
+# Number of team members from the user's team in each associated project (each of which would
+# be a duplicate row without DISTINCT)
+NUM_TEAM_MEMBERS_PER_PROJECT = 5
+
+
+@pytest.fixture
+def team_with_projects():
+    """Creates a team whose advisers are team members of many projects."""
+    team = TeamFactory()
+    advisers = AdviserFactory.create_batch(NUM_TEAM_MEMBERS_PER_PROJECT, dit_team=team)
+
+    for project in InvestmentProjectFactory.create_batch(NUM_PROJECTS):
+        for adviser in advisers:
+            InvestmentProjectTeamMemberFactory(investment_project=project, adviser=adviser)
+
+    InvestmentProjectFactory.create_batch(NUM_PROJECTS)
+    return team
+
+
+def _filter_using_exists(dit_team_id):
+    user = Mock(
+        dit_team_id=dit_team_id,
+        has_perm=lambda permission: permission.endswith('_associated_investmentproject'),
+    )
+    request = Mock(method='GET', user=user)
+    view = Mock(action='list')
+
+    return IsAssociatedToInvestmentProjectFilter().filter_queryset(
+        request,
+        InvestmentProject.objects.all(),
+        view,
+    )
+
+
+def _filter_using_joins_and_distinct(dit_team_id):
+    """The association filter as it was before EXISTS subqueries were used."""
+    to_one_filters, to_many_filters = get_association_filters(dit_team_id)
+
+    query = Q()
+    for field, value in to_one_filters:
+        query |= Q(**{f'{field}__dit_team_id': value})
+
+    for field, value in to_many_filters:
+        query |= Q(**{f'{field.field_name}__{field.subfield_name}__dit_team_id': value})
+
+    return InvestmentProject.objects.filter(query).distinct()
+
+
+def test_filters_return_same_projects(team_with_projects):
+    """Test that both forms of the filter return the same projects (for the benchmarks below)."""
+    exists_query = _filter_using_exists(team_with_projects.pk)
+    distinct_query = _filter_using_joins_and_distinct(team_with_projects.pk)
+
+    assert 'DISTINCT' not in str(exists_query.query)
+    assert set(exists_query.values_list('pk', flat=True)) == set(
+        distinct_query.values_list('pk', flat=True),
+    )
+    assert exists_query.count() == NUM_PROJECTS
+
+
+@pytest.mark.benchmark(group='investment-project-association-filter')
+@pytest.mark.parametrize(
+    'filter_func',
+    (_filter_using_exists, _filter_using_joins_and_distinct),
+    ids=('exists', 'joins-and-distinct'),
+)
+def test_benchmark_association_filter(benchmark, team_with_projects, filter_func):
+    """Benchmark listing the (ordered) projects associated with a team."""
+    def _list_projects():
+        return list(
+            filter_func(team_with_projects.pk).order_by('-created_on').values_list(
+                'pk',
+                flat=True,
+            ),
+        )
+
+    project_ids = benchmark(_list_projects)
+
+    assert len(project_ids) == NUM_PROJECTS
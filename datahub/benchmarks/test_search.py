@@ -0,0 +1,108 @@
+"""
+Benchmarks for syncing objects to Elasticsearch and exporting search results as CSV files.
+
+Elasticsearch is replaced with an in-memory stand-in (see the in_memory_es fixture).
+"""
+from csv import DictReader
+from io import StringIO
+
+import pytest
+from rest_framework import status
+from rest_framework.reverse import reverse
+
+from datahub.company.test.factories import CompanyFactory, ContactFactory
+from datahub.core.test_utils import APITestMixin
+from datahub.interaction.test.factories import CompanyInteractionFactory
+from datahub.investment.project.test.factories import InvestmentProjectFactory
+from datahub.search.bulk_sync import sync_objects
+from datahub.search.company import CompanySearchApp
+from datahub.search.contact import ContactSearchApp
+from datahub.search.interaction import InteractionSearchApp
+from datahub.search.investment import InvestmentSearchApp
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('seed_database_random'),
+]
+
+# Number of objects created for each benchmark
+NUM_OBJECTS = 50
+
+
+@pytest.fixture(
+    params=(
+        (CompanySearchApp, CompanyFactory),
+        (ContactSearchApp, ContactFactory),
+        (InteractionSearchApp, CompanyInteractionFactory),
+        (InvestmentSearchApp, InvestmentProjectFactory),
+    ),
+    ids=('company', 'contact', 'interaction', 'investment'),
+)
+def search_app_and_pks(request):
+    """Creates NUM_OBJECTS objects for a search app and returns the search app and their IDs."""
+    search_app, factory = request.param
+    objs = factory.create_batch(NUM_OBJECTS)
+    return search_app, [obj.pk for obj in objs]
+
+
+def _sync_objects(search_app, pks):
+    write_alias = search_app.es_model.get_write_alias()
+    # A new query set is used each time so that objects are loaded from the database again
+    db_objects = search_app.queryset.filter(pk__in=pks)
+    return sync_objects(search_app.es_model, db_objects, (write_alias,), write_alias)
+
+
+@pytest.mark.benchmark(group='search-sync')
+def test_benchmark_sync_objects(benchmark, in_memory_es, search_app_and_pks):
+    """Benchmark loading objects from the database and syncing them to Elasticsearch."""
+    search_app, pks = search_app_and_pks
+
+    result = benchmark(_sync_objects, search_app, pks)
+
+    assert result.written == NUM_OBJECTS
+    assert len(in_memory_es.get_ids(search_app.es_model.get_write_alias())) == NUM_OBJECTS
+
+
+@pytest.mark.benchmark(group='search-document-conversion')
+def test_benchmark_db_objects_to_es_documents(benchmark, search_app_and_pks):
+    """Benchmark converting (already loaded) objects to Elasticsearch documents."""
+    search_app, pks = search_app_and_pks
+    es_model = search_app.es_model
+    db_objects = list(search_app.queryset.filter(pk__in=pks))
+
+    def _convert():
+        return list(es_model.db_objects_to_es_documents(db_objects))
+
+    docs = benchmark(_convert)
+
+    assert len(docs) == NUM_OBJECTS
+
+
+class TestSearchExportBenchmarks(APITestMixin):
+    """Benchmarks for search export views."""
+
+    @pytest.mark.benchmark(group='search-export')
+    @pytest.mark.parametrize(
+        'search_app,factory,url_name',
+        (
+            (CompanySearchApp, CompanyFactory, 'api-v4:search:company-export'),
+            (ContactSearchApp, ContactFactory, 'api-v3:search:contact-export'),
+            (InteractionSearchApp, CompanyInteractionFactory, 'api-v3:search:interaction-export'),
+        ),
+        ids=('company', 'contact', 'interaction'),
+    )
+    def test_benchmark_export(self, benchmark, in_memory_es, search_app, factory, url_name):
+        """Benchmark generating a search export CSV file."""
+        objs = factory.create_batch(NUM_OBJECTS)
+        _sync_objects(search_app, [obj.pk for obj in objs])
+        url = reverse(url_name)
+
+        def _export():
+            response = self.api_client.post(url, data={})
+            assert response.status_code == status.HTTP_200_OK
+            return b''.join(response.streaming_content)
+
+        content = benchmark(_export)
+
+        rows = list(DictReader(StringIO(content.decode('utf-8-sig'))))
+        assert len(rows) == NUM_OBJECTS
@@ -0,0 +1,37 @@
+from collections import defaultdict
+
+from elasticsearch.serializer import JSONSerializer
+
+# Seed used for factory_boy, Faker, Python's random module and PostgreSQL's random() so that
+# the same data is generated for each benchmark run
+RANDOM_SEED = 4321
+
+
+class InMemoryElasticsearch:
+    """
+    Stand-in for Elasticsearch that holds indexed documents in memory.
+
+    Documents are serialised to JSON (as they would be when sent to Elasticsearch) so that
+    serialisation is included in benchmark timings, but no network requests are made.
+    """
+
+    def __init__(self):
+        """Initialises the stand-in with no documents."""
+        self.indices = defaultdict(dict)
+        self._serializer = JSONSerializer()
+
+    def bulk(self, actions=None, **kwargs):
+        """Indexes or deletes documents (replaces datahub.search.elasticsearch.bulk)."""
+        for action in actions:
+            index = self.indices[action['_index']]
+
+            if action.get('_op_type') == 'delete':
+                index.pop(action['_id'], None)
+            else:
+                index[action['_id']] = self._serializer.dumps(action['_source'])
+
+        return len(actions), []
+
+    def get_ids(self, index_name):
+        """Gets the IDs of the documents in an index (in the order they were indexed)."""
+        return list(self.indices[index_name])
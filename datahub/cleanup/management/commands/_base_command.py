@@ -1,3 +1,4 @@
+from collections import Counter
 from contextlib import ExitStack
 from functools import reduce
 from logging import getLogger
@@ -48,6 +49,13 @@ class BaseCleanupCommand(BaseCommand):
             help='Only prints the SQL query and number of matching records. Does not delete '
                  'records or simulate deletions.',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            help='Deletes records in batches of this size (ordered by primary key), each in its '
+                 'own transaction, instead of in a single transaction. If interrupted, the '
+                 'command can be run again to continue where it left off.',
+        )
 
     def handle(self, *args, **options):
         """Main logic for the actual command."""
@@ -62,22 +70,59 @@ class BaseCleanupCommand(BaseCommand):
             self._print_queries(model, qs)
             return
 
-        try:
-            with ExitStack() as stack:
-                if not is_simulation:
-                    stack.enter_context(update_es_after_deletions())
+        batch_size = options['batch_size']
+        if batch_size:
+            self._delete_in_batches(qs, batch_size, is_simulation)
+            return
+
+        total_deleted, deletions_by_model = _delete(qs, is_simulation)
+        _log_deletions(total_deleted, deletions_by_model)
+
+        if is_simulation:
+            logger.info('Deletions rolled back')
+
+    def _delete_in_batches(self, qs, batch_size, is_simulation):
+        """
+        Deletes the records matched by qs in batches.
+
+        Batches are selected using the primary key (keyset pagination), and each batch is
+        deleted (and removed from Elasticsearch) in its own transaction. This avoids holding
+        locks for the entire run and loading every record to delete into memory at once.
+
+        As completed batches are committed, running the command again after an interruption
+        resumes where it left off.
+        """
+        qs = qs.order_by('pk')
+        total_deleted = 0
+        deletions_by_model = Counter()
+        last_pk = None
+
+        while True:
+            batch_qs = qs if last_pk is None else qs.filter(pk__gt=last_pk)
+            batch_pks = list(batch_qs.values_list('pk', flat=True)[:batch_size])
+
+            if not batch_pks:
+                break
+
+            last_pk = batch_pks[-1]
 
-                stack.enter_context(atomic())
-                total_deleted, deletions_by_model = qs.delete()
+            # The filters are applied again so that records that have started being referenced
+            # since the primary keys were retrieved are not deleted
+            batch_total_deleted, batch_deletions_by_model = _delete(
+                qs.filter(pk__in=batch_pks),
+                is_simulation,
+            )
+
+            total_deleted += batch_total_deleted
+            deletions_by_model.update(batch_deletions_by_model)
+            logger.info(
+                f'{batch_total_deleted} records deleted in batch ending at primary key '
+                f'{last_pk} ({total_deleted} so far)',
+            )
 
-                logger.info(f'{total_deleted} records deleted. Breakdown by model:')
-                for deletion_model, model_deletion_count in deletions_by_model.items():
-                    logger.info(f'{deletion_model}: {model_deletion_count}')
+        _log_deletions(total_deleted, deletions_by_model)
 
-                if is_simulation:
-                    logger.info('Rolling back deletions...')
-                    raise SimulationRollbackError()
-        except SimulationRollbackError:
+        if is_simulation:
             logger.info('Deletions rolled back')
 
     def _print_queries(self, model, qs):
@@ -112,6 +157,36 @@ class BaseCleanupCommand(BaseCommand):
         )
 
 
+def _delete(qs, is_simulation):
+    """
+    Deletes the records matched by qs in a transaction (and from Elasticsearch).
+
+    If is_simulation is True, the transaction is rolled back (and nothing is deleted from
+    Elasticsearch).
+    """
+    try:
+        with ExitStack() as stack:
+            if not is_simulation:
+                stack.enter_context(update_es_after_deletions())
+
+            stack.enter_context(atomic())
+            deletion_result = qs.delete()
+
+            if is_simulation:
+                logger.info('Rolling back deletions...')
+                raise SimulationRollbackError()
+    except SimulationRollbackError:
+        pass
+
+    return deletion_result
+
+
+def _log_deletions(total_deleted, deletions_by_model):
+    logger.info(f'{total_deleted} records deleted. Breakdown by model:')
+    for deletion_model, model_deletion_count in deletions_by_model.items():
+        logger.info(f'{deletion_model}: {model_deletion_count}')
+
+
 def _print_query(model, qs, relation=None):
     model_verbose_name = capfirst(model._meta.verbose_name_plural)
 
@@ -1,23 +1,25 @@
-from collections import Counter
 from logging import getLogger
 
-import reversion
 from django.apps import apps
 from django.core.management import BaseCommand
-from django.db import transaction
-from django.db.models import CharField
-from django.db.models.functions import Cast
-from reversion.models import Revision, Version
-
-logger = getLogger(__name__)
 
+from datahub.cleanup.orphaned_versions import (
+    clear_checkpoint,
+    DEFAULT_BATCH_SIZE,
+    delete_orphaned_versions,
+    get_all_model_labels,
+)
 
-def _get_all_model_labels():
-    return [model._meta.label for model in reversion.get_registered_models()]
+logger = getLogger(__name__)
 
 
 class Command(BaseCommand):
-    """Deletes all django versions for models that no longer exist in the database."""
+    """
+    Deletes all django versions for models that no longer exist in the database.
+
+    Versions are deleted in batches (each in its own transaction). If the command is
+    interrupted, it resumes where it left off when run again (unless --restart is used).
+    """
 
     def __repr__(self):
         """Python representation (used for parametrised tests)."""
@@ -29,50 +31,54 @@ class Command(BaseCommand):
         parser.add_argument(
             '--model-label',
             action='append',
-            choices=_get_all_model_labels(),
+            choices=get_all_model_labels(),
             help='Model of which we want the versions deleted. If empty, it includes all models',
         )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help='Number of versions (or revisions) to check in each batch.',
+        )
+        parser.add_argument(
+            '--load-budget',
+            type=float,
+            help='Fraction of time to spend running queries (between 0 and 1). The command '
+                 'sleeps between batches to stay within this budget. Defaults to the '
+                 'ORPHANED_VERSIONS_CLEANUP_LOAD_BUDGET setting.',
+        )
+        parser.add_argument(
+            '--max-duration',
+            type=int,
+            help='Stop after this many seconds. The next run will resume where this one '
+                 'left off.',
+        )
+        parser.add_argument(
+            '--restart',
+            action='store_true',
+            help='Discard the progress of any previous interrupted run and start afresh.',
+        )
 
-    @transaction.atomic
     def handle(self, *args, **options):
         """Main logic for the actual command."""
-        model_labels = options['model_label'] or _get_all_model_labels()
+        model_labels = options['model_label'] or get_all_model_labels()
         models = [apps.get_model(model_label) for model_label in model_labels]
 
-        logger.info(f'Deleting versions for following deleted models: {", ".join(model_labels)}')
+        if options['restart']:
+            clear_checkpoint()
 
-        counter = Counter()
-        for model in models:
-            # The Version's `get_deleted` method was originally used here, but it was not working
-            # quickly enough for our use case. The records to be deleted are now being determined
-            # in a way that is easier on the database being used.
-            _, deletions_by_model = _get_orphaned_versions_query(model).delete()
-            counter.update(deletions_by_model)
+        logger.info(f'Deleting versions for following deleted models: {", ".join(model_labels)}')
 
-        # delete revisions without versions
-        _, deletions_by_model = Revision.objects.filter(version__isnull=True).delete()
-        counter.update(deletions_by_model)
+        deletions_by_model, is_complete = delete_orphaned_versions(
+            models,
+            batch_size=options['batch_size'],
+            load_budget=options['load_budget'],
+            max_duration=options['max_duration'],
+        )
 
-        logger.info(f'{sum(counter.values())} records deleted. Breakdown by model:')
-        for deletion_model, model_deletion_count in counter.items():
+        logger.info(f'{sum(deletions_by_model.values())} records deleted. Breakdown by model:')
+        for deletion_model, model_deletion_count in deletions_by_model.items():
             logger.info(f'{deletion_model}: {model_deletion_count}')
 
-
-def _get_orphaned_versions_query(model):
-    all_model_ids = model.objects.annotate(
-        object_id=Cast('pk', CharField()),
-    ).values(
-        'object_id',
-    )
-
-    version_ids_to_delete = Version.objects.get_for_model(
-        model,
-    ).values(
-        'object_id',
-    ).difference(
-        all_model_ids,
-    )
-
-    return Version.objects.get_for_model(model).filter(
-        object_id__in=version_ids_to_delete,
-    )
+        if not is_complete:
+            logger.info('Maximum duration reached, run the command again to continue.')
@@ -0,0 +1,333 @@
+"""
+Incremental deletion of orphaned django-reversion versions and revisions.
+
+Versions are orphaned when the object they belong to has been deleted, and revisions are
+orphaned when all of their versions have been deleted.
+
+Rather than deleting all orphaned versions of a model in a single statement, versions are
+walked in chunks of batch_size (ordered by primary key, using keyset pagination). Orphaned
+versions in each chunk are deleted using a raw DELETE statement in their own transaction
+(bypassing Django's deletion collector, which would load every affected object into memory).
+Revisions are then walked and deleted in the same way.
+
+Progress is checkpointed (in the cache) after each batch. If a run is interrupted (or stops
+because max_duration was reached), the next run resumes from the checkpoint.
+
+Each run can be throttled using a load budget: the fraction of the run's elapsed time that
+should be spent running queries. After each batch, the run sleeps for long enough to stay
+within the budget (e.g. with a load budget of 0.25, it sleeps for three times as long as the
+batch took).
+"""
+from collections import Counter, namedtuple
+from contextlib import contextmanager
+from logging import getLogger
+from time import monotonic, sleep
+
+import reversion
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.db.models import SET_NULL
+from reversion.models import Revision, Version
+
+logger = getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 1000
+CHECKPOINT_CACHE_KEY = 'orphaned-versions-cleanup-checkpoint'
+CHECKPOINT_CACHE_TIMEOUT = 7 * 24 * 60 * 60  # seconds
+
+CleanupResult = namedtuple('CleanupResult', ('deletions_by_model', 'is_complete'))
+
+_DELETE_VERSIONS_SQL = 'DELETE FROM {version_table} WHERE id = ANY(%s)'
+# The NOT EXISTS condition guards against versions having been added since the revisions were
+# selected
+_DELETE_REVISIONS_SQL = """DELETE FROM {revision_table} r
+WHERE r.id = ANY(%s)
+AND NOT EXISTS (
+    SELECT 1 FROM {version_table} v WHERE v.revision_id = r.id
+)"""
+_SET_NULL_SQL = 'UPDATE {table} SET {column} = NULL WHERE {column} = ANY(%s)'
+
+
+def get_all_model_labels():
+    """Returns the labels of all models registered with django-reversion."""
+    return [model._meta.label for model in reversion.get_registered_models()]
+
+
+def get_checkpoint():
+    """Returns the checkpoint of an interrupted run (or None if there isn't one)."""
+    return cache.get(CHECKPOINT_CACHE_KEY)
+
+
+def clear_checkpoint():
+    """Discards the checkpoint of an interrupted run, so that the next run starts afresh."""
+    cache.delete(CHECKPOINT_CACHE_KEY)
+
+
+class _Throttle:
+    """Keeps a run within its load budget and maximum duration."""
+
+    def __init__(self, load_budget, max_duration):
+        if not 0 < load_budget <= 1:
+            raise ValueError('load_budget must be greater than 0 and no greater than 1.')
+
+        self._load_budget = load_budget
+        self._max_duration = max_duration
+        self._started_at = monotonic()
+
+    def is_time_up(self):
+        """Returns whether the run has reached its maximum duration."""
+        return (
+            self._max_duration is not None
+            and monotonic() - self._started_at >= self._max_duration
+        )
+
+    @contextmanager
+    def batch(self):
+        """Times a batch, and then sleeps for as long as needed to stay within the budget."""
+        started_at = monotonic()
+        yield
+        batch_duration = monotonic() - started_at
+        sleep(batch_duration * (1 - self._load_budget) / self._load_budget)
+
+
+def delete_orphaned_versions(
+    models,
+    batch_size=DEFAULT_BATCH_SIZE,
+    load_budget=None,
+    max_duration=None,
+):
+    """
+    Deletes versions of objects that no longer exist (for the specified models), followed by
+    revisions that no longer have any versions.
+
+    :param models: models to delete orphaned versions for
+    :param batch_size: number of versions (or revisions) to check in each batch
+    :param load_budget: fraction of time to spend running queries (between 0 and 1, defaults
+        to settings.ORPHANED_VERSIONS_CLEANUP_LOAD_BUDGET)
+    :param max_duration: if specified, the run stops (leaving a checkpoint to resume from)
+        once it has been running for this many seconds
+    :returns: CleanupResult of the number of deleted records (by model label), and whether
+        the cleanup was completed
+    """
+    if load_budget is None:
+        load_budget = settings.ORPHANED_VERSIONS_CLEANUP_LOAD_BUDGET
+
+    throttle = _Throttle(load_budget, max_duration)
+    checkpoint = get_checkpoint()
+
+    if checkpoint:
+        logger.info('Resuming orphaned versions cleanup from checkpoint')
+    else:
+        checkpoint = {
+            'completed_model_labels': [],
+            'last_version_ids': {},
+            'last_revision_id': 0,
+        }
+
+    deletions_by_model = Counter()
+    is_complete = _delete_orphaned_versions_for_models(
+        models,
+        batch_size,
+        throttle,
+        checkpoint,
+        deletions_by_model,
+    ) and _delete_orphaned_revisions(
+        batch_size,
+        throttle,
+        checkpoint,
+        deletions_by_model,
+    )
+
+    if is_complete:
+        clear_checkpoint()
+
+    return CleanupResult(deletions_by_model, is_complete)
+
+
+def _delete_orphaned_versions_for_models(
+    models,
+    batch_size,
+    throttle,
+    checkpoint,
+    deletions_by_model,
+):
+    for model in models:
+        model_label = model._meta.label
+        if model_label in checkpoint['completed_model_labels']:
+            continue
+
+        while True:
+            if throttle.is_time_up():
+                return False
+
+            with throttle.batch():
+                num_deleted, last_version_id = _delete_orphaned_version_batch(
+                    model,
+                    checkpoint['last_version_ids'].get(model_label, 0),
+                    batch_size,
+                )
+
+            deletions_by_model[Version._meta.label] += num_deleted
+
+            if last_version_id is None:
+                checkpoint['completed_model_labels'].append(model_label)
+                _save_checkpoint(checkpoint)
+                break
+
+            checkpoint['last_version_ids'][model_label] = last_version_id
+            _save_checkpoint(checkpoint)
+
+    return True
+
+
+def _delete_orphaned_revisions(batch_size, throttle, checkpoint, deletions_by_model):
+    while True:
+        if throttle.is_time_up():
+            return False
+
+        with throttle.batch():
+            num_deleted, last_revision_id = _delete_orphaned_revision_batch(
+                checkpoint['last_revision_id'],
+                batch_size,
+            )
+
+        deletions_by_model[Revision._meta.label] += num_deleted
+
+        if last_revision_id is None:
+            return True
+
+        checkpoint['last_revision_id'] = last_revision_id
+        _save_checkpoint(checkpoint)
+
+
+def _save_checkpoint(checkpoint):
+    cache.set(CHECKPOINT_CACHE_KEY, checkpoint, CHECKPOINT_CACHE_TIMEOUT)
+
+
+def _delete_orphaned_version_batch(model, last_version_id, batch_size):
+    """
+    Deletes orphaned versions in the next chunk of versions for a model.
+
+    :returns: the number of deleted versions, and the ID of the last version checked (or None
+        if there were no more versions to check)
+    """
+    versions = list(
+        Version.objects.get_for_model(
+            model,
+        ).filter(
+            pk__gt=last_version_id,
+        ).order_by(
+            'pk',
+        ).values_list(
+            'pk',
+            'object_id',
+        )[:batch_size],
+    )
+
+    if not versions:
+        return 0, None
+
+    object_pks_by_version_id = {
+        version_id: _to_pk_value(model, object_id) for version_id, object_id in versions
+    }
+    existing_object_pks = set(
+        model._base_manager.filter(
+            pk__in={pk for pk in object_pks_by_version_id.values() if pk is not None},
+        ).values_list(
+            'pk',
+            flat=True,
+        ),
+    )
+    orphaned_version_ids = [
+        version_id
+        for version_id, object_pk in object_pks_by_version_id.items()
+        if object_pk not in existing_object_pks
+    ]
+
+    num_deleted = 0
+    if orphaned_version_ids:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                _DELETE_VERSIONS_SQL.format(version_table=_quote_table(Version)),
+                [orphaned_version_ids],
+            )
+            num_deleted = cursor.rowcount
+
+    return num_deleted, versions[-1][0]
+
+
+def _delete_orphaned_revision_batch(last_revision_id, batch_size):
+    """
+    Deletes revisions without versions in the next chunk of revisions.
+
+    :returns: the number of deleted revisions, and the ID of the last revision checked (or None
+        if there were no more revisions to check)
+    """
+    revision_ids = list(
+        Revision.objects.filter(
+            pk__gt=last_revision_id,
+        ).order_by(
+            'pk',
+        ).values_list(
+            'pk',
+            flat=True,
+        )[:batch_size],
+    )
+
+    if not revision_ids:
+        return 0, None
+
+    orphaned_revision_ids = list(
+        Revision.objects.filter(
+            pk__in=revision_ids,
+            version__isnull=True,
+        ).values_list(
+            'pk',
+            flat=True,
+        ),
+    )
+
+    num_deleted = 0
+    if orphaned_revision_ids:
+        with transaction.atomic(), connection.cursor() as cursor:
+            # Raw deletions don't apply on_delete behaviour, so SET_NULL is applied manually
+            # (other types of references would make the deletion fail)
+            for table, column in _get_set_null_references(Revision):
+                cursor.execute(
+                    _SET_NULL_SQL.format(table=table, column=column),
+                    [orphaned_revision_ids],
+                )
+
+            cursor.execute(
+                _DELETE_REVISIONS_SQL.format(
+                    revision_table=_quote_table(Revision),
+                    version_table=_quote_table(Version),
+                ),
+                [orphaned_revision_ids],
+            )
+            num_deleted = cursor.rowcount
+
+    return num_deleted, revision_ids[-1]
+
+
+def _get_set_null_references(model):
+    quote_name = connection.ops.quote_name
+    return [
+        (_quote_table(relation.related_model), quote_name(relation.field.column))
+        for relation in model._meta.related_objects
+        if relation.on_delete is SET_NULL
+    ]
+
+
+def _quote_table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def _to_pk_value(model, object_id):
+    # Versions with object IDs that aren't valid primary key values are treated as orphaned
+    try:
+        return model._meta.pk.to_python(object_id)
+    except ValidationError:
+        return None
@@ -0,0 +1,40 @@
+import reversion
+from celery import shared_task
+from celery.utils.log import get_task_logger
+from django_pglocks import advisory_lock
+
+from datahub.cleanup import orphaned_versions
+from datahub.core.realtime_messaging import send_realtime_message
+
+logger = get_task_logger(__name__)
+
+
+@shared_task(acks_late=True)
+def delete_orphaned_versions(
+    batch_size=orphaned_versions.DEFAULT_BATCH_SIZE,
+    load_budget=None,
+    max_duration=None,
+):
+    """
+    Deletes versions (and revisions) of objects that no longer exist.
+
+    If max_duration is reached, the next run of this task resumes where this one left off.
+    """
+    with advisory_lock('delete_orphaned_versions', wait=False) as acquired:
+        if not acquired:
+            logger.info('Another instance of this task is already running.')
+            return
+
+        deletions_by_model, is_complete = orphaned_versions.delete_orphaned_versions(
+            reversion.get_registered_models(),
+            batch_size=batch_size,
+            load_budget=load_budget,
+            max_duration=max_duration,
+        )
+
+    total_deleted = sum(deletions_by_model.values())
+    status = 'completed' if is_complete else 'stopped at maximum duration'
+    logger.info(f'Orphaned versions clean-up {status}, {total_deleted} records deleted')
+    send_realtime_message(
+        f'{delete_orphaned_versions.name} {status}, records deleted: {total_deleted}',
+    )
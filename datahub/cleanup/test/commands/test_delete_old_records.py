@@ -823,6 +823,55 @@ def test_run(
     assert actual_deleted_models - {model._meta.label} <= mapping['implicitly_deletable_models']
 
 
+@freeze_time(FROZEN_TIME)
+@pytest.mark.parametrize('model_name,config', delete_old_records.Command.CONFIGS.items())
+@pytest.mark.django_db
+def test_run_in_batches(
+    model_name,
+    config,
+    track_return_values,
+    es_with_signals,
+    es_collector_context_manager,
+):
+    """
+    Test that if --batch-size is passed in, records are deleted in batches of that size (and
+    are deleted from Elasticsearch).
+    """
+    delete_return_value_tracker = track_return_values(QuerySet, 'delete')
+    command = delete_old_records.Command()
+
+    mapping = MAPPING[model_name]
+    model_factory = mapping['factory']
+    has_search_app = not mapping.get('has_no_search_app')
+
+    with es_collector_context_manager as collector:
+        for _ in range(3):
+            _create_model_obj(model_factory, **mapping['expired_objects_kwargs'][0])
+
+        _create_model_obj(model_factory, **mapping['unexpired_objects_kwargs'][0])
+
+        collector.flush_and_refresh()
+
+    model = apps.get_model(model_name)
+    assert model.objects.count() == 4
+
+    management.call_command(command, model_name, batch_size=2)
+    es_with_signals.indices.refresh()
+
+    # Two batches should have been deleted, of sizes 2 and 1
+    return_values = delete_return_value_tracker.return_values
+    assert [
+        deletions_by_model[model._meta.label] for _, deletions_by_model in return_values
+    ] == [2, 1]
+
+    assert model.objects.count() == 1
+
+    if has_search_app:
+        search_app = get_search_app_by_model(model)
+        read_alias = search_app.es_model.get_read_alias()
+        assert es_with_signals.count(index=read_alias)['count'] == 1
+
+
 @freeze_time(FROZEN_TIME)
 @pytest.mark.parametrize('model_name,config', delete_old_records.Command.CONFIGS.items())
 @pytest.mark.usefixtures('disconnect_delete_search_signal_receivers')
@@ -5,10 +5,16 @@ import reversion
 from django.apps import apps
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
+from django.core.cache import cache
 from django.core.management.base import CommandError
 from reversion.models import Revision, Version
 
 from datahub.cleanup.management.commands import delete_orphaned_versions
+from datahub.cleanup.orphaned_versions import (
+    CHECKPOINT_CACHE_KEY,
+    get_all_model_labels,
+    get_checkpoint,
+)
 from datahub.company.test.factories import (
     AdviserFactory,
     CompanyExportCountryFactory,
@@ -58,7 +64,7 @@ def test_mappings():
     Test that `MAPPINGS` includes all the data necessary for covering all the cases.
     This is to avoid missing tests when new fields and models are added or changed.
     """
-    assert set(delete_orphaned_versions._get_all_model_labels()) == set(MAPPINGS)
+    assert set(get_all_model_labels()) == set(MAPPINGS)
 
 
 @pytest.mark.django_db
@@ -162,8 +168,12 @@ def test_delete_revisions_without_versions(caplog):
 
 
 @pytest.mark.django_db
-def test_rollback_in_case_or_error(monkeypatch):
-    """Test that if there's an exception in the logic, all the changes are rolled back."""
+@pytest.mark.usefixtures('local_memory_cache')
+def test_resumes_after_error(monkeypatch):
+    """
+    Test that if there's an exception part of the way through, the batches already processed
+    are kept and the next run continues where the failed one stopped.
+    """
     objs = []
     for model_factory in MAPPINGS.values():
         with reversion.create_revision():
@@ -179,7 +189,45 @@ def test_rollback_in_case_or_error(monkeypatch):
     with pytest.raises(Exception):
         management.call_command(delete_orphaned_versions.Command())
 
-    assert Version.objects.count() == total_versions
+    # Orphaned versions were deleted before the error (when deleting revisions)
+    assert Version.objects.count() == total_versions - len(MAPPINGS)
+    assert Revision.objects.count() == len(MAPPINGS)
+    assert get_checkpoint()['completed_model_labels'] == get_all_model_labels()
+
+    monkeypatch.undo()
+    management.call_command(delete_orphaned_versions.Command())
+
+    assert Version.objects.count() == total_versions - len(MAPPINGS)
+    assert not Revision.objects.filter(version__isnull=True).exists()
+    assert get_checkpoint() is None
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('local_memory_cache')
+def test_restart():
+    """Test that --restart discards the progress of an interrupted run."""
+    model_label, model_factory = next(iter(MAPPINGS.items()))
+    with reversion.create_revision():
+        obj = model_factory()
+    obj.delete()
+
+    # Simulate an interrupted run that had already checked this model
+    cache.set(
+        CHECKPOINT_CACHE_KEY,
+        {
+            'completed_model_labels': [model_label],
+            'last_version_ids': {},
+            'last_revision_id': 0,
+        },
+    )
+
+    management.call_command(
+        delete_orphaned_versions.Command(),
+        model_label=[model_label],
+        restart=True,
+    )
+
+    assert not Version.objects.get_for_model(apps.get_model(model_label)).exists()
 
 
 def test_fails_with_invalid_model():
@@ -0,0 +1,110 @@
+from unittest import mock
+
+import pytest
+import reversion
+from django.utils.timezone import now
+from reversion.models import Revision, Version
+
+from datahub.cleanup.orphaned_versions import (
+    _Throttle,
+    delete_orphaned_versions,
+    get_checkpoint,
+)
+from datahub.company.models import Company
+from datahub.company.test.factories import CompanyFactory
+from datahub.investment.project.test.factories import InvestmentActivityFactory
+
+
+class TestThrottle:
+    """Tests for _Throttle."""
+
+    @pytest.mark.parametrize(
+        'load_budget,expected_sleep_duration',
+        (
+            (1, 0),
+            (0.5, 2),
+            (0.25, 6),
+        ),
+    )
+    @mock.patch('datahub.cleanup.orphaned_versions.sleep')
+    @mock.patch('datahub.cleanup.orphaned_versions.monotonic')
+    def test_sleeps_to_stay_within_load_budget(
+        self,
+        mocked_monotonic,
+        mocked_sleep,
+        load_budget,
+        expected_sleep_duration,
+    ):
+        """Test that the throttle sleeps for long enough after a batch to stay in budget."""
+        mocked_monotonic.side_effect = [0, 10, 12]
+        throttle = _Throttle(load_budget, None)
+
+        with throttle.batch():
+            pass
+
+        mocked_sleep.assert_called_once_with(expected_sleep_duration)
+
+    @pytest.mark.parametrize('load_budget', (0, -1, 1.5))
+    def test_rejects_invalid_load_budget(self, load_budget):
+        """Test that a load budget that isn't between 0 and 1 is rejected."""
+        with pytest.raises(ValueError):
+            _Throttle(load_budget, None)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('local_memory_cache')
+class TestDeleteOrphanedVersions:
+    """Tests for delete_orphaned_versions()."""
+
+    def test_resumes_from_checkpoint(self):
+        """
+        Test that a run that stops at its maximum duration can be resumed by the next run.
+        """
+        with reversion.create_revision():
+            CompanyFactory.create_batch(3)
+
+        versions = list(Version.objects.get_for_model(Company).order_by('pk'))
+        # Delete the companies of the first two versions
+        Company.objects.filter(pk__in=[version.object_id for version in versions[:2]]).delete()
+
+        with mock.patch.object(_Throttle, 'is_time_up', side_effect=[False, True]):
+            result = delete_orphaned_versions([Company], batch_size=1)
+
+        assert not result.is_complete
+        assert result.deletions_by_model == {'reversion.Version': 1}
+        assert get_checkpoint()['last_version_ids'] == {'company.Company': versions[0].pk}
+
+        result = delete_orphaned_versions([Company], batch_size=1)
+
+        assert result.is_complete
+        assert result.deletions_by_model['reversion.Version'] == 1
+        assert list(Version.objects.get_for_model(Company)) == [versions[2]]
+        assert get_checkpoint() is None
+
+    def test_treats_invalid_object_ids_as_orphaned(self):
+        """Test that versions with object IDs that aren't valid primary keys are deleted."""
+        with reversion.create_revision():
+            company = CompanyFactory()
+
+        Version.objects.get_for_model(Company).update(object_id='invalid')
+
+        result = delete_orphaned_versions([Company])
+
+        assert result.deletions_by_model['reversion.Version'] == 1
+        assert Company.objects.filter(pk=company.pk).exists()
+
+    def test_nulls_references_to_deleted_revisions(self):
+        """
+        Test that references to deleted revisions using on_delete=SET_NULL are set to null
+        (as Django's deletion collector would do).
+        """
+        revision = Revision.objects.create(date_created=now())
+        investment_activity = InvestmentActivityFactory(revision=revision)
+
+        result = delete_orphaned_versions([])
+
+        assert result.deletions_by_model['reversion.Revision'] == 1
+        assert not Revision.objects.filter(pk=revision.pk).exists()
+
+        investment_activity.refresh_from_db()
+        assert investment_activity.revision is None
@@ -0,0 +1,48 @@
+from unittest import mock
+
+import pytest
+import reversion
+from reversion.models import Version
+
+from datahub.cleanup.tasks import delete_orphaned_versions
+from datahub.company.test.factories import CompanyFactory
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('local_memory_cache')
+class TestDeleteOrphanedVersions:
+    """Tests for the delete_orphaned_versions task."""
+
+    def test_deletes_orphaned_versions(self):
+        """Test that versions of deleted objects are deleted."""
+        with reversion.create_revision():
+            company = CompanyFactory()
+
+        company_pk = str(company.pk)
+        company.delete()
+
+        delete_orphaned_versions.apply_async(kwargs={'batch_size': 10})
+
+        assert not Version.objects.filter(object_id=company_pk).exists()
+
+    @pytest.mark.parametrize(
+        'lock_acquired,call_count',
+        (
+            (False, 0),
+            (True, 1),
+        ),
+    )
+    def test_lock(self, monkeypatch, lock_acquired, call_count):
+        """Test that the task doesn't run if it cannot acquire the advisory_lock."""
+        mock_advisory_lock = mock.MagicMock()
+        mock_advisory_lock.return_value.__enter__.return_value = lock_acquired
+        monkeypatch.setattr('datahub.cleanup.tasks.advisory_lock', mock_advisory_lock)
+        mock_delete_orphaned_versions = mock.Mock(return_value=({}, True))
+        monkeypatch.setattr(
+            'datahub.cleanup.orphaned_versions.delete_orphaned_versions',
+            mock_delete_orphaned_versions,
+        )
+
+        delete_orphaned_versions()
+
+        assert mock_delete_orphaned_versions.call_count == call_count
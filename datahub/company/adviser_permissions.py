@@ -0,0 +1,130 @@
+"""
+Maintenance of the materialised AdviserPermission table.
+
+An adviser's effective permissions are the union of:
+
+- their direct user permissions
+- the permissions of their groups
+- the permissions of the groups of their team's role
+
+(Superusers have all permissions, but these are not materialised.)
+
+refresh_adviser_permissions() brings the rows for particular advisers up to date, and is called
+by signal receivers when any of the above change. rebuild_all_adviser_permissions() brings the
+rows for every adviser up to date.
+"""
+from django.contrib.auth.models import Group
+from django.db import transaction
+from django.db.models import Q
+
+from datahub.company.models import AdviserPermission, Advisor
+from datahub.metadata.models import TeamRole
+
+REBUILD_BATCH_SIZE = 1000
+
+
+def get_advisers_with_permission_query(app_label, codename):
+    """Gets a query for the IDs of advisers who have a permission (excluding superusers)."""
+    return AdviserPermission.objects.filter(
+        permission__content_type__app_label=app_label,
+        permission__codename=codename,
+    ).values(
+        'adviser_id',
+    )
+
+
+def get_affected_adviser_ids(model, ids):
+    """
+    Gets the IDs of the advisers whose effective permissions depend on particular advisers,
+    groups or team roles.
+    """
+    if model is Advisor:
+        return set(ids)
+
+    if model is Group:
+        q = Q(groups__in=ids) | Q(dit_team__role__groups__in=ids)
+    elif model is TeamRole:
+        q = Q(dit_team__role__in=ids)
+    else:
+        raise ValueError(f'Unexpected model {model._meta.label}.')
+
+    return set(Advisor.objects.filter(q).values_list('pk', flat=True))
+
+
+def refresh_adviser_permissions(adviser_ids):
+    """Brings the AdviserPermission rows for the specified advisers up to date."""
+    adviser_ids = set(adviser_ids)
+    if not adviser_ids:
+        return
+
+    effective_permissions = _get_effective_permissions(adviser_ids)
+
+    with transaction.atomic():
+        existing_permissions = {
+            (adviser_id, permission_id): pk
+            for pk, adviser_id, permission_id in AdviserPermission.objects.filter(
+                adviser_id__in=adviser_ids,
+            ).values_list(
+                'pk',
+                'adviser_id',
+                'permission_id',
+            )
+        }
+
+        AdviserPermission.objects.filter(
+            pk__in=[
+                pk
+                for adviser_permission, pk in existing_permissions.items()
+                if adviser_permission not in effective_permissions
+            ],
+        ).delete()
+
+        AdviserPermission.objects.bulk_create(
+            [
+                AdviserPermission(adviser_id=adviser_id, permission_id=permission_id)
+                for adviser_id, permission_id in effective_permissions
+                if (adviser_id, permission_id) not in existing_permissions
+            ],
+            # In case the same adviser is being refreshed concurrently
+            ignore_conflicts=True,
+        )
+
+
+def rebuild_all_adviser_permissions(batch_size=REBUILD_BATCH_SIZE):
+    """
+    Brings the AdviserPermission rows for all advisers up to date (in batches of advisers).
+
+    :returns: the number of advisers refreshed
+    """
+    adviser_ids = list(Advisor.objects.order_by('pk').values_list('pk', flat=True))
+
+    for index in range(0, len(adviser_ids), batch_size):
+        refresh_adviser_permissions(adviser_ids[index:index + batch_size])
+
+    return len(adviser_ids)
+
+
+def _get_effective_permissions(adviser_ids):
+    """Gets the effective permissions of advisers as a set of (adviser ID, permission ID)."""
+    user_permissions = Advisor.user_permissions.through.objects.filter(
+        advisor_id__in=adviser_ids,
+    ).values_list(
+        'advisor_id',
+        'permission_id',
+    )
+    group_permissions = Advisor.groups.through.objects.filter(
+        advisor_id__in=adviser_ids,
+        group__permissions__isnull=False,
+    ).values_list(
+        'advisor_id',
+        'group__permissions',
+    )
+    team_role_permissions = Advisor.objects.filter(
+        pk__in=adviser_ids,
+        dit_team__role__groups__permissions__isnull=False,
+    ).values_list(
+        'pk',
+        'dit_team__role__groups__permissions',
+    )
+
+    return {*user_permissions, *group_permissions, *team_role_permissions}
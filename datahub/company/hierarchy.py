@@ -0,0 +1,239 @@
+"""
+Resolution of the One List group (the global headquarters, and its One List tier, global
+account manager and core team) of many companies at once.
+
+Company.get_group_global_headquarters() and related methods normally query the database for
+each company. Instead, OneListGroupResolver.prime() can be used to resolve the groups of a batch
+of companies using a fixed number of queries, after which those methods use the resolved
+groups.
+"""
+from collections import defaultdict
+
+from django.core.cache import cache
+from django.db.models.functions import Coalesce
+
+from datahub.company.models import Company, OneListCoreTeamMember
+
+GLOBAL_HEADQUARTERS_CACHE_KEY_PREFIX = 'company-global-headquarters'
+ONE_LIST_GROUP_CACHE_KEY_PREFIX = 'company-one-list-group'
+# Cached groups include copies of advisers (and their teams), which are not invalidated when
+# advisers change, so this is kept relatively short
+ONE_LIST_GROUP_CACHE_TIMEOUT = 15 * 60  # seconds
+
+_ADVISER_SELECT_RELATED_FIELDS = (
+    'dit_team',
+    'dit_team__uk_region',
+    'dit_team__country',
+)
+
+
+class OneListGroup:
+    """The One List data for the group of companies headed by a global headquarters."""
+
+    def __init__(self, global_headquarters, core_team_members=None):
+        """
+        Initialises the group.
+
+        :param global_headquarters: the global headquarters of the group
+        :param core_team_members: the advisers in the core team of the group, excluding the
+            global account manager (or None if they have not been loaded)
+        """
+        self.global_headquarters = global_headquarters
+        self.core_team_members = core_team_members
+
+    @property
+    def one_list_tier(self):
+        """The One List tier of the group."""
+        return self.global_headquarters.one_list_tier
+
+    @property
+    def global_account_manager(self):
+        """The One List global account manager of the group."""
+        return self.global_headquarters.one_list_account_owner
+
+    def get_core_team(self):
+        """
+        :returns: the core team as a list of dicts with `adviser` and `is_global_account_manager`
+            (in the same format as Company.get_one_list_group_core_team())
+        """
+        core_team = []
+
+        if self.global_account_manager:
+            core_team.append(
+                {
+                    'adviser': self.global_account_manager,
+                    'is_global_account_manager': True,
+                },
+            )
+
+        core_team.extend(
+            {
+                'adviser': adviser,
+                'is_global_account_manager': False,
+            }
+            for adviser in self.core_team_members
+        )
+        return core_team
+
+
+def get_global_headquarters_ids(company_ids):
+    """
+    Gets the IDs of the global headquarters of multiple companies using a single query.
+
+    As with Company.get_group_global_headquarters(), only the company's own
+    global_headquarters is considered (the hierarchy is not followed any further). Companies
+    without a global headquarters are their own global headquarters. IDs of companies that do
+    not exist are omitted from the result.
+
+    :returns: dict of company ID to global headquarters ID
+    """
+    if not company_ids:
+        return {}
+
+    return dict(
+        Company.objects.filter(
+            pk__in=company_ids,
+        ).values_list(
+            'pk',
+            Coalesce('global_headquarters_id', 'pk'),
+        ),
+    )
+
+
+class OneListGroupResolver:
+    """
+    Resolves the One List groups of batches of companies.
+
+    Groups are memoised (by global headquarters ID) for the lifetime of the resolver, so each
+    group is only loaded once even if many of the companies belong to it. Resolvers are intended
+    to be short-lived (e.g. one per batch of companies being synced to Elasticsearch).
+    """
+
+    def __init__(self, include_core_team=False):
+        """
+        Initialises the resolver.
+
+        :param include_core_team: whether to also load the core teams of groups (this is not
+            needed for the One List tier and global account manager)
+        """
+        self.include_core_team = include_core_team
+        self._groups_by_headquarters_id = {}
+
+    def prime(self, companies):
+        """
+        Resolves the One List groups of multiple companies.
+
+        Afterwards, Company.get_group_global_headquarters() and related methods use the
+        resolved groups instead of querying the database.
+        """
+        companies = [company for company in companies if company.pk]
+        headquarters_ids = get_global_headquarters_ids([company.pk for company in companies])
+        self._load_groups(set(headquarters_ids.values()))
+
+        for company in companies:
+            headquarters_id = headquarters_ids.get(company.pk)
+            if headquarters_id in self._groups_by_headquarters_id:
+                company._one_list_group = self._groups_by_headquarters_id[headquarters_id]
+
+    def get_group(self, headquarters_id):
+        """
+        Gets the One List group headed by a global headquarters (or None if the company
+        doesn't exist).
+        """
+        self._load_groups({headquarters_id})
+        return self._groups_by_headquarters_id.get(headquarters_id)
+
+    def _load_groups(self, headquarters_ids):
+        headquarters_ids = headquarters_ids - self._groups_by_headquarters_id.keys()
+        if not headquarters_ids:
+            return
+
+        global_headquarters = Company.objects.select_related(
+            'one_list_tier',
+            'one_list_account_owner',
+            *(
+                f'one_list_account_owner__{field}'
+                for field in _ADVISER_SELECT_RELATED_FIELDS
+            ),
+        ).filter(
+            pk__in=headquarters_ids,
+        )
+        core_team_members_by_headquarters_id = (
+            self._get_core_team_members(headquarters_ids) if self.include_core_team else None
+        )
+
+        for company in global_headquarters:
+            core_team_members = None
+
+            if core_team_members_by_headquarters_id is not None:
+                core_team_members = [
+                    adviser
+                    for adviser in core_team_members_by_headquarters_id[company.pk]
+                    if adviser.pk != company.one_list_account_owner_id
+                ]
+
+            self._groups_by_headquarters_id[company.pk] = OneListGroup(
+                company,
+                core_team_members=core_team_members,
+            )
+
+    @staticmethod
+    def _get_core_team_members(headquarters_ids):
+        core_team_members = OneListCoreTeamMember.objects.filter(
+            company_id__in=headquarters_ids,
+        ).select_related(
+            'adviser',
+            *(f'adviser__{field}' for field in _ADVISER_SELECT_RELATED_FIELDS),
+        ).order_by(
+            'adviser__first_name',
+            'adviser__last_name',
+        )
+
+        core_team_members_by_headquarters_id = defaultdict(list)
+        for core_team_member in core_team_members:
+            core_team_members_by_headquarters_id[core_team_member.company_id].append(
+                core_team_member.adviser,
+            )
+        return core_team_members_by_headquarters_id
+
+
+def prime_one_list_group_from_cache(company):
+    """
+    Resolves the One List group (including the core team) of a single company, using the
+    cache where possible.
+
+    Cached data is invalidated when companies or core team members are saved or deleted (see
+    datahub.company.signals), and otherwise expires after ONE_LIST_GROUP_CACHE_TIMEOUT seconds.
+    """
+    global_headquarters_cache_key = f'{GLOBAL_HEADQUARTERS_CACHE_KEY_PREFIX}:{company.pk}'
+    headquarters_id = cache.get(global_headquarters_cache_key)
+
+    if headquarters_id is None:
+        headquarters_id = get_global_headquarters_ids([company.pk]).get(company.pk)
+        if not headquarters_id:
+            return
+
+        cache.set(global_headquarters_cache_key, headquarters_id, ONE_LIST_GROUP_CACHE_TIMEOUT)
+
+    one_list_group_cache_key = f'{ONE_LIST_GROUP_CACHE_KEY_PREFIX}:{headquarters_id}'
+    one_list_group = cache.get(one_list_group_cache_key)
+
+    if one_list_group is None:
+        resolver = OneListGroupResolver(include_core_team=True)
+        one_list_group = resolver.get_group(headquarters_id)
+        if not one_list_group:
+            return
+
+        cache.set(one_list_group_cache_key, one_list_group, ONE_LIST_GROUP_CACHE_TIMEOUT)
+
+    company._one_list_group = one_list_group
+
+
+def invalidate_cached_global_headquarters(company_id):
+    """Removes the cached global headquarters ID of a company."""
+    cache.delete(f'{GLOBAL_HEADQUARTERS_CACHE_KEY_PREFIX}:{company_id}')
+
+
+def invalidate_cached_one_list_group(headquarters_id):
+    """Removes the cached One List group headed by a global headquarters."""
+    cache.delete(f'{ONE_LIST_GROUP_CACHE_KEY_PREFIX}:{headquarters_id}')
@@ -0,0 +1,34 @@
+from logging import getLogger
+
+from django.core.management.base import BaseCommand
+
+from datahub.company.adviser_permissions import (
+    rebuild_all_adviser_permissions,
+    REBUILD_BATCH_SIZE,
+)
+
+logger = getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the materialised adviser permissions table for all advisers.
+
+    The table is normally kept up to date by signal receivers, so this is only needed if
+    permissions, groups or team roles were changed without signals being sent (e.g. using
+    QuerySet.update() or raw SQL).
+    """
+
+    def add_arguments(self, parser):
+        """Define extra arguments."""
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=REBUILD_BATCH_SIZE,
+            help='Number of advisers to rebuild in each transaction.',
+        )
+
+    def handle(self, *args, **options):
+        """Main logic for the actual command."""
+        num_advisers = rebuild_all_adviser_permissions(batch_size=options['batch_size'])
+        logger.info(f'Adviser permissions rebuilt for {num_advisers} advisers')
@@ -0,0 +1,29 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('company', '0113_auto_20210722_1249'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        # These indexes are used by AutocompleteFilter(use_trigram_index=True) and must match
+        # the SQL generated by datahub.core.autocomplete.AutocompleteSearchText exactly
+        migrations.RunSQL(
+            sql=[
+                """CREATE INDEX "company_advisor_autocomplete_trgm_5c1b2e8f" ON "company_advisor"
+USING gin (((COALESCE("first_name", '') || ' ' || COALESCE("last_name", ''))::text) gin_trgm_ops);""",
+            ],
+            reverse_sql=['DROP INDEX "company_advisor_autocomplete_trgm_5c1b2e8f";'],
+        ),
+        migrations.RunSQL(
+            sql=[
+                """CREATE INDEX "company_company_autocomplete_trgm_0e6f3a41" ON "company_company"
+USING gin (((COALESCE("name", ''))::text) gin_trgm_ops);""",
+            ],
+            reverse_sql=['DROP INDEX "company_company_autocomplete_trgm_0e6f3a41";'],
+        ),
+    ]
@@ -0,0 +1,53 @@
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('company', '0114_autocomplete_trigram_indexes'),
+        ('metadata', '0016_update_trade_agreements'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdviserPermission',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('adviser', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('permission', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='auth.permission')),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='adviserpermission',
+            index=models.Index(fields=['permission', 'adviser'], name='company_adv_permiss_c287f9_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='adviserpermission',
+            constraint=models.UniqueConstraint(fields=('adviser', 'permission'), name='unique_adviser_and_permission'),
+        ),
+        # Populate the table for existing advisers (it's kept up to date by signal receivers
+        # after this)
+        migrations.RunSQL(
+            sql=[
+                """INSERT INTO "company_adviserpermission" ("adviser_id", "permission_id")
+SELECT "advisor_id", "permission_id" FROM "company_advisor_user_permissions"
+UNION
+SELECT "company_advisor_groups"."advisor_id", "auth_group_permissions"."permission_id"
+FROM "company_advisor_groups"
+INNER JOIN "auth_group_permissions"
+ON "auth_group_permissions"."group_id" = "company_advisor_groups"."group_id"
+UNION
+SELECT "company_advisor"."id", "auth_group_permissions"."permission_id"
+FROM "company_advisor"
+INNER JOIN "metadata_team" ON "metadata_team"."id" = "company_advisor"."dit_team_id"
+INNER JOIN "metadata_teamrole_groups"
+ON "metadata_teamrole_groups"."teamrole_id" = "metadata_team"."role_id"
+INNER JOIN "auth_group_permissions"
+ON "auth_group_permissions"."group_id" = "metadata_teamrole_groups"."group_id";""",
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
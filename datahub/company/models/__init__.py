@@ -1,4 +1,4 @@
-from datahub.company.models.adviser import Advisor
+from datahub.company.models.adviser import AdviserPermission, Advisor
 from datahub.company.models.company import (
     Company,
     CompanyExportCountry,
@@ -11,6 +11,7 @@ from datahub.company.models.company import (
 from datahub.company.models.contact import Contact, ContactPermission
 
 __all__ = (
+    'AdviserPermission',
     'Advisor',
     'Company',
     'CompanyExportCountry',
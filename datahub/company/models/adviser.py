@@ -59,6 +59,11 @@ class Advisor(AbstractBaseUser, PermissionsMixin):
         Name: company_advisor_is_active_upper_name_e0ab1b4f
         Definition: ("is_active", (UPPER("first_name" || ' ' || "last_name" )))
         Comments: Used by the import interactions tool when looking up an active adviser by name
+
+        Name: company_advisor_autocomplete_trgm_5c1b2e8f
+        Definition: GIN (((COALESCE("first_name", '') || ' ' || COALESCE("last_name", ''))::text)
+            gin_trgm_ops)
+        Comments: Used by the adviser autocomplete filter
     """
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4)
@@ -163,3 +168,42 @@ class Advisor(AbstractBaseUser, PermissionsMixin):
         :returns: Features that are currently active.
         """
         return self.features.filter(is_active=True).values_list('code', flat=True)
+
+
+class AdviserPermission(models.Model):
+    """
+    An effective permission of an adviser (materialised from the adviser's direct permissions,
+    groups and team role groups).
+
+    This is maintained by the signal receivers in datahub.company.signals (and can be rebuilt
+    using the rebuild_adviser_permissions management command). Superusers have all
+    permissions, but these are not recorded here.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    adviser = models.ForeignKey(
+        Advisor,
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+    permission = models.ForeignKey(
+        'auth.Permission',
+        on_delete=models.CASCADE,
+        related_name='+',
+    )
+
+    def __str__(self):
+        """Human-readable representation."""
+        return f'{self.adviser} – {self.permission}'
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=('adviser', 'permission'),
+                name='unique_adviser_and_permission',
+            ),
+        ]
+        indexes = [
+            # For looking up the advisers with a particular permission
+            models.Index(fields=('permission', 'adviser')),
+        ]
@@ -64,7 +64,15 @@ class OneListTier(BaseOrderedConstantModel):
 
 @reversion.register_base_model()
 class Company(ArchivableModel, BaseModel):
-    """Representation of the company."""
+    """
+    Representation of the company.
+
+    Additional indexes created via migrations:
+
+        Name: company_company_autocomplete_trgm_0e6f3a41
+        Definition: GIN (((COALESCE("name", ''))::text) gin_trgm_ops)
+        Comments: Used by the company autocomplete filter
+    """
 
     class TransferReason(models.TextChoices):
         DUPLICATE = ('duplicate', 'Duplicate record')
@@ -445,7 +453,15 @@ class Company(ArchivableModel, BaseModel):
     def get_group_global_headquarters(self):
         """
         :returns: the Global Headquarters for the group that this company is part of.
+
+        If the One List group of the company has been resolved in advance (using
+        datahub.company.hierarchy.OneListGroupResolver), that is used instead. Either way, only
+        the company's own global_headquarters is considered.
         """
+        one_list_group = getattr(self, '_one_list_group', None)
+        if one_list_group:
+            return one_list_group.global_headquarters
+
         if self.global_headquarters:
             return self.global_headquarters
         return self
@@ -461,6 +477,10 @@ class Company(ArchivableModel, BaseModel):
         :returns: the One List Core Team for the group that this company is part of
             as a list of dicts with `adviser` and `is_global_account_manager`.
         """
+        one_list_group = getattr(self, '_one_list_group', None)
+        if one_list_group and one_list_group.core_team_members is not None:
+            return one_list_group.get_core_team()
+
         group_global_headquarters = self.get_group_global_headquarters()
         global_account_manager = group_global_headquarters.one_list_account_owner
 
@@ -1,22 +1,51 @@
 import logging
 
-from django.db.models.signals import post_migrate
+from django.contrib.auth.models import Group
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_migrate,
+    post_save,
+    pre_delete,
+)
 from django.dispatch import receiver
 
+from datahub.company.adviser_permissions import (
+    get_affected_adviser_ids,
+    refresh_adviser_permissions,
+)
 from datahub.company.constants import BusinessTypeConstant
+from datahub.company.hierarchy import (
+    invalidate_cached_global_headquarters,
+    invalidate_cached_one_list_group,
+)
 from datahub.company.models import (
+    Advisor,
+    Company,
     CompanyExportCountry,
     CompanyExportCountryHistory,
+    OneListCoreTeamMember,
 )
 from datahub.company.signal_receivers import (
     export_country_delete_signal,
     export_country_update_signal,
 )
 from datahub.core.utils import load_constants_to_database
-from datahub.metadata.models import BusinessType
+from datahub.metadata.models import BusinessType, Team, TeamRole
 
 logger = logging.getLogger(__name__)
 
+# Many-to-many fields that adviser permissions are derived from, by through model
+_PERMISSION_SOURCE_FIELDS = {
+    field.remote_field.through: field
+    for field in (
+        Advisor._meta.get_field('user_permissions'),
+        Advisor._meta.get_field('groups'),
+        Group._meta.get_field('permissions'),
+        TeamRole._meta.get_field('groups'),
+    )
+}
+
 
 @receiver(
     post_migrate,
@@ -61,6 +90,185 @@ def record_export_country_history_delete(sender, instance, by, **kwargs):
     _record_export_country_history(instance, action, by)
 
 
+@receiver(
+    post_save,
+    sender=Company,
+    dispatch_uid='invalidate_cached_one_list_group_on_company_save',
+)
+@receiver(
+    post_delete,
+    sender=Company,
+    dispatch_uid='invalidate_cached_one_list_group_on_company_delete',
+)
+def invalidate_cached_one_list_group_on_company_change(sender, instance, **kwargs):
+    """
+    Invalidate the cached global headquarters of a company, and the cached One List group it
+    heads (if any), when it's changed.
+    """
+    invalidate_cached_global_headquarters(instance.pk)
+    invalidate_cached_one_list_group(instance.pk)
+
+
+@receiver(
+    post_save,
+    sender=OneListCoreTeamMember,
+    dispatch_uid='invalidate_cached_one_list_group_on_core_team_member_save',
+)
+@receiver(
+    post_delete,
+    sender=OneListCoreTeamMember,
+    dispatch_uid='invalidate_cached_one_list_group_on_core_team_member_delete',
+)
+def invalidate_cached_one_list_group_on_core_team_change(sender, instance, **kwargs):
+    """Invalidate the cached One List group of a company when its core team is changed."""
+    invalidate_cached_one_list_group(instance.company_id)
+
+
+@receiver(
+    m2m_changed,
+    sender=Advisor.user_permissions.through,
+    dispatch_uid='refresh_adviser_permissions_on_user_permissions_m2m_changed',
+)
+@receiver(
+    m2m_changed,
+    sender=Advisor.groups.through,
+    dispatch_uid='refresh_adviser_permissions_on_adviser_groups_m2m_changed',
+)
+@receiver(
+    m2m_changed,
+    sender=Group.permissions.through,
+    dispatch_uid='refresh_adviser_permissions_on_group_permissions_m2m_changed',
+)
+@receiver(
+    m2m_changed,
+    sender=TeamRole.groups.through,
+    dispatch_uid='refresh_adviser_permissions_on_team_role_groups_m2m_changed',
+)
+def refresh_adviser_permissions_on_m2m_changed(
+    sender,
+    instance,
+    action,
+    reverse,
+    pk_set,
+    **kwargs,
+):
+    """
+    Refresh the materialised permissions of the affected advisers when user permissions,
+    adviser groups, group permissions or team role groups are changed.
+    """
+    field = _PERMISSION_SOURCE_FIELDS[sender]
+
+    if action == 'pre_clear' and reverse:
+        # pk_set is not provided when clearing, so the objects being cleared are recorded
+        # beforehand
+        instance._cleared_permission_source_ids = set(
+            sender.objects.filter(
+                **{field.m2m_reverse_field_name(): instance.pk},
+            ).values_list(
+                field.m2m_field_name(),
+                flat=True,
+            ),
+        )
+        return
+
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+
+    if not reverse:
+        source_ids = {instance.pk}
+    elif action == 'post_clear':
+        source_ids = instance.__dict__.pop('_cleared_permission_source_ids')
+    else:
+        source_ids = pk_set
+
+    refresh_adviser_permissions(get_affected_adviser_ids(field.model, source_ids))
+
+
+@receiver(
+    post_save,
+    sender=Advisor,
+    dispatch_uid='refresh_adviser_permissions_on_adviser_save',
+)
+def refresh_adviser_permissions_on_adviser_save(
+    sender,
+    instance,
+    created,
+    update_fields,
+    **kwargs,
+):
+    """Refresh the materialised permissions of an adviser when their team may have changed."""
+    if created and not instance.dit_team_id:
+        # The adviser can't have any permissions yet
+        return
+
+    if update_fields is not None and 'dit_team' not in update_fields:
+        return
+
+    refresh_adviser_permissions([instance.pk])
+
+
+@receiver(
+    post_save,
+    sender=Team,
+    dispatch_uid='refresh_adviser_permissions_on_team_save',
+)
+def refresh_adviser_permissions_on_team_save(sender, instance, created, update_fields, **kwargs):
+    """Refresh the materialised permissions of a team's advisers when its role may have changed."""
+    if created or (update_fields is not None and 'role' not in update_fields):
+        return
+
+    refresh_adviser_permissions(
+        Advisor.objects.filter(dit_team=instance).values_list('pk', flat=True),
+    )
+
+
+@receiver(
+    pre_delete,
+    sender=Group,
+    dispatch_uid='record_group_advisers_on_group_pre_delete',
+)
+def record_group_advisers_on_group_pre_delete(sender, instance, **kwargs):
+    """Record the advisers affected by a group being deleted (before it's deleted)."""
+    instance._affected_adviser_ids = get_affected_adviser_ids(Group, [instance.pk])
+
+
+@receiver(
+    post_delete,
+    sender=Group,
+    dispatch_uid='refresh_adviser_permissions_on_group_post_delete',
+)
+def refresh_adviser_permissions_on_group_post_delete(sender, instance, **kwargs):
+    """Refresh the materialised permissions of the advisers affected by a deleted group."""
+    refresh_adviser_permissions(instance.__dict__.pop('_affected_adviser_ids', ()))
+
+
+@receiver(
+    pre_delete,
+    sender=Team,
+    dispatch_uid='record_team_advisers_on_team_pre_delete',
+)
+def record_team_advisers_on_team_pre_delete(sender, instance, **kwargs):
+    """
+    Record the advisers of a team being deleted (before it's deleted).
+
+    Their dit_team is set to NULL using a query set update, so no post_save signals are sent
+    for them.
+    """
+    instance._affected_adviser_ids = set(
+        Advisor.objects.filter(dit_team=instance).values_list('pk', flat=True),
+    )
+
+
+@receiver(
+    post_delete,
+    sender=Team,
+    dispatch_uid='refresh_adviser_permissions_on_team_post_delete',
+)
+def refresh_adviser_permissions_on_team_post_delete(sender, instance, **kwargs):
+    """Refresh the materialised permissions of the former advisers of a deleted team."""
+    refresh_adviser_permissions(instance.__dict__.pop('_affected_adviser_ids', ()))
+
+
 def _record_export_country_history(export_country, action, adviser):
     """
     Records each change made to `CompanyExportCountry` model
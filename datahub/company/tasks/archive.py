@@ -0,0 +1,47 @@
+from functools import partial
+
+from django.db import transaction
+from django.utils import timezone
+
+from datahub.core.query_utils import update_returning_pks
+from datahub.search.apps import get_search_app_by_model
+from datahub.search.sync_object import sync_objects_async
+
+ARCHIVE_BATCH_SIZE = 1000
+
+
+def archive_in_batches(queryset, limit, archived_reason, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Archives up to `limit` objects matched by a query set and returns their primary keys.
+
+    Objects are archived in batches using UPDATE ... RETURNING statements (so save() is not
+    called and no signals are sent). Instead, the archived objects of each batch are synced to
+    Elasticsearch using a single task.
+
+    :param queryset: query set of objects to archive
+    :param limit: the maximum number of objects to archive
+    :param archived_reason: the archive reason; a value or an expression (evaluated in the
+        database for each object)
+    :param batch_size: the maximum number of objects to archive per statement
+    """
+    model = queryset.model
+    search_app = get_search_app_by_model(model)
+    archived_pks = []
+
+    while len(archived_pks) < limit:
+        num_to_archive = min(batch_size, limit - len(archived_pks))
+        batch_pks = update_returning_pks(
+            model.objects.filter(pk__in=queryset.values('pk')[:num_to_archive]),
+            archived=True,
+            archived_reason=archived_reason,
+            archived_on=timezone.now(),
+        )
+
+        if batch_pks:
+            transaction.on_commit(partial(sync_objects_async, search_app, batch_pks))
+            archived_pks.extend(batch_pks)
+
+        if len(batch_pks) < num_to_archive:
+            break
+
+    return archived_pks
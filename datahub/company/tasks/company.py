@@ -7,6 +7,7 @@ from django_pglocks import advisory_lock
 
 from datahub.company.constants import AUTOMATIC_COMPANY_ARCHIVE_FEATURE_FLAG
 from datahub.company.models import Company
+from datahub.company.tasks.archive import archive_in_batches
 from datahub.core.realtime_messaging import send_realtime_message
 from datahub.feature_flag.utils import is_feature_flag_active
 from datahub.interaction.models import Interaction
@@ -16,7 +17,6 @@ logger = get_task_logger(__name__)
 
 
 def _automatic_company_archive(limit, simulate):
-
     _5y_ago = timezone.now() - relativedelta(years=5)
     _3m_ago = timezone.now() - relativedelta(months=3)
 
@@ -41,34 +41,29 @@ def _automatic_company_archive(limit, simulate):
         active_investment_projects__isnull=True,
         created_on__lt=_3m_ago,
         modified_on__lt=_3m_ago,
-    )[:limit]
+    )
 
-    for company in companies_to_be_archived:
-        message = f'Automatically archived company: {company.id}'
-        if simulate:
-            logger.info(f'[SIMULATION] {message}')
-            continue
-        company.archived = True
-        company.archived_reason = 'This record was automatically archived due to inactivity'
-        company.archived_on = timezone.now()
-        company.save(
-            update_fields=[
-                'archived',
-                'archived_reason',
-                'archived_on',
-            ],
-        )
-        logger.info(message)
+    if simulate:
+        company_ids = list(companies_to_be_archived.values_list('pk', flat=True)[:limit])
+        for company_id in company_ids:
+            logger.info(f'[SIMULATION] Automatically archived company: {company_id}')
+        return len(company_ids)
+
+    archived_company_ids = archive_in_batches(
+        companies_to_be_archived,
+        limit,
+        'This record was automatically archived due to inactivity',
+    )
+    for company_id in archived_company_ids:
+        logger.info(f'Automatically archived company: {company_id}')
 
-    return companies_to_be_archived.count()
+    return len(archived_company_ids)
 
 
 @shared_task(
     bind=True,
     acks_late=True,
-    priority=9,
     max_retries=3,
-    queue='long-running',
     # name set explicitly to maintain backwards compatibility
     name='datahub.company.tasks.automatic_company_archive',
 )
@@ -1,11 +1,13 @@
 import requests
 from celery import shared_task
 from celery.utils.log import get_task_logger
-from django.utils import timezone
+from django.db.models import CharField, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
 from django_pglocks import advisory_lock
 
 from datahub.company import consent
-from datahub.company.models import Contact
+from datahub.company.models import Company, Contact
+from datahub.company.tasks.archive import archive_in_batches
 from datahub.core.realtime_messaging import send_realtime_message
 
 logger = get_task_logger(__name__)
@@ -14,27 +16,30 @@ logger = get_task_logger(__name__)
 def _automatic_contact_archive(limit=1000, simulate=False):
     contacts_to_be_archived = Contact.objects.filter(
         archived=False, company__archived=True,
-    ).prefetch_related('company')[:limit]
+    )
+
+    if simulate:
+        contact_ids = list(contacts_to_be_archived.values_list('pk', flat=True)[:limit])
+        for contact_id in contact_ids:
+            logger.info(f'[SIMULATION] Automatically archived contact: {contact_id}')
+        return len(contact_ids)
+
+    # The archive reason includes the company name, and is generated in the database
+    company_name = Subquery(
+        Company.objects.filter(pk=OuterRef('company_id')).values('name'),
+    )
+    archived_reason = Concat(
+        Value('Record was automatically archived due to the company "'),
+        company_name,
+        Value('" being archived'),
+        output_field=CharField(),
+    )
 
-    for contact in contacts_to_be_archived:
-        message = f'Automatically archived contact: {contact.id}'
-        if simulate:
-            logger.info(f'[SIMULATION] {message}')
-            continue
-        contact.archived = True
-        contact.archived_reason = f'Record was automatically archived due to the company ' \
-                                  f'"{contact.company.name}" being archived'
-        contact.archived_on = timezone.now()
-        contact.save(
-            update_fields=[
-                'archived',
-                'archived_reason',
-                'archived_on',
-            ],
-        )
-        logger.info(message)
+    archived_contact_ids = archive_in_batches(contacts_to_be_archived, limit, archived_reason)
+    for contact_id in archived_contact_ids:
+        logger.info(f'Automatically archived contact: {contact_id}')
 
-    return contacts_to_be_archived.count()
+    return len(archived_contact_ids)
 
 
 @shared_task(
@@ -60,9 +65,7 @@ def update_contact_consent(email_address,
 @shared_task(
     bind=True,
     acks_late=True,
-    priority=9,
     max_retries=3,
-    queue='long-running',
     # name set explicitly to maintain backwards compatibility
     name='datahub.company.tasks.automatic_contact_archive',
 )
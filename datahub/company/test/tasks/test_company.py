@@ -16,6 +16,7 @@ from datahub.investment.investor_profile.test.factories import LargeCapitalInves
 from datahub.investment.project.models import InvestmentProject
 from datahub.investment.project.test.factories import InvestmentProjectFactory
 from datahub.omis.order.test.factories import OrderFactory
+from datahub.search.company import CompanySearchApp
 
 
 @pytest.fixture()
@@ -371,3 +372,36 @@ class TestAutomaticCompanyArchive:
         assert task_result.successful()
         company.refresh_from_db()
         assert company.archived == expected_archived
+
+    @pytest.mark.usefixtures('synchronous_on_commit')
+    @freeze_time('2020-01-01-12:00:00')
+    def test_archived_companies_are_synced_to_search(
+        self,
+        monkeypatch,
+        automatic_company_archive_feature_flag,
+    ):
+        """Test that archived companies are synced to Elasticsearch in bulk."""
+        mock_sync_objects_async = mock.Mock()
+        monkeypatch.setattr(
+            'datahub.company.tasks.archive.sync_objects_async',
+            mock_sync_objects_async,
+        )
+        gt_3m_ago = timezone.now() - relativedelta(months=3, days=1)
+        with freeze_time(gt_3m_ago):
+            companies = CompanyFactory.create_batch(2)
+
+        task_result = automatic_company_archive.apply_async(kwargs={'simulate': False})
+        assert task_result.successful()
+
+        mock_sync_objects_async.assert_called_once()
+        search_app, synced_company_ids = mock_sync_objects_async.call_args[0]
+        assert search_app is CompanySearchApp
+        assert set(synced_company_ids) == {company.pk for company in companies}
+
+        for company in companies:
+            company.refresh_from_db()
+            assert company.archived
+            assert company.archived_on == timezone.now()
+            assert company.archived_reason == (
+                'This record was automatically archived due to inactivity'
+            )
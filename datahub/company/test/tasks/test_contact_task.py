@@ -258,6 +258,21 @@ class TestContactArchiveTask:
         automatic_contact_archive.apply_async()
         mock_send_realtime_message.assert_called_once_with(message)
 
+    def test_archived_reason_includes_company_name(self):
+        """Test that the archive reason (generated in the database) includes the company name."""
+        company = CompanyFactory(name='Archived company', archived=True)
+        contact = ContactFactory(company=company)
+
+        task_result = automatic_contact_archive.apply_async()
+        assert task_result.successful()
+
+        contact.refresh_from_db()
+        assert contact.archived
+        assert contact.archived_reason == (
+            'Record was automatically archived due to the company "Archived company" being '
+            'archived'
+        )
+
     def test_archive_no_updates(self):
         """
         Test contact archiving with no updates on contacts
@@ -0,0 +1,207 @@
+import pytest
+from django.contrib.auth.models import Permission
+from django.core import management
+
+from datahub.company.models import AdviserPermission
+from datahub.company.test.factories import AdviserFactory
+from datahub.core.auth import TeamModelPermissionsBackend
+from datahub.core.test.factories import GroupFactory
+from datahub.metadata.test.factories import TeamFactory, TeamRoleFactory
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def permissions():
+    """Some permissions for testing."""
+    return list(
+        Permission.objects.filter(
+            content_type__app_label='company',
+            codename__in=('view_company', 'change_company', 'view_contact'),
+        ).order_by('codename'),
+    )
+
+
+def _get_materialised_permissions(adviser):
+    return set(
+        AdviserPermission.objects.filter(adviser=adviser).values_list('permission', flat=True),
+    )
+
+
+def _ids(permissions):
+    return {permission.pk for permission in permissions}
+
+
+class TestUserPermissions:
+    """Tests for permissions assigned directly to advisers."""
+
+    def test_add_and_remove(self, permissions):
+        """Test that adding and removing user permissions updates the table."""
+        adviser = AdviserFactory(dit_team=None)
+
+        adviser.user_permissions.add(*permissions)
+        assert _get_materialised_permissions(adviser) == _ids(permissions)
+
+        adviser.user_permissions.remove(permissions[0])
+        assert _get_materialised_permissions(adviser) == _ids(permissions[1:])
+
+        adviser.user_permissions.clear()
+        assert _get_materialised_permissions(adviser) == set()
+
+    def test_reverse_add_and_clear(self, permissions):
+        """Test that changes made from the permission side update the table."""
+        advisers = AdviserFactory.create_batch(2, dit_team=None)
+        permission = permissions[0]
+
+        permission.user_set.add(*advisers)
+        for adviser in advisers:
+            assert _get_materialised_permissions(adviser) == {permission.pk}
+
+        permission.user_set.clear()
+        for adviser in advisers:
+            assert _get_materialised_permissions(adviser) == set()
+
+
+class TestGroupPermissions:
+    """Tests for permissions assigned to advisers through groups."""
+
+    def test_adviser_groups(self, permissions):
+        """Test that adding an adviser to, and removing them from, a group updates the table."""
+        adviser = AdviserFactory(dit_team=None)
+        group = GroupFactory()
+        group.permissions.add(*permissions)
+
+        adviser.groups.add(group)
+        assert _get_materialised_permissions(adviser) == _ids(permissions)
+
+        group.user_set.remove(adviser)
+        assert _get_materialised_permissions(adviser) == set()
+
+    def test_group_permissions(self, permissions):
+        """Test that changing the permissions of a group updates the table for its members."""
+        adviser = AdviserFactory(dit_team=None)
+        group = GroupFactory()
+        adviser.groups.add(group)
+
+        group.permissions.add(permissions[0])
+        assert _get_materialised_permissions(adviser) == {permissions[0].pk}
+
+        permissions[0].group_set.clear()
+        assert _get_materialised_permissions(adviser) == set()
+
+    def test_group_deletion(self, permissions):
+        """Test that deleting a group updates the table for its members."""
+        adviser = AdviserFactory(dit_team=None)
+        group = GroupFactory()
+        group.permissions.add(*permissions)
+        adviser.groups.add(group)
+
+        group.delete()
+
+        assert _get_materialised_permissions(adviser) == set()
+
+
+class TestTeamRolePermissions:
+    """Tests for permissions assigned to advisers through their team's role."""
+
+    def test_team_role_groups(self, permissions):
+        """Test that changing the groups of a team role updates the table for its advisers."""
+        group = GroupFactory()
+        group.permissions.add(*permissions)
+        team = TeamFactory()
+        adviser = AdviserFactory(dit_team=team)
+
+        team.role.groups.add(group)
+        assert _get_materialised_permissions(adviser) == _ids(permissions)
+
+        group.team_roles.remove(team.role)
+        assert _get_materialised_permissions(adviser) == set()
+
+    def test_adviser_team_change(self, permissions):
+        """Test that changing an adviser's team updates the table."""
+        group = GroupFactory()
+        group.permissions.add(*permissions)
+        team = TeamFactory()
+        team.role.groups.add(group)
+        adviser = AdviserFactory(dit_team=None)
+
+        adviser.dit_team = team
+        adviser.save()
+        assert _get_materialised_permissions(adviser) == _ids(permissions)
+
+        adviser.dit_team = TeamFactory()
+        adviser.save(update_fields=('dit_team',))
+        assert _get_materialised_permissions(adviser) == set()
+
+    def test_team_role_change(self, permissions):
+        """Test that changing a team's role updates the table for its advisers."""
+        group = GroupFactory()
+        group.permissions.add(*permissions)
+        team_role = TeamRoleFactory()
+        team_role.groups.add(group)
+        team = TeamFactory()
+        adviser = AdviserFactory(dit_team=team)
+        assert _get_materialised_permissions(adviser) == set()
+
+        team.role = team_role
+        team.save()
+
+        assert _get_materialised_permissions(adviser) == _ids(permissions)
+
+    def test_team_deletion(self, permissions):
+        """Test that deleting a team updates the table for its former advisers."""
+        group = GroupFactory()
+        group.permissions.add(*permissions)
+        team = TeamFactory()
+        team.role.groups.add(group)
+        adviser = AdviserFactory(dit_team=team)
+        assert _get_materialised_permissions(adviser) == _ids(permissions)
+
+        team.delete()
+
+        adviser.refresh_from_db()
+        assert adviser.dit_team is None
+        assert _get_materialised_permissions(adviser) == set()
+
+
+def test_rebuild_command(permissions):
+    """Test that the rebuild_adviser_permissions command repopulates the table."""
+    adviser = AdviserFactory(dit_team=None)
+    group = GroupFactory()
+    group.permissions.add(permissions[0])
+    adviser.groups.add(group)
+    adviser.user_permissions.add(permissions[1])
+    AdviserPermission.objects.all().delete()
+
+    management.call_command('rebuild_adviser_permissions', batch_size=1)
+
+    assert _get_materialised_permissions(adviser) == _ids(permissions[:2])
+
+
+class TestTeamModelPermissionsBackend:
+    """Tests for TeamModelPermissionsBackend."""
+
+    def test_get_all_permissions(self, permissions, django_assert_num_queries):
+        """Test that all permissions are fetched from the materialised table in one query."""
+        group = GroupFactory()
+        group.permissions.add(permissions[0])
+        team = TeamFactory()
+        team.role.groups.add(group)
+        adviser = AdviserFactory(dit_team=team)
+        adviser.user_permissions.add(permissions[1])
+
+        with django_assert_num_queries(1):
+            all_permissions = TeamModelPermissionsBackend().get_all_permissions(adviser)
+
+        assert all_permissions == {
+            f'company.{permission.codename}' for permission in permissions[:2]
+        }
+
+    def test_superuser_has_all_permissions(self):
+        """Test that superusers have all permissions (without them being materialised)."""
+        adviser = AdviserFactory(is_superuser=True)
+
+        all_permissions = TeamModelPermissionsBackend().get_all_permissions(adviser)
+
+        assert len(all_permissions) == Permission.objects.count()
+        assert not AdviserPermission.objects.filter(adviser=adviser).exists()
@@ -27,8 +27,10 @@ from datahub.core.constants import (
     TurnoverRange,
     UKRegion,
 )
+from datahub.core.query_instrumentation import QueryCounter
 from datahub.core.test_utils import (
     APITestMixin,
+    assert_query_budget,
     create_test_user,
     format_date_or_datetime,
     random_obj_for_model,
@@ -58,6 +60,33 @@ class TestListCompanies(APITestMixin):
         assert response.status_code == status.HTTP_200_OK
         assert response.json()['count'] == 2
 
+    def test_number_of_queries_does_not_depend_on_number_of_companies(self):
+        """Test that related objects are not loaded separately for each company."""
+        url = reverse('api-v4:company:collection')
+        global_headquarters = CompanyFactory(
+            one_list_tier=random_obj_for_model(OneListTier),
+            one_list_account_owner=AdviserFactory(),
+        )
+
+        def create_companies(count):
+            companies = CompanyFactory.create_batch(
+                count,
+                global_headquarters=global_headquarters,
+            )
+            for company in companies:
+                CompanyExportCountryFactory(company=company)
+
+        create_companies(1)
+        with QueryCounter() as query_counter:
+            self.api_client.get(url)
+
+        create_companies(4)
+        with assert_query_budget(max_queries=query_counter.query_count):
+            response = self.api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['count'] == 6
+
     def test_autocomplete_companies(self):
         """Test that the companies viewset can autocomplete."""
         CompanyFactory(name='Apple')
@@ -0,0 +1,184 @@
+import pytest
+
+from datahub.company.hierarchy import (
+    get_global_headquarters_ids,
+    OneListGroupResolver,
+    prime_one_list_group_from_cache,
+)
+from datahub.company.models import Company
+from datahub.company.test.factories import (
+    AdviserFactory,
+    CompanyFactory,
+    OneListCoreTeamMemberFactory,
+)
+from datahub.company.test.utils import random_non_ita_one_list_tier
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def one_list_group():
+    """Get a global headquarters with a core team and two subsidiaries."""
+    global_headquarters = CompanyFactory(
+        global_headquarters=None,
+        one_list_tier=random_non_ita_one_list_tier(),
+        one_list_account_owner=AdviserFactory(),
+    )
+    OneListCoreTeamMemberFactory.create_batch(2, company=global_headquarters)
+    # The global account manager is also a core team member, but should only be listed once
+    OneListCoreTeamMemberFactory(
+        company=global_headquarters,
+        adviser=global_headquarters.one_list_account_owner,
+    )
+    subsidiaries = CompanyFactory.create_batch(2, global_headquarters=global_headquarters)
+    yield global_headquarters, subsidiaries
+
+
+class TestGetGlobalHeadquartersIDs:
+    """Tests for get_global_headquarters_ids()."""
+
+    def test_resolves_hierarchy(self, one_list_group):
+        """Test that subsidiaries and headquarters resolve to the global headquarters."""
+        global_headquarters, subsidiaries = one_list_group
+        standalone_company = CompanyFactory(global_headquarters=None)
+        company_ids = [
+            global_headquarters.pk,
+            standalone_company.pk,
+            *(subsidiary.pk for subsidiary in subsidiaries),
+        ]
+
+        assert get_global_headquarters_ids(company_ids) == {
+            global_headquarters.pk: global_headquarters.pk,
+            standalone_company.pk: standalone_company.pk,
+            **{subsidiary.pk: global_headquarters.pk for subsidiary in subsidiaries},
+        }
+
+    def test_does_not_follow_multi_level_hierarchies(self):
+        """
+        Test that only a company's own global headquarters is considered (as it is for
+        unprimed companies).
+        """
+        ultimate_headquarters = CompanyFactory(global_headquarters=None)
+        intermediate_headquarters = CompanyFactory(global_headquarters=ultimate_headquarters)
+        company = CompanyFactory(global_headquarters=intermediate_headquarters)
+
+        assert get_global_headquarters_ids([company.pk]) == {
+            company.pk: intermediate_headquarters.pk,
+        }
+
+    def test_ignores_non_existent_companies(self):
+        """Test that IDs of non-existent companies are omitted."""
+        assert get_global_headquarters_ids([CompanyFactory.build().pk]) == {}
+
+
+class TestOneListGroupResolver:
+    """Tests for OneListGroupResolver."""
+
+    def test_primed_companies_match_unprimed_companies(self, one_list_group):
+        """Test that primed companies return the same group data as unprimed companies."""
+        global_headquarters, subsidiaries = one_list_group
+        companies = list(Company.objects.filter(pk__in=[c.pk for c in subsidiaries]))
+        unprimed_companies = list(Company.objects.filter(pk__in=[c.pk for c in subsidiaries]))
+
+        OneListGroupResolver(include_core_team=True).prime(companies)
+
+        for company, unprimed_company in zip(companies, unprimed_companies):
+            assert company.get_group_global_headquarters() == global_headquarters
+            assert company.get_one_list_group_tier() == unprimed_company.get_one_list_group_tier()
+            assert (
+                company.get_one_list_group_global_account_manager()
+                == unprimed_company.get_one_list_group_global_account_manager()
+            )
+            assert (
+                company.get_one_list_group_core_team()
+                == unprimed_company.get_one_list_group_core_team()
+            )
+
+    @pytest.mark.parametrize('prime', (True, False))
+    def test_multi_level_hierarchy(self, prime):
+        """
+        Test that primed and unprimed companies in a two-level hierarchy resolve to the same
+        global headquarters.
+        """
+        ultimate_headquarters = CompanyFactory(
+            global_headquarters=None,
+            one_list_tier=random_non_ita_one_list_tier(),
+        )
+        intermediate_headquarters = CompanyFactory(
+            global_headquarters=ultimate_headquarters,
+            one_list_tier=random_non_ita_one_list_tier(),
+        )
+        company = Company.objects.get(
+            pk=CompanyFactory(global_headquarters=intermediate_headquarters).pk,
+        )
+
+        if prime:
+            OneListGroupResolver().prime([company])
+
+        assert company.get_group_global_headquarters() == intermediate_headquarters
+        assert company.get_one_list_group_tier() == intermediate_headquarters.one_list_tier
+
+    def test_uses_fixed_number_of_queries(self, one_list_group, django_assert_num_queries):
+        """Test that groups are resolved using the same number of queries for any batch size."""
+        _, subsidiaries = one_list_group
+        other_companies = CompanyFactory.create_batch(
+            3,
+            one_list_account_owner=AdviserFactory(),
+        )
+        companies = list(
+            Company.objects.filter(
+                pk__in=[company.pk for company in [*subsidiaries, *other_companies]],
+            ),
+        )
+
+        # One query to resolve the hierarchy and one to load the global headquarters
+        with django_assert_num_queries(2):
+            OneListGroupResolver().prime(companies)
+
+        with django_assert_num_queries(0):
+            for company in companies:
+                company.get_one_list_group_global_account_manager().name
+
+
+@pytest.mark.usefixtures('local_memory_cache')
+class TestPrimeOneListGroupFromCache:
+    """Tests for prime_one_list_group_from_cache()."""
+
+    def test_caches_group(self, one_list_group, django_assert_num_queries):
+        """Test that the group is only loaded from the database once."""
+        _, subsidiaries = one_list_group
+        subsidiary = subsidiaries[0]
+        expected_core_team = Company.objects.get(pk=subsidiary.pk).get_one_list_group_core_team()
+
+        prime_one_list_group_from_cache(Company.objects.get(pk=subsidiary.pk))
+
+        company = Company.objects.get(pk=subsidiary.pk)
+        with django_assert_num_queries(0):
+            prime_one_list_group_from_cache(company)
+            assert company.get_one_list_group_core_team() == expected_core_team
+
+    def test_invalidated_on_core_team_change(self, one_list_group):
+        """Test that the cached group is invalidated when a core team member is added."""
+        global_headquarters, subsidiaries = one_list_group
+        prime_one_list_group_from_cache(Company.objects.get(pk=subsidiaries[0].pk))
+
+        new_member = OneListCoreTeamMemberFactory(company=global_headquarters)
+
+        company = Company.objects.get(pk=subsidiaries[0].pk)
+        prime_one_list_group_from_cache(company)
+        core_team_advisers = [item['adviser'] for item in company.get_one_list_group_core_team()]
+        assert new_member.adviser in core_team_advisers
+
+    def test_invalidated_on_hierarchy_change(self, one_list_group):
+        """Test that the cached global headquarters is invalidated when a company is saved."""
+        _, subsidiaries = one_list_group
+        subsidiary = subsidiaries[0]
+        prime_one_list_group_from_cache(Company.objects.get(pk=subsidiary.pk))
+
+        new_global_headquarters = CompanyFactory(global_headquarters=None)
+        subsidiary.global_headquarters = new_global_headquarters
+        subsidiary.save()
+
+        company = Company.objects.get(pk=subsidiary.pk)
+        prime_one_list_group_from_cache(company)
+        assert company.get_group_global_headquarters() == new_global_headquarters
@@ -1,5 +1,5 @@
 """Company and related resources view sets."""
-from django.contrib.auth.models import Group, Permission
+from django.contrib.auth.models import Permission
 from django.db.models import Exists, Prefetch, Q
 from django.http import (
     Http404,
@@ -14,6 +14,7 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import GenericViewSet
 
 from config.settings.types import HawkScope
+from datahub.company.adviser_permissions import get_advisers_with_permission_query
 from datahub.company.company_matching_api import (
     CompanyMatchingServiceConnectionError,
     CompanyMatchingServiceHTTPError,
@@ -26,6 +27,7 @@ from datahub.company.export_wins_api import (
     ExportWinsAPITimeoutError,
     get_export_wins,
 )
+from datahub.company.hierarchy import prime_one_list_group_from_cache
 from datahub.company.models import (
     Advisor,
     Company,
@@ -73,7 +75,7 @@ from datahub.investment.project.queryset import get_slim_investment_project_quer
 class CompanyFilterSet(FilterSet):
     """Company filter."""
 
-    autocomplete = AutocompleteFilter(search_fields=('name',))
+    autocomplete = AutocompleteFilter(search_fields=('name',), use_trigram_index=True)
 
     class Meta:
         model = Company
@@ -367,6 +369,7 @@ class OneListGroupCoreTeamViewSet(CoreViewSet):
     def list(self, request, *args, **kwargs):
         """Lists Core Team members."""
         company = self.get_object()
+        prime_one_list_group_from_cache(company)
         core_team = company.get_one_list_group_core_team()
 
         serializer = self.get_serializer(core_team, many=True)
@@ -432,29 +435,18 @@ def _build_permission_filter(app_label, codename):
     """
     Create a Q object that checks if an adviser has a particular permission.
 
-    All possible places permissions could be stored are checked:
-
-    - directly on the user
-    - in the users' groups
-    - in the user's team role's groups
+    Superusers have all permissions. For other advisers, the materialised AdviserPermission
+    table is checked (which combines permissions stored directly on the user, in the user's
+    groups and in the user's team role's groups).
     """
     all_matching_permissions = Permission.objects.filter(
         content_type__app_label=app_label,
         codename=codename,
     ).order_by()
 
-    matching_permission = all_matching_permissions[:1]
-
-    # Use a subquery for groups as joining on the permissions table is very inefficient
-    groups_with_permission = Group.objects.filter(
-        permissions=matching_permission,
-    )
-
     return Exists(all_matching_permissions) & (
         Q(is_superuser=True)
-        | Q(user_permissions=matching_permission)
-        | Q(groups__in=groups_with_permission)
-        | Q(dit_team__role__groups__in=groups_with_permission)
+        | Q(pk__in=get_advisers_with_permission_query(app_label, codename))
     )
 
 
@@ -463,6 +455,7 @@ class AdviserFilter(FilterSet):
 
     autocomplete = AutocompleteFilter(
         search_fields=('first_name', 'last_name', 'dit_team__name'),
+        use_trigram_index=True,
     )
     permissions__has = CharFilter(method='filter_permissions__has')
 
@@ -471,16 +464,9 @@ class AdviserFilter(FilterSet):
         """
         Filter advisers by a single permission (e.g. filter to advisers with the
         'company.add_company' permission).
-
-        Note: An adviser could have the same permission multiple times (in different
-        locations) and so duplicates need be avoided when this is the case. This is
-        done by using a subquery.
         """
         app_label, _, codename = value.partition('.')
-        q = _build_permission_filter(app_label, codename)
-        subquery = Advisor.objects.filter(q).values('pk')
-
-        return queryset.filter(pk__in=subquery)
+        return queryset.filter(_build_permission_filter(app_label, codename))
 
     class Meta:
         model = Advisor
@@ -2,6 +2,7 @@ import atexit
 
 from django.apps import AppConfig
 
+from datahub.core import statsd
 from datahub.core.thread_pool import shut_down_thread_pool
 
 
@@ -15,5 +16,12 @@ class CoreConfig(AppConfig):
 
         I haven't found a better way to do this; this won't get called when using runserver_plus,
         but will be when using gunicorn.
+
+        Also registers an atexit handler to send any buffered StatsD stats, and the Celery signal
+        receivers that record task metrics (and SQL query counts).
         """
+        import datahub.core.metrics  # noqa: F401
+        import datahub.core.query_instrumentation  # noqa: F401
+
         atexit.register(shut_down_thread_pool)
+        atexit.register(statsd.flush)
@@ -1,5 +1,6 @@
 import logging
 
+from django.apps import apps
 from django.conf import settings
 from django.contrib.auth.backends import ModelBackend
 from django.contrib.auth.models import Permission
@@ -36,15 +37,28 @@ class TeamModelPermissionsBackend(ModelBackend):
 
     def get_all_permissions(self, user_obj, obj=None):
         """
-        Because of using cache in the parent class, its hard to extend using super()
-        so the code is slightly duplicated
+        Returns a set of permission strings the user `user_obj` has directly, from their groups
+        and from their team role's groups.
+
+        These are read from the materialised AdviserPermission table in a single query (rather
+        than from each location in turn). Because of using cache in the parent class, its hard
+        to extend using super() so the code is slightly duplicated.
         """
         if not user_obj.is_active or user_obj.is_anonymous or obj is not None:
             return set()
         if not hasattr(user_obj, '_perm_cache'):
-            user_obj._perm_cache = self.get_user_permissions(user_obj).copy()
-            user_obj._perm_cache.update(self.get_group_permissions(user_obj))
-            user_obj._perm_cache.update(self.get_team_permissions(user_obj))
+            if user_obj.is_superuser:
+                permissions = Permission.objects.values_list('content_type__app_label', 'codename')
+            else:
+                permissions = apps.get_model('company', 'AdviserPermission').objects.filter(
+                    adviser=user_obj,
+                ).values_list(
+                    'permission__content_type__app_label',
+                    'permission__codename',
+                )
+            user_obj._perm_cache = {
+                f'{app_label}.{codename}' for app_label, codename in permissions
+            }
         return user_obj._perm_cache
 
 
@@ -2,10 +2,33 @@ import re
 from functools import reduce
 from operator import or_
 
-from django.db.models import Case, CharField, IntegerField, Q, When
+from django.db.models import Case, CharField, Func, IntegerField, Q, TextField, Value, When
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Coalesce
 from django_filters import CharFilter
 
 
+class AutocompleteSearchText(Func):
+    """
+    Concatenates fields (separated by spaces) for use in an autocomplete search.
+
+    This generates SQL in the form:
+
+        ((COALESCE("field_1", '') || ' ' || COALESCE("field_2", ''))::text)
+
+    which, unlike CONCAT(), is immutable and so can be indexed. Indexes must use exactly the
+    same expression (with the fields in the same order) to be used.
+    """
+
+    arg_joiner = " || ' ' || "
+    template = '((%(expressions)s)::text)'
+    output_field = TextField()
+
+    def __init__(self, *fields):
+        """Initialises the expression."""
+        super().__init__(*(Coalesce(field, Value('')) for field in fields))
+
+
 class AutocompleteFilter(CharFilter):
     """
     Autocomplete filters that performs a prefix match of the specified search terms against a
@@ -15,16 +38,22 @@ class AutocompleteFilter(CharFilter):
     it operates.
     """
 
-    def __init__(self, *args, search_fields=None, **kwargs):
+    def __init__(self, *args, search_fields=None, use_trigram_index=False, **kwargs):
         """
         Initialises the filter.
 
         The search_fields keyword argument specifies which fields to search and is required.
+
+        If use_trigram_index is True, the search is performed in a way that can make use of a
+        GIN index (using the gin_trgm_ops operator class) on the AutocompleteSearchText()
+        expression of the search fields of the model itself (see
+        _apply_autocomplete_filter_to_queryset() for more details).
         """
         if search_fields is None:
             raise ValueError('The search_fields keyword argument must be specified')
 
         self.search_fields = search_fields
+        self.use_trigram_index = use_trigram_index
         super().__init__(*args, **kwargs)
 
     def filter(self, queryset, value):
@@ -34,10 +63,20 @@ class AutocompleteFilter(CharFilter):
         if self.field_name not in self.parent.form.data:
             return queryset
 
-        return _apply_autocomplete_filter_to_queryset(queryset, self.search_fields, value)
+        return _apply_autocomplete_filter_to_queryset(
+            queryset,
+            self.search_fields,
+            value,
+            use_trigram_index=self.use_trigram_index,
+        )
 
 
-def _apply_autocomplete_filter_to_queryset(queryset, autocomplete_fields, search_string):
+def _apply_autocomplete_filter_to_queryset(
+    queryset,
+    autocomplete_fields,
+    search_string,
+    use_trigram_index=False,
+):
     """
     Performs an autocomplete search.
 
@@ -62,9 +101,18 @@ def _apply_autocomplete_filter_to_queryset(queryset, autocomplete_fields, search
     Note that special care should be taken to ensure that orderings from other places (e.g.
     default orderings on views) don't override the ordering performed by the filter.
 
-    It also also possible to significantly speed up this filter by creating GIN indexes using
-    the gin_trgm_ops operator class from the pg_trgm PostgreSQL extension. However, this will
-    typically only work if all search fields are on the same table.
+    If use_trigram_index is True, the filtering is performed in a way that PostgreSQL can
+    serve using a GIN index (with the gin_trgm_ops operator class from the pg_trgm extension):
+
+    - the fields on the model itself are matched as a single AutocompleteSearchText()
+    expression (rather than each field being matched separately), so that one index on that
+    expression can be used
+    - fields on related models are matched by first looking up the primary keys of the
+    matching related objects (using a separate query per token), so that the main query is
+    not filtered on joined tables
+
+    This returns the same results in the same order, and is intended for large tables where
+    the index has been created in a migration.
     """
     escaped_tokens = [re.escape(token) for token in search_string.split()]
 
@@ -75,10 +123,18 @@ def _apply_autocomplete_filter_to_queryset(queryset, autocomplete_fields, search
             'pk',
         )
 
-    filter_q_objects_for_tokens = (
-        _make_filter_q_for_token(autocomplete_fields, escaped_token)
-        for escaped_token in escaped_tokens
-    )
+    if use_trigram_index:
+        local_fields = [field for field in autocomplete_fields if LOOKUP_SEP not in field]
+        queryset = queryset.alias(_autocomplete_search_text=AutocompleteSearchText(*local_fields))
+        filter_q_objects_for_tokens = [
+            _make_indexed_filter_q_for_token(queryset.model, autocomplete_fields, escaped_token)
+            for escaped_token in escaped_tokens
+        ]
+    else:
+        filter_q_objects_for_tokens = (
+            _make_filter_q_for_token(autocomplete_fields, escaped_token)
+            for escaped_token in escaped_tokens
+        )
 
     return queryset.annotate(
         _matched_group_index=_make_ordering_case_expression(
@@ -144,6 +200,57 @@ def _make_filter_q_for_token(fields, escaped_token):
     )
 
 
+def _make_indexed_filter_q_for_token(model, fields, escaped_token):
+    r"""
+    Creates a Q object that checks if a token appears in a list of fields (as a prefix), in a
+    way that can make use of a trigram index.
+
+    For example::
+
+        _make_indexed_filter_q_for_token(
+            Advisor,
+            ['first_name', 'last_name', 'dit_team__name'],
+            'Joh',
+        )
+
+    would return a Q object equivalent to::
+
+        Q(_autocomplete_search_text__iregex='\mJoh') | Q(dit_team__in=[<IDs of matching teams>])
+    """
+    q_objects = []
+
+    if any(LOOKUP_SEP not in field for field in fields):
+        q_objects.append(_make_prefix_match_q('_autocomplete_search_text', escaped_token))
+
+    for field in fields:
+        if LOOKUP_SEP not in field:
+            continue
+
+        relation_path, related_model, related_field = _split_related_field(model, field)
+        matching_pks = related_model._base_manager.filter(
+            _make_prefix_match_q(related_field, escaped_token),
+        ).values_list('pk', flat=True)
+        q_objects.append(Q(**{f'{relation_path}__in': list(matching_pks)}))
+
+    return reduce(or_, q_objects)
+
+
+def _split_related_field(model, field):
+    """
+    Splits a field path into the path of the relation, the related model and the name of the
+    field on the related model.
+
+    For example, ('dit_team', Team, 'name') is returned for 'dit_team__name' on Advisor.
+    """
+    *relation_names, related_field = field.split(LOOKUP_SEP)
+    related_model = model
+
+    for relation_name in relation_names:
+        related_model = related_model._meta.get_field(relation_name).related_model
+
+    return LOOKUP_SEP.join(relation_names), related_model, related_field
+
+
 def _make_prefix_match_q(field, escaped_token):
     r"""
     Generates a Q object that performs a case-insensitive match of a token with prefixes
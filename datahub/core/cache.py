@@ -1,4 +1,105 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+
 from django.core.cache import cache as django_cache
 
+from datahub.core import statsd
 
 cache = django_cache
+
+_MISSING = object()
+
+
+class LocalLRUCache:
+    """
+    Small, bounded, in-process least-recently-used cache with per-entry expiry.
+
+    Entries are only visible to the process that added them, so this is only suitable for
+    data that can tolerate being slightly stale (up to the timeout of each entry) in other
+    processes.
+
+    Hit and miss counts are sent to StatsD (as <name>.hit and <name>.miss) every
+    `stats_interval` look-ups so that hit rates can be used to tune the size of the cache.
+    """
+
+    def __init__(self, name, max_size, stats_interval=100):
+        """Initialises the cache."""
+        self.name = name
+        self.max_size = max_size
+        self.stats_interval = stats_interval
+        self._entries = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key, default=None):
+        """Gets a value from the cache, returning `default` if missing or expired."""
+        with self._lock:
+            value, expires_at = self._entries.get(key, (_MISSING, None))
+
+            if value is not _MISSING and expires_at <= time.time():
+                del self._entries[key]
+                value = _MISSING
+
+            if value is _MISSING:
+                self._misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self._hits += 1
+
+            stats = self._pop_stats_if_due()
+
+        if stats:
+            hits, misses = stats
+            statsd.incr(f'{self.name}.hit', hits)
+            statsd.incr(f'{self.name}.miss', misses)
+
+        return default if value is _MISSING else value
+
+    def set(self, key, value, timeout):
+        """
+        Adds a value to the cache for `timeout` seconds.
+
+        The least recently used entry is evicted if the cache is full.
+        """
+        if self.max_size <= 0 or timeout <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (value, time.time() + timeout)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        """Removes a value from the cache (if present)."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_matching(self, predicate):
+        """Removes all values for which predicate(value) is true."""
+        with self._lock:
+            keys_to_delete = [
+                key for key, (value, _) in self._entries.items() if predicate(value)
+            ]
+            for key in keys_to_delete:
+                del self._entries[key]
+
+    def clear(self):
+        """Removes all values from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        """Returns the number of entries (including any that have expired but not been purged)."""
+        return len(self._entries)
+
+    def _pop_stats_if_due(self):
+        if self._hits + self._misses < self.stats_interval:
+            return None
+
+        stats = (self._hits, self._misses)
+        self._hits = self._misses = 0
+        return stats
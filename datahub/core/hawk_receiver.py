@@ -59,8 +59,16 @@ class HawkResponseSigningMixin:
         If the request was authenticated using Hawk, this adds a post-render callback to the
         response which sets the Server-Authorization header, so that the originator of the
         request can authenticate the response.
+
+        Streaming responses are signed straight away without a hash of the content (as the
+        content is not known in advance), so clients must accept untrusted content for them.
         """
         finalized_response = super().finalize_response(request, response, *args, **kwargs)
+
+        if finalized_response.streaming:
+            _sign_streaming_response(request, finalized_response)
+            return finalized_response
+
         callback = partial(_sign_rendered_response, request)
         finalized_response.add_post_render_callback(callback)
         return finalized_response
@@ -132,6 +140,11 @@ def _authorise(request):
     )
 
 
+def _sign_streaming_response(request, response):
+    if isinstance(request.successful_authenticator, HawkAuthentication):
+        response['Server-Authorization'] = request.auth.respond(always_hash_content=False)
+
+
 def _sign_rendered_response(request, response):
     if isinstance(request.successful_authenticator, HawkAuthentication):
         response['Server-Authorization'] = request.auth.respond(
@@ -0,0 +1,131 @@
+import random
+from statistics import median
+from time import perf_counter
+
+from django.core.management import BaseCommand
+from django.db import connection, transaction
+from faker import Faker
+
+from datahub.company.models import Advisor, Company
+from datahub.core.autocomplete import _apply_autocomplete_filter_to_queryset
+from datahub.core.utils import slice_iterable_into_chunks
+from datahub.metadata.models import Team
+
+BATCH_SIZE = 10000
+NAME_POOL_SIZE = 2000
+DEFAULT_TERMS = ('a', 'jo', 'john', 'john sm', 'smith', 'xyz')
+
+# (model, autocomplete search fields) combinations that are benchmarked (these should match the
+# corresponding filter sets)
+BENCHMARKS = (
+    (Advisor, ('first_name', 'last_name', 'dit_team__name')),
+    (Company, ('name',)),
+)
+
+
+class Command(BaseCommand):
+    """Benchmarks the autocomplete filter with and without trigram indexes."""
+
+    help = (
+        'Compares the latency of AutocompleteFilter with and without use_trigram_index=True '
+        'on a generated data set of advisers and companies. The generated data is rolled back '
+        'afterwards. Only intended to be used in development environments (as it generates '
+        'a large amount of load on the database).'
+    )
+
+    def add_arguments(self, parser):
+        """Adds additional command arguments."""
+        parser.add_argument(
+            '--count',
+            type=int,
+            default=1000000,
+            help='Number of advisers and of companies to generate (default: 1,000,000).',
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Number of times to run each query (default: 20).',
+        )
+        parser.add_argument(
+            '--limit',
+            type=int,
+            default=10,
+            help='Number of results to fetch for each query (default: 10).',
+        )
+        parser.add_argument(
+            '--terms',
+            nargs='+',
+            default=DEFAULT_TERMS,
+            help='Search terms to benchmark.',
+        )
+
+    def handle(self, *args, count=None, repeat=None, limit=None, terms=None, **options):
+        """Generates the data, runs the benchmarks and rolls back the generated data."""
+        with transaction.atomic():
+            self._generate_data(count)
+
+            for model, search_fields in BENCHMARKS:
+                for term in terms:
+                    self._benchmark(model, search_fields, term, repeat, limit)
+
+            transaction.set_rollback(True)
+
+    def _generate_data(self, count):
+        faker = Faker('en_GB')
+        first_names = [faker.first_name() for _ in range(NAME_POOL_SIZE)]
+        last_names = [faker.last_name() for _ in range(NAME_POOL_SIZE)]
+        company_names = [faker.company() for _ in range(NAME_POOL_SIZE)]
+        team_ids = list(Team.objects.values_list('pk', flat=True)) or [None]
+
+        self.stdout.write(f'Generating {count} advisers and {count} companies...')
+
+        advisers = (
+            Advisor(
+                email=f'autocomplete-benchmark-{index}@example.com',
+                first_name=random.choice(first_names),
+                last_name=random.choice(last_names),
+                dit_team_id=random.choice(team_ids),
+            )
+            for index in range(count)
+        )
+        for batch in slice_iterable_into_chunks(advisers, BATCH_SIZE):
+            Advisor.objects.bulk_create(batch)
+
+        companies = (
+            Company(name=f'{random.choice(company_names)} {index}')
+            for index in range(count)
+        )
+        for batch in slice_iterable_into_chunks(companies, BATCH_SIZE):
+            Company.objects.bulk_create(batch)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE "{Advisor._meta.db_table}", "{Company._meta.db_table}"')
+
+    def _benchmark(self, model, search_fields, term, repeat, limit):
+        results = {}
+
+        for use_trigram_index in (False, True):
+            timings = []
+
+            for _ in range(repeat):
+                start_time = perf_counter()
+                queryset = _apply_autocomplete_filter_to_queryset(
+                    model.objects.all(),
+                    search_fields,
+                    term,
+                    use_trigram_index=use_trigram_index,
+                )
+                list(queryset[:limit])
+                timings.append((perf_counter() - start_time) * 1000)
+
+            results[use_trigram_index] = timings
+
+        regex_median = median(results[False])
+        trigram_median = median(results[True])
+        self.stdout.write(
+            f'{model.__name__} {term!r}: regex median {regex_median:.1f}ms '
+            f'(max {max(results[False]):.1f}ms), trigram median {trigram_median:.1f}ms '
+            f'(max {max(results[True]):.1f}ms), '
+            f'speed-up {regex_median / max(trigram_median, 0.001):.1f}x',
+        )
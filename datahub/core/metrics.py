@@ -0,0 +1,99 @@
+"""
+StatsD metrics recorded automatically for every request and Celery task.
+
+For each view (identified by its URL pattern name) the following are recorded:
+
+- request.<view name>.duration (timer)
+- request.<view name>.count (counter)
+- request.<view name>.error (counter, for 5xx responses)
+
+For each Celery task:
+
+- celery.task.<task name>.duration (timer)
+- celery.task.<task name>.queue_wait (timer, for tasks not scheduled with an ETA or countdown)
+- celery.task.<task name>.<state> (counter, where state is success, failure or retry)
+
+Buffered stats are flushed at the end of each request and task.
+"""
+from time import perf_counter, time
+
+from celery.signals import before_task_publish, task_postrun, task_prerun
+
+from datahub.core import statsd
+
+PUBLISHED_AT_HEADER = 'datahub_published_at'
+UNRESOLVED_VIEW_NAME = 'unresolved'
+
+# Start times of the Celery tasks currently running in this process (by task ID)
+_task_start_times = {}
+
+
+class RequestMetricsMiddleware:
+    """Records the latency and error rate of each view."""
+
+    def __init__(self, get_response):
+        """Initialises the middleware."""
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Records metrics for a request and then sends all buffered stats."""
+        start_time = perf_counter()
+        response = self.get_response(request)
+        duration = (perf_counter() - start_time) * 1000
+        stat_prefix = f'request.{get_view_name(request)}'
+
+        with statsd.statsd().pipeline() as pipeline:
+            pipeline.timing(f'{stat_prefix}.duration', duration)
+            pipeline.incr(f'{stat_prefix}.count')
+            if response.status_code >= 500:
+                pipeline.incr(f'{stat_prefix}.error')
+
+        statsd.flush()
+        return response
+
+
+def get_view_name(request):
+    """Gets the name of the view that handled a request, in a form suitable for stat names."""
+    resolver_match = getattr(request, 'resolver_match', None)
+    if not resolver_match or not resolver_match.view_name:
+        return UNRESOLVED_VIEW_NAME
+
+    # Colons have a special meaning in StatsD
+    return resolver_match.view_name.replace(':', '.')
+
+
+@before_task_publish.connect(dispatch_uid='add_published_at_header')
+def add_published_at_header(headers=None, **kwargs):
+    """Records when a task was sent (so that the time spent waiting in the queue is known)."""
+    if headers is not None:
+        headers[PUBLISHED_AT_HEADER] = time()
+
+
+@task_prerun.connect(dispatch_uid='record_task_queue_wait')
+def record_task_queue_wait(task_id=None, task=None, **kwargs):
+    """Records how long a task waited in the queue, and when it started."""
+    _task_start_times[task_id] = perf_counter()
+
+    published_at = getattr(task.request, PUBLISHED_AT_HEADER, None)
+    # Time spent waiting for an ETA or countdown (including for retries) is not queue wait
+    if published_at is None or task.request.eta:
+        return
+
+    queue_wait = max(time() - published_at, 0) * 1000
+    statsd.statsd().timing(f'celery.task.{task.name}.queue_wait', queue_wait)
+
+
+@task_postrun.connect(dispatch_uid='record_task_duration')
+def record_task_duration(task_id=None, task=None, state=None, **kwargs):
+    """Records how long a task took and its outcome, and then sends all buffered stats."""
+    start_time = _task_start_times.pop(task_id, None)
+    stat_prefix = f'celery.task.{task.name}'
+
+    with statsd.statsd().pipeline() as pipeline:
+        if start_time is not None:
+            pipeline.timing(f'{stat_prefix}.duration', (perf_counter() - start_time) * 1000)
+
+        if state:
+            pipeline.incr(f'{stat_prefix}.{state.lower()}')
+
+    statsd.flush()
@@ -0,0 +1,97 @@
+"""
+PostgreSQL database backend that checks connections out of a process-wide pool.
+
+To use it, set ENGINE to 'datahub.core.postgresql_pool' and CONN_MAX_AGE to 0 (so that
+connections are returned to the pool at the end of each request and Celery task).
+
+The pool is configured using the POOL key of the database settings, for example:
+
+    'POOL': {
+        'MAX_SIZE': 10,
+        'MAX_LIFETIME': 3600,
+        'TIMEOUT': 30,
+    }
+
+(See ConnectionPool for details.)
+"""
+from threading import Lock
+
+import psycopg2.extras
+from django.db.backends.postgresql import base
+
+from datahub.core.postgresql_pool.pool import ConnectionPool
+
+DEFAULT_POOL_OPTIONS = {
+    'MAX_SIZE': 10,
+    'MAX_LIFETIME': 3600,  # seconds
+    'TIMEOUT': 30,  # seconds
+}
+
+_pools = {}
+_pools_lock = Lock()
+
+
+def get_pool(alias, conn_params, pool_options):
+    """
+    Gets (or creates) the pool for a database.
+
+    Pools are keyed by the connection parameters as well as the alias, as the database name
+    can change (e.g. when test databases are created).
+    """
+    key = (alias, *sorted((name, str(value)) for name, value in conn_params.items()))
+
+    with _pools_lock:
+        if key not in _pools:
+            options = {**DEFAULT_POOL_OPTIONS, **pool_options}
+            _pools[key] = ConnectionPool(
+                lambda: base.Database.connect(**conn_params),
+                options['MAX_SIZE'],
+                options['MAX_LIFETIME'],
+                options['TIMEOUT'],
+                name=alias,
+            )
+
+        return _pools[key]
+
+
+def close_all_pools():
+    """Closes the idle connections in all pools."""
+    with _pools_lock:
+        pools = list(_pools.values())
+
+    for pool in pools:
+        pool.close()
+
+
+class DatabaseWrapper(base.DatabaseWrapper):
+    """PostgreSQL database wrapper that uses a pool of connections."""
+
+    _pool = None
+
+    def get_new_connection(self, conn_params):
+        """
+        Checks out a connection from the pool.
+
+        This also does the same set-up as base.DatabaseWrapper.get_new_connection() (which is
+        quick to repeat for connections that are reused).
+        """
+        self._pool = get_pool(self.alias, conn_params, self.settings_dict.get('POOL', {}))
+        connection = self._pool.acquire()
+
+        options = self.settings_dict['OPTIONS']
+        try:
+            self.isolation_level = options['isolation_level']
+        except KeyError:
+            self.isolation_level = connection.isolation_level
+        else:
+            if self.isolation_level != connection.isolation_level:
+                connection.set_session(isolation_level=self.isolation_level)
+
+        psycopg2.extras.register_default_jsonb(conn_or_curs=connection, loads=lambda x: x)
+        return connection
+
+    def _close(self):
+        """Returns the connection to the pool instead of closing it."""
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self._pool.release(self.connection)
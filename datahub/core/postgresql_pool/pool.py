@@ -0,0 +1,243 @@
+import os
+from collections import deque, namedtuple
+from threading import Condition
+from time import monotonic
+
+from psycopg2 import OperationalError
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+
+from datahub.core import statsd
+
+# Connections that have been idle for longer than this are checked with a query on checkout
+# (connections that were used more recently are only checked locally)
+HEALTH_CHECK_IDLE_TIME = 5  # seconds
+
+_PooledConnection = namedtuple('_PooledConnection', ('connection', 'created_at', 'released_at'))
+
+
+class PoolTimeoutError(OperationalError):
+    """A connection could not be checked out of a pool before the timeout was reached."""
+
+
+class ConnectionPool:
+    """
+    Pool of Psycopg2 connections for a single database, shared by all threads (or greenlets)
+    in a process.
+
+    At most max_size connections are open at once; checkouts wait (for up to timeout seconds)
+    for a connection to be returned once this limit is reached. The pool uses the threading
+    module for synchronisation, so waiting only blocks the current greenlet when gevent has
+    patched threading (as it has in gevent Gunicorn workers).
+
+    Connections are health-checked on checkout and closed once they are older than
+    max_lifetime seconds.
+
+    Checkout wait times and pool saturation are sent to StatsD using the stat prefix
+    db.pool.<name>.
+    """
+
+    def __init__(self, connect, max_size, max_lifetime, timeout, name='default'):
+        """
+        Initialises the pool (without opening any connections).
+
+        :param connect: callable that opens and returns a new connection
+        """
+        self._connect = connect
+        self._max_size = max_size
+        self._max_lifetime = max_lifetime
+        self._timeout = timeout
+        self._stat_prefix = f'db.pool.{name}'
+
+        self._condition = Condition()
+        self._reset()
+
+    @property
+    def size(self):
+        """The number of open connections (both idle and checked out)."""
+        return self._size
+
+    @property
+    def idle_count(self):
+        """The number of idle connections."""
+        return len(self._idle)
+
+    def acquire(self):
+        """
+        Checks out a connection, opening a new one if there are no idle connections (and the
+        pool is not full).
+
+        :raises PoolTimeoutError: if the pool is full and no connection was returned to it
+            before the timeout was reached
+        """
+        start_time = monotonic()
+        deadline = start_time + self._timeout
+        waited = False
+
+        while True:
+            with self._condition:
+                self._reset_if_forked()
+
+                while not self._idle and self._size >= self._max_size:
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        self._record_timeout()
+                        raise PoolTimeoutError(
+                            f'Timed out waiting for a database connection (pool size '
+                            f'{self._max_size})',
+                        )
+
+                    waited = True
+                    self._condition.wait(remaining)
+
+                self._in_use += 1
+
+                if self._idle:
+                    # The most recently used connection is reused so that any excess
+                    # connections are left idle and eventually age out
+                    pooled_connection = self._idle.pop()
+                else:
+                    pooled_connection = None
+                    self._size += 1
+
+            if pooled_connection is None:
+                connection = self._open_connection()
+                break
+
+            if self._is_healthy(pooled_connection):
+                connection = pooled_connection.connection
+                break
+
+            self._discard(pooled_connection.connection, checked_out=True)
+
+        self._record_checkout(monotonic() - start_time, waited)
+        return connection
+
+    def release(self, connection):
+        """
+        Returns a connection to the pool.
+
+        Any open transaction is rolled back. The connection is closed instead if it is broken
+        or has reached its maximum lifetime.
+        """
+        created_at = self._created_at.get(id(connection))
+
+        with self._condition:
+            if self._pid != os.getpid() or created_at is None:
+                # The connection belongs to a pool in the parent process (or another pool)
+                return
+
+        is_reusable = (
+            monotonic() - created_at < self._max_lifetime
+            and self._reset_connection(connection)
+        )
+
+        if not is_reusable:
+            self._discard(connection, checked_out=True)
+            return
+
+        with self._condition:
+            self._in_use -= 1
+            self._idle.append(_PooledConnection(connection, created_at, monotonic()))
+            self._condition.notify()
+
+    def close(self):
+        """Closes all idle connections (checked-out connections are closed when released)."""
+        with self._condition:
+            idle, self._idle = self._idle, deque()
+
+        for pooled_connection in idle:
+            self._discard(pooled_connection.connection, checked_out=False)
+
+    def _open_connection(self):
+        try:
+            connection = self._connect()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._in_use -= 1
+                self._condition.notify()
+            raise
+
+        self._created_at[id(connection)] = monotonic()
+        statsd.incr(f'{self._stat_prefix}.connections_opened')
+        return connection
+
+    def _is_healthy(self, pooled_connection):
+        connection = pooled_connection.connection
+
+        if monotonic() - pooled_connection.created_at >= self._max_lifetime:
+            return False
+
+        if connection.closed or connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+            return False
+
+        if monotonic() - pooled_connection.released_at < HEALTH_CHECK_IDLE_TIME:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+
+            # If autocommit is off, the query will have started a transaction
+            if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except Exception:
+            return False
+
+        return True
+
+    def _reset_connection(self, connection):
+        """Rolls back any open transaction, returning whether the connection is reusable."""
+        if connection.closed:
+            return False
+
+        try:
+            if connection.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except Exception:
+            return False
+
+        return connection.get_transaction_status() == TRANSACTION_STATUS_IDLE
+
+    def _discard(self, connection, checked_out):
+        self._created_at.pop(id(connection), None)
+
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+        with self._condition:
+            self._size -= 1
+            if checked_out:
+                self._in_use -= 1
+            self._condition.notify()
+
+        statsd.incr(f'{self._stat_prefix}.connections_closed')
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._idle = deque()
+        self._created_at = {}
+        self._size = 0
+        self._in_use = 0
+
+    def _reset_if_forked(self):
+        """
+        Forgets about any connections inherited from a parent process.
+
+        (They are not closed, as that would also close them in the parent process.)
+        """
+        if self._pid != os.getpid():
+            self._reset()
+
+    def _record_checkout(self, wait_time, waited):
+        with statsd.statsd().pipeline() as pipeline:
+            pipeline.timing(f'{self._stat_prefix}.wait', wait_time * 1000)
+            pipeline.gauge(f'{self._stat_prefix}.in_use', self._in_use)
+            pipeline.gauge(f'{self._stat_prefix}.saturation', self._in_use / self._max_size)
+            if waited:
+                pipeline.incr(f'{self._stat_prefix}.waits')
+
+    def _record_timeout(self):
+        statsd.incr(f'{self._stat_prefix}.timeouts')
@@ -0,0 +1,154 @@
+"""
+Instrumentation of the SQL queries run by each request and Celery task.
+
+This is only active when settings.QUERY_INSTRUMENTATION_ENABLED is True (which it should not
+be in production).
+
+For each view (identified by its URL pattern name) the following are recorded:
+
+- request.<view name>.query_count (timer)
+- request.<view name>.query_duration (timer)
+- request.<view name>.repeated_queries (timer)
+
+The same values are also added to the response as the X-Query-Count, X-Query-Duration and
+X-Query-Repeated headers.
+
+For each Celery task:
+
+- celery.task.<task name>.query_count (timer)
+- celery.task.<task name>.query_duration (timer)
+- celery.task.<task name>.repeated_queries (timer)
+
+repeated_queries is the number of queries whose SQL (ignoring parameters) was identical to
+that of an earlier query. These are usually the result of a related object being loaded
+separately for each object in a list (N+1 queries).
+
+(Timers are used for the counts so that their distributions are recorded.)
+"""
+from collections import Counter
+from contextlib import ExitStack
+from time import perf_counter
+
+from celery.signals import task_postrun, task_prerun
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from datahub.core import statsd
+from datahub.core.metrics import get_view_name
+
+QUERY_COUNT_HEADER = 'X-Query-Count'
+QUERY_DURATION_HEADER = 'X-Query-Duration'
+REPEATED_QUERIES_HEADER = 'X-Query-Repeated'
+
+# Query counters of the Celery tasks currently running in this process (by task ID)
+_task_query_counters = {}
+
+
+class QueryCounter:
+    """
+    Context manager that counts the SQL queries run (on all database connections in the
+    current thread) and how long they took.
+
+    Usage example:
+
+        with QueryCounter() as query_counter:
+            ...
+
+        print(query_counter.query_count, query_counter.repeated_queries)
+    """
+
+    def __init__(self):
+        """Initialises the counter."""
+        self.query_count = 0
+        # In milliseconds
+        self.duration = 0
+        self.sql_counts = Counter()
+        self._exit_stack = None
+
+    def __enter__(self):
+        """Starts counting queries."""
+        self._exit_stack = ExitStack()
+        for connection in connections.all():
+            self._exit_stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stops counting queries."""
+        self._exit_stack.close()
+
+    def __call__(self, execute, sql, params, many, context):
+        """Runs and counts a query (called by Django for each query)."""
+        start_time = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += (perf_counter() - start_time) * 1000
+            self.query_count += 1
+            self.sql_counts[sql] += 1
+
+    @property
+    def repeated_query_count(self):
+        """The number of queries whose SQL was identical to that of an earlier query."""
+        return sum(count - 1 for count in self.sql_counts.values())
+
+    @property
+    def repeated_queries(self):
+        """
+        The SQL of queries that were run more than once, mapped to the number of times each was
+        run (most frequent first).
+        """
+        return {sql: count for sql, count in self.sql_counts.most_common() if count > 1}
+
+    def send_stats(self, stat_prefix):
+        """Records the counts and duration in StatsD."""
+        with statsd.statsd().pipeline() as pipeline:
+            pipeline.timing(f'{stat_prefix}.query_count', self.query_count)
+            pipeline.timing(f'{stat_prefix}.query_duration', self.duration)
+            pipeline.timing(f'{stat_prefix}.repeated_queries', self.repeated_query_count)
+
+
+class QueryInstrumentationMiddleware:
+    """Records the number of SQL queries run by each view (if enabled)."""
+
+    def __init__(self, get_response):
+        """Initialises the middleware (or disables it if query instrumentation is disabled)."""
+        if not settings.QUERY_INSTRUMENTATION_ENABLED:
+            raise MiddlewareNotUsed
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Counts the queries run by a request and records the counts."""
+        with QueryCounter() as query_counter:
+            response = self.get_response(request)
+
+        query_counter.send_stats(f'request.{get_view_name(request)}')
+
+        response[QUERY_COUNT_HEADER] = str(query_counter.query_count)
+        response[QUERY_DURATION_HEADER] = f'{query_counter.duration:.3f}'
+        response[REPEATED_QUERIES_HEADER] = str(query_counter.repeated_query_count)
+        return response
+
+
+@task_prerun.connect(dispatch_uid='start_task_query_counter')
+def start_task_query_counter(task_id=None, **kwargs):
+    """Starts counting the queries run by a task (if query instrumentation is enabled)."""
+    if not settings.QUERY_INSTRUMENTATION_ENABLED:
+        return
+
+    query_counter = QueryCounter()
+    query_counter.__enter__()
+    _task_query_counters[task_id] = query_counter
+
+
+@task_postrun.connect(dispatch_uid='stop_task_query_counter')
+def stop_task_query_counter(task_id=None, task=None, **kwargs):
+    """Stops counting the queries run by a task and records the counts."""
+    query_counter = _task_query_counters.pop(task_id, None)
+    if not query_counter:
+        return
+
+    query_counter.__exit__(None, None, None)
+    query_counter.send_stats(f'celery.task.{task.name}')
+    statsd.flush()
@@ -1,8 +1,10 @@
 from django.conf import settings
 from django.contrib.postgres.aggregates import ArrayAgg, StringAgg
 from django.contrib.postgres.fields import JSONField
+from django.db import connections, transaction
 from django.db.models import Case, CharField, F, Func, OuterRef, Subquery, Value, When
 from django.db.models.functions import Cast, Coalesce, Concat, NullIf
+from django.db.models.sql import UpdateQuery
 
 
 class ConcatWS(Func):
@@ -360,3 +362,43 @@ def get_queryset_object(queryset, **filters):
 def get_empty_string_if_null_expression(field):
     """Get empty string if field is None."""
     return Coalesce(field, Value('', output_field=CharField()))
+
+
+def update_returning_pks(queryset, **values):
+    """
+    Updates the objects matched by a query set and returns the primary keys of the updated
+    objects.
+
+    This works like QuerySet.update() (so save() is not called and no signals are sent), but
+    uses a single UPDATE ... RETURNING statement so that the updated objects are known without
+    running the query again.
+
+    Slices are not supported, so to limit the number of objects updated filter on a sliced
+    subquery instead, for example:
+
+        update_returning_pks(
+            Company.objects.filter(pk__in=queryset.values('pk')[:limit]),
+            archived=True,
+        )
+    """
+    if queryset.query.is_sliced:
+        raise TypeError('Cannot update a query once a slice has been taken.')
+
+    query = queryset.query.chain(UpdateQuery)
+    query.add_update_values(values)
+    query.annotations = {}
+
+    if query.related_updates:
+        raise ValueError('Updates spanning multiple tables are not supported.')
+
+    connection = connections[queryset.db]
+    sql, params = query.get_compiler(queryset.db).as_sql()
+
+    meta = queryset.model._meta
+    qualified_pk_column = '.'.join(
+        connection.ops.quote_name(name) for name in (meta.db_table, meta.pk.column)
+    )
+
+    with transaction.mark_for_rollback_on_error(using=queryset.db), connection.cursor() as cursor:
+        cursor.execute(f'{sql} RETURNING {qualified_pk_column}', params)
+        return [row[0] for row in cursor.fetchall()]
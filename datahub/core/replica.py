@@ -0,0 +1,183 @@
+"""
+Routing of read-only workloads to a read replica of the database.
+
+Reads are only sent to the replica inside use_replica() (or a view decorated with
+replica_view()), and only if a database with the alias REPLICA_DATABASE_ALIAS is configured.
+All writes go to the default database.
+
+If the replica falls behind the primary by more than settings.DATABASE_REPLICA_MAX_LAG
+seconds (or the replica cannot be queried), reads fall back to the default database until the
+replica catches up. The lag is checked at most once every LAG_CHECK_INTERVAL seconds in each
+process.
+
+The following stats are sent to StatsD:
+
+- db.replica.lag (gauge, in seconds)
+- db.replica.fallback (counter, incremented each time a read falls back to the default
+  database)
+"""
+import logging
+from contextlib import contextmanager
+from functools import wraps
+from threading import local, Lock
+from time import monotonic
+
+from django.conf import settings
+from django.db import connections, DEFAULT_DB_ALIAS, Error
+
+from datahub.core import statsd
+
+logger = logging.getLogger(__name__)
+
+REPLICA_DATABASE_ALIAS = 'replica'
+# How often the replication lag is checked (in seconds)
+LAG_CHECK_INTERVAL = 10
+
+# Note: pg_last_xact_replay_timestamp() is the time of the last transaction replayed, so
+# the lag is only calculated if there is WAL that has been received but not yet replayed
+# (otherwise the replica would appear to fall behind whenever no writes are taking place).
+# On a server that is not a replica, the lag is always 0.
+_LAG_SQL = """SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END"""
+
+_state = local()
+
+
+class ReplicaLagMonitor:
+    """Keeps track of whether the replica is up to date enough to be used for reads."""
+
+    def __init__(self, check_interval=LAG_CHECK_INTERVAL):
+        """Initialises the monitor (without checking the lag)."""
+        self._check_interval = check_interval
+        self._lock = Lock()
+        self._checked_at = None
+        self._is_available = False
+
+    def is_available(self):
+        """Returns whether the replica's lag was within the threshold when last checked."""
+        with self._lock:
+            should_check = (
+                self._checked_at is None
+                or monotonic() - self._checked_at >= self._check_interval
+            )
+            if should_check:
+                # Set this now so that only one thread (or greenlet) checks the lag
+                self._checked_at = monotonic()
+
+        if should_check:
+            self._is_available = self._check_lag()
+
+        return self._is_available
+
+    def reset(self):
+        """Forgets the result of the last check."""
+        with self._lock:
+            self._checked_at = None
+            self._is_available = False
+
+    def _check_lag(self):
+        try:
+            with connections[REPLICA_DATABASE_ALIAS].cursor() as cursor:
+                cursor.execute(_LAG_SQL)
+                lag = cursor.fetchone()[0]
+        except Error:
+            logger.exception('Could not check the replication lag of the replica database')
+            return False
+
+        lag = float(lag or 0)
+        statsd.statsd().gauge('db.replica.lag', lag)
+        return lag <= settings.DATABASE_REPLICA_MAX_LAG
+
+
+lag_monitor = ReplicaLagMonitor()
+
+
+def is_replica_configured():
+    """Returns whether a replica database is configured."""
+    return REPLICA_DATABASE_ALIAS in settings.DATABASES
+
+
+def is_using_replica():
+    """Returns whether the current thread (or greenlet) is inside use_replica()."""
+    return getattr(_state, 'depth', 0) > 0
+
+
+@contextmanager
+def use_replica():
+    """
+    Context manager (or function decorator) that routes reads to the replica database.
+
+    This should only be used for read-only workloads that can tolerate slightly out-of-date
+    data.
+
+    Note that querysets are routed when they are evaluated, so querysets that are evaluated
+    after this exits (e.g. in a streamed response) are not routed to the replica.
+    """
+    _state.depth = getattr(_state, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _state.depth -= 1
+
+
+def replica_view(view_func):
+    """
+    Decorator for views (or view methods) that routes the reads made by the view to the
+    replica database.
+
+    For streamed responses, reads made while the response is being streamed are also routed
+    to the replica.
+    """
+    @wraps(view_func)
+    def wrapper(*args, **kwargs):
+        with use_replica():
+            response = view_func(*args, **kwargs)
+
+        if getattr(response, 'streaming', False):
+            response.streaming_content = iterate_using_replica(response.streaming_content)
+
+        return response
+
+    return wrapper
+
+
+def iterate_using_replica(iterable):
+    """
+    Iterates over an iterable inside use_replica().
+
+    This can be used to route the reads made by a lazily-evaluated iterable (such as
+    QuerySet.iterator()) to the replica.
+    """
+    with use_replica():
+        yield from iterable
+
+
+class ReplicaRouter:
+    """
+    Database router that routes reads inside use_replica() to the replica database (when one
+    is configured and it is up to date enough).
+    """
+
+    def db_for_read(self, model, **hints):
+        """Returns the replica alias when reads should be routed to the replica."""
+        if not (is_using_replica() and is_replica_configured()):
+            return None
+
+        if not lag_monitor.is_available():
+            statsd.incr('db.replica.fallback')
+            return DEFAULT_DB_ALIAS
+
+        return REPLICA_DATABASE_ALIAS
+
+    def db_for_write(self, model, **hints):
+        """Always routes writes to the default database."""
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Allows relations between objects loaded from the default and replica databases."""
+        databases = {DEFAULT_DB_ALIAS, REPLICA_DATABASE_ALIAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
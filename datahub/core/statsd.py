@@ -1,37 +1,174 @@
+import socket
+from threading import Lock
+from time import monotonic
+
 from django.conf import settings
 from statsd import defaults
-from statsd.client import StatsClient
+from statsd.client.base import StatsClientBase
+from statsd.client.udp import Pipeline
 
 HOST = settings.STATSD_HOST
 PORT = settings.STATSD_PORT
 PREFIX = settings.STATSD_PREFIX
 MAXUDPSIZE = defaults.MAXUDPSIZE
 IPV6 = defaults.IPV6
+# How often the StatsD host name is resolved again (to pick up changes to its IP address)
+RESOLVE_INTERVAL = 60  # seconds
+# Buffered stats are sent when there are this many of them...
+MAX_BUFFERED_STATS = 100
+# ...or when a stat is added and the oldest buffered stat is older than this
+MAX_BUFFER_AGE = 1  # seconds
+
+
+class BufferedStatsClient(StatsClientBase):
+    """
+    Long-lived StatsD client that buffers stats and sends them in as few UDP datagrams as
+    possible.
+
+    Buffered stats are sent when flush() is called (which happens at the end of each request
+    and Celery task), or when the buffer is full or old.
+
+    The socket is reused, and the StatsD host name is resolved again every `resolve_interval`
+    seconds (so that changes to its IP address are picked up).
+    """
+
+    def __init__(
+        self,
+        host='localhost',
+        port=8125,
+        prefix=None,
+        maxudpsize=512,
+        ipv6=False,
+        resolve_interval=RESOLVE_INTERVAL,
+        max_buffered_stats=MAX_BUFFERED_STATS,
+        max_buffer_age=MAX_BUFFER_AGE,
+    ):
+        """Initialises the client (without resolving the host name or creating a socket)."""
+        self._host = host
+        self._port = port
+        self._prefix = prefix
+        self._maxudpsize = maxudpsize
+        self._family = socket.AF_INET6 if ipv6 else socket.AF_INET
+        self._resolve_interval = resolve_interval
+        self._max_buffered_stats = max_buffered_stats
+        self._max_buffer_age = max_buffer_age
+
+        self._lock = Lock()
+        self._buffer = []
+        self._buffer_started_at = None
+        self._sock = None
+        self._addr = None
+        self._resolved_at = None
+
+    def _send(self, data):
+        """Adds data (one or more newline-separated stats) to the buffer."""
+        with self._lock:
+            if not self._buffer:
+                self._buffer_started_at = monotonic()
+
+            self._buffer.append(data)
+            should_flush = (
+                len(self._buffer) >= self._max_buffered_stats
+                or monotonic() - self._buffer_started_at >= self._max_buffer_age
+            )
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Sends all buffered stats."""
+        with self._lock:
+            stats, self._buffer = self._buffer, []
+
+        if not stats:
+            return
+
+        datagram = stats[0]
+        for stat in stats[1:]:
+            if len(datagram) + len(stat) + 1 >= self._maxudpsize:
+                self._send_datagram(datagram)
+                datagram = stat
+            else:
+                datagram = f'{datagram}\n{stat}'
+
+        self._send_datagram(datagram)
+
+    def _send_datagram(self, datagram):
+        try:
+            sock, addr = self._get_socket_and_address()
+            sock.sendto(datagram.encode('ascii'), addr)
+        except (socket.error, RuntimeError):
+            # As with statsd.StatsClient, errors are ignored (and the stats lost)
+            pass
+
+    def _get_socket_and_address(self):
+        with self._lock:
+            if self._addr is None or monotonic() - self._resolved_at >= self._resolve_interval:
+                family, _, _, _, addr = socket.getaddrinfo(
+                    self._host,
+                    self._port,
+                    self._family,
+                    socket.SOCK_DGRAM,
+                )[0]
+
+                if not self._sock or self._sock.family != family:
+                    self._close_socket()
+                    self._sock = socket.socket(family, socket.SOCK_DGRAM)
+
+                self._addr = addr
+                self._resolved_at = monotonic()
+
+            return self._sock, self._addr
+
+    def close(self):
+        """Sends all buffered stats and closes the socket."""
+        self.flush()
+
+        with self._lock:
+            self._close_socket()
+            self._addr = None
+
+    def _close_socket(self):
+        if self._sock:
+            self._sock.close()
+        self._sock = None
+
+    def pipeline(self):
+        """Returns a pipeline, which adds its stats to the buffer in as few chunks as possible."""
+        return Pipeline(self)
+
+
+_client = BufferedStatsClient(
+    host=HOST,
+    port=PORT,
+    prefix=PREFIX,
+    maxudpsize=MAXUDPSIZE,
+    ipv6=IPV6,
+)
 
 
 def statsd():
     """
-    Returns a new StatsD client.
+    Returns the StatsD client.
 
     Use this instead of:
         statsd.defaults.django.statsd
 
     because statsd.defaults.django.statsd is a singleton
     initialised at the start of the process and therefore
-    does not deal with chnages to the IP of the statsd instance.
+    does not deal with changes to the IP of the statsd instance.
+
+    The client is shared by the whole process and buffers stats, which are sent at the end of
+    each request and Celery task (see datahub.core.metrics).
     """
-    return StatsClient(
-        host=HOST,
-        port=PORT,
-        prefix=PREFIX,
-        maxudpsize=MAXUDPSIZE,
-        ipv6=IPV6,
-    )
+    return _client
 
 
 def incr(*args, **kwargs):
-    """
-    Increments the given stat by `count` after
-    creating a new `StatsClient`.
-    """
+    """Increments the given stat by `count`."""
     statsd().incr(*args, **kwargs)
+
+
+def flush():
+    """Sends all buffered stats."""
+    statsd().flush()
@@ -0,0 +1,225 @@
+"""
+Routing of Celery tasks to queues (lanes) and priorities.
+
+Every task must be listed in TASK_ROUTES. Tasks should not set a queue or priority in their
+decorator (as that would override the route).
+
+Each lane is a separate queue consumed by its own workers (see WORKER_PROFILES and the
+Procfile), so that (for example) nightly bulk tasks do not delay the syncing of modified
+objects to Elasticsearch.
+"""
+from collections import namedtuple
+from enum import IntEnum
+
+from celery import current_app
+
+from datahub.core.utils import StrEnum
+
+
+class Lane(StrEnum):
+    """Queues that tasks are routed to."""
+
+    # Short tasks whose results users are waiting for (e.g. keeping search results up to date)
+    realtime = 'realtime'
+    # Tasks that call external services (and so may be slow or rate-limited)
+    integration = 'integration'
+    # Long-running tasks that process large numbers of records
+    bulk = 'bulk'
+    # Reports and other non-urgent analysis
+    reporting = 'reporting'
+
+
+class Priority(IntEnum):
+    """
+    Priorities of tasks within a lane.
+
+    For Redis, 0 is the highest priority. (Redis only supports these four levels by default.)
+    """
+
+    high = 0
+    normal = 3
+    low = 6
+    lowest = 9
+
+
+TaskRoute = namedtuple('TaskRoute', ('lane', 'priority'))
+
+
+TASK_ROUTES = {
+    # Realtime
+    'datahub.documents.tasks.delete_document': TaskRoute(Lane.realtime, Priority.normal),
+    'datahub.search.tasks.sync_object_task': TaskRoute(Lane.realtime, Priority.high),
+    'datahub.search.tasks.sync_objects_task': TaskRoute(Lane.realtime, Priority.high),
+    # Syncing related objects is less important than syncing the object that was modified
+    'datahub.search.tasks.sync_related_objects_task': TaskRoute(Lane.realtime, Priority.low),
+
+    # Integration
+    'datahub.company.tasks.contact.update_contact_consent': TaskRoute(
+        Lane.integration,
+        Priority.normal,
+    ),
+    'datahub.dnb_api.tasks.sync.sync_company_with_dnb': TaskRoute(
+        Lane.integration,
+        Priority.lowest,
+    ),
+    'datahub.documents.tasks.virus_scan_document': TaskRoute(Lane.integration, Priority.normal),
+    'datahub.email_ingestion.tasks.ingest_emails': TaskRoute(Lane.integration, Priority.lowest),
+    'datahub.email_ingestion.tasks.process_mailbox_emails': TaskRoute(
+        Lane.integration,
+        Priority.lowest,
+    ),
+    'datahub.notification.tasks.send_email_notification': TaskRoute(
+        Lane.integration,
+        Priority.lowest,
+    ),
+    'datahub.omis.payment.tasks.refresh_payment_gateway_session': TaskRoute(
+        Lane.integration,
+        Priority.high,
+    ),
+    'datahub.omis.payment.tasks.refresh_pending_payment_gateway_sessions': TaskRoute(
+        Lane.integration,
+        Priority.high,
+    ),
+
+    # Bulk
+    'datahub.cleanup.tasks.delete_orphaned_versions': TaskRoute(Lane.bulk, Priority.lowest),
+    'datahub.company.tasks.automatic_company_archive': TaskRoute(Lane.bulk, Priority.lowest),
+    'datahub.company.tasks.automatic_contact_archive': TaskRoute(Lane.bulk, Priority.lowest),
+    'datahub.dbmaintenance.tasks.copy_export_countries_to_company_export_country_model': (
+        TaskRoute(Lane.bulk, Priority.normal)
+    ),
+    'datahub.dbmaintenance.tasks.copy_foreign_key_to_m2m_field': TaskRoute(
+        Lane.bulk,
+        Priority.normal,
+    ),
+    'datahub.dbmaintenance.tasks.replace_null_with_default': TaskRoute(
+        Lane.bulk,
+        Priority.normal,
+    ),
+    'datahub.dnb_api.tasks.sync.sync_company_with_dnb_rate_limited': TaskRoute(
+        Lane.bulk,
+        Priority.lowest,
+    ),
+    'datahub.dnb_api.tasks.sync.sync_outdated_companies_with_dnb': TaskRoute(
+        Lane.bulk,
+        Priority.lowest,
+    ),
+    'datahub.dnb_api.tasks.update.get_company_updates': TaskRoute(Lane.bulk, Priority.lowest),
+    'datahub.dnb_api.tasks.update.update_company_from_dnb_data': TaskRoute(
+        Lane.bulk,
+        Priority.lowest,
+    ),
+    (
+        'datahub.investment.project.tasks.'
+        'refresh_gross_value_added_value_for_fdi_investment_projects'
+    ): TaskRoute(Lane.bulk, Priority.lowest),
+    'datahub.investment.project.tasks.update_country_of_origin_for_investment_projects': (
+        TaskRoute(Lane.bulk, Priority.lowest)
+    ),
+    'datahub.investment.project.tasks.update_investment_projects_for_gva_multiplier_task': (
+        TaskRoute(Lane.bulk, Priority.normal)
+    ),
+    'datahub.search.tasks.complete_model_migration': TaskRoute(Lane.bulk, Priority.low),
+    'datahub.search.tasks.sync_all_models': TaskRoute(Lane.bulk, Priority.lowest),
+    'datahub.search.tasks.sync_model': TaskRoute(Lane.bulk, Priority.lowest),
+
+    # Reporting
+    'datahub.investment.project.report.tasks.generate_spi_report': TaskRoute(
+        Lane.reporting,
+        Priority.normal,
+    ),
+    'datahub.search.tasks.profile_slow_search_query': TaskRoute(Lane.reporting, Priority.lowest),
+    'datahub.search.tasks.refresh_search_aggregation_rollups': TaskRoute(
+        Lane.reporting,
+        Priority.normal,
+    ),
+}
+
+WorkerProfile = namedtuple(
+    'WorkerProfile',
+    ('queues', 'concurrency', 'prefetch_multiplier', 'fair_scheduling'),
+)
+
+# Worker processes (as named in the Procfile) and the queues they consume.
+#
+# The celery and long-running queues were used before tasks were routed to lanes, and are
+# still consumed so that any messages published to them by older app instances (e.g. during a
+# deployment) are processed.
+#
+# Celery's own tasks (e.g. celery.chord_unlock) are sent to CELERY_TASK_DEFAULT_QUEUE
+# (the realtime lane).
+WORKER_PROFILES = {
+    'celeryworker': WorkerProfile(
+        queues=(Lane.realtime.value, 'celery'),
+        concurrency=None,
+        prefetch_multiplier=None,
+        fair_scheduling=False,
+    ),
+    'celeryintegration': WorkerProfile(
+        queues=(Lane.integration.value,),
+        concurrency=4,
+        prefetch_multiplier=1,
+        fair_scheduling=True,
+    ),
+    'celerylongrunning': WorkerProfile(
+        queues=(Lane.bulk.value, 'long-running'),
+        concurrency=2,
+        prefetch_multiplier=1,
+        fair_scheduling=True,
+    ),
+    'celeryreporting': WorkerProfile(
+        queues=(Lane.reporting.value,),
+        concurrency=1,
+        prefetch_multiplier=1,
+        fair_scheduling=True,
+    ),
+}
+
+
+def route_task(name, args, kwargs, options, task=None, **kw):
+    """
+    Celery router that routes tasks according to TASK_ROUTES.
+
+    Explicitly specified options (e.g. a priority passed to apply_async()) take precedence.
+    """
+    route = TASK_ROUTES.get(name)
+    if not route:
+        return None
+
+    return {
+        'queue': route.lane.value,
+        'priority': route.priority.value,
+    }
+
+
+def get_worker_command(profile_name):
+    """Gets the command (for use in the Procfile) that starts a worker for a profile."""
+    profile = WORKER_PROFILES[profile_name]
+    queues = ','.join(profile.queues)
+    command_parts = ['celery worker -A config -l info']
+
+    if profile.concurrency:
+        command_parts.append(f'-c {profile.concurrency}')
+
+    if profile.fair_scheduling:
+        command_parts.append('-O fair')
+
+    if profile.prefetch_multiplier:
+        command_parts.append(f'--prefetch-multiplier {profile.prefetch_multiplier}')
+
+    command_parts.append(f'-Q {queues}')
+    return ' '.join(command_parts)
+
+
+def get_unrouted_task_names(app=None):
+    """
+    Gets the names of registered tasks (excluding Celery's own) that are not in TASK_ROUTES.
+    """
+    app = app or current_app
+    app.loader.import_default_modules()
+
+    return sorted(
+        name
+        for name in app.tasks
+        if not name.startswith('celery.') and name not in TASK_ROUTES
+    )
@@ -0,0 +1,25 @@
+import pytest
+from django.core.management import call_command
+
+from datahub.company.models import Advisor, Company
+
+pytestmark = pytest.mark.django_db
+
+
+def test_benchmark_autocomplete(capsys):
+    """Test that the benchmark runs for each model and term and that the data is rolled back."""
+    adviser_count = Advisor.objects.count()
+    company_count = Company.objects.count()
+
+    call_command('benchmark_autocomplete', count=20, repeat=2, terms=['jo', 'smith'])
+
+    output_lines = capsys.readouterr().out.splitlines()
+    assert output_lines[0] == 'Generating 20 advisers and 20 companies...'
+    assert [line.split(':')[0] for line in output_lines[1:]] == [
+        "Advisor 'jo'",
+        "Advisor 'smith'",
+        "Company 'jo'",
+        "Company 'smith'",
+    ]
+    assert Advisor.objects.count() == adviser_count
+    assert Company.objects.count() == company_count
@@ -0,0 +1,48 @@
+import pytest
+
+from datahub.company.models import Advisor
+from datahub.company.test.factories import AdviserFactory
+from datahub.core.autocomplete import _apply_autocomplete_filter_to_queryset
+from datahub.metadata.test.factories import TeamFactory
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'dit_team__name')
+
+
+@pytest.mark.django_db
+class TestTrigramIndexAutocomplete:
+    """Tests for AutocompleteFilter with use_trigram_index=True."""
+
+    @pytest.fixture
+    def advisers(self):
+        """Creates advisers in various teams."""
+        london = TeamFactory(name='London')
+        new_york = TeamFactory(name='New York')
+        return [
+            AdviserFactory(first_name='Neil', last_name='Coldman', dit_team=london),
+            AdviserFactory(first_name='Nigel', last_name='Newman', dit_team=new_york),
+            AdviserFactory(first_name='Amy Sarah', last_name='Dacre', dit_team=new_york),
+            AdviserFactory(first_name='Jo', last_name="O'Conner", dit_team=None),
+            AdviserFactory(first_name='Lon', last_name='Smith', dit_team=london),
+        ]
+
+    @pytest.mark.parametrize(
+        'search_string',
+        ('', 'ne', 'new', 'ne lo', 'lo', 'sa da', "o'conner", 'york smith', 'zzz'),
+    )
+    def test_matches_regex_filter(self, advisers, search_string):
+        """Test that the same results are returned in the same order as the regex filter."""
+        queryset = Advisor.objects.filter(pk__in=[adviser.pk for adviser in advisers])
+
+        expected_results = list(
+            _apply_autocomplete_filter_to_queryset(queryset, SEARCH_FIELDS, search_string),
+        )
+        actual_results = list(
+            _apply_autocomplete_filter_to_queryset(
+                queryset,
+                SEARCH_FIELDS,
+                search_string,
+                use_trigram_index=True,
+            ),
+        )
+
+        assert actual_results == expected_results
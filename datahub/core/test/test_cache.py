@@ -0,0 +1,107 @@
+from datetime import datetime, timedelta
+from unittest.mock import call, Mock
+
+import pytest
+from freezegun import freeze_time
+
+from datahub.core.cache import LocalLRUCache
+
+FROZEN_DATETIME = datetime(2020, 1, 1)
+
+
+@pytest.fixture
+def mock_statsd(monkeypatch):
+    """Returns a mock statsd module."""
+    mock_statsd = Mock()
+    monkeypatch.setattr('datahub.core.cache.statsd', mock_statsd)
+    return mock_statsd
+
+
+class TestLocalLRUCache:
+    """Tests for LocalLRUCache."""
+
+    def test_get_returns_cached_value(self):
+        """A value that has been set should be returned."""
+        cache = LocalLRUCache('test-cache', 10)
+        cache.set('key', 'value', 10)
+
+        assert cache.get('key') == 'value'
+
+    def test_get_returns_default_when_missing(self):
+        """The default should be returned for a missing key."""
+        cache = LocalLRUCache('test-cache', 10)
+
+        assert cache.get('key') is None
+        assert cache.get('key', 'default') == 'default'
+
+    def test_entries_expire(self):
+        """Values should not be returned after their timeout."""
+        cache = LocalLRUCache('test-cache', 10)
+
+        with freeze_time(FROZEN_DATETIME):
+            cache.set('key', 'value', 10)
+
+        with freeze_time(FROZEN_DATETIME + timedelta(seconds=9)):
+            assert cache.get('key') == 'value'
+
+        with freeze_time(FROZEN_DATETIME + timedelta(seconds=10)):
+            assert cache.get('key') is None
+
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used_entry_when_full(self):
+        """The least recently used entry should be evicted when the cache is full."""
+        cache = LocalLRUCache('test-cache', 2)
+        cache.set('key1', 'value1', 10)
+        cache.set('key2', 'value2', 10)
+        # Use key1 so that key2 becomes the least recently used entry
+        cache.get('key1')
+        cache.set('key3', 'value3', 10)
+
+        assert cache.get('key1') == 'value1'
+        assert cache.get('key2') is None
+        assert cache.get('key3') == 'value3'
+
+    @pytest.mark.parametrize('max_size,timeout', ((0, 10), (10, 0)))
+    def test_set_does_nothing_if_disabled(self, max_size, timeout):
+        """Nothing should be cached if the maximum size or timeout is zero."""
+        cache = LocalLRUCache('test-cache', max_size)
+        cache.set('key', 'value', timeout)
+
+        assert cache.get('key') is None
+
+    def test_delete_matching(self):
+        """Only values matching the predicate should be deleted."""
+        cache = LocalLRUCache('test-cache', 10)
+        cache.set('key1', 1, 10)
+        cache.set('key2', 2, 10)
+
+        cache.delete_matching(lambda value: value == 1)
+
+        assert cache.get('key1') is None
+        assert cache.get('key2') == 2
+
+    def test_clear(self):
+        """All values should be deleted."""
+        cache = LocalLRUCache('test-cache', 10)
+        cache.set('key1', 1, 10)
+        cache.set('key2', 2, 10)
+
+        cache.clear()
+
+        assert len(cache) == 0
+
+    def test_sends_hit_and_miss_counts(self, mock_statsd):
+        """Hit and miss counts should be sent to StatsD every stats_interval look-ups."""
+        cache = LocalLRUCache('test-cache', 10, stats_interval=3)
+        cache.set('key', 'value', 10)
+
+        cache.get('key')
+        cache.get('missing-key')
+        assert not mock_statsd.incr.called
+
+        cache.get('key')
+        assert mock_statsd.incr.call_args_list == [
+            call('test-cache.hit', 2),
+            call('test-cache.miss', 1),
+        ]
@@ -0,0 +1,136 @@
+from unittest import mock
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import ResolverMatch
+from freezegun import freeze_time
+
+from datahub.core.metrics import (
+    add_published_at_header,
+    PUBLISHED_AT_HEADER,
+    record_task_duration,
+    record_task_queue_wait,
+    RequestMetricsMiddleware,
+)
+
+
+def _parse_stats(datagrams):
+    return [stat.split(':')[0] for datagram in datagrams for stat in datagram.split('\n')]
+
+
+class TestRequestMetricsMiddleware:
+    """Tests for RequestMetricsMiddleware."""
+
+    @pytest.mark.parametrize(
+        'view_name,status_code,expected_stats',
+        (
+            (
+                'api-v4:company:item',
+                200,
+                [
+                    'request.api-v4.company.item.duration',
+                    'request.api-v4.company.item.count',
+                ],
+            ),
+            (
+                'api-v4:company:item',
+                500,
+                [
+                    'request.api-v4.company.item.duration',
+                    'request.api-v4.company.item.count',
+                    'request.api-v4.company.item.error',
+                ],
+            ),
+            (
+                None,
+                404,
+                [
+                    'request.unresolved.duration',
+                    'request.unresolved.count',
+                ],
+            ),
+        ),
+    )
+    def test_records_and_sends_stats(self, statsd_sink, view_name, status_code, expected_stats):
+        """Test that request stats are recorded and sent at the end of the request."""
+        request = RequestFactory().get('/')
+
+        def get_response(request):
+            if view_name:
+                request.resolver_match = ResolverMatch(
+                    mock.Mock(),
+                    (),
+                    {},
+                    url_name=view_name.rsplit(':', 1)[-1],
+                    namespaces=view_name.split(':')[:-1],
+                )
+            return HttpResponse(status=status_code)
+
+        middleware = RequestMetricsMiddleware(get_response)
+        response = middleware(request)
+
+        assert response.status_code == status_code
+        assert _parse_stats(statsd_sink()) == expected_stats
+
+
+class TestCeleryTaskMetrics:
+    """Tests for the Celery signal receivers that record task metrics."""
+
+    def test_add_published_at_header(self):
+        """Test that the time a task was sent is added to its headers."""
+        headers = {}
+
+        with freeze_time('2020-01-01 00:00:00'):
+            add_published_at_header(headers=headers)
+
+        assert headers == {PUBLISHED_AT_HEADER: 1577836800.0}
+
+    @pytest.mark.parametrize(
+        'eta,state,expected_stats',
+        (
+            (
+                None,
+                'SUCCESS',
+                [
+                    'celery.task.test-task.queue_wait',
+                    'celery.task.test-task.duration',
+                    'celery.task.test-task.success',
+                ],
+            ),
+            (
+                None,
+                'FAILURE',
+                [
+                    'celery.task.test-task.queue_wait',
+                    'celery.task.test-task.duration',
+                    'celery.task.test-task.failure',
+                ],
+            ),
+            (
+                '2020-01-01T00:00:00+00:00',
+                'SUCCESS',
+                [
+                    'celery.task.test-task.duration',
+                    'celery.task.test-task.success',
+                ],
+            ),
+        ),
+    )
+    def test_records_and_sends_stats(self, statsd_sink, eta, state, expected_stats):
+        """Test that task stats are recorded and sent at the end of the task."""
+        task = mock.Mock()
+        task.name = 'test-task'
+        task.request.eta = eta
+        setattr(task.request, PUBLISHED_AT_HEADER, 1577836800.0)
+
+        with freeze_time('2020-01-01 00:00:02'):
+            record_task_queue_wait(task_id='test-id', task=task)
+            assert statsd_sink() == []
+
+            record_task_duration(task_id='test-id', task=task, state=state)
+
+        datagrams = statsd_sink()
+        assert _parse_stats(datagrams) == expected_stats
+        if not eta:
+            assert 'celery.task.test-task.queue_wait:2000.000000|ms' in datagrams[0]
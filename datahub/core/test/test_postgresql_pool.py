@@ -0,0 +1,204 @@
+from threading import Thread
+from time import sleep
+from unittest import mock
+
+import pytest
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE, TRANSACTION_STATUS_INTRANS
+
+from datahub.core import statsd
+from datahub.core.postgresql_pool.pool import ConnectionPool, PoolTimeoutError
+
+
+class FakeConnection:
+    """Stand-in for a Psycopg2 connection."""
+
+    def __init__(self):
+        """Initialises the connection as open and idle."""
+        self.closed = 0
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+        self.execute_error = None
+        self.cursor_mock = mock.MagicMock()
+
+    def get_transaction_status(self):
+        """Returns the transaction status."""
+        return self.transaction_status
+
+    def cursor(self):
+        """Returns a mock cursor."""
+        if self.execute_error:
+            self.cursor_mock.__enter__.return_value.execute.side_effect = self.execute_error
+        return self.cursor_mock
+
+    def rollback(self):
+        """Rolls back the open transaction."""
+        self.transaction_status = TRANSACTION_STATUS_IDLE
+
+    def close(self):
+        """Closes the connection."""
+        self.closed = 1
+
+
+def _create_pool(max_size=2, max_lifetime=3600, timeout=1):
+    connect = mock.Mock(side_effect=FakeConnection)
+    return ConnectionPool(connect, max_size, max_lifetime, timeout), connect
+
+
+def _parse_stat_names(datagrams):
+    return {
+        stat.split(':')[0]
+        for datagram in datagrams
+        for stat in datagram.split('\n')
+    }
+
+
+class TestConnectionPool:
+    """Tests for ConnectionPool."""
+
+    def test_reuses_released_connections(self):
+        """Test that a released connection is checked out again (instead of opening one)."""
+        pool, connect = _create_pool()
+
+        connection = pool.acquire()
+        pool.release(connection)
+
+        assert pool.acquire() is connection
+        assert connect.call_count == 1
+        assert pool.size == 1
+
+    def test_opens_connections_up_to_max_size(self):
+        """Test that new connections are opened while all connections are checked out."""
+        pool, connect = _create_pool(max_size=2)
+
+        connections = [pool.acquire(), pool.acquire()]
+
+        assert connections[0] is not connections[1]
+        assert connect.call_count == 2
+        assert pool.size == 2
+
+    def test_times_out_when_full(self, statsd_sink):
+        """Test that PoolTimeoutError is raised if the pool stays full until the timeout."""
+        pool, connect = _create_pool(max_size=1, timeout=0.01)
+        pool.acquire()
+
+        with pytest.raises(PoolTimeoutError):
+            pool.acquire()
+
+        statsd.flush()
+
+        assert connect.call_count == 1
+        assert 'db.pool.default.timeouts' in _parse_stat_names(statsd_sink())
+
+    def test_waits_for_released_connection(self):
+        """Test that a checkout waits for a connection to be released when the pool is full."""
+        pool, connect = _create_pool(max_size=1, timeout=5)
+        connection = pool.acquire()
+
+        def _release_later():
+            sleep(0.05)
+            pool.release(connection)
+
+        thread = Thread(target=_release_later)
+        thread.start()
+
+        assert pool.acquire() is connection
+
+        thread.join()
+        assert connect.call_count == 1
+
+    def test_rolls_back_open_transaction_on_release(self):
+        """Test that an open transaction is rolled back when a connection is released."""
+        pool, _ = _create_pool()
+        connection = pool.acquire()
+        connection.transaction_status = TRANSACTION_STATUS_INTRANS
+
+        pool.release(connection)
+
+        assert connection.transaction_status == TRANSACTION_STATUS_IDLE
+        assert pool.idle_count == 1
+
+    def test_discards_closed_connection_on_release(self):
+        """Test that a connection that has been closed is not returned to the pool."""
+        pool, _ = _create_pool()
+        connection = pool.acquire()
+        connection.closed = 2
+
+        pool.release(connection)
+
+        assert pool.size == 0
+        assert pool.idle_count == 0
+
+    def test_recycles_connections_after_max_lifetime(self):
+        """Test that connections are closed once they reach their maximum lifetime."""
+        pool, connect = _create_pool(max_lifetime=0)
+        connection = pool.acquire()
+
+        pool.release(connection)
+
+        assert connection.closed
+        assert pool.acquire() is not connection
+        assert connect.call_count == 2
+
+    def test_health_checks_idle_connections_on_checkout(self, monkeypatch):
+        """Test that a connection that fails a health check is replaced on checkout."""
+        monkeypatch.setattr('datahub.core.postgresql_pool.pool.HEALTH_CHECK_IDLE_TIME', 0)
+        pool, connect = _create_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+        connection.execute_error = Exception('server closed the connection unexpectedly')
+
+        new_connection = pool.acquire()
+
+        assert new_connection is not connection
+        assert connection.closed
+        assert connect.call_count == 2
+        assert pool.size == 1
+
+    def test_skips_health_check_query_for_recently_used_connections(self):
+        """Test that a connection used recently is not queried on checkout."""
+        pool, _ = _create_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        assert pool.acquire() is connection
+        assert not connection.cursor_mock.__enter__.return_value.execute.called
+
+    def test_forgets_inherited_connections_after_fork(self):
+        """
+        Test that connections opened in a parent process are not reused (or closed) in a child
+        process.
+        """
+        pool, connect = _create_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        with mock.patch('datahub.core.postgresql_pool.pool.os.getpid', return_value=-1):
+            new_connection = pool.acquire()
+
+        assert new_connection is not connection
+        assert not connection.closed
+        assert connect.call_count == 2
+
+    def test_close_closes_idle_connections(self):
+        """Test that close() closes idle connections."""
+        pool, _ = _create_pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        pool.close()
+
+        assert connection.closed
+        assert pool.size == 0
+
+    def test_records_metrics(self, statsd_sink):
+        """Test that checkout wait times and saturation are sent to StatsD."""
+        pool, _ = _create_pool()
+        pool.acquire()
+
+        statsd.flush()
+
+        assert _parse_stat_names(statsd_sink()) == {
+            'db.pool.default.connections_opened',
+            'db.pool.default.wait',
+            'db.pool.default.in_use',
+            'db.pool.default.saturation',
+        }
@@ -0,0 +1,147 @@
+from unittest import mock
+
+import pytest
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+from datahub.company.models import Advisor
+from datahub.company.test.factories import AdviserFactory
+from datahub.core import statsd
+from datahub.core.query_instrumentation import (
+    QUERY_COUNT_HEADER,
+    QueryCounter,
+    QueryInstrumentationMiddleware,
+    REPEATED_QUERIES_HEADER,
+    start_task_query_counter,
+    stop_task_query_counter,
+)
+from datahub.core.test_utils import assert_query_budget
+
+
+def _parse_stats(datagrams):
+    return {
+        stat.split('|')[0].split(':')[0]: float(stat.split('|')[0].split(':')[1])
+        for datagram in datagrams
+        for stat in datagram.split('\n')
+    }
+
+
+@pytest.mark.django_db
+class TestQueryCounter:
+    """Tests for QueryCounter."""
+
+    def test_counts_queries(self):
+        """Test that queries, and queries with the same SQL, are counted."""
+        advisers = AdviserFactory.create_batch(3)
+
+        with QueryCounter() as query_counter:
+            for adviser in advisers:
+                Advisor.objects.get(pk=adviser.pk)
+            Advisor.objects.count()
+
+        assert query_counter.query_count == 4
+        assert query_counter.repeated_query_count == 2
+        assert list(query_counter.repeated_queries.values()) == [3]
+        assert query_counter.duration > 0
+
+    def test_stops_counting_on_exit(self):
+        """Test that queries run after the context manager exits are not counted."""
+        with QueryCounter() as query_counter:
+            Advisor.objects.count()
+
+        Advisor.objects.count()
+
+        assert query_counter.query_count == 1
+
+
+class TestQueryInstrumentationMiddleware:
+    """Tests for QueryInstrumentationMiddleware."""
+
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=False)
+    def test_not_used_if_disabled(self):
+        """Test that the middleware is not used if query instrumentation is disabled."""
+        with pytest.raises(MiddlewareNotUsed):
+            QueryInstrumentationMiddleware(mock.Mock())
+
+    @pytest.mark.django_db
+    @override_settings(QUERY_INSTRUMENTATION_ENABLED=True)
+    def test_records_query_counts(self, statsd_sink):
+        """Test that query counts are added to the response and sent to StatsD."""
+        advisers = AdviserFactory.create_batch(3)
+
+        def get_response(request):
+            for adviser in advisers:
+                Advisor.objects.get(pk=adviser.pk)
+            Advisor.objects.count()
+            return HttpResponse()
+
+        middleware = QueryInstrumentationMiddleware(get_response)
+        response = middleware(RequestFactory().get('/'))
+
+        assert response[QUERY_COUNT_HEADER] == '4'
+        assert response[REPEATED_QUERIES_HEADER] == '2'
+
+        statsd.flush()
+        stats = _parse_stats(statsd_sink())
+        assert stats['request.unresolved.query_count'] == 4
+        assert stats['request.unresolved.repeated_queries'] == 2
+        assert 'request.unresolved.query_duration' in stats
+
+
+@pytest.mark.django_db
+@override_settings(QUERY_INSTRUMENTATION_ENABLED=True)
+def test_records_task_query_counts(statsd_sink):
+    """Test that the queries run by a Celery task are counted and sent to StatsD."""
+    task = mock.Mock()
+    task.name = 'test-task'
+
+    start_task_query_counter(task_id='test-id', task=task)
+    Advisor.objects.count()
+    Advisor.objects.count()
+    stop_task_query_counter(task_id='test-id', task=task)
+
+    stats = _parse_stats(statsd_sink())
+    assert stats['celery.task.test-task.query_count'] == 2
+    assert stats['celery.task.test-task.repeated_queries'] == 1
+
+
+@pytest.mark.django_db
+class TestAssertQueryBudget:
+    """Tests for assert_query_budget()."""
+
+    @pytest.mark.parametrize(
+        'max_queries,max_repeated_queries,expected_message',
+        (
+            (3, None, '4 queries were run (limit: 3)'),
+            (None, 1, '2 repeated queries were run (limit: 1)'),
+        ),
+    )
+    def test_fails_if_budget_exceeded(self, max_queries, max_repeated_queries, expected_message):
+        """Test that the test fails if too many queries are run."""
+        advisers = AdviserFactory.create_batch(3)
+
+        with pytest.raises(pytest.fail.Exception) as excinfo:
+            with assert_query_budget(
+                max_queries=max_queries,
+                max_repeated_queries=max_repeated_queries,
+            ):
+                for adviser in advisers:
+                    Advisor.objects.get(pk=adviser.pk)
+                Advisor.objects.count()
+
+        assert expected_message in str(excinfo.value)
+        assert '3x: SELECT' in str(excinfo.value)
+
+    def test_passes_within_budget(self):
+        """Test that the test does not fail if the budget is not exceeded."""
+        with assert_query_budget(max_queries=1, max_repeated_queries=0) as query_counter:
+            Advisor.objects.count()
+
+        assert query_counter.query_count == 1
+
+    @assert_query_budget(max_queries=1)
+    def test_can_be_used_as_decorator(self):
+        """Test that assert_query_budget() can be used to decorate a test."""
+        Advisor.objects.count()
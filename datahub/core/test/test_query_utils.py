@@ -6,7 +6,7 @@ import factory
 import pytest
 from django.conf import settings
 from django.db.models import CharField, F, Max, Q, Value
-from django.db.models.functions import Cast, Left
+from django.db.models.functions import Cast, Concat, Left
 
 from datahub.core.query_utils import (
     get_aggregate_subquery,
@@ -20,6 +20,7 @@ from datahub.core.query_utils import (
     get_string_agg_subquery,
     get_top_related_expression_subquery,
     JSONBBuildObject,
+    update_returning_pks,
 )
 from datahub.core.test.support.factories import BookFactory, PersonFactory, PersonListItemFactory
 from datahub.core.test.support.models import Book, Person, PersonListItem
@@ -522,3 +523,54 @@ def test_get_empty_string_if_null_expression(value, expected):
     ).values('some_property')
     person = query.first()
     assert person['some_property'] == expected
+
+
+class TestUpdateReturningPks:
+    """Tests for update_returning_pks()."""
+
+    def test_updates_and_returns_pks(self):
+        """Test that matching objects are updated and their primary keys returned."""
+        people_to_update = PersonFactory.create_batch(2, country='France')
+        other_person = PersonFactory(country='Spain')
+
+        returned_pks = update_returning_pks(
+            Person.objects.filter(country='France'),
+            country='Germany',
+        )
+
+        assert set(returned_pks) == {person.pk for person in people_to_update}
+        assert Person.objects.filter(country='Germany').count() == 2
+        other_person.refresh_from_db()
+        assert other_person.country == 'Spain'
+
+    def test_updates_using_expressions(self):
+        """Test that values can be expressions that refer to other fields."""
+        person = PersonFactory(first_name='Jo', last_name='Bloggs')
+
+        update_returning_pks(
+            Person.objects.filter(pk=person.pk),
+            country=Concat(F('first_name'), Value(' '), F('last_name')),
+        )
+
+        person.refresh_from_db()
+        assert person.country == 'Jo Bloggs'
+
+    def test_can_limit_using_sliced_subquery(self):
+        """Test that the number of updated objects can be limited using a sliced subquery."""
+        PersonFactory.create_batch(3, country='France')
+        queryset = Person.objects.filter(country='France')
+
+        returned_pks = update_returning_pks(
+            Person.objects.filter(pk__in=queryset.values('pk')[:2]),
+            country='Germany',
+        )
+
+        assert len(returned_pks) == 2
+        assert set(Person.objects.filter(country='Germany').values_list('pk', flat=True)) == set(
+            returned_pks,
+        )
+
+    def test_raises_error_if_sliced(self):
+        """Test that an error is raised if the query set has been sliced."""
+        with pytest.raises(TypeError):
+            update_returning_pks(Person.objects.all()[:2], country='Germany')
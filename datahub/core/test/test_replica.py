@@ -0,0 +1,155 @@
+from unittest import mock
+
+import pytest
+from django.db import DEFAULT_DB_ALIAS
+from django.http import StreamingHttpResponse
+
+from datahub.company.models import Advisor
+from datahub.company.test.factories import AdviserFactory
+from datahub.core import statsd
+from datahub.core.replica import (
+    iterate_using_replica,
+    lag_monitor,
+    REPLICA_DATABASE_ALIAS,
+    replica_view,
+    ReplicaRouter,
+    use_replica,
+)
+
+# The database standing in for the replica is not kept in sync with the default database, so
+# objects created in the default database are only found if reads go to the default database
+both_databases = pytest.mark.django_db(databases=[DEFAULT_DB_ALIAS, REPLICA_DATABASE_ALIAS])
+
+
+@pytest.fixture(autouse=True)
+def replica_routing():
+    """Enables routing to the replica (overriding the fixture in the root conftest)."""
+    lag_monitor.reset()
+    yield
+    lag_monitor.reset()
+
+
+def _adviser_exists(adviser):
+    return Advisor.objects.filter(pk=adviser.pk).exists()
+
+
+class TestReplicaRouter:
+    """Tests for ReplicaRouter."""
+
+    def test_reads_go_to_default_database_outside_use_replica(self):
+        """Test that reads are not routed outside use_replica()."""
+        assert ReplicaRouter().db_for_read(Advisor) is None
+
+    @mock.patch.object(lag_monitor, 'is_available', return_value=True)
+    def test_reads_go_to_replica_inside_use_replica(self, mocked_is_available):
+        """Test that reads are routed to the replica inside use_replica()."""
+        with use_replica():
+            assert ReplicaRouter().db_for_read(Advisor) == REPLICA_DATABASE_ALIAS
+
+    @mock.patch.object(lag_monitor, 'is_available', return_value=False)
+    def test_falls_back_to_default_database_when_replica_lagging(
+        self,
+        mocked_is_available,
+        statsd_sink,
+    ):
+        """Test that reads go to the default database if the replica is not available."""
+        with use_replica():
+            assert ReplicaRouter().db_for_read(Advisor) == DEFAULT_DB_ALIAS
+
+        statsd.flush()
+        assert statsd_sink() == ['db.replica.fallback:1|c']
+
+    @mock.patch.object(lag_monitor, 'is_available', return_value=True)
+    def test_writes_go_to_default_database(self, mocked_is_available):
+        """Test that writes are never routed to the replica."""
+        with use_replica():
+            assert ReplicaRouter().db_for_write(Advisor) == DEFAULT_DB_ALIAS
+
+    def test_use_replica_can_be_nested(self):
+        """Test that reads are still routed after exiting a nested use_replica()."""
+        with use_replica(), mock.patch.object(lag_monitor, 'is_available', return_value=True):
+            with use_replica():
+                pass
+
+            assert ReplicaRouter().db_for_read(Advisor) == REPLICA_DATABASE_ALIAS
+
+
+@both_databases
+class TestReplicaRouting:
+    """Tests for reads against the two databases."""
+
+    def test_use_replica(self):
+        """Test that reads inside use_replica() go to the replica."""
+        adviser = AdviserFactory()
+
+        with use_replica():
+            assert not _adviser_exists(adviser)
+
+        assert _adviser_exists(adviser)
+
+    def test_use_replica_as_decorator(self):
+        """Test that use_replica() can be used as a function decorator."""
+        adviser = AdviserFactory()
+
+        @use_replica()
+        def _exists_on_replica():
+            return _adviser_exists(adviser)
+
+        assert not _exists_on_replica()
+
+    def test_falls_back_when_lag_exceeds_threshold(self, settings):
+        """Test that reads go to the default database if the lag exceeds the threshold."""
+        settings.DATABASE_REPLICA_MAX_LAG = -1
+        adviser = AdviserFactory()
+
+        with use_replica():
+            assert _adviser_exists(adviser)
+
+    def test_records_lag(self, statsd_sink):
+        """Test that the lag is sent to StatsD when checked."""
+        with use_replica():
+            Advisor.objects.exists()
+
+        statsd.flush()
+        assert 'db.replica.lag:0.0|g' in statsd_sink()
+
+    def test_lag_is_checked_periodically(self):
+        """Test that the lag is only checked once per interval."""
+        with use_replica(), mock.patch.object(
+            lag_monitor,
+            '_check_lag',
+            return_value=True,
+        ) as mocked_check_lag:
+            Advisor.objects.exists()
+            Advisor.objects.exists()
+
+        assert mocked_check_lag.call_count == 1
+
+    def test_iterate_using_replica(self):
+        """Test that a lazily-evaluated iterable is evaluated using the replica."""
+        adviser = AdviserFactory()
+
+        rows = iterate_using_replica(Advisor.objects.filter(pk=adviser.pk).iterator())
+
+        assert list(rows) == []
+
+    @pytest.mark.parametrize('streaming', (False, True))
+    def test_replica_view(self, streaming):
+        """Test that reads made by a view (and while streaming its response) use the replica."""
+        adviser = AdviserFactory()
+
+        @replica_view
+        def view(request):
+            if not streaming:
+                return mock.Mock(streaming=False, exists=_adviser_exists(adviser))
+
+            return StreamingHttpResponse(
+                str(_adviser_exists(adviser)) for _ in range(1)
+            )
+
+        response = view(mock.Mock())
+
+        if streaming:
+            assert b''.join(response.streaming_content) == b'False'
+        else:
+            assert not response.exists
@@ -0,0 +1,111 @@
+import socket
+from unittest import mock
+
+from freezegun import freeze_time
+
+from datahub.core import statsd
+from datahub.core.statsd import BufferedStatsClient
+
+
+class TestBufferedStatsClient:
+    """Tests for BufferedStatsClient (using a local UDP sink)."""
+
+    def test_buffers_stats_until_flushed(self, statsd_sink):
+        """Test that stats are only sent when flush() is called, in a single datagram."""
+        statsd.incr('test.counter')
+        statsd.statsd().timing('test.timer', 12.5)
+        statsd.statsd().gauge('test.gauge', 3)
+
+        assert statsd_sink() == []
+
+        statsd.flush()
+
+        assert statsd_sink() == [
+            'test.counter:1|c\ntest.timer:12.500000|ms\ntest.gauge:3|g',
+        ]
+
+    def test_pipeline(self, statsd_sink):
+        """Test that stats sent using a pipeline are buffered with other stats."""
+        statsd.incr('test.counter')
+        with statsd.statsd().pipeline() as pipeline:
+            pipeline.incr('test.pipeline-counter-1')
+            pipeline.incr('test.pipeline-counter-2')
+
+        statsd.flush()
+
+        assert statsd_sink() == [
+            'test.counter:1|c\ntest.pipeline-counter-1:1|c\ntest.pipeline-counter-2:1|c',
+        ]
+
+    def test_splits_datagrams_at_max_udp_size(self, statsd_sink):
+        """Test that buffered stats are split into datagrams no larger than maxudpsize."""
+        client = statsd.statsd()
+        client._maxudpsize = 40
+
+        for index in range(5):
+            client.incr(f'test.counter-{index}')
+        client.flush()
+
+        datagrams = statsd_sink()
+        assert datagrams == [
+            'test.counter-0:1|c\ntest.counter-1:1|c',
+            'test.counter-2:1|c\ntest.counter-3:1|c',
+            'test.counter-4:1|c',
+        ]
+
+    def test_flushes_when_buffer_full(self, statsd_sink):
+        """Test that stats are sent once the maximum number of stats are buffered."""
+        client = statsd.statsd()
+        client._max_buffered_stats = 2
+
+        client.incr('test.counter-1')
+        assert statsd_sink() == []
+
+        client.incr('test.counter-2')
+        assert statsd_sink() == ['test.counter-1:1|c\ntest.counter-2:1|c']
+
+    def test_flushes_when_buffer_old(self, statsd_sink):
+        """Test that stats are sent when a stat is added to a buffer that has become old."""
+        client = statsd.statsd()
+
+        with freeze_time('2020-01-01 00:00:00') as frozen_time:
+            client.incr('test.counter-1')
+            frozen_time.tick(0.5)
+            client.incr('test.counter-2')
+            assert statsd_sink() == []
+
+            frozen_time.tick(0.5)
+            client.incr('test.counter-3')
+            assert statsd_sink() == ['test.counter-1:1|c\ntest.counter-2:1|c\ntest.counter-3:1|c']
+
+    def test_resolves_host_periodically(self, monkeypatch):
+        """Test that the host name is only resolved again once the resolve interval passes."""
+        mock_getaddrinfo = mock.Mock(wraps=socket.getaddrinfo)
+        monkeypatch.setattr('datahub.core.statsd.socket.getaddrinfo', mock_getaddrinfo)
+        client = BufferedStatsClient(host='127.0.0.1', port=9, resolve_interval=60)
+
+        with freeze_time('2020-01-01 00:00:00') as frozen_time:
+            for _ in range(3):
+                client.incr('test.counter')
+                client.flush()
+
+            assert mock_getaddrinfo.call_count == 1
+
+            frozen_time.tick(60)
+            client.incr('test.counter')
+            client.flush()
+
+            assert mock_getaddrinfo.call_count == 2
+
+        client.close()
+
+    def test_ignores_resolution_errors(self, monkeypatch):
+        """Test that stats are dropped (rather than an error raised) if the host can't be found."""
+        monkeypatch.setattr(
+            'datahub.core.statsd.socket.getaddrinfo',
+            mock.Mock(side_effect=socket.gaierror),
+        )
+        client = BufferedStatsClient(host='statsd.invalid')
+
+        client.incr('test.counter')
+        client.flush()
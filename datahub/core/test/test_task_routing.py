@@ -0,0 +1,94 @@
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+
+from config.celery import app
+from datahub.core.task_routing import (
+    get_unrouted_task_names,
+    get_worker_command,
+    Lane,
+    Priority,
+    route_task,
+    TASK_ROUTES,
+    WORKER_PROFILES,
+)
+
+PROCFILE_PATH = Path(settings.ROOT_DIR) / 'Procfile'
+
+
+def _get_procfile_commands():
+    lines = PROCFILE_PATH.read_text().splitlines()
+    return dict(line.split(': ', maxsplit=1) for line in lines if line)
+
+
+def _get_consumed_queues():
+    return {queue for profile in WORKER_PROFILES.values() for queue in profile.queues}
+
+
+def test_all_tasks_are_routed():
+    """Test that every registered task has an entry in TASK_ROUTES."""
+    assert get_unrouted_task_names(app) == []
+
+
+def test_routed_tasks_exist():
+    """Test that every entry in TASK_ROUTES is for a registered task (and not e.g. a typo)."""
+    app.loader.import_default_modules()
+
+    assert set(TASK_ROUTES) - set(app.tasks) == set()
+
+
+def test_all_lanes_are_consumed():
+    """Test that every lane (and the default queue) is consumed by a worker profile."""
+    consumed_queues = _get_consumed_queues()
+
+    assert {lane.value for lane in Lane} <= consumed_queues
+    assert settings.CELERY_TASK_DEFAULT_QUEUE in consumed_queues
+
+
+@pytest.mark.parametrize('profile_name', WORKER_PROFILES)
+def test_procfile_matches_worker_profiles(profile_name):
+    """Test that the Procfile contains the command for each worker profile."""
+    assert _get_procfile_commands()[profile_name] == get_worker_command(profile_name)
+
+
+def test_get_worker_command():
+    """Test the command generated for a worker profile with all options set."""
+    assert get_worker_command('celerylongrunning') == (
+        'celery worker -A config -l info -c 2 -O fair --prefetch-multiplier 1 '
+        '-Q bulk,long-running'
+    )
+
+
+class TestRouteTask:
+    """Tests for route_task()."""
+
+    def test_routes_task(self):
+        """Test that a task in TASK_ROUTES is routed to its lane with its priority."""
+        route = route_task('datahub.search.tasks.sync_model', (), {}, {})
+
+        assert route == {
+            'queue': Lane.bulk.value,
+            'priority': Priority.lowest.value,
+        }
+
+    def test_returns_none_for_unknown_task(self):
+        """Test that None is returned for a task not in TASK_ROUTES."""
+        assert route_task('celery.chord_unlock', (), {}, {}) is None
+
+    def test_router_is_used_by_app(self):
+        """Test that the router is configured for the Celery app."""
+        route = app.amqp.router.route({}, 'datahub.search.tasks.sync_object_task')
+
+        assert route['queue'].name == Lane.realtime.value
+        assert route['priority'] == Priority.high.value
+
+    def test_explicit_options_take_precedence(self):
+        """Test that a priority passed to apply_async() overrides the routed priority."""
+        route = app.amqp.router.route(
+            {'priority': Priority.low.value},
+            'datahub.search.tasks.sync_object_task',
+        )
+
+        assert route['queue'].name == Lane.realtime.value
+        assert route['priority'] == Priority.low.value
@@ -1,6 +1,7 @@
 import json
 import os
 from collections.abc import Mapping, Sequence
+from contextlib import contextmanager
 from datetime import datetime
 from operator import attrgetter
 from secrets import token_hex
@@ -22,6 +23,7 @@ from rest_framework.test import APIClient
 from reversion.models import Revision, Version
 
 from datahub.core.csv import transform_csv_value
+from datahub.core.query_instrumentation import QueryCounter
 from datahub.core.utils import join_truthy_strings
 from datahub.metadata.models import Team
 from datahub.oauth.cache import add_token_data_to_cache
@@ -561,3 +563,43 @@ def mock_environ(**env_variables):
     :return: mock.patch.dict of os.environ values
     """
     return mock.patch.dict(os.environ, env_variables)
+
+
+@contextmanager
+def assert_query_budget(max_queries=None, max_repeated_queries=None):
+    """
+    Context manager (or decorator) that fails the test if the code inside it runs more SQL
+    queries than allowed.
+
+    Usage example:
+
+        with assert_query_budget(max_queries=10, max_repeated_queries=0):
+            response = api_client.get(url)
+
+    :param max_queries: the maximum number of queries allowed (None for no limit)
+    :param max_repeated_queries: the maximum number of queries allowed whose SQL (ignoring
+        parameters) is identical to that of an earlier query (None for no limit). Repeated
+        queries are usually N+1 queries.
+    """
+    with QueryCounter() as query_counter:
+        yield query_counter
+
+    failures = []
+
+    if max_queries is not None and query_counter.query_count > max_queries:
+        failures.append(f'{query_counter.query_count} queries were run (limit: {max_queries})')
+
+    if (
+        max_repeated_queries is not None
+        and query_counter.repeated_query_count > max_repeated_queries
+    ):
+        failures.append(
+            f'{query_counter.repeated_query_count} repeated queries were run (limit: '
+            f'{max_repeated_queries})',
+        )
+
+    if failures:
+        repeated_queries = '\n'.join(
+            f'{count}x: {sql}' for sql, count in query_counter.repeated_queries.items()
+        )
+        pytest.fail(f'Query budget exceeded: {"; ".join(failures)}\n{repeated_queries}')
@@ -0,0 +1,94 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from functools import reduce
+from operator import and_, or_
+
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.utils.encoders import JSONEncoder
+
+from datahub.core.utils import slice_iterable_into_chunks
+
+
+def encode_continuation_token(values):
+    """
+    Encodes the values of the ordering fields of a record as a continuation token.
+
+    The token is URL-safe base64-encoded JSON (of a list of the values), so clients can also
+    construct it themselves from the last record they received.
+    """
+    data = json.dumps(values, cls=JSONEncoder, separators=(',', ':'))
+    return urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_continuation_token(token, num_values):
+    """
+    Decodes a continuation token.
+
+    :raises ParseError: if the token is not valid
+    """
+    # binascii.Error and UnicodeError are subclasses of ValueError
+    try:
+        values = json.loads(urlsafe_b64decode(token.encode('ascii')))
+    except ValueError:
+        raise ParseError('Invalid continuation token.')
+
+    if not isinstance(values, list) or len(values) != num_values:
+        raise ParseError('Invalid continuation token.')
+
+    return values
+
+
+def get_keyset_filter(fields, values):
+    """
+    Gets a Q object that filters a query set (ordered by fields in ascending order) to rows
+    after the row with the specified values (the keyset).
+
+    NULL values are taken into account, and are assumed to sort after all other values (which
+    is the default for PostgreSQL when sorting in ascending order).
+
+    For example, for fields ('created_on', 'pk') and non-NULL values (x, y) this is equivalent
+    to:
+
+        Q(created_on__gt=x) | Q(created_on__isnull=True) | Q(created_on=x, pk__gt=y)
+    """
+    q_objects = []
+
+    for index, (field, value) in enumerate(zip(fields, values)):
+        # Nothing sorts after NULL
+        if value is None:
+            continue
+
+        preceding_fields_equal_q_objects = [
+            Q(**{f'{preceding_field}__isnull': True})
+            if preceding_value is None
+            else Q(**{preceding_field: preceding_value})
+            for preceding_field, preceding_value in zip(fields[:index], values[:index])
+        ]
+        field_after_q = Q(**{f'{field}__gt': value}) | Q(**{f'{field}__isnull': True})
+        q_objects.append(reduce(and_, [*preceding_fields_equal_q_objects, field_after_q]))
+
+    if not q_objects:
+        # The keyset was the last possible row
+        return Q(pk__in=[])
+
+    return reduce(or_, q_objects)
+
+
+def iter_ndjson_chunks(queryset, chunk_size, enrich_chunk=None):
+    """
+    Streams the records from a values() query set as newline-delimited JSON.
+
+    A server-side cursor is used, so that only chunk_size records are held in memory at a
+    time. Each yielded string contains one chunk of records.
+    """
+    records = queryset.iterator(chunk_size=chunk_size)
+
+    for chunk in slice_iterable_into_chunks(records, chunk_size):
+        if enrich_chunk:
+            enrich_chunk(chunk)
+
+        yield ''.join(
+            f'{json.dumps(record, cls=JSONEncoder, separators=(",", ":"))}\n'
+            for record in chunk
+        )
@@ -1,8 +1,12 @@
+import json
 from unittest import mock
 
 import pytest
 from rest_framework import status
 
+from datahub.dataset.core.streaming import encode_continuation_token
+from datahub.dataset.core.views import ORDERING_FIELDS_HEADER
+
 
 class BaseDatasetViewTest:
     """Base test class for dataset view tests.
@@ -14,6 +18,8 @@ class BaseDatasetViewTest:
 
     view_url = None
     factory = None
+    # Should match the supports_streaming attribute of the view
+    supports_streaming = True
 
     @pytest.mark.parametrize('method', ('delete', 'patch', 'post', 'put'))
     def test_other_methods_not_allowed(
@@ -82,3 +88,59 @@ class BaseDatasetViewTest:
         assert response_for_page_size_10.status_code == status.HTTP_200_OK
         assert len(response_for_page_size_1.json()['results']) == 1
         assert len(response_for_page_size_10.json()['results']) == 2
+
+    def _skip_if_streaming_not_supported(self):
+        if not self.supports_streaming:
+            pytest.skip('Streaming is not supported for this view.')
+
+    def _get_streamed_records(self, data_flow_api_client, params=None):
+        response = data_flow_api_client.get(
+            self.view_url,
+            params={'stream': 'true', **(params or {})},
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response['Content-Type'] == 'application/x-ndjson'
+        content = b''.join(response.streaming_content).decode('utf-8')
+        records = [json.loads(line) for line in content.splitlines()]
+        return records, response[ORDERING_FIELDS_HEADER].split(',')
+
+    def test_streaming_returns_same_records_as_pagination(self, data_flow_api_client):
+        """Test that streaming returns all records, in the same order as pagination does."""
+        self._skip_if_streaming_not_supported()
+        self.factory.create_batch(3)
+        paginated_response = data_flow_api_client.get(self.view_url)
+        streamed_records, _ = self._get_streamed_records(data_flow_api_client)
+
+        assert streamed_records == paginated_response.json()['results']
+
+    def test_streaming_can_be_resumed(self, data_flow_api_client):
+        """Test that a stream can be resumed after a record using a continuation token."""
+        self._skip_if_streaming_not_supported()
+        self.factory.create_batch(3)
+        all_records, ordering_fields = self._get_streamed_records(data_flow_api_client)
+        token = encode_continuation_token([all_records[0][field] for field in ordering_fields])
+
+        resumed_records, _ = self._get_streamed_records(
+            data_flow_api_client,
+            params={'after': token},
+        )
+
+        assert resumed_records == all_records[1:]
+
+    @pytest.mark.parametrize('token', ('invalid', encode_continuation_token(['a', 'b', 'c'])))
+    def test_streaming_with_invalid_continuation_token(self, data_flow_api_client, token):
+        """Test that an invalid continuation token returns an error."""
+        self._skip_if_streaming_not_supported()
+        response = data_flow_api_client.get(
+            self.view_url,
+            params={'stream': 'true', 'after': token},
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_streaming_when_not_supported(self, data_flow_api_client):
+        """Test that requesting a stream returns an error if the view doesn't support it."""
+        if self.supports_streaming:
+            pytest.skip('Streaming is supported for this view.')
+
+        response = data_flow_api_client.get(self.view_url, params={'stream': 'true'})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
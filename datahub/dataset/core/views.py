@@ -1,3 +1,6 @@
+from django.core.exceptions import ValidationError
+from django.http import StreamingHttpResponse
+from rest_framework.exceptions import ParseError
 from rest_framework.views import APIView
 
 from config.settings.types import HawkScope
@@ -7,7 +10,17 @@ from datahub.core.hawk_receiver import (
     HawkResponseSigningMixin,
     HawkScopePermission,
 )
+from datahub.core.replica import replica_view
 from datahub.dataset.core.pagination import DatasetCursorPagination
+from datahub.dataset.core.streaming import (
+    decode_continuation_token,
+    get_keyset_filter,
+    iter_ndjson_chunks,
+)
+
+STREAM_QUERY_PARAM = 'stream'
+CONTINUATION_TOKEN_QUERY_PARAM = 'after'
+ORDERING_FIELDS_HEADER = 'X-Dataset-Ordering-Fields'
 
 
 class BaseDatasetView(HawkResponseSigningMixin, APIView):
@@ -20,15 +33,71 @@ class BaseDatasetView(HawkResponseSigningMixin, APIView):
     permission_classes = (HawkScopePermission, )
     required_hawk_scope = HawkScope.data_flow_api
     pagination_class = DatasetCursorPagination
+    # Whether records can be streamed (using the stream query parameter). This should be
+    # disabled for views whose records are formatted by the pagination class, as streaming
+    # bypasses the pagination class
+    supports_streaming = True
+    # Number of records fetched from the database (and held in memory) at a time when streaming
+    stream_chunk_size = 2000
 
+    @replica_view
     def get(self, request):
-        """Endpoint which serves all records for a specific Dataset"""
+        """
+        Endpoint which serves all records for a specific Dataset.
+
+        Records are read from the replica database (if one is configured).
+
+        If the stream query parameter is true, all records are returned in a single streamed
+        response (see _get_streaming_response()). Otherwise, records are returned a page at a
+        time.
+        """
         dataset = self.get_dataset()
+
+        if request.query_params.get(STREAM_QUERY_PARAM, '').lower() in ('1', 'true'):
+            if not self.supports_streaming:
+                raise ParseError('Streaming is not supported for this dataset.')
+
+            return self._get_streaming_response(request, dataset)
+
         paginator = self.pagination_class()
         page = paginator.paginate_queryset(dataset, request, view=self)
         self._enrich_data(page)
         return paginator.get_paginated_response(page)
 
+    def _get_streaming_response(self, request, dataset):
+        """
+        Returns all records (after the record specified by the optional after query parameter)
+        as newline-delimited JSON, streamed using a server-side cursor.
+
+        Records are ordered by the ordering fields of the pagination class (usually created_on
+        and id), which are listed in the X-Dataset-Ordering-Fields response header.
+
+        If the response is interrupted, the client can resume from the last record it received
+        by passing a continuation token in the after query parameter. The token is the
+        URL-safe base64 encoding of a JSON list of the values of the ordering fields of that
+        record (see encode_continuation_token()).
+        """
+        ordering = self.pagination_class.ordering
+        dataset = dataset.order_by(*ordering)
+
+        token = request.query_params.get(CONTINUATION_TOKEN_QUERY_PARAM)
+        if token:
+            keyset_values = decode_continuation_token(token, len(ordering))
+            try:
+                dataset = dataset.filter(get_keyset_filter(ordering, keyset_values))
+            except ValidationError:
+                raise ParseError('Invalid continuation token.')
+
+        pk_name = dataset.model._meta.pk.name
+        record_ordering_fields = [pk_name if field == 'pk' else field for field in ordering]
+
+        response = StreamingHttpResponse(
+            iter_ndjson_chunks(dataset, self.stream_chunk_size, enrich_chunk=self._enrich_data),
+            content_type='application/x-ndjson',
+        )
+        response[ORDERING_FIELDS_HEADER] = ','.join(record_ordering_fields)
+        return response
+
     def _enrich_data(self, dataset):
         """
         Hook for enriching the paged dataset before returning a response.
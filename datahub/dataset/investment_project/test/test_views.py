@@ -276,6 +276,7 @@ class TestInvestmentProjectsActivityDatasetViewSet(BaseDatasetViewTest):
 
     view_url = reverse('api-v4:dataset:investment-projects-activity-dataset')
     factory = InvestmentProjectFactory
+    supports_streaming = False
 
     def test_propositions_are_being_formatted(self, data_flow_api_client, propositions):
         """Test that returned propositions are being formatted correctly."""
@@ -160,9 +160,13 @@ class InvestmentProjectsActivityDatasetView(BaseDatasetView):
     Because of the way the report is generated, the relevant SPI report fields are attached to
     Investment Project record in the 'InvestmentProjectActivityDatasetViewCursorPagination'
     pagination class and at the same time all other fields are being left out.
+
+    Streaming is not supported, as it would bypass the pagination class (and the formatted
+    records don't include the ordering fields needed for continuation tokens).
     """
 
     pagination_class = InvestmentProjectActivityDatasetViewCursorPagination
+    supports_streaming = False
 
     def get_dataset(self):
         """Get dataset."""
@@ -1,11 +1,18 @@
 import codecs
 import csv
 from contextlib import closing
+from functools import partial
 from logging import getLogger
 
+import reversion
 from django.core.management.base import BaseCommand
+from django.db import transaction
 
+from datahub.core.utils import slice_iterable_into_chunks
+from datahub.dbmaintenance.utils import parse_uuid
 from datahub.documents.utils import get_s3_client_for_bucket
+from datahub.search.apps import get_search_app_by_model
+from datahub.search.sync_object import sync_objects_async
 
 logger = getLogger(__name__)
 
@@ -46,20 +53,23 @@ class CSVBaseCommand(BaseCommand):
         """
         result = {True: 0, False: 0}
 
+        for row in self._iter_rows(options['bucket'], options['object_key']):
+            succeeded = self.process_row(row, **options)
+            result[succeeded] += 1
+        return result
+
+    @staticmethod
+    def _iter_rows(bucket, object_key):
+        """Streams the rows of the CSV file from S3 (as dicts keyed by the header)."""
         s3_client = get_s3_client_for_bucket('default')
         response = s3_client.get_object(
-            Bucket=options['bucket'],
-            Key=options['object_key'],
+            Bucket=bucket,
+            Key=object_key,
         )['Body']
 
         with closing(response):
             csvfile = codecs.getreader('utf-8')(response)
-            reader = csv.DictReader(csvfile)
-
-            for row in reader:
-                succeeded = self.process_row(row, **options)
-                result[succeeded] += 1
-        return result
+            yield from csv.DictReader(csvfile)
 
     def handle(self, *args, **options):
         """Process the CSV file."""
@@ -93,3 +103,181 @@ class CSVBaseCommand(BaseCommand):
         :param options: same as the django command options
         """
         raise NotImplementedError()
+
+
+class CSVBulkBaseCommand(CSVBaseCommand):
+    """
+    Base class for db maintenance commands that update existing objects of a model using
+    values from a CSV file stored in S3, in batches.
+
+    For each batch of rows:
+
+    - the objects to update are loaded using a single query
+    - changes are applied in memory by `_update_object()`
+    - changed objects are saved using bulk_update(), in a single transaction, with a single
+      reversion revision for the batch
+    - changed objects are synced to Elasticsearch using a single task per batch (search
+      signal receivers are not triggered by bulk_update())
+
+    Save-related signals are not sent, and auto-updated fields (such as modified_on) are only
+    updated if they're in `update_fields`.
+
+    Usage:
+        class Command(CSVBulkBaseCommand):
+            model = Company
+            update_fields = ('sector',)
+            revision_comment = 'Sector updated.'
+
+            def _update_object(self, obj, row, **options):
+                # update obj using row['col1'], row['col2'] where col1, col2 are the
+                # values in the header
+                # return True if obj was changed
+                ...
+
+        ./manage.py <command-name> <bucket> <object_key> [--batch-size <batch-size>]
+    """
+
+    # The model of the objects to update
+    model = None
+    # The CSV column containing the primary key of the object to update
+    pk_column = 'id'
+    # The fields updated by _update_object()
+    update_fields = ()
+    # The comment to use for reversion revisions
+    revision_comment = None
+    default_batch_size = 1000
+
+    def add_arguments(self, parser):
+        """Define extra arguments."""
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=self.default_batch_size,
+            help='The number of rows to process in each batch.',
+        )
+
+    def _handle(self, *args, **options):
+        """
+        Internal version of the `handle` method.
+
+        :returns: dict with count of records successful and failed updates
+        """
+        result = {True: 0, False: 0}
+        rows = self._iter_rows(options['bucket'], options['object_key'])
+
+        for batch_num, batch in enumerate(
+            slice_iterable_into_chunks(rows, options['batch_size']),
+            start=1,
+        ):
+            batch_result = self.process_batch(batch, **options)
+            result[True] += batch_result[True]
+            result[False] += batch_result[False]
+
+            logger.info(
+                f'Batch {batch_num} - succeeded: {batch_result[True]}, '
+                f'failed: {batch_result[False]}',
+            )
+
+        return result
+
+    def process_batch(self, rows, simulate=False, **options):
+        """
+        Process a batch of rows.
+
+        :returns: dict with count of rows successfully and unsuccessfully processed
+        """
+        result = {True: 0, False: 0}
+        pks_by_row_num = {}
+
+        for row_num, row in enumerate(rows):
+            try:
+                pks_by_row_num[row_num] = parse_uuid(row[self.pk_column])
+            except Exception:
+                logger.exception(f'Row {row} - Failed')
+
+        objs_by_pk = self.model.objects.in_bulk(set(pks_by_row_num.values()))
+        changed_objs = {}
+
+        for row_num, pk in pks_by_row_num.items():
+            row = rows[row_num]
+            succeeded, changed = self._process_row_for_object(
+                row,
+                objs_by_pk.get(pk),
+                simulate=simulate,
+                **options,
+            )
+
+            result[succeeded] += 1
+            if changed:
+                changed_objs[pk] = objs_by_pk[pk]
+
+        result[False] += len(rows) - len(pks_by_row_num)
+
+        if changed_objs and not simulate:
+            self._save_objects(list(changed_objs.values()))
+
+        return result
+
+    def _process_row_for_object(self, row, obj, **options):
+        """
+        Applies the changes for a row to an object (in memory).
+
+        :returns: a 2-tuple of (whether the row was processed successfully,
+            whether the object was changed)
+        """
+        try:
+            if obj is None:
+                raise self.model.DoesNotExist(
+                    f'{self.model._meta.object_name} matching query does not exist.',
+                )
+
+            changed = self._update_object(obj, row, **options)
+        except Exception:
+            logger.exception(f'Row {row} - Failed')
+            return False, False
+
+        logger.info(f'Row {row} - OK')
+        return True, bool(changed)
+
+    def _save_objects(self, objs):
+        with transaction.atomic(), reversion.create_revision():
+            self.model.objects.bulk_update(objs, self.update_fields)
+
+            for obj in objs:
+                reversion.add_to_revision(obj)
+
+            if self.revision_comment:
+                reversion.set_comment(self.revision_comment)
+
+            self._schedule_search_sync([obj.pk for obj in objs])
+
+    def _schedule_search_sync(self, pks):
+        try:
+            search_app = get_search_app_by_model(self.model)
+        except LookupError:
+            return
+
+        transaction.on_commit(partial(sync_objects_async, search_app, pks))
+
+    def _process_row(self, row, **options):
+        """
+        Rows are processed in batches by `process_batch()` (using `_update_object()`), so this
+        should not be called or implemented by subclasses.
+        """
+        raise TypeError(
+            f'{self.__class__.__name__} processes rows in batches using process_batch() and '
+            f'_update_object(); rows cannot be processed individually.',
+        )
+
+    def _update_object(self, obj, row, **options):
+        """
+        To be implemented by a subclass, it should update obj (in memory) using the values in
+        row and propagate exceptions so that the row is counted as failed.
+
+        :param obj: the object to update
+        :param row: dict where the keys are defined in the header and the values are the CSV row
+        :param options: same as the django command options
+        :returns: True if obj was changed (and hence needs to be saved), False otherwise
+        """
+        raise NotImplementedError()
@@ -1,18 +1,20 @@
 from logging import getLogger
 
-import reversion
-
 from datahub.company.models import Company
-from datahub.dbmaintenance.management.base import CSVBaseCommand
+from datahub.dbmaintenance.management.base import CSVBulkBaseCommand
 from datahub.dbmaintenance.utils import parse_uuid
 
 
 logger = getLogger(__name__)
 
 
-class Command(CSVBaseCommand):
+class Command(CSVBulkBaseCommand):
     """Command to update Company.sector."""
 
+    model = Company
+    update_fields = ('sector_id',)
+    revision_comment = 'Sector updated.'
+
     def add_arguments(self, parser):
         """Define additional arguments."""
         super().add_arguments(parser)
@@ -24,26 +26,18 @@ class Command(CSVBaseCommand):
             help='Overwrite existing values rather than leaving them in place.',
         )
 
-    def _process_row(self, row, simulate=False, overwrite=False, **options):
-        """Process a single row."""
-        pk = parse_uuid(row['id'])
-        company = Company.objects.get(pk=pk)
+    def _update_object(self, company, row, overwrite=False, **options):
+        """Update the sector of a company."""
         sector_id = parse_uuid(row['sector_id'])
 
         if company.sector_id and not overwrite:
             logger.warning(
                 f'Skipping update of company {company.pk} as it already has a sector.',
             )
-            return
+            return False
 
         if company.sector_id == sector_id:
-            return
+            return False
 
         company.sector_id = sector_id
-
-        if simulate:
-            return
-
-        with reversion.create_revision():
-            company.save(update_fields=('sector_id',))
-            reversion.set_comment('Sector updated.')
+        return True
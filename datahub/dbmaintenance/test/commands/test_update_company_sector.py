@@ -1,6 +1,7 @@
 """Tests for the update_company_sector management command."""
 from datetime import datetime
 from io import BytesIO
+from unittest.mock import Mock
 
 import factory
 import pytest
@@ -12,6 +13,7 @@ from reversion.models import Version
 from datahub.company.test.factories import CompanyFactory
 from datahub.core.test_utils import random_obj_for_model
 from datahub.metadata.models import Sector
+from datahub.search.company import CompanySearchApp
 
 pytestmark = pytest.mark.django_db
 
@@ -138,3 +140,53 @@ def test_audit_log(s3_stubber):
     versions = Version.objects.get_for_object(company_with_change)
     assert versions.count() == 1
     assert versions[0].revision.get_comment() == 'Sector updated.'
+
+
+@pytest.mark.usefixtures('synchronous_on_commit')
+def test_updates_in_batches(s3_stubber, monkeypatch):
+    """
+    Test that rows are processed in batches, with a single revision and a single search
+    sync per batch.
+    """
+    mock_sync_objects_async = Mock()
+    monkeypatch.setattr(
+        'datahub.dbmaintenance.management.base.sync_objects_async',
+        mock_sync_objects_async,
+    )
+
+    sector = random_obj_for_model(Sector)
+    companies = CompanyFactory.create_batch(3, sector_id=None)
+
+    bucket = 'test_bucket'
+    object_key = 'test_key'
+    csv_content = '\n'.join(
+        ['id,sector_id', *(f'{company.pk},{sector.pk}' for company in companies)],
+    )
+
+    s3_stubber.add_response(
+        'get_object',
+        {
+            'Body': BytesIO(csv_content.encode(encoding='utf-8')),
+        },
+        expected_params={
+            'Bucket': bucket,
+            'Key': object_key,
+        },
+    )
+
+    call_command('update_company_sector', bucket, object_key, batch_size=2)
+
+    for company in companies:
+        company.refresh_from_db()
+        assert company.sector_id == sector.pk
+
+    revisions = [
+        Version.objects.get_for_object(company).get().revision_id for company in companies
+    ]
+    assert revisions[0] == revisions[1]
+    assert revisions[1] != revisions[2]
+
+    assert [call_args[0] for call_args in mock_sync_objects_async.call_args_list] == [
+        (CompanySearchApp, [companies[0].pk, companies[1].pk]),
+        (CompanySearchApp, [companies[2].pk]),
+    ]
@@ -0,0 +1,194 @@
+import logging
+from collections import namedtuple
+
+import reversion
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.utils.timezone import now
+
+from datahub.company.models import Company
+from datahub.dnb_api.constants import ALL_DNB_UPDATED_SERIALIZER_FIELDS
+from datahub.dnb_api.serializers import DNBCompanySerializer
+from datahub.dnb_api.utils import format_dnb_company
+from datahub.search.company import CompanySearchApp
+from datahub.search.signals import disable_search_signal_receivers
+from datahub.search.sync_object import sync_objects_async
+
+logger = logging.getLogger(__name__)
+
+# Fields that are set on every company that is updated from D&B (whether or not any of its D&B
+# fields changed)
+_ALWAYS_UPDATED_FIELDS = ('pending_dnb_investigation', 'dnb_modified_on')
+# Fields that are copied to the search documents of other objects by
+# datahub.search.dict_utils.company_dict() (so changes to them can't be coalesced into a single
+# company sync)
+_FIELDS_WITH_RELATED_SEARCH_DOCUMENTS = {'name', 'trading_names'}
+
+# IDs of the companies that were updated, and the number of updates that could not be applied
+BatchUpdateResult = namedtuple('BatchUpdateResult', ('updated_company_ids', 'failure_count'))
+
+
+def apply_dnb_company_updates(dnb_company_updates, fields_to_update=None, update_descriptor=''):
+    """
+    Applies a batch of company updates from dnb-service (e.g. a page of results from
+    get_company_update_page()).
+
+    This is equivalent to calling update_company_from_dnb() for each update, but:
+
+    - all the matching companies are loaded using a single query
+    - only fields with changed values are written, using a single bulk update
+    - a single revision is created for all companies with changed values
+    - the companies are synced to Elasticsearch using a single task
+
+    Updates for companies that don't exist or that fail validation are logged and skipped.
+
+    :returns: BatchUpdateResult
+    """
+    fields_to_update = fields_to_update or ALL_DNB_UPDATED_SERIALIZER_FIELDS
+    dnb_companies_by_duns_number = {}
+
+    for dnb_company_data in dnb_company_updates:
+        dnb_company = format_dnb_company(dnb_company_data)
+        dnb_companies_by_duns_number[dnb_company['duns_number']] = dnb_company
+
+    companies_by_duns_number = Company.objects.in_bulk(
+        dnb_companies_by_duns_number.keys(),
+        field_name='duns_number',
+    )
+    failure_count = len(dnb_company_updates) - len(dnb_companies_by_duns_number)
+    updated_companies = []
+    changed_field_names_by_company = {}
+    dnb_modified_on = now()
+
+    for duns_number, dnb_company in dnb_companies_by_duns_number.items():
+        company = companies_by_duns_number.get(duns_number)
+
+        if not company:
+            logger.error(
+                'Company matching duns_number was not found',
+                extra={
+                    'duns_number': duns_number,
+                    'dnb_company': dnb_company,
+                },
+            )
+            failure_count += 1
+            continue
+
+        changed_field_names = _apply_dnb_company_to_company(
+            company,
+            {field: dnb_company[field] for field in fields_to_update},
+        )
+        if changed_field_names is None:
+            failure_count += 1
+            continue
+
+        company.pending_dnb_investigation = False
+        company.dnb_modified_on = dnb_modified_on
+        updated_companies.append(company)
+
+        if changed_field_names:
+            changed_field_names_by_company[company] = changed_field_names
+
+    if updated_companies:
+        _save_companies(updated_companies, changed_field_names_by_company, update_descriptor)
+
+    return BatchUpdateResult(
+        [str(company.pk) for company in updated_companies],
+        failure_count,
+    )
+
+
+def _apply_dnb_company_to_company(company, dnb_company):
+    """
+    Validates D&B data for a company and sets changed values on the company.
+
+    :returns: the names of the model fields that changed (or None if the data was invalid)
+    """
+    company_serializer = DNBCompanySerializer(company, data=dnb_company, partial=True)
+
+    if not company_serializer.is_valid():
+        logger.error(
+            'Data from D&B did not pass the Data Hub validation checks.',
+            extra={'dnb_company': dnb_company, 'errors': company_serializer.errors},
+        )
+        return None
+
+    changed_field_names = set()
+
+    for field_name, value in company_serializer.validated_data.items():
+        field = Company._meta.get_field(field_name)
+
+        if field.is_relation:
+            # Compare IDs to avoid loading the current related object
+            current_value = getattr(company, field.attname)
+            new_value = value.pk if value else None
+        else:
+            current_value = getattr(company, field_name)
+            new_value = value
+
+        if current_value != new_value:
+            setattr(company, field_name, value)
+            changed_field_names.add(field_name)
+
+    return changed_field_names
+
+
+def _save_companies(updated_companies, changed_field_names_by_company, update_descriptor):
+    changed_field_names = set().union(*changed_field_names_by_company.values())
+    update_comment = 'Updated from D&B'
+    if update_descriptor:
+        update_comment = f'{update_comment} [{update_descriptor}]'
+
+    # As with update_company_from_dnb(), modified_on is deliberately not updated (it should only
+    # be set through saves initiated by a user)
+    with reversion.create_revision():
+        Company.objects.bulk_update(
+            updated_companies,
+            [*_ALWAYS_UPDATED_FIELDS, *sorted(changed_field_names)],
+        )
+
+        for company in changed_field_names_by_company:
+            reversion.add_to_revision(company)
+
+        reversion.set_comment(update_comment)
+
+        coalesced_company_ids = _send_post_save_signals(changed_field_names_by_company)
+
+    if coalesced_company_ids:
+        transaction.on_commit(
+            lambda: sync_objects_async(CompanySearchApp, coalesced_company_ids),
+        )
+
+
+def _send_post_save_signals(changed_field_names_by_company):
+    """
+    Sends post_save signals for companies with changed values (as bulk_update() doesn't).
+
+    Search signal receivers are disabled for companies where none of the changed fields are
+    copied to the search documents of other objects. Instead, those companies should be synced
+    to Elasticsearch together.
+
+    :returns: the IDs of the companies that should be synced to Elasticsearch
+    """
+    coalesced_company_ids = []
+
+    for company, changed_field_names in changed_field_names_by_company.items():
+        signal_kwargs = {
+            'sender': Company,
+            'instance': company,
+            'created': False,
+            'update_fields': frozenset([*_ALWAYS_UPDATED_FIELDS, *changed_field_names]),
+            'raw': False,
+            'using': Company.objects.db,
+        }
+
+        if changed_field_names & _FIELDS_WITH_RELATED_SEARCH_DOCUMENTS:
+            post_save.send(**signal_kwargs)
+            continue
+
+        with disable_search_signal_receivers(Company):
+            post_save.send(**signal_kwargs)
+
+        coalesced_company_ids.append(company.pk)
+
+    return coalesced_company_ids
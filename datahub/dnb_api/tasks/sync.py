@@ -46,7 +46,6 @@ def _sync_company_with_dnb(
 @shared_task(
     bind=True,
     acks_late=True,
-    priority=9,
     max_retries=3,
 )
 def sync_company_with_dnb(
@@ -73,10 +72,8 @@ def sync_company_with_dnb(
 @shared_task(
     bind=True,
     acks_late=True,
-    priority=9,
     max_retries=3,
     rate_limit=1,  # Run this task at most once per worker per second
-    queue='long-running',
 )
 def sync_company_with_dnb_rate_limited(
     self,
@@ -116,8 +113,6 @@ def sync_company_with_dnb_rate_limited(
 @shared_task(
     bind=True,
     acks_late=True,
-    priority=9,
-    queue='long-running',
 )
 def sync_outdated_companies_with_dnb(
     self,
@@ -1,8 +1,9 @@
 from datetime import datetime, time, timedelta
+from time import perf_counter
 
 from celery import shared_task
-from celery.result import ResultSet
 from django.conf import settings
+from django.core.cache import cache
 from django.utils.timezone import now
 from django_pglocks import advisory_lock
 from rest_framework.status import is_server_error
@@ -10,6 +11,7 @@ from rest_framework.status import is_server_error
 from datahub.company.models import Company
 from datahub.core.realtime_messaging import send_realtime_message
 from datahub.core.utils import log_to_sentry
+from datahub.dnb_api.batch_update import apply_dnb_company_updates
 from datahub.dnb_api.constants import FEATURE_FLAG_DNB_COMPANY_UPDATES
 from datahub.dnb_api.tasks.sync import logger
 from datahub.dnb_api.utils import (
@@ -22,27 +24,24 @@ from datahub.dnb_api.utils import (
 )
 from datahub.feature_flag.utils import is_feature_flag_active
 
+PROGRESS_CACHE_KEY_PREFIX = 'dnb-company-updates-progress'
+PROGRESS_CACHE_TIMEOUT = 24 * 60 * 60  # seconds
 
-def _record_audit(update_results, producer_task, start_time):
+
+def _record_audit(progress, producer_task):
     """
     Record an audit log for the get_company_updates task which expresses the number
     of companies successfully updates, failures, ids of companies updated, celery
     task info and start/end times.
     """
     audit = {
-        'success_count': 0,
-        'failure_count': 0,
-        'updated_company_ids': [],
+        'success_count': len(progress['updated_company_ids']),
+        'failure_count': progress['failure_count'],
+        'updated_company_ids': progress['updated_company_ids'],
         'producer_task_id': producer_task.request.id,
-        'start_time': start_time.isoformat(),
+        'start_time': progress['start_time'],
         'end_time': now().isoformat(),
     }
-    for result in update_results:
-        if result.successful():
-            audit['success_count'] += 1
-            audit['updated_company_ids'].append(result.result)
-        else:
-            audit['failure_count'] += 1
     log_to_sentry('get_company_updates task completed.', extra=audit)
     success_count, failure_count = audit['success_count'], audit['failure_count']
     realtime_message = (
@@ -65,67 +64,95 @@ def _get_company_updates_from_api(last_updated_after, next_page, task):
         raise task.retry(exc=exc, countdown=60)
 
 
-def _get_company_updates(task, last_updated_after, fields_to_update):
+def _get_progress_cache_key(task):
+    return f'{PROGRESS_CACHE_KEY_PREFIX}:{task.request.id}'
+
+
+def _get_initial_progress(last_updated_after):
     yesterday = now() - timedelta(days=1)
     midnight_yesterday = datetime.combine(yesterday, time.min)
-    last_updated_after = last_updated_after or midnight_yesterday.isoformat()
-    next_page = None
-    updates_remaining = settings.DNB_AUTOMATIC_UPDATE_LIMIT
-    update_results = []
-    start_time = now()
-    logger.info('Started get_company_updates task')
+
+    return {
+        'last_updated_after': last_updated_after or midnight_yesterday.isoformat(),
+        'next_page': None,
+        'updates_remaining': settings.DNB_AUTOMATIC_UPDATE_LIMIT,
+        'updated_company_ids': [],
+        'failure_count': 0,
+        'start_time': now().isoformat(),
+    }
+
+
+def _get_company_updates(task, last_updated_after, fields_to_update):
+    """
+    Goes through the pages of company updates and applies each page in a single batch.
+
+    Progress is saved (in the cache) after each page, so that if the task fails and is
+    retried (with the same task ID), it resumes from the page after the last one applied.
+    """
+    progress_cache_key = _get_progress_cache_key(task)
+    progress = cache.get(progress_cache_key)
+
+    if progress:
+        logger.info(f'Resuming get_company_updates task from {progress["next_page"]}')
+    else:
+        progress = _get_initial_progress(last_updated_after)
+        logger.info('Started get_company_updates task')
+
     update_descriptor = f'celery:get_company_updates:{task.request.id}'
 
     while True:
-
-        response = _get_company_updates_from_api(last_updated_after, next_page, task)
+        response = _get_company_updates_from_api(
+            progress['last_updated_after'],
+            progress['next_page'],
+            task,
+        )
         dnb_company_updates = response.get('results', [])
+        dnb_company_updates = dnb_company_updates[:progress['updates_remaining']]
 
-        dnb_company_updates = dnb_company_updates[:updates_remaining]
-
-        # Spawn tasks that update Data Hub companies
-        for data in dnb_company_updates:
-            result = update_company_from_dnb_data.apply_async(
-                args=(data,),
-                kwargs={
-                    'fields_to_update': fields_to_update,
-                    'update_descriptor': update_descriptor,
-                },
-            )
-            update_results.append(result)
-
-        if updates_remaining is not None:
-            updates_remaining -= len(dnb_company_updates)
-            if updates_remaining <= 0:
+        start_time = perf_counter()
+        result = apply_dnb_company_updates(
+            dnb_company_updates,
+            fields_to_update=fields_to_update,
+            update_descriptor=update_descriptor,
+        )
+        duration = perf_counter() - start_time
+        logger.info(
+            f'Applied page of {len(dnb_company_updates)} D&B company updates in '
+            f'{duration:.2f}s ({len(dnb_company_updates) / max(duration, 0.001):.1f} '
+            f'updates/s, {result.failure_count} failed)',
+        )
+
+        progress['updated_company_ids'].extend(result.updated_company_ids)
+        progress['failure_count'] += result.failure_count
+        progress['next_page'] = response.get('next')
+
+        if progress['updates_remaining'] is not None:
+            progress['updates_remaining'] -= len(dnb_company_updates)
+            if progress['updates_remaining'] <= 0:
                 break
 
-        next_page = response.get('next')
-        if next_page is None:
+        if progress['next_page'] is None:
             break
 
-    # Wait for all update tasks to finish...
-    ResultSet(results=update_results).join(
-        propagate=False,
-        disable_sync_subtasks=False,
-    )
-    _record_audit(update_results, task, start_time)
+        cache.set(progress_cache_key, progress, PROGRESS_CACHE_TIMEOUT)
+
+    _record_audit(progress, task)
+    cache.delete(progress_cache_key)
     logger.info('Finished get_company_updates task')
 
 
 @shared_task(
     bind=True,
     acks_late=True,
-    priority=9,
     max_retries=3,
-    queue='long-running',
 )
 def get_company_updates(self, last_updated_after=None, fields_to_update=None):
     """
     Gets the lastest updates for D&B companies from dnb-service.
 
     The `dnb-service` exposes these updates as a cursor-paginated list. This
-    task goes through the pages and spawns tasks that update the records in
-    Data Hub.
+    task goes through the pages and updates the records in Data Hub (one batch
+    per page).
     """
     # TODO: remove this feature flag after a reasonable period after going live
     # with unlimited company updates
@@ -146,7 +173,6 @@ def get_company_updates(self, last_updated_after=None, fields_to_update=None):
 
 @shared_task(
     acks_late=True,
-    priority=9,
 )
 def update_company_from_dnb_data(dnb_company_data, fields_to_update=None, update_descriptor=None):
     """
@@ -0,0 +1,180 @@
+from unittest import mock
+
+import pytest
+from django.utils.timezone import now
+from freezegun import freeze_time
+from reversion.models import Version
+
+from datahub.company.models import Company
+from datahub.company.test.factories import CompanyFactory
+from datahub.dnb_api.batch_update import (
+    _FIELDS_WITH_RELATED_SEARCH_DOCUMENTS,
+    apply_dnb_company_updates,
+    BatchUpdateResult,
+)
+from datahub.search.dict_utils import company_dict
+
+pytestmark = pytest.mark.django_db
+
+UPDATE_DESCRIPTOR = 'celery:get_company_updates:foo'
+
+
+@pytest.fixture
+def mock_sync_objects_async(monkeypatch):
+    """Mock sync_objects_async() in the batch_update module."""
+    mock_sync_objects_async = mock.Mock()
+    monkeypatch.setattr(
+        'datahub.dnb_api.batch_update.sync_objects_async',
+        mock_sync_objects_async,
+    )
+    return mock_sync_objects_async
+
+
+def _dnb_company_data(dnb_response_uk, duns_number, **overrides):
+    return {
+        **dnb_response_uk['results'][0],
+        'duns_number': duns_number,
+        **overrides,
+    }
+
+
+@freeze_time('2019-01-01 11:12:13')
+@pytest.mark.usefixtures('mock_sync_objects_async')
+def test_updates_companies(dnb_response_uk):
+    """Test that all companies in a batch are updated."""
+    companies = [
+        CompanyFactory(duns_number='123456789', pending_dnb_investigation=True),
+        CompanyFactory(duns_number='987654321', pending_dnb_investigation=True),
+    ]
+    dnb_updates = [
+        _dnb_company_data(dnb_response_uk, '123456789'),
+        _dnb_company_data(dnb_response_uk, '987654321', primary_name='BAR BICYCLE LIMITED'),
+    ]
+
+    result = apply_dnb_company_updates(dnb_updates, update_descriptor=UPDATE_DESCRIPTOR)
+
+    assert result == BatchUpdateResult([str(company.pk) for company in companies], 0)
+
+    for company, dnb_update in zip(companies, dnb_updates):
+        original_modified_on = company.modified_on
+        company.refresh_from_db()
+
+        assert company.name == dnb_update['primary_name']
+        assert company.address_1 == 'Unit 10, Ockham Drive'
+        assert company.company_number == '01261539'
+        assert company.global_ultimate_duns_number == '291332174'
+        assert company.turnover == 50651895
+        assert not company.pending_dnb_investigation
+        assert company.dnb_modified_on == now()
+        assert company.modified_on == original_modified_on
+
+
+@pytest.mark.usefixtures('mock_sync_objects_async')
+def test_creates_single_revision_for_changed_companies(dnb_response_uk):
+    """Test that one revision is created for the companies that changed."""
+    changed_company = CompanyFactory(duns_number='123456789')
+    dnb_update = _dnb_company_data(dnb_response_uk, '123456789')
+    apply_dnb_company_updates([dnb_update])
+    unchanged_company = changed_company
+    changed_company = CompanyFactory(duns_number='987654321')
+
+    apply_dnb_company_updates(
+        [dnb_update, _dnb_company_data(dnb_response_uk, '987654321')],
+        update_descriptor=UPDATE_DESCRIPTOR,
+    )
+
+    versions = Version.objects.filter(revision__comment=f'Updated from D&B [{UPDATE_DESCRIPTOR}]')
+    assert [version.object_id for version in versions] == [str(changed_company.pk)]
+    assert Version.objects.get_for_object(unchanged_company).count() == 1
+
+
+@pytest.mark.usefixtures('synchronous_on_commit')
+def test_syncs_changed_companies_to_search_together(dnb_response_uk, mock_sync_objects_async):
+    """
+    Test that companies without name or trading name changes are synced to Elasticsearch using
+    a single call.
+    """
+    companies = [
+        CompanyFactory(
+            duns_number='123456789',
+            name='FOO BICYCLE LIMITED',
+            trading_names=[],
+        ),
+        CompanyFactory(
+            duns_number='987654321',
+            name='FOO BICYCLE LIMITED',
+            trading_names=[],
+        ),
+    ]
+
+    apply_dnb_company_updates(
+        [
+            _dnb_company_data(dnb_response_uk, '123456789'),
+            _dnb_company_data(dnb_response_uk, '987654321'),
+        ],
+    )
+
+    mock_sync_objects_async.assert_called_once()
+    assert set(mock_sync_objects_async.call_args.args[1]) == {
+        company.pk for company in companies
+    }
+
+
+@pytest.mark.usefixtures('synchronous_on_commit')
+def test_syncs_companies_with_trading_name_changes_individually(
+    dnb_response_uk,
+    mock_sync_objects_async,
+):
+    """
+    Test that companies whose trading names changed are synced using the search signal
+    receivers (so that the search documents of related objects are also updated).
+    """
+    company = CompanyFactory(
+        duns_number='123456789',
+        name='FOO BICYCLE LIMITED',
+        trading_names=['Old trading name'],
+    )
+
+    with mock.patch(
+        'datahub.search.sync_object.sync_object_task',
+    ), mock.patch(
+        'datahub.search.sync_object.sync_related_objects_task',
+    ) as mock_sync_related_objects_task:
+        apply_dnb_company_updates(
+            [_dnb_company_data(dnb_response_uk, '123456789', trading_names=['New trading name'])],
+        )
+
+    company.refresh_from_db()
+    assert company.name == 'FOO BICYCLE LIMITED'
+    assert company.trading_names == ['New trading name']
+    mock_sync_objects_async.assert_not_called()
+
+    synced_related_field_names = {
+        call.kwargs['args'][2]
+        for call in mock_sync_related_objects_task.apply_async.call_args_list
+    }
+    assert 'contacts' in synced_related_field_names
+
+
+def test_fields_with_related_search_documents_match_company_dict():
+    """Test that all company fields copied to related search documents are handled."""
+    company_dict_fields = company_dict(CompanyFactory.build()).keys() - {'id'}
+    assert company_dict_fields == _FIELDS_WITH_RELATED_SEARCH_DOCUMENTS
+
+
+@pytest.mark.usefixtures('mock_sync_objects_async')
+def test_skips_missing_and_invalid_companies(dnb_response_uk):
+    """Test that updates for companies that don't exist or fail validation are skipped."""
+    company = CompanyFactory(duns_number='123456789')
+    CompanyFactory(duns_number='987654321', name='original name')
+
+    result = apply_dnb_company_updates(
+        [
+            _dnb_company_data(dnb_response_uk, '123456789'),
+            _dnb_company_data(dnb_response_uk, '999999999'),
+            _dnb_company_data(dnb_response_uk, '987654321', primary_name=None),
+        ],
+    )
+
+    assert result == BatchUpdateResult([str(company.pk)], 2)
+    assert Company.objects.get(duns_number='987654321').name == 'original name'
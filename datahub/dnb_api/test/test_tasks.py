@@ -14,6 +14,7 @@ from reversion.models import Version
 
 from datahub.company.models import Company
 from datahub.company.test.factories import CompanyFactory
+from datahub.dnb_api.batch_update import BatchUpdateResult
 from datahub.dnb_api.tasks import (
     get_company_updates,
     sync_company_with_dnb,
@@ -360,10 +361,10 @@ class TestGetCompanyUpdates:
             'datahub.dnb_api.tasks.update.get_company_update_page',
             mock_get_company_update_page,
         )
-        mock_update_company = mock.Mock()
+        mock_apply_updates = mock.Mock(return_value=BatchUpdateResult([], 0))
         monkeypatch.setattr(
-            'datahub.dnb_api.tasks.update.update_company_from_dnb_data',
-            mock_update_company,
+            'datahub.dnb_api.tasks.update.apply_dnb_company_updates',
+            mock_apply_updates,
         )
         task_result = get_company_updates.apply(kwargs={'fields_to_update': fields_to_update})
 
@@ -377,24 +378,78 @@ class TestGetCompanyUpdates:
             'http://foo.bar/companies?cursor=page2',
         )
 
-        assert mock_update_company.apply_async.call_count == 3
+        assert mock_apply_updates.call_count == 2
         expected_kwargs = {
             'fields_to_update': fields_to_update,
             'update_descriptor': f'celery:get_company_updates:{task_result.id}',
         }
-        mock_update_company.apply_async.assert_any_call(
-            args=({'foo': 1},),
-            kwargs=expected_kwargs,
+        mock_apply_updates.assert_any_call(
+            [{'foo': 1}, {'bar': 2}],
+            **expected_kwargs,
         )
-        mock_update_company.apply_async.assert_any_call(
-            args=({'bar': 2},),
-            kwargs=expected_kwargs,
+        mock_apply_updates.assert_any_call(
+            [{'baz': 3}],
+            **expected_kwargs,
         )
-        mock_update_company.apply_async.assert_any_call(
-            args=({'baz': 3},),
-            kwargs=expected_kwargs,
+
+    @pytest.mark.usefixtures('local_memory_cache')
+    @freeze_time('2019-01-02T2:00:00')
+    def test_resumes_after_failure(self, monkeypatch):
+        """
+        Test that if the task fails part way through, it resumes from the page after the last
+        page applied when it is run again with the same task ID.
+        """
+        data = {
+            None: {
+                'next': 'http://foo.bar/companies?cursor=page2',
+                'previous': None,
+                'results': [{'foo': 1}],
+            },
+            'http://foo.bar/companies?cursor=page2': {
+                'next': None,
+                'previous': 'http://foo.bar/companies',
+                'results': [{'bar': 2}],
+            },
+        }
+        error = DNBServiceError('An error occurred', status_code=400)
+        mock_get_company_update_page = mock.Mock(
+            side_effect=[data[None], error, data['http://foo.bar/companies?cursor=page2']],
+        )
+        monkeypatch.setattr(
+            'datahub.dnb_api.tasks.update.get_company_update_page',
+            mock_get_company_update_page,
+        )
+        mock_apply_updates = mock.Mock(
+            side_effect=[BatchUpdateResult(['1'], 0), BatchUpdateResult(['2'], 1)],
+        )
+        monkeypatch.setattr(
+            'datahub.dnb_api.tasks.update.apply_dnb_company_updates',
+            mock_apply_updates,
+        )
+        mock_log_to_sentry = mock.Mock()
+        monkeypatch.setattr(
+            'datahub.dnb_api.tasks.update.log_to_sentry',
+            mock_log_to_sentry,
         )
 
+        failed_result = get_company_updates.apply(task_id='test-task')
+        assert isinstance(failed_result.result, DNBServiceError)
+
+        get_company_updates.apply(task_id='test-task')
+
+        assert mock_get_company_update_page.call_args_list == [
+            mock.call('2019-01-01T00:00:00', None),
+            mock.call('2019-01-01T00:00:00', 'http://foo.bar/companies?cursor=page2'),
+            mock.call('2019-01-01T00:00:00', 'http://foo.bar/companies?cursor=page2'),
+        ]
+        assert [call.args[0] for call in mock_apply_updates.call_args_list] == [
+            [{'foo': 1}],
+            [{'bar': 2}],
+        ]
+        audit = mock_log_to_sentry.call_args.kwargs['extra']
+        assert audit['updated_company_ids'] == ['1', '2']
+        assert audit['failure_count'] == 1
+
     @pytest.mark.parametrize(
         'lock_acquired, call_count',
         (
@@ -476,26 +531,25 @@ class TestGetCompanyUpdates:
             'datahub.dnb_api.tasks.update.get_company_update_page',
             mock_get_company_update_page,
         )
-        mock_update_company = mock.Mock()
+        mock_apply_updates = mock.Mock(return_value=BatchUpdateResult([], 0))
         monkeypatch.setattr(
-            'datahub.dnb_api.tasks.update.update_company_from_dnb_data',
-            mock_update_company,
+            'datahub.dnb_api.tasks.update.apply_dnb_company_updates',
+            mock_apply_updates,
         )
         task_result = get_company_updates.apply()
 
-        assert mock_update_company.apply_async.call_count == 2
+        applied_updates = [
+            update
+            for call in mock_apply_updates.call_args_list
+            for update in call.args[0]
+        ]
+        assert applied_updates == [{'foo': 1}, {'bar': 2}]
         expected_kwargs = {
             'fields_to_update': None,
             'update_descriptor': f'celery:get_company_updates:{task_result.id}',
         }
-        mock_update_company.apply_async.assert_any_call(
-            args=({'foo': 1},),
-            kwargs=expected_kwargs,
-        )
-        mock_update_company.apply_async.assert_any_call(
-            args=({'bar': 2},),
-            kwargs=expected_kwargs,
-        )
+        for call in mock_apply_updates.call_args_list:
+            assert call.kwargs == expected_kwargs
 
     @mock.patch('datahub.dnb_api.tasks.update.send_realtime_message')
     @mock.patch('datahub.dnb_api.tasks.update.log_to_sentry')
@@ -12,7 +12,7 @@ from datahub.interaction import (
 logger = get_task_logger(__name__)
 
 
-@shared_task(acks_late=True, priority=9)
+@shared_task(acks_late=True)
 def ingest_emails():
     """
     Ingest and process new emails for all mailboxes in the application - i.e.
@@ -38,7 +38,7 @@ def ingest_emails():
             mailbox.process_new_mail()
 
 
-@shared_task(acks_late=True, priority=9)
+@shared_task(acks_late=True)
 def process_mailbox_emails():
     """
     Process new emails for S3 mailboxes.
@@ -6,3 +6,7 @@ class FeatureFlagConfig(AppConfig):
 
     name = 'datahub.feature_flag'
     verbose_name = 'Feature Flag'
+
+    def ready(self):
+        """Registers the signal receivers for this app."""
+        import datahub.feature_flag.signals  # noqa: F401
@@ -0,0 +1,112 @@
+import logging
+from threading import Lock
+from time import monotonic
+
+from django.conf import settings
+from django.core.cache import cache
+
+from datahub.feature_flag.models import FeatureFlag
+
+logger = logging.getLogger(__name__)
+
+GENERATION_CACHE_KEY = 'feature-flag-generation'
+
+
+class FeatureFlagRegistry:
+    """
+    In-process copy of the codes of all active feature flags.
+
+    The flags are loaded from the database in a single query, and reloaded when the generation
+    number in the shared cache changes (which happens whenever a feature flag is saved or
+    deleted in any process – see datahub.feature_flag.signals).
+
+    To avoid a round trip to the shared cache on every check, the generation number is only
+    read if it was last read more than settings.FEATURE_FLAG_GENERATION_CHECK_INTERVAL seconds
+    ago.
+
+    The flags are also reloaded if they were loaded more than
+    settings.FEATURE_FLAG_LOCAL_CACHE_TIMEOUT seconds ago. This bounds how stale they can be if
+    the shared cache can't be reached (or a change to the generation number is lost).
+    """
+
+    def __init__(self):
+        """Initialises the registry."""
+        self._lock = Lock()
+        self._active_codes = None
+        self._generation = None
+        self._loaded_at = None
+        self._generation_checked_at = None
+
+    def is_active(self, code):
+        """Tells if a feature flag is active (returning False if it doesn't exist)."""
+        return code in self._get_active_codes()
+
+    def clear(self):
+        """Discards the loaded flags (so that they are reloaded on next use)."""
+        with self._lock:
+            self._active_codes = None
+
+    def _get_active_codes(self):
+        with self._lock:
+            if self._active_codes is not None and not self._is_generation_check_due():
+                return self._active_codes
+
+        generation = _get_shared_generation()
+
+        with self._lock:
+            if self._active_codes is not None and not self._is_stale(generation):
+                self._generation_checked_at = monotonic()
+                return self._active_codes
+
+        # The generation is read before the flags are loaded so that any change made while they
+        # are being loaded causes them to be reloaded again on next use
+        active_codes = frozenset(
+            FeatureFlag.objects.filter(is_active=True).values_list('code', flat=True),
+        )
+
+        with self._lock:
+            self._active_codes = active_codes
+            self._generation = generation
+            self._loaded_at = monotonic()
+            self._generation_checked_at = self._loaded_at
+
+        return active_codes
+
+    def _is_generation_check_due(self):
+        current_time = monotonic()
+        return (
+            current_time - self._loaded_at >= settings.FEATURE_FLAG_LOCAL_CACHE_TIMEOUT
+            or current_time - self._generation_checked_at
+            >= settings.FEATURE_FLAG_GENERATION_CHECK_INTERVAL
+        )
+
+    def _is_stale(self, generation):
+        if monotonic() - self._loaded_at >= settings.FEATURE_FLAG_LOCAL_CACHE_TIMEOUT:
+            return True
+
+        return generation is not None and generation != self._generation
+
+
+def _get_shared_generation():
+    """
+    Gets the current feature flag generation from the shared cache.
+
+    :returns: the generation, or None if the shared cache is unavailable
+    """
+    try:
+        return cache.get(GENERATION_CACHE_KEY, 0)
+    except Exception:
+        logger.warning('Could not get the feature flag generation from the cache', exc_info=True)
+        return None
+
+
+def bump_generation():
+    """Makes all processes reload feature flags on next use."""
+    try:
+        cache.incr(GENERATION_CACHE_KEY)
+    except ValueError:
+        # The key did not exist
+        cache.set(GENERATION_CACHE_KEY, 1, timeout=None)
+
+
+feature_flag_registry = FeatureFlagRegistry()
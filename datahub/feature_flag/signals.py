@@ -0,0 +1,19 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from datahub.feature_flag.models import FeatureFlag
+from datahub.feature_flag.registry import bump_generation, feature_flag_registry
+
+
+@receiver(post_save, sender=FeatureFlag, dispatch_uid='reload_feature_flags_on_save')
+@receiver(post_delete, sender=FeatureFlag, dispatch_uid='reload_feature_flags_on_delete')
+def reload_feature_flags_on_change(sender, **kwargs):
+    """
+    Make all processes reload feature flags when one is changed.
+
+    The current process reloads them immediately (so that it sees its own changes), and other
+    processes do so once the change has been committed.
+    """
+    feature_flag_registry.clear()
+    transaction.on_commit(bump_generation)
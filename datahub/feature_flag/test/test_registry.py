@@ -0,0 +1,122 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.test.utils import override_settings
+from freezegun import freeze_time
+
+from datahub.feature_flag.registry import (
+    bump_generation,
+    FeatureFlagRegistry,
+    GENERATION_CACHE_KEY,
+)
+from datahub.feature_flag.test.factories import FeatureFlagFactory
+from datahub.feature_flag.utils import is_feature_flag_active
+
+pytestmark = [
+    pytest.mark.django_db,
+    pytest.mark.usefixtures('local_memory_cache'),
+]
+
+
+class TestFeatureFlagRegistry:
+    """Tests for FeatureFlagRegistry."""
+
+    def test_loads_flags_once(self, django_assert_num_queries):
+        """Test that all flags are loaded using a single query and then held in memory."""
+        FeatureFlagFactory(code='active-flag', is_active=True)
+        FeatureFlagFactory(code='inactive-flag', is_active=False)
+        registry = FeatureFlagRegistry()
+
+        with django_assert_num_queries(1):
+            assert registry.is_active('active-flag')
+            assert not registry.is_active('inactive-flag')
+            assert not registry.is_active('non-existent-flag')
+
+    @override_settings(FEATURE_FLAG_GENERATION_CHECK_INTERVAL=2)
+    def test_reloads_flags_when_generation_changes(self):
+        """
+        Test that flags are reloaded when the generation in the shared cache changes (as it
+        would if a flag were changed by another process), once the check interval has passed.
+        """
+        flag = FeatureFlagFactory(code='test-flag', is_active=False)
+        registry = FeatureFlagRegistry()
+
+        with freeze_time('2020-01-01 00:00:00') as frozen_time:
+            assert not registry.is_active('test-flag')
+
+            flag.is_active = True
+            flag.save()
+            assert not registry.is_active('test-flag')
+
+            bump_generation()
+            frozen_time.tick(1)
+            assert not registry.is_active('test-flag')
+
+            frozen_time.tick(1)
+            assert registry.is_active('test-flag')
+
+    @override_settings(FEATURE_FLAG_GENERATION_CHECK_INTERVAL=2)
+    def test_only_checks_generation_after_interval(self, monkeypatch):
+        """Test that the shared cache is not queried on every check."""
+        FeatureFlagFactory(code='test-flag', is_active=True)
+        registry = FeatureFlagRegistry()
+        mock_cache_get = mock.Mock(return_value=0)
+        monkeypatch.setattr('datahub.feature_flag.registry.cache.get', mock_cache_get)
+
+        with freeze_time('2020-01-01 00:00:00') as frozen_time:
+            assert registry.is_active('test-flag')
+            assert mock_cache_get.call_count == 1
+
+            frozen_time.tick(1)
+            assert registry.is_active('test-flag')
+            assert registry.is_active('test-flag')
+            assert mock_cache_get.call_count == 1
+
+            frozen_time.tick(1)
+            assert registry.is_active('test-flag')
+            assert mock_cache_get.call_count == 2
+
+    @override_settings(FEATURE_FLAG_LOCAL_CACHE_TIMEOUT=60)
+    def test_reloads_flags_when_shared_cache_unavailable(self, monkeypatch):
+        """Test that flags are reloaded after the timeout if the shared cache is unavailable."""
+        flag = FeatureFlagFactory(code='test-flag', is_active=False)
+        monkeypatch.setattr(
+            'datahub.feature_flag.registry.cache.get',
+            mock.Mock(side_effect=ConnectionError),
+        )
+        registry = FeatureFlagRegistry()
+
+        with freeze_time('2020-01-01 00:00:00') as frozen_time:
+            assert not registry.is_active('test-flag')
+
+            flag.is_active = True
+            flag.save()
+            frozen_time.tick(59)
+            assert not registry.is_active('test-flag')
+
+            frozen_time.tick(1)
+            assert registry.is_active('test-flag')
+
+
+def test_flag_change_is_visible_to_current_process():
+    """Test that a change to a flag is visible to the process that made it immediately."""
+    flag = FeatureFlagFactory(code='test-flag', is_active=False)
+    assert not is_feature_flag_active('test-flag')
+
+    flag.is_active = True
+    flag.save()
+    assert is_feature_flag_active('test-flag')
+
+    flag.delete()
+    assert not is_feature_flag_active('test-flag')
+
+
+@pytest.mark.django_db(transaction=True)
+def test_flag_change_bumps_generation_on_commit():
+    """Test that the generation in the shared cache is bumped once a flag change is committed."""
+    initial_generation = cache.get(GENERATION_CACHE_KEY, 0)
+
+    FeatureFlagFactory(code='test-flag', is_active=True)
+
+    assert cache.get(GENERATION_CACHE_KEY) == initial_generation + 1
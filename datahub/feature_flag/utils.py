@@ -2,7 +2,7 @@ from functools import wraps
 
 from django.http import Http404
 
-from datahub.feature_flag.models import FeatureFlag
+from datahub.feature_flag.registry import feature_flag_registry
 
 
 def is_feature_flag_active(code):
@@ -10,8 +10,11 @@ def is_feature_flag_active(code):
     Tells if given feature flag is active.
 
     If feature flag doesn't exist, it returns False.
+
+    Flags are looked up in an in-process registry rather than querying the database on
+    every call (see datahub.feature_flag.registry).
     """
-    return FeatureFlag.objects.filter(code=code, is_active=True).exists()
+    return feature_flag_registry.is_active(code)
 
 
 def feature_flagged_view(code):
@@ -56,7 +56,11 @@ def get_interaction_queryset():
 
     queryset = get_base_interaction_queryset()
 
-    return queryset.prefetch_related(
+    return queryset.select_related(
+        'large_capital_opportunity',
+    ).prefetch_related(
+        'companies',
+        'related_trade_agreements',
         Prefetch(
             'export_countries',
             queryset=(
@@ -12,9 +12,11 @@ from reversion.models import Version
 
 from datahub.company.test.factories import AdviserFactory, CompanyFactory, ContactFactory
 from datahub.core.constants import Service
+from datahub.core.query_instrumentation import QueryCounter
 from datahub.core.reversion import EXCLUDED_BASE_MODEL_FIELDS
 from datahub.core.test_utils import (
     APITestMixin,
+    assert_query_budget,
     create_test_user,
     format_date_or_datetime,
     random_obj_for_model,
@@ -23,6 +25,7 @@ from datahub.event.test.factories import EventFactory
 from datahub.interaction.models import CommunicationChannel, Interaction, InteractionPermission
 from datahub.interaction.test.factories import (
     CompanyInteractionFactory,
+    CompanyInteractionFactoryWithRelatedTradeAgreements,
     EventServiceDeliveryFactory,
     InteractionDITParticipantFactory,
 )
@@ -31,6 +34,7 @@ from datahub.interaction.test.permissions import (
 )
 from datahub.interaction.test.utils import random_service
 from datahub.interaction.test.views.utils import resolve_data
+from datahub.investment.opportunity.test.factories import LargeCapitalOpportunityFactory
 from datahub.investment.project.test.factories import InvestmentProjectFactory
 from datahub.metadata.test.factories import TeamFactory
 
@@ -852,6 +856,27 @@ class TestListInteractions(APITestMixin):
         expected_ids = [str(person.pk) for person in contacts]
         assert actual_ids == expected_ids
 
+    def test_number_of_queries_does_not_depend_on_number_of_interactions(self):
+        """Test that related objects are not loaded separately for each interaction."""
+        url = reverse('api-v3:interaction:collection')
+
+        def create_interactions(count):
+            CompanyInteractionFactoryWithRelatedTradeAgreements.create_batch(
+                count,
+                large_capital_opportunity=LargeCapitalOpportunityFactory(),
+            )
+
+        create_interactions(1)
+        with QueryCounter() as query_counter:
+            self.api_client.get(url)
+
+        create_interactions(4)
+        with assert_query_budget(max_queries=query_counter.query_count):
+            response = self.api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()['count'] == 5
+
 
 class TestInteractionVersioning(APITestMixin):
     """
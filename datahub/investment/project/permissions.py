@@ -1,3 +1,4 @@
+from django.db.models import Exists, OuterRef
 from django.db.models.query_utils import Q
 from rest_framework.filters import BaseFilterBackend
 
@@ -172,11 +173,23 @@ class IsAssociatedToInvestmentProjectFilter(BaseFilterBackend):
             full_field_name = f'{field_prefix}{field}__dit_team_id'
             query |= Q(**{full_field_name: value})
 
+        # To-many fields are checked using correlated EXISTS subqueries (rather than joins) so
+        # that projects don't have to be de-duplicated using DISTINCT
         for field, value in to_many_filters:
-            full_field_name = (f'{field_prefix}{field.field_name}__'
-                               f'{field.subfield_name}__dit_team_id')
-            query |= Q(**{full_field_name: value})
-        return queryset.filter(query).distinct()
+            query |= Q(Exists(self._get_to_many_subquery(field, value)))
+
+        return queryset.filter(query)
+
+    def _get_to_many_subquery(self, field, dit_team_id):
+        related_field = InvestmentProject._meta.get_field(field.field_name)
+        outer_ref_field_name = self.model_attribute or 'pk'
+
+        return related_field.related_model.objects.filter(
+            **{
+                related_field.field.name: OuterRef(outer_ref_field_name),
+                f'{field.subfield_name}__dit_team_id': dit_team_id,
+            },
+        )
 
     def _get_filter_field_prefix(self):
         return f'{self.model_attribute}__' if self.model_attribute else ''
@@ -3,6 +3,7 @@ import tempfile
 from celery.task import task
 from django.utils.timezone import now
 
+from datahub.core.replica import use_replica
 from datahub.documents.utils import get_bucket_name, get_s3_client_for_bucket
 from datahub.investment.project.report.models import SPIReport
 from datahub.investment.project.report.spi import write_report
@@ -18,7 +19,8 @@ def _get_report_key():
 def generate_spi_report():
     """Celery task that generates SPI report."""
     with tempfile.TemporaryFile(mode='wb+') as file:
-        write_report(file)
+        with use_replica():
+            write_report(file)
 
         file.seek(0)
 
@@ -1,5 +1,7 @@
+from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
-from django.db.models.signals import m2m_changed, post_save, pre_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from datahub.company.models import Company
@@ -9,8 +11,10 @@ from datahub.investment.project.models import (
     GVAMultiplier,
     InvestmentProject,
     InvestmentProjectCode,
+    InvestmentProjectTeamMember,
 )
 from datahub.investment.project.tasks import update_investment_projects_for_gva_multiplier_task
+from datahub.investment.summary.annual_summaries import invalidate_annual_summaries
 
 
 @receiver(
@@ -119,3 +123,94 @@ def update_country_investment_originates_from(sender, **kwargs):
             investment_project.save(
                 update_fields=('country_investment_originates_from',),
             )
+
+
+# The fields of the advisers whose annual summaries include a project (other than team members)
+PROJECT_ADVISER_FIELDS = (
+    'client_relationship_manager',
+    'project_assurance_adviser',
+    'project_manager',
+)
+
+
+@receiver(
+    pre_save,
+    sender=InvestmentProject,
+    dispatch_uid='record_previous_project_advisers_pre_save',
+)
+def record_previous_project_advisers_pre_save(sender, instance, raw, update_fields, **kwargs):
+    """
+    Records the advisers a project had before it was saved, so that the cached annual summaries
+    of advisers removed from the project can also be invalidated.
+    """
+    instance._previous_adviser_ids = ()
+
+    if not settings.INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT or raw or instance._state.adding:
+        return
+
+    adviser_field_names = {
+        name for field in PROJECT_ADVISER_FIELDS for name in (field, f'{field}_id')
+    }
+    if update_fields is not None and adviser_field_names.isdisjoint(update_fields):
+        return
+
+    previous_adviser_ids = InvestmentProject.objects.filter(
+        pk=instance.pk,
+    ).values_list(
+        *(f'{field}_id' for field in PROJECT_ADVISER_FIELDS),
+    ).first()
+    instance._previous_adviser_ids = previous_adviser_ids or ()
+
+
+@receiver(
+    post_save,
+    sender=InvestmentProject,
+    dispatch_uid='invalidate_annual_summaries_on_project_post_save',
+)
+@receiver(
+    post_delete,
+    sender=InvestmentProject,
+    dispatch_uid='invalidate_annual_summaries_on_project_post_delete',
+)
+def invalidate_annual_summaries_on_project_change(sender, instance, **kwargs):
+    """
+    Invalidates the cached investment project summaries of the advisers involved in a project
+    when it changes (e.g. when its stage or land date changes), including advisers that were
+    removed from one of the project's roles.
+
+    The summaries are invalidated once the transaction has been committed (so that they can't
+    be recalculated and cached using the old data in the meantime).
+    """
+    if not settings.INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT:
+        return
+
+    adviser_ids = [
+        *getattr(instance, '_previous_adviser_ids', ()),
+        *(getattr(instance, f'{field}_id') for field in PROJECT_ADVISER_FIELDS),
+        *InvestmentProjectTeamMember.objects.filter(
+            investment_project_id=instance.pk,
+        ).values_list(
+            'adviser_id',
+            flat=True,
+        ),
+    ]
+    transaction.on_commit(lambda: invalidate_annual_summaries(adviser_ids))
+
+
+@receiver(
+    post_save,
+    sender=InvestmentProjectTeamMember,
+    dispatch_uid='invalidate_annual_summaries_on_team_member_post_save',
+)
+@receiver(
+    post_delete,
+    sender=InvestmentProjectTeamMember,
+    dispatch_uid='invalidate_annual_summaries_on_team_member_post_delete',
+)
+def invalidate_annual_summaries_on_team_member_change(sender, instance, **kwargs):
+    """
+    Invalidates the cached investment project summary of an added or removed team member
+    (once the transaction has been committed).
+    """
+    adviser_id = instance.adviser_id
+    transaction.on_commit(lambda: invalidate_annual_summaries([adviser_id]))
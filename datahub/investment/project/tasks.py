@@ -15,7 +15,6 @@ logger = getLogger(__name__)
 
 @shared_task(
     autoretry_for=(Exception,),
-    queue='long-running',
     max_retries=5,
     retry_backoff=30,
 )
@@ -46,9 +45,7 @@ def _update_investment_projects_for_gva_multiplier(gva_multiplier):
         investment_project.save(update_fields=['gross_value_added'])
 
 
-@shared_task(
-    queue='long-running',
-)
+@shared_task
 def refresh_gross_value_added_value_for_fdi_investment_projects():
     """
     Loops over all investment projects that GVA
@@ -92,9 +89,7 @@ def get_investment_projects_for_country_of_origin_update():
     )
 
 
-@shared_task(
-    queue='long-running',
-)
+@shared_task
 def update_country_of_origin_for_investment_projects():
     """
     Loops over all investment projects that do not have country of origin updated and
@@ -331,6 +331,30 @@ class TestListView(APITestMixin):
 
         assert {result['id'] for result in results} == expected_ids
 
+    def test_restricted_users_see_projects_with_multiple_associations_once(self):
+        """
+        Tests that a project associated with a restricted user's team in multiple ways is
+        only returned once.
+        """
+        team = TeamFactory()
+        advisers = AdviserFactory.create_batch(2, dit_team_id=team.id)
+
+        _, api_client = _create_user_and_api_client(
+            self, team, [InvestmentProjectPermission.view_associated],
+        )
+
+        project = InvestmentProjectFactory(client_relationship_manager=advisers[0])
+        for adviser in advisers:
+            InvestmentProjectTeamMemberFactory(adviser=adviser, investment_project=project)
+
+        url = reverse('api-v3:investment:investment-collection')
+        response = api_client.get(url)
+
+        assert response.status_code == status.HTTP_200_OK
+        response_data = response.json()
+        assert response_data['count'] == 1
+        assert response_data['results'][0]['id'] == str(project.pk)
+
     def test_restricted_user_with_no_team_cannot_see_projects(self):
         """
         Checks that a restricted user that doesn't have a team cannot view any projects (in
@@ -0,0 +1,164 @@
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from datahub.core.constants import InvestmentProjectStage
+from datahub.core.utils import get_financial_year
+from datahub.investment.project.models import InvestmentProject, InvestmentProjectTeamMember
+
+CACHE_KEY_PREFIX = 'investment-project-annual-summaries'
+
+# Stages (other than prospect) counted in the summaries, by label
+SUMMARY_STAGE_LABELS = {
+    InvestmentProjectStage.assign_pm: 'Assign PM',
+    InvestmentProjectStage.active: 'Active',
+    InvestmentProjectStage.verify_win: 'Verify Win',
+    InvestmentProjectStage.won: 'Won',
+}
+
+
+def get_annual_summaries(adviser_id):
+    """
+    Gets the investment project summaries of an adviser for the previous, current and next
+    financial years (most recent first).
+
+    Summaries are cached for settings.INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT seconds (0
+    disables caching), or until invalidate_annual_summaries() is called for the adviser.
+    """
+    current_financial_year = get_financial_year(timezone.now())
+    cache_timeout = settings.INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT
+
+    if not cache_timeout:
+        return _calculate_annual_summaries(adviser_id, current_financial_year)
+
+    cache_key = _get_cache_key(adviser_id, current_financial_year)
+    summaries = cache.get(cache_key)
+
+    if summaries is None:
+        summaries = _calculate_annual_summaries(adviser_id, current_financial_year)
+        cache.set(cache_key, summaries, cache_timeout)
+
+    return summaries
+
+
+def invalidate_annual_summaries(adviser_ids):
+    """Discards the cached investment project summaries of the specified advisers."""
+    if not settings.INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT:
+        return
+
+    current_financial_year = get_financial_year(timezone.now())
+    cache.delete_many(
+        [
+            _get_cache_key(adviser_id, current_financial_year)
+            for adviser_id in adviser_ids
+            if adviser_id is not None
+        ],
+    )
+
+
+def get_adviser_project_ids_query(adviser_id):
+    """
+    Gets a query for the IDs of the investment projects an adviser is involved in (as client
+    relationship manager, project assurance adviser, project manager or team member).
+
+    This is a UNION of a query for each role (rather than an OR across several joins), so
+    that each part can use the index on the relevant column and projects are not duplicated.
+    """
+    project_ids_by_role = [
+        InvestmentProject.objects.filter(**{field_name: adviser_id}).values('pk')
+        for field_name in (
+            'client_relationship_manager_id',
+            'project_assurance_adviser_id',
+            'project_manager_id',
+        )
+    ]
+    team_member_project_ids = InvestmentProjectTeamMember.objects.filter(
+        adviser_id=adviser_id,
+    ).values(
+        'investment_project_id',
+    )
+
+    return project_ids_by_role[0].union(*project_ids_by_role[1:], team_member_project_ids)
+
+
+def _calculate_annual_summaries(adviser_id, current_financial_year):
+    """
+    Calculates the summaries for all financial years in a single query (using conditional
+    aggregation).
+
+    Prospects are counted (cumulatively) by the financial year they were created in. Projects
+    at other stages are counted by the financial year of their land date (the actual land date
+    if set, otherwise the estimated land date).
+    """
+    financial_years = range(current_financial_year + 1, current_financial_year - 2, -1)
+    aggregates = {}
+
+    for financial_year in financial_years:
+        start = date(year=financial_year, month=4, day=1)
+        next_start = date(year=financial_year + 1, month=4, day=1)
+
+        aggregates[_get_aggregate_name(financial_year, InvestmentProjectStage.prospect)] = Count(
+            'pk',
+            filter=Q(
+                stage_id=InvestmentProjectStage.prospect.value.id,
+                created_on__lt=datetime(
+                    year=financial_year + 1,
+                    month=4,
+                    day=1,
+                    tzinfo=timezone.utc,
+                ),
+            ),
+        )
+
+        lands_in_financial_year = Q(
+            actual_land_date__gte=start,
+            actual_land_date__lt=next_start,
+        ) | Q(
+            actual_land_date__isnull=True,
+            estimated_land_date__gte=start,
+            estimated_land_date__lt=next_start,
+        )
+        for stage in SUMMARY_STAGE_LABELS:
+            aggregates[_get_aggregate_name(financial_year, stage)] = Count(
+                'pk',
+                filter=Q(stage_id=stage.value.id) & lands_in_financial_year,
+            )
+
+    counts = InvestmentProject.objects.filter(
+        pk__in=get_adviser_project_ids_query(adviser_id),
+    ).aggregate(
+        **aggregates,
+    )
+
+    return [_format_annual_summary(financial_year, counts) for financial_year in financial_years]
+
+
+def _format_annual_summary(financial_year, counts):
+    stage_labels = {InvestmentProjectStage.prospect: 'Prospect', **SUMMARY_STAGE_LABELS}
+
+    return {
+        'financial_year': {
+            'label': f'{financial_year}-{str(financial_year + 1)[-2:]}',
+            'start': date(year=financial_year, month=4, day=1),
+            'end': date(year=financial_year + 1, month=3, day=31),
+        },
+        'totals': {
+            stage.name: {
+                'label': label,
+                'id': stage.value.id,
+                'value': counts[_get_aggregate_name(financial_year, stage)],
+            }
+            for stage, label in stage_labels.items()
+        },
+    }
+
+
+def _get_aggregate_name(financial_year, stage):
+    return f'{stage.name}_{financial_year}'
+
+
+def _get_cache_key(adviser_id, financial_year):
+    return f'{CACHE_KEY_PREFIX}:{adviser_id}:{financial_year}'
@@ -0,0 +1,133 @@
+from datetime import date
+
+import pytest
+
+from datahub.company.test.factories import AdviserFactory
+from datahub.core.constants import InvestmentProjectStage
+from datahub.investment.project.test.factories import (
+    InvestmentProjectFactory,
+    InvestmentProjectTeamMemberFactory,
+)
+from datahub.investment.summary.annual_summaries import get_annual_summaries
+
+
+@pytest.fixture
+def adviser():
+    """An adviser for testing."""
+    return AdviserFactory()
+
+
+@pytest.fixture
+def summary_cache(settings, local_memory_cache):
+    """Enables caching of investment project summaries."""
+    settings.INVESTMENT_PROJECT_SUMMARY_CACHE_TIMEOUT = 60
+
+
+def _get_active_count(adviser):
+    current_summary = get_annual_summaries(adviser.pk)[1]
+    return current_summary['totals']['active']['value']
+
+
+@pytest.mark.django_db
+class TestGetAnnualSummaries:
+    """Tests for get_annual_summaries()."""
+
+    def test_uses_single_query(self, adviser, django_assert_num_queries):
+        """Test that the summaries for all years and stages are calculated in one query."""
+        InvestmentProjectFactory(
+            stage_id=InvestmentProjectStage.prospect.value.id,
+            client_relationship_manager=adviser,
+        )
+        InvestmentProjectFactory(
+            stage_id=InvestmentProjectStage.active.value.id,
+            project_manager=adviser,
+            estimated_land_date=date.today(),
+        )
+
+        with django_assert_num_queries(1):
+            summaries = get_annual_summaries(adviser.pk)
+
+        assert len(summaries) == 3
+        assert summaries[1]['totals']['active']['value'] == 1
+
+    @pytest.mark.usefixtures('summary_cache')
+    def test_caches_summaries(self, adviser, django_assert_num_queries):
+        """Test that summaries are cached."""
+        expected_summaries = get_annual_summaries(adviser.pk)
+
+        with django_assert_num_queries(0):
+            assert get_annual_summaries(adviser.pk) == expected_summaries
+
+    @pytest.mark.usefixtures('summary_cache', 'synchronous_on_commit')
+    def test_invalidated_on_project_stage_change(self, adviser):
+        """Test that cached summaries are invalidated when a project's stage changes."""
+        project = InvestmentProjectFactory(
+            stage_id=InvestmentProjectStage.assign_pm.value.id,
+            client_relationship_manager=adviser,
+            estimated_land_date=date.today(),
+        )
+        assert _get_active_count(adviser) == 0
+
+        project.stage_id = InvestmentProjectStage.active.value.id
+        project.save()
+
+        assert _get_active_count(adviser) == 1
+
+    @pytest.mark.parametrize(
+        'field',
+        ('client_relationship_manager', 'project_assurance_adviser', 'project_manager'),
+    )
+    @pytest.mark.usefixtures('summary_cache', 'synchronous_on_commit')
+    def test_invalidated_on_adviser_change(self, adviser, field):
+        """
+        Test that the cached summaries of both the previous and the new adviser are
+        invalidated when a project's adviser changes.
+        """
+        new_adviser = AdviserFactory()
+        project = InvestmentProjectFactory(
+            stage_id=InvestmentProjectStage.active.value.id,
+            estimated_land_date=date.today(),
+            **{field: adviser},
+        )
+        assert _get_active_count(adviser) == 1
+        assert _get_active_count(new_adviser) == 0
+
+        setattr(project, field, new_adviser)
+        project.save()
+
+        assert _get_active_count(adviser) == 0
+        assert _get_active_count(new_adviser) == 1
+
+    @pytest.mark.usefixtures('summary_cache')
+    def test_not_invalidated_before_commit(self, adviser):
+        """Test that cached summaries are only invalidated once the transaction is committed."""
+        project = InvestmentProjectFactory(
+            stage_id=InvestmentProjectStage.assign_pm.value.id,
+            client_relationship_manager=adviser,
+            estimated_land_date=date.today(),
+        )
+        assert _get_active_count(adviser) == 0
+
+        project.stage_id = InvestmentProjectStage.active.value.id
+        project.save()
+
+        # The test transaction is never committed, so the cached summary is still used
+        assert _get_active_count(adviser) == 0
+
+    @pytest.mark.usefixtures('summary_cache', 'synchronous_on_commit')
+    def test_invalidated_on_team_change(self, adviser):
+        """Test that cached summaries are invalidated when an adviser joins or leaves a team."""
+        project = InvestmentProjectFactory(
+            stage_id=InvestmentProjectStage.active.value.id,
+            estimated_land_date=date.today(),
+        )
+        assert _get_active_count(adviser) == 0
+
+        team_member = InvestmentProjectTeamMemberFactory(
+            investment_project=project,
+            adviser=adviser,
+        )
+        assert _get_active_count(adviser) == 1
+
+        team_member.delete()
+        assert _get_active_count(adviser) == 0
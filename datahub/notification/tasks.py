@@ -7,7 +7,6 @@ from datahub.notification.core import notify_gateway
 @shared_task(
     bind=True,
     acks_late=True,
-    priority=9,
     max_retries=5,
 )
 def send_email_notification(
@@ -5,3 +5,7 @@ class CoreConfig(AppConfig):
     """Django App Config for the OAuth Core app."""
 
     name = 'datahub.oauth'
+
+    def ready(self):
+        """Registers the signal receivers for this app."""
+        import datahub.oauth.signals  # noqa: F401
@@ -7,7 +7,12 @@ from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import AuthenticationFailed
 
 from datahub.company.models import Advisor
-from datahub.oauth.cache import add_token_data_to_cache, get_token_data_from_cache
+from datahub.oauth.cache import (
+    add_adviser_to_local_cache,
+    add_token_data_to_cache,
+    get_adviser_from_local_cache,
+    get_token_data_from_cache,
+)
 from datahub.oauth.sso_api_client import (
     introspect_token,
     SSOInvalidTokenError,
@@ -113,15 +118,23 @@ def _look_up_adviser(cached_token_data):
     """
     Look up the adviser using data about an access token.
 
-    The adviser is looked up using its SSO email user ID.
+    The adviser is looked up using its SSO email user ID. Advisers are briefly cached in the
+    current process to avoid a database query on every request.
     """
     sso_email_user_id = cached_token_data['sso_email_user_id']
+    adviser = get_adviser_from_local_cache(sso_email_user_id)
+
+    if adviser:
+        return adviser
 
     try:
-        return _get_adviser(sso_email_user_id=sso_email_user_id)
+        adviser = _get_adviser(sso_email_user_id=sso_email_user_id)
     except Advisor.DoesNotExist:
         return None
 
+    add_adviser_to_local_cache(adviser)
+    return adviser
+
 
 def _calculate_expiry(timestamp):
     expires_in = timestamp - time.time()
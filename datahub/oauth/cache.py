@@ -1,22 +1,111 @@
+import time
+from copy import copy
+
+from django.conf import settings
 from django.core.cache import cache
 
+from datahub.core.cache import LocalLRUCache
+
+# Per-process caches that sit in front of the shared cache (for token data) and the
+# database (for advisers).
+#
+# Entries are only kept for STAFF_SSO_LOCAL_CACHE_TIMEOUT seconds (or until the token
+# expires, if sooner), which bounds how stale they can be in processes that did not
+# observe a change.
+local_token_cache = LocalLRUCache(
+    'oauth.local-token-cache',
+    settings.STAFF_SSO_LOCAL_CACHE_MAX_SIZE,
+)
+local_adviser_cache = LocalLRUCache(
+    'oauth.local-adviser-cache',
+    settings.STAFF_SSO_LOCAL_CACHE_MAX_SIZE,
+)
+
 
 def add_token_data_to_cache(token, email, sso_email_user_id, timeout):
-    """Add data about an access token to the cache."""
+    """
+    Add data about an access token to the cache.
+
+    The time the token expires at is also stored in the shared cache, so that other processes
+    don't cache the token locally for longer than it's valid for.
+    """
     cache_key = _cache_key(token)
     data = {
         'email': email,
         'sso_email_user_id': sso_email_user_id,
     }
+    expires_at = time.time() + timeout if timeout is not None else None
 
-    cache.set(cache_key, data, timeout=timeout)
+    cache.set(cache_key, {**data, 'expires_at': expires_at}, timeout=timeout)
+    local_token_cache.set(cache_key, data, _get_local_timeout(timeout))
     return data
 
 
 def get_token_data_from_cache(token):
-    """Retrieve data about an access token from the cache."""
+    """
+    Retrieve data about an access token from the cache.
+
+    The local (in-process) cache is checked first, falling back to the shared cache.
+    """
     cache_key = _cache_key(token)
-    return cache.get(cache_key)
+    data = local_token_cache.get(cache_key)
+
+    if data is None:
+        shared_data = cache.get(cache_key)
+
+        if shared_data is not None:
+            data = {key: value for key, value in shared_data.items() if key != 'expires_at'}
+            local_timeout = _get_local_timeout(_get_remaining_timeout(shared_data))
+            local_token_cache.set(cache_key, data, local_timeout)
+
+    return data
+
+
+def get_adviser_from_local_cache(sso_email_user_id):
+    """
+    Retrieve an adviser from the local (in-process) cache.
+
+    A copy is returned so that changes made to the returned object (such as cached
+    permissions) are not shared between requests.
+    """
+    adviser = local_adviser_cache.get(sso_email_user_id)
+    return copy(adviser) if adviser else None
+
+
+def add_adviser_to_local_cache(adviser):
+    """Add an adviser to the local (in-process) cache."""
+    local_adviser_cache.set(
+        adviser.sso_email_user_id,
+        copy(adviser),
+        settings.STAFF_SSO_LOCAL_CACHE_TIMEOUT,
+    )
+
+
+def remove_adviser_from_local_cache(adviser_id):
+    """Remove an adviser from the local (in-process) cache (regardless of its SSO ID)."""
+    local_adviser_cache.delete_matching(lambda cached_adviser: cached_adviser.pk == adviser_id)
+
+
+def clear_local_caches():
+    """Remove all entries from the local (in-process) caches."""
+    local_token_cache.clear()
+    local_adviser_cache.clear()
+
+
+def _get_remaining_timeout(shared_data):
+    # Entries written before expiry times were stored don't have one
+    expires_at = shared_data.get('expires_at')
+    if expires_at is None:
+        return None
+
+    return expires_at - time.time()
+
+
+def _get_local_timeout(timeout):
+    if timeout is None:
+        return settings.STAFF_SSO_LOCAL_CACHE_TIMEOUT
+
+    return min(timeout, settings.STAFF_SSO_LOCAL_CACHE_TIMEOUT)
 
 
 def _cache_key(token):
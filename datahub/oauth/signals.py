@@ -0,0 +1,24 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from datahub.company.models import Advisor
+from datahub.metadata.models import Team
+from datahub.oauth.cache import local_adviser_cache, remove_adviser_from_local_cache
+
+
+@receiver(post_save, sender=Advisor, dispatch_uid='remove_saved_adviser_from_local_cache')
+@receiver(post_delete, sender=Advisor, dispatch_uid='remove_deleted_adviser_from_local_cache')
+def remove_adviser_from_local_cache_on_change(sender, instance, **kwargs):
+    """Stop using a locally cached copy of an adviser once it has been changed or deleted."""
+    remove_adviser_from_local_cache(instance.pk)
+
+
+@receiver(post_save, sender=Team, dispatch_uid='clear_local_adviser_cache_on_team_save')
+def clear_local_adviser_cache_on_team_save(sender, instance, **kwargs):
+    """
+    Clear locally cached advisers when a team is changed.
+
+    Cached advisers hold a copy of their team (which determines their team role and hence
+    some of their permissions).
+    """
+    local_adviser_cache.clear()
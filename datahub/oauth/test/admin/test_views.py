@@ -124,6 +124,7 @@ class TestAddAccessTokenAdminView(AdminTestMixin):
             assert cache.get(f'access_token:{token}') == {
                 'email': adviser.email,
                 'sso_email_user_id': sso_email_user_id,
+                'expires_at': expected_expiry_time.timestamp(),
             }
 
         with freeze_time(expected_expiry_time):
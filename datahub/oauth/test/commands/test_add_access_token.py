@@ -55,6 +55,7 @@ class TestAddAccessTokenCommand:
             assert cache.get(f'access_token:{token}') == {
                 'email': adviser.email,
                 'sso_email_user_id': sso_email_user_id,
+                'expires_at': expected_expiry_time.timestamp(),
             }
 
         with freeze_time(expected_expiry_time):
@@ -78,4 +79,5 @@ class TestAddAccessTokenCommand:
             assert cache.get(f'access_token:{token}') == {
                 'email': adviser.email,
                 'sso_email_user_id': sso_email_user_id,
+                'expires_at': (frozen_time + timedelta(hours=10)).timestamp(),
             }
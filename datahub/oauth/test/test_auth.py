@@ -185,13 +185,15 @@ class TestSSOIntrospectionAuthentication:
         response = view(request)
         assert response.status_code == status.HTTP_200_OK
 
+        caching_period = settings.STAFF_SSO_USER_TOKEN_CACHING_PERIOD
+
         # Check that the returned token data is cached
         assert cache.get('access_token:token') == {
             'email': introspection_data['username'],
             'sso_email_user_id': introspection_data['email_user_id'],
+            'expires_at': FROZEN_DATETIME.timestamp() + caching_period,
         }
 
-        caching_period = settings.STAFF_SSO_USER_TOKEN_CACHING_PERIOD
         post_expiry_time = FROZEN_DATETIME + timedelta(seconds=caching_period)
 
         # Check that the cached token data expires after the caching period
@@ -225,3 +227,54 @@ class TestSSOIntrospectionAuthentication:
         assert not request.user
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
         assert response.data == {'detail': 'Invalid authentication credentials.'}
+
+    def test_caches_adviser_locally(
+        self,
+        api_request_factory,
+        requests_mock,
+        django_assert_num_queries,
+    ):
+        """
+        Test that once a token and its adviser have been looked up, subsequent requests
+        are authenticated using the local caches (without any queries).
+        """
+        adviser = AdviserFactory(sso_email_user_id=EXAMPLE_SSO_EMAIL_USER_ID)
+        requests_mock.post(STAFF_SSO_INTROSPECT_URL, json=_make_introspection_data())
+
+        request = api_request_factory.get('/test-path', HTTP_AUTHORIZATION='Bearer token')
+        response = view(request)
+        assert response.status_code == status.HTTP_200_OK
+
+        # Remove the token from the shared cache to check that the local cache is used
+        cache.clear()
+
+        with django_assert_num_queries(0):
+            request = api_request_factory.get('/test-path', HTTP_AUTHORIZATION='Bearer token')
+            response = view(request)
+
+        assert response.status_code == status.HTTP_200_OK
+        assert request.user == adviser
+        assert requests_mock.call_count == 1
+
+    def test_locally_cached_adviser_is_invalidated_on_save(
+        self,
+        api_request_factory,
+        requests_mock,
+    ):
+        """Test that changes to an adviser are seen immediately by the current process."""
+        adviser = AdviserFactory(sso_email_user_id=EXAMPLE_SSO_EMAIL_USER_ID)
+        requests_mock.post(STAFF_SSO_INTROSPECT_URL, json=_make_introspection_data())
+
+        request = api_request_factory.get('/test-path', HTTP_AUTHORIZATION='Bearer token')
+        response = view(request)
+        assert response.status_code == status.HTTP_200_OK
+
+        adviser.is_active = False
+        adviser.save()
+
+        request = api_request_factory.get('/test-path', HTTP_AUTHORIZATION='Bearer token')
+        response = view(request)
+
+        assert not request.user
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+        assert response.data == {'detail': 'Invalid authentication credentials.'}
@@ -1,11 +1,16 @@
 from datetime import timedelta
 
 import pytest
+from django.conf import settings
 from django.core.cache import cache
 from django.utils.timezone import now
 from freezegun import freeze_time
 
-from datahub.oauth.cache import add_token_data_to_cache, get_token_data_from_cache
+from datahub.oauth.cache import (
+    add_token_data_to_cache,
+    clear_local_caches,
+    get_token_data_from_cache,
+)
 
 
 @pytest.mark.usefixtures('local_memory_cache')
@@ -43,7 +48,10 @@ class TestAddTokenDataToCache:
             add_token_data_to_cache(token, email, sso_email_user_id, 10)
 
         cache_key = 'access_token:test-token'
-        assert cache.get(cache_key) == expected_data
+        assert cache.get(cache_key) == {
+            **expected_data,
+            'expires_at': frozen_time.timestamp() + 10,
+        }
 
         # The data should expire after 10 seconds
         with freeze_time(frozen_time + timedelta(seconds=10)):
@@ -71,3 +79,60 @@ class TestGetTokenDataFromCache:
         """None should be returned when there is no cached data for the token."""
         token = 'test-token'
         assert get_token_data_from_cache(token) is None
+
+    def test_retrieves_locally_cached_data(self):
+        """Data added in this process should be returned even if the shared cache is cleared."""
+        token = 'test-token'
+        data = add_token_data_to_cache(token, 'email@datahub.test', 'id@datahub.test', 100)
+        cache.clear()
+
+        assert get_token_data_from_cache(token) == data
+
+    def test_locally_cached_data_expires(self):
+        """Locally cached data should expire after the local caching period."""
+        token = 'test-token'
+        frozen_time = now()
+        local_timeout = settings.STAFF_SSO_LOCAL_CACHE_TIMEOUT
+
+        with freeze_time(frozen_time):
+            add_token_data_to_cache(token, 'email@datahub.test', 'id@datahub.test', None)
+
+        cache.clear()
+
+        with freeze_time(frozen_time + timedelta(seconds=local_timeout - 1)):
+            assert get_token_data_from_cache(token)
+
+        with freeze_time(frozen_time + timedelta(seconds=local_timeout)):
+            assert get_token_data_from_cache(token) is None
+
+    def test_locally_cached_data_from_shared_cache_expires_with_token(self):
+        """
+        Data copied from the shared cache to the local cache should not be cached locally for
+        longer than the token has left before it expires.
+        """
+        token = 'test-token'
+        frozen_time = now()
+        token_timeout = settings.STAFF_SSO_LOCAL_CACHE_TIMEOUT * 2
+        remaining_timeout = 5
+
+        with freeze_time(frozen_time):
+            add_token_data_to_cache(token, 'email@datahub.test', 'id@datahub.test', token_timeout)
+
+        # Simulate another process, which only has access to the shared cache
+        clear_local_caches()
+        fetch_time = frozen_time + timedelta(seconds=token_timeout - remaining_timeout)
+
+        with freeze_time(fetch_time):
+            assert get_token_data_from_cache(token) == {
+                'email': 'email@datahub.test',
+                'sso_email_user_id': 'id@datahub.test',
+            }
+
+        # Simulate the token being evicted from the shared cache
+        cache.clear()
+
+        with freeze_time(fetch_time + timedelta(seconds=remaining_timeout - 1)):
+            assert get_token_data_from_cache(token)
+
+        with freeze_time(fetch_time + timedelta(seconds=remaining_timeout)):
+            assert get_token_data_from_cache(token) is None
@@ -0,0 +1,14 @@
+from django.contrib.admin import site
+from django.urls import path
+
+from datahub.search.admin.views import slow_query_log_view
+
+app_name = 'admin_search'
+
+urlpatterns = [
+    path(
+        'admin/search/slow-queries/',
+        site.admin_view(slow_query_log_view),
+        name='slow-query-log',
+    ),
+]
@@ -0,0 +1,18 @@
+from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
+from django.views.decorators.http import require_GET
+
+from datahub.search.profiling import get_slow_query_log
+
+
+@require_GET
+def slow_query_log_view(request):
+    """
+    View that returns the search slow query log (slowest first) as JSON.
+
+    Requires superuser access.
+    """
+    if not request.user.is_superuser:
+        raise PermissionDenied()
+
+    return JsonResponse({'results': get_slow_query_log()})
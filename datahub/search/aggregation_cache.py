@@ -0,0 +1,184 @@
+import json
+from hashlib import blake2b
+from logging import getLogger
+
+from django.conf import settings
+from django.core.cache import cache
+from elasticsearch_dsl.response import Response
+
+from datahub.search.elasticsearch import get_client
+from datahub.search.execute_query import execute_search_query
+
+logger = getLogger(__name__)
+
+GENERATION_CACHE_KEY_PREFIX = 'search-aggregation-generation'
+AGGREGATIONS_CACHE_KEY_PREFIX = 'search-aggregations'
+ROLLUP_CACHE_KEY_PREFIX = 'search-aggregation-rollup'
+ROLLUP_REGISTRY_CACHE_KEY = 'search-aggregation-rollup-registry'
+# Rollups expire if they stop being refreshed (e.g. if the Celery beat task is disabled)
+ROLLUP_CACHE_TIMEOUT = 60 * 60  # seconds
+ROLLUP_REGISTRY_CACHE_TIMEOUT = 24 * 60 * 60  # seconds
+
+# Parts of a query that affect the results of aggregations (pagination, sorting and source
+# filtering do not)
+_AGGREGATION_QUERY_KEYS = ('query', 'post_filter', 'aggs')
+
+
+def get_aggregation_generation(search_app_name):
+    """
+    Gets the current aggregation cache generation for a search app.
+
+    The generation is incremented whenever documents for the search app are written to or
+    deleted from Elasticsearch, and is part of the cache key of cached aggregations (so that
+    bumping it invalidates them).
+    """
+    return cache.get(f'{GENERATION_CACHE_KEY_PREFIX}:{search_app_name}', 0)
+
+
+def bump_aggregation_generation(search_app_name):
+    """Invalidates all cached aggregations for a search app."""
+    key = f'{GENERATION_CACHE_KEY_PREFIX}:{search_app_name}'
+
+    try:
+        cache.incr(key)
+    except ValueError:
+        # The key did not exist
+        cache.set(key, 1, timeout=None)
+
+
+def get_aggregation_query_body(query):
+    """Gets the parts of a query that affect the results of its aggregations."""
+    query_dict = query.to_dict()
+    return {key: query_dict[key] for key in _AGGREGATION_QUERY_KEYS if key in query_dict}
+
+
+def get_aggregation_cache_key(query):
+    """
+    Gets a cache key for the aggregations of a query.
+
+    This is based on the index aliases searched, the filters applied and the aggregations
+    requested (normalised by sorting keys).
+    """
+    data = json.dumps(
+        {
+            'indices': sorted(query._index or ()),
+            'body': get_aggregation_query_body(query),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return blake2b(data.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def execute_search_query_with_cached_aggregations(
+    query,
+    search_app_name,
+    endpoint,
+    indices,
+    use_rollup=False,
+):
+    """
+    Executes an Elasticsearch query, using cached results for its aggregations if possible.
+
+    If the aggregations are cached, the query is executed without them (which is much cheaper
+    for Elasticsearch) and the cached aggregations are added to the response. Otherwise, the
+    query is executed as normal and the aggregations in the response are cached for
+    settings.SEARCH_AGGREGATION_CACHE_TIMEOUT seconds (or until the search app's aggregation
+    generation is bumped).
+
+    Note that as Elasticsearch refreshes indices periodically, a query executed just after
+    documents were synced may not reflect those changes. Aggregations cached at that moment
+    will be stale until they time out.
+
+    If use_rollup is True and rollups are enabled, the aggregations are instead served from a
+    rollup, which is refreshed periodically by the refresh_search_aggregation_rollups task
+    rather than being invalidated when documents change. This should only be used for
+    queries that are not filtered by the user (as there are a limited number of those).
+
+    indices should be the names of the indices (or aliases) that the query searches.
+    """
+    if not query.aggs.aggs or not settings.SEARCH_AGGREGATION_CACHE_TIMEOUT:
+        return execute_search_query(
+            query,
+            search_app_name=search_app_name,
+            endpoint=endpoint,
+            indices=indices,
+        )
+
+    aggregation_cache_key = get_aggregation_cache_key(query)
+    use_rollup = use_rollup and settings.SEARCH_AGGREGATION_ROLLUPS_ENABLED
+
+    if use_rollup:
+        cache_key = f'{ROLLUP_CACHE_KEY_PREFIX}:{aggregation_cache_key}'
+        cache_timeout = ROLLUP_CACHE_TIMEOUT
+    else:
+        generation = get_aggregation_generation(search_app_name)
+        cache_key = (
+            f'{AGGREGATIONS_CACHE_KEY_PREFIX}:{search_app_name}:{generation}:'
+            f'{aggregation_cache_key}'
+        )
+        cache_timeout = settings.SEARCH_AGGREGATION_CACHE_TIMEOUT
+
+    cached_aggregations = cache.get(cache_key)
+
+    if cached_aggregations is not None:
+        response = execute_search_query(
+            _remove_aggregations(query),
+            search_app_name=search_app_name,
+            endpoint=endpoint,
+            indices=indices,
+        )
+        return Response(query, {**response.to_dict(), 'aggregations': cached_aggregations})
+
+    response = execute_search_query(
+        query,
+        search_app_name=search_app_name,
+        endpoint=endpoint,
+        indices=indices,
+    )
+    cache.set(cache_key, response.to_dict().get('aggregations', {}), cache_timeout)
+
+    if use_rollup:
+        _register_rollup(aggregation_cache_key, query, indices)
+
+    return response
+
+
+def refresh_aggregation_rollups():
+    """
+    Refreshes all registered aggregation rollups.
+
+    Only the aggregations of each registered query are requested from Elasticsearch (no
+    hits are fetched).
+    """
+    registry = cache.get(ROLLUP_REGISTRY_CACHE_KEY, {})
+    client = get_client()
+
+    for aggregation_cache_key, rollup in registry.items():
+        response = client.search(
+            index=rollup['indices'],
+            body={**rollup['body'], 'size': 0},
+            request_timeout=settings.ES_SEARCH_REQUEST_TIMEOUT,
+        )
+        cache.set(
+            f'{ROLLUP_CACHE_KEY_PREFIX}:{aggregation_cache_key}',
+            response.get('aggregations', {}),
+            ROLLUP_CACHE_TIMEOUT,
+        )
+
+    logger.info(f'{len(registry)} search aggregation rollups refreshed')
+
+
+def _register_rollup(aggregation_cache_key, query, indices):
+    registry = cache.get(ROLLUP_REGISTRY_CACHE_KEY, {})
+    registry[aggregation_cache_key] = {
+        'indices': list(query._index or ()),
+        'body': get_aggregation_query_body(query),
+    }
+    cache.set(ROLLUP_REGISTRY_CACHE_KEY, registry, ROLLUP_REGISTRY_CACHE_TIMEOUT)
+
+
+def _remove_aggregations(query):
+    query_without_aggregations = query._clone()
+    query_without_aggregations.aggs._params = {'aggs': {}}
+    return query_without_aggregations
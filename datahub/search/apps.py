@@ -17,6 +17,9 @@ class SearchApp:
     bulk_batch_size = 2000
 
     queryset = None
+    # Optional SQLDocumentBuilder subclass. If set, documents are built in the database
+    # (rather than from model instances) when the app is synced in full
+    sql_document_builder = None
     exclude_from_global_search = False
     # A sequence of permissions. The user must have one of these permissions to perform searches.
     view_permissions = None
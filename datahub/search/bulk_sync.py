@@ -1,16 +1,40 @@
+from collections import namedtuple
 from logging import getLogger
 
+from django.conf import settings
+
 from datahub.core.utils import slice_iterable_into_chunks
+from datahub.search.aggregation_cache import bump_aggregation_generation
+from datahub.search.document_hashes import (
+    exclude_unchanged_documents,
+    get_document_hashes,
+    save_document_hashes,
+)
 from datahub.search.elasticsearch import bulk
 
 logger = getLogger(__name__)
 
+# Numbers of documents written to and skipped (as they were unchanged) by a sync
+SyncResult = namedtuple('SyncResult', ('written', 'skipped'))
+
 PROGRESS_INTERVAL = 20000
 BULK_INDEX_TIMEOUT_SECS = 300
 
 
-def sync_app(search_app, batch_size=None, post_batch_callback=None):
-    """Syncs objects for an app to ElasticSearch in batches of batch_size."""
+def sync_app(search_app, batch_size=None, post_batch_callback=None, force=False):
+    """
+    Syncs objects for an app to ElasticSearch in batches of batch_size.
+
+    If force is True, all documents are written (even if they are unchanged according to
+    their stored hashes). This can be used to repair documents that no longer match their
+    stored hashes (e.g. after an index has been restored from a snapshot).
+
+    If the search app has a SQL document builder, documents are built in the database and
+    streamed using a server-side cursor. Otherwise, model instances are loaded and converted to
+    documents in batches.
+
+    :returns: SyncResult with the total numbers of documents written and skipped
+    """
     model_name = search_app.es_model.__name__
     batch_size = batch_size or search_app.bulk_batch_size
     logger.info(f'Processing {model_name} records, using batch size {batch_size}')
@@ -19,19 +43,43 @@ def sync_app(search_app, batch_size=None, post_batch_callback=None):
 
     num_source_rows_processed = 0
     num_objects_synced = 0
+    num_objects_skipped = 0
     total_rows = search_app.queryset.count()
-    it = search_app.queryset.values_list('pk', flat=True).iterator(chunk_size=batch_size)
-    batches = slice_iterable_into_chunks(it, batch_size)
-    for batch in batches:
-        objs = search_app.queryset.filter(pk__in=batch)
+    sql_document_builder = search_app.sql_document_builder
 
-        num_actions = sync_objects(
-            search_app.es_model,
-            objs,
-            read_indices,
+    if sql_document_builder:
+        it = sql_document_builder.iter_es_documents(
+            search_app.queryset,
             write_index,
-            post_batch_callback=post_batch_callback,
+            chunk_size=batch_size,
         )
+    else:
+        it = search_app.queryset.values_list('pk', flat=True).iterator(chunk_size=batch_size)
+
+    batches = slice_iterable_into_chunks(it, batch_size)
+    for batch in batches:
+        if sql_document_builder:
+            result = sync_documents(
+                search_app.es_model,
+                batch,
+                read_indices,
+                write_index,
+                post_batch_callback=post_batch_callback,
+                force=force,
+            )
+        else:
+            objs = search_app.queryset.filter(pk__in=batch)
+
+            result = sync_objects(
+                search_app.es_model,
+                objs,
+                read_indices,
+                write_index,
+                post_batch_callback=post_batch_callback,
+                force=force,
+            )
+
+        num_actions = result.written + result.skipped
 
         emit_progress = (
             (num_source_rows_processed + num_actions) // PROGRESS_INTERVAL
@@ -41,6 +89,7 @@ def sync_app(search_app, batch_size=None, post_batch_callback=None):
 
         num_source_rows_processed += len(batch)
         num_objects_synced += num_actions
+        num_objects_skipped += result.skipped
 
         if emit_progress:
             logger.info(
@@ -55,20 +104,85 @@ def sync_app(search_app, batch_size=None, post_batch_callback=None):
             f'syncing model {model_name}',
         )
 
+    num_objects_written = num_objects_synced - num_objects_skipped
+    logger.info(
+        f'{model_name} documents written: {num_objects_written}, skipped as unchanged: '
+        f'{num_objects_skipped}',
+    )
+    return SyncResult(num_objects_written, num_objects_skipped)
+
+
+def sync_objects(
+    es_model,
+    model_objects,
+    read_indices,
+    write_index,
+    post_batch_callback=None,
+    force=False,
+):
+    """
+    Syncs an iterable of model instances to Elasticsearch.
 
-def sync_objects(es_model, model_objects, read_indices, write_index, post_batch_callback=None):
-    """Syncs an iterable of model instances to Elasticsearch."""
+    See sync_documents() for the meaning of force.
+
+    :returns: SyncResult with the numbers of documents written and skipped
+    """
     actions = list(
         es_model.db_objects_to_es_documents(model_objects, index=write_index),
     )
-    num_actions = len(actions)
-    bulk(
-        actions=actions,
-        chunk_size=num_actions,
-        request_timeout=BULK_INDEX_TIMEOUT_SECS,
+    return sync_documents(
+        es_model,
+        actions,
+        read_indices,
+        write_index,
+        post_batch_callback=post_batch_callback,
+        force=force,
     )
 
-    if post_batch_callback:
+
+def sync_documents(
+    es_model,
+    actions,
+    read_indices,
+    write_index,
+    post_batch_callback=None,
+    force=False,
+):
+    """
+    Syncs a list of Elasticsearch index actions to Elasticsearch.
+
+    If settings.SEARCH_SKIP_UNCHANGED_DOCUMENTS is True, documents that haven't changed since
+    they were last written (to the same index) are skipped, unless force is True (in which
+    case all documents are written, and their hashes are still saved).
+
+    If any documents are written, cached aggregations for the search app are invalidated.
+
+    :returns: SyncResult with the numbers of documents written and skipped
+    """
+    num_actions = len(actions)
+    document_hashes = None
+
+    if settings.SEARCH_SKIP_UNCHANGED_DOCUMENTS:
+        if force:
+            document_hashes = get_document_hashes(actions)
+        else:
+            actions, document_hashes = exclude_unchanged_documents(
+                es_model.get_app_name(),
+                actions,
+            )
+
+    if actions:
+        bulk(
+            actions=actions,
+            chunk_size=len(actions),
+            request_timeout=BULK_INDEX_TIMEOUT_SECS,
+        )
+        bump_aggregation_generation(es_model.get_app_name())
+
+    if document_hashes:
+        save_document_hashes(es_model.get_app_name(), document_hashes)
+
+    if post_batch_callback and actions:
         post_batch_callback(read_indices, write_index, actions)
 
-    return num_actions
+    return SyncResult(len(actions), num_actions - len(actions))
@@ -2,6 +2,7 @@ from functools import partial
 
 from elasticsearch_dsl import Boolean, Date, Keyword, Object, Text
 
+from datahub.company.hierarchy import OneListGroupResolver
 from datahub.company.models import CompanyExportCountry
 from datahub.search import dict_utils, fields
 from datahub.search.models import BaseESModel
@@ -114,3 +115,15 @@ class Company(BaseESModel):
         'registered_address.postcode.trigram',
         'registered_address.area.name.trigram',
     )
+
+    @classmethod
+    def db_objects_to_es_documents(cls, db_objects, index=None):
+        """
+        Converts DB model objects to Elasticsearch documents.
+
+        The One List groups of the companies are resolved for the whole batch up front (rather
+        than separately for each company).
+        """
+        db_objects = list(db_objects)
+        OneListGroupResolver().prime(db_objects)
+        return super().db_objects_to_es_documents(db_objects, index=index)
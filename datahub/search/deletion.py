@@ -1,11 +1,14 @@
 from collections import defaultdict
 from contextlib import contextmanager
 
+from django.conf import settings
 from django.db import transaction
 from django.db.models.signals import post_delete, pre_delete
 
 from datahub.core.exceptions import DataHubError
+from datahub.search.aggregation_cache import bump_aggregation_generation
 from datahub.search.apps import get_search_app_by_model, get_search_apps
+from datahub.search.document_hashes import delete_document_hashes
 from datahub.search.elasticsearch import bulk, get_client
 from datahub.search.signals import SignalReceiver
 
@@ -121,6 +124,10 @@ class Collector:
         for model, es_docs in self.deletions.items():
             search_app = get_search_app_by_model(model)
             delete_documents(search_app.es_model.get_write_alias(), es_docs)
+            bump_aggregation_generation(search_app.name)
+
+            if settings.SEARCH_SKIP_UNCHANGED_DOCUMENTS:
+                delete_document_hashes(search_app.name, [es_doc['_id'] for es_doc in es_docs])
 
     def delete_from_es(self):
         """Deletes all the deleted django models from ES."""
@@ -167,3 +174,8 @@ def delete_document(model, document_id, indices=None, ignore_404_responses=True)
             id=document_id,
             ignore=ignored_response_statuses,
         )
+
+    bump_aggregation_generation(model.get_app_name())
+
+    if settings.SEARCH_SKIP_UNCHANGED_DOCUMENTS:
+        delete_document_hashes(model.get_app_name(), [document_id])
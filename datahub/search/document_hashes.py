@@ -0,0 +1,91 @@
+import json
+from hashlib import blake2b
+
+from django.db import connection
+from elasticsearch.serializer import JSONSerializer
+
+from datahub.search.models import SearchDocumentHash
+
+_serializer = JSONSerializer()
+
+
+def get_document_hash(action):
+    """
+    Gets a hash of an Elasticsearch index action (covering the index and document source).
+
+    The source can be either a dict or a JSON string (as produced by SQL document builders).
+    Both are serialised in the same canonical form, so that the same document has the same
+    hash whichever way it was built.
+    """
+    source = action['_source']
+    if isinstance(source, str):
+        source = json.loads(source)
+
+    canonical_source = json.dumps(source, sort_keys=True, default=_serializer.default)
+    data = f'{action["_index"]}\n{canonical_source}'.encode('utf-8')
+    return blake2b(data, digest_size=16).hexdigest()
+
+
+def get_document_hashes(actions):
+    """Gets the hashes of the documents of index actions as a dict of object ID to hash."""
+    return {str(action['_id']): get_document_hash(action) for action in actions}
+
+
+def exclude_unchanged_documents(search_app_name, actions):
+    """
+    Filters out index actions for documents that are unchanged since they were last written.
+
+    :returns: tuple of (actions for changed documents, dict of object ID to hash for those
+        documents)
+    """
+    hashes_by_object_id = get_document_hashes(actions)
+    stored_hashes_by_object_id = dict(
+        SearchDocumentHash.objects.filter(
+            search_app=search_app_name,
+            object_id__in=hashes_by_object_id.keys(),
+        ).values_list(
+            'object_id',
+            'document_hash',
+        ),
+    )
+
+    changed_hashes_by_object_id = {
+        object_id: document_hash
+        for object_id, document_hash in hashes_by_object_id.items()
+        if stored_hashes_by_object_id.get(object_id) != document_hash
+    }
+    changed_actions = [
+        action for action in actions if str(action['_id']) in changed_hashes_by_object_id
+    ]
+    return changed_actions, changed_hashes_by_object_id
+
+
+def save_document_hashes(search_app_name, hashes_by_object_id):
+    """Creates or updates the stored hashes of documents (using a single query)."""
+    if not hashes_by_object_id:
+        return
+
+    table_name = SearchDocumentHash._meta.db_table
+    values_sql = ', '.join(['(%s, %s, %s)'] * len(hashes_by_object_id))
+    params = [
+        param
+        for object_id, document_hash in hashes_by_object_id.items()
+        for param in (search_app_name, object_id, document_hash)
+    ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO "{table_name}" (search_app, object_id, document_hash) '
+            f'VALUES {values_sql} '
+            f'ON CONFLICT (search_app, object_id) '
+            f'DO UPDATE SET document_hash = EXCLUDED.document_hash',
+            params,
+        )
+
+
+def delete_document_hashes(search_app_name, object_ids):
+    """Deletes the stored hashes of documents (so that they are written on the next sync)."""
+    SearchDocumentHash.objects.filter(
+        search_app=search_app_name,
+        object_id__in=[str(object_id) for object_id in object_ids],
+    ).delete()
@@ -1,4 +1,5 @@
 from logging import getLogger
+from time import perf_counter
 from urllib.parse import urlparse
 
 from django.conf import settings
@@ -6,16 +7,23 @@ from elasticsearch.exceptions import ConnectionError
 
 from datahub.core.exceptions import APIBadGatewayException
 from datahub.core.utils import log_to_sentry
+from datahub.search.profiling import record_search_query
 
 logger = getLogger(__name__)
 
 
-def execute_search_query(query):
+def execute_search_query(query, search_app_name=None, endpoint=None, indices=()):
     """
     Executes an Elasticsearch query using the globally configured request timeout.
 
     (A warning is also logged if the query takes longer than a set threshold.)
+
+    If search_app_name and endpoint are provided, profiling information is also recorded
+    for the query (see datahub.search.profiling). indices should then be the names of the
+    indices (or aliases) that the query searches.
     """
+    start_time = perf_counter()
+
     try:
         response = query.params(request_timeout=settings.ES_SEARCH_REQUEST_TIMEOUT).execute()
     except ConnectionError:
@@ -23,6 +31,18 @@ def execute_search_query(query):
             f'Upstream service unavailable: {urlparse(settings.ES_URL).netloc}',
         )
 
+    round_trip_time = (perf_counter() - start_time) * 1000
+
+    if search_app_name and endpoint:
+        record_search_query(
+            query,
+            response,
+            round_trip_time,
+            search_app_name,
+            endpoint,
+            indices,
+        )
+
     if response.took >= settings.ES_SEARCH_REQUEST_WARNING_THRESHOLD * 1000:
         logger.warning(f'Elasticsearch query took a long time ({response.took / 1000:.2f}s)')
 
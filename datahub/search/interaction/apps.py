@@ -8,6 +8,7 @@ from datahub.interaction.models import (
 )
 from datahub.search.apps import SearchApp
 from datahub.search.interaction.models import Interaction
+from datahub.search.interaction.sql_documents import InteractionSQLDocumentBuilder
 
 
 class InteractionSearchApp(SearchApp):
@@ -17,6 +18,7 @@ class InteractionSearchApp(SearchApp):
     es_model = Interaction
     view_permissions = (f'interaction.{InteractionPermission.view_all}',)
     export_permission = f'interaction.{InteractionPermission.export}'
+    sql_document_builder = InteractionSQLDocumentBuilder
     queryset = DBInteraction.objects.select_related(
         'company',
         'company__sector',
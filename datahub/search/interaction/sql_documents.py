@@ -0,0 +1,129 @@
+from django.db.models import BooleanField, Case, Value, When
+from django.db.models.fields.json import JSONField
+
+from datahub.core.query_utils import get_bracketed_concat_expression
+from datahub.interaction.models import (
+    Interaction as DBInteraction,
+    InteractionDITParticipant,
+    InteractionExportCountry,
+)
+from datahub.metadata.models import Sector, Service
+from datahub.search.interaction.models import Interaction
+from datahub.search.sql_documents import (
+    id_name_object_expression,
+    m2m_object_array_expression,
+    mptt_name_expression,
+    nullable_object_expression,
+    person_object_expression,
+    related_object_array_expression,
+    sector_object_expression,
+    SQLDocumentBuilder,
+)
+
+
+class InteractionSQLDocumentBuilder(SQLDocumentBuilder):
+    """Builds interaction search documents in the database."""
+
+    es_model = Interaction
+
+    @classmethod
+    def get_document_fields(cls):
+        """Returns the field names and expressions used to build interaction documents."""
+        return {
+            'id': 'id',
+            'company': nullable_object_expression(
+                'company',
+                id='company__id',
+                name='company__name',
+                trading_names='company__trading_names',
+            ),
+            'companies': m2m_object_array_expression(
+                DBInteraction.companies.field,
+                ordering=('name',),
+                id='id',
+                name='name',
+                trading_names='trading_names',
+            ),
+            'company_sector': sector_object_expression(Sector, 'company__sector'),
+            'company_one_list_group_tier': Case(
+                When(company__isnull=True, then=None),
+                When(
+                    company__global_headquarters__isnull=False,
+                    then=id_name_object_expression(
+                        'company__global_headquarters__one_list_tier',
+                    ),
+                ),
+                default=id_name_object_expression('company__one_list_tier'),
+                output_field=JSONField(),
+            ),
+            'communication_channel': id_name_object_expression('communication_channel'),
+            'contacts': m2m_object_array_expression(
+                DBInteraction.contacts.field,
+                ordering=('last_name', 'first_name'),
+                id='id',
+                first_name='first_name',
+                last_name='last_name',
+                name=get_bracketed_concat_expression(
+                    'contact__first_name',
+                    'contact__last_name',
+                ),
+            ),
+            'created_on': 'created_on',
+            'date': 'date',
+            'dit_participants': related_object_array_expression(
+                InteractionDITParticipant,
+                'interaction',
+                ordering=('id',),
+                adviser=person_object_expression('adviser'),
+                team=id_name_object_expression('team'),
+            ),
+            'event': id_name_object_expression('event'),
+            'export_countries': related_object_array_expression(
+                InteractionExportCountry,
+                'interaction',
+                ordering=('country__name',),
+                country=id_name_object_expression('country'),
+                status='status',
+            ),
+            'grant_amount_offered': 'grant_amount_offered',
+            'investment_project': id_name_object_expression('investment_project'),
+            'investment_project_sector': sector_object_expression(
+                Sector,
+                'investment_project__sector',
+            ),
+            'is_event': Case(
+                When(
+                    kind=DBInteraction.Kind.SERVICE_DELIVERY,
+                    event__isnull=False,
+                    then=Value(True),
+                ),
+                When(kind=DBInteraction.Kind.SERVICE_DELIVERY, then=Value(False)),
+                default=None,
+                output_field=BooleanField(),
+            ),
+            'kind': 'kind',
+            'modified_on': 'modified_on',
+            'net_company_receipt': 'net_company_receipt',
+            'notes': 'notes',
+            'policy_areas': m2m_object_array_expression(
+                DBInteraction.policy_areas.field,
+                ordering=('order',),
+                id='id',
+                name='name',
+            ),
+            'policy_issue_types': m2m_object_array_expression(
+                DBInteraction.policy_issue_types.field,
+                ordering=('order',),
+                id='id',
+                name='name',
+            ),
+            'service': nullable_object_expression(
+                'service',
+                id='service__id',
+                name=mptt_name_expression(Service, 'service'),
+            ),
+            'service_delivery_status': id_name_object_expression('service_delivery_status'),
+            'subject': 'subject',
+            'was_policy_feedback_provided': 'was_policy_feedback_provided',
+            'were_countries_discussed': 'were_countries_discussed',
+        }
@@ -0,0 +1,61 @@
+import pytest
+
+from datahub.company.models import OneListTier
+from datahub.company.test.factories import CompanyFactory, SubsidiaryFactory
+from datahub.core.test_utils import random_obj_for_model
+from datahub.interaction.test.factories import (
+    CompaniesInteractionFactory,
+    CompanyInteractionFactory,
+    CompanyInteractionFactoryWithPolicyFeedback,
+    EventServiceDeliveryFactory,
+    ExportCountriesInteractionFactory,
+    InvestmentProjectInteractionFactory,
+    ServiceDeliveryFactory,
+)
+from datahub.search.interaction import InteractionSearchApp
+from datahub.search.test.utils import get_sql_document_differences
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.mark.parametrize(
+    'factory_cls,factory_kwargs',
+    (
+        (CompanyInteractionFactory, {}),
+        (CompanyInteractionFactory, {'company': None, 'dit_participants': []}),
+        (
+            CompanyInteractionFactory,
+            {
+                'company': lambda: CompanyFactory(
+                    one_list_tier=random_obj_for_model(OneListTier),
+                ),
+            },
+        ),
+        (
+            CompanyInteractionFactory,
+            {
+                'company': lambda: SubsidiaryFactory(
+                    global_headquarters__one_list_tier=random_obj_for_model(OneListTier),
+                ),
+            },
+        ),
+        (CompaniesInteractionFactory, {}),
+        (CompanyInteractionFactoryWithPolicyFeedback, {}),
+        (ExportCountriesInteractionFactory, {}),
+        (InvestmentProjectInteractionFactory, {}),
+        (ServiceDeliveryFactory, {}),
+        (EventServiceDeliveryFactory, {}),
+    ),
+)
+def test_sql_documents_match_db_object_to_dict(factory_cls, factory_kwargs):
+    """
+    Test that documents built by InteractionSQLDocumentBuilder match those built by
+    Interaction.db_object_to_dict().
+    """
+    resolved_factory_kwargs = {
+        key: value() if callable(value) else value
+        for key, value in factory_kwargs.items()
+    }
+    interaction = factory_cls(**resolved_factory_kwargs)
+
+    assert get_sql_document_differences(InteractionSearchApp, pks=[interaction.pk]) == {}
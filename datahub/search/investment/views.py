@@ -142,11 +142,21 @@ class SearchInvestmentProjectAPIViewMixin:
         ])
         return Bool(must=[financial_year_start_filter, land_date_filter])
 
+    def is_filtered(self, validated_data):
+        """Also take into account the financial year filters applied by get_extra_filters()."""
+        return bool(
+            super().is_filtered(validated_data)
+            or validated_data.get('financial_year_start')
+            or validated_data.get('land_date_financial_year_start'),
+        )
+
 
 @register_v3_view()
 class SearchInvestmentProjectAPIView(SearchInvestmentProjectAPIViewMixin, SearchAPIView):
     """Filtered investment project search view."""
 
+    cache_aggregations = True
+
     def get_base_query(self, request, validated_data):
         """Add aggregations to show the number of projects at each stage."""
         base_query = super().get_base_query(request, validated_data)
@@ -27,6 +27,13 @@ class Command(BaseCommand):
             help='If specified, the command runs in the foreground without needing Celery '
                  'running. (By default, it runs asynchronously using Celery.)',
         )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='If specified, all documents are written, even if they are unchanged since '
+                 'they were last synced. This can be used to repair indices whose documents '
+                 'no longer match their stored hashes (e.g. after a snapshot restore).',
+        )
 
     def handle(self, *args, **options):
         """Handle."""
@@ -42,10 +49,11 @@ class Command(BaseCommand):
 
         for app in apps:
             task_args = (app.name,)
+            task_kwargs = {'force': options['force']}
 
             if options['foreground']:
-                sync_model.apply(args=task_args, throw=True)
+                sync_model.apply(args=task_args, kwargs=task_kwargs, throw=True)
             else:
-                sync_model.apply_async(args=task_args)
+                sync_model.apply_async(args=task_args, kwargs=task_kwargs)
 
         logger.info('Elasticsearch sync complete!')
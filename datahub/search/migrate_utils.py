@@ -25,7 +25,12 @@ def resync_after_migrate(search_app):
         )
         return
 
-    sync_app(search_app, post_batch_callback=delete_from_secondary_indices_callback)
+    # Stored document hashes are ignored, so that every document is written to the new index
+    sync_app(
+        search_app,
+        post_batch_callback=delete_from_secondary_indices_callback,
+        force=True,
+    )
     _clean_up_aliases_and_indices(search_app)
 
 
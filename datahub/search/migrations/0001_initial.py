@@ -0,0 +1,27 @@
+# Generated by Django 3.2.7 on 2026-10-19 10:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocumentHash',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('search_app', models.CharField(max_length=255)),
+                ('object_id', models.CharField(max_length=255)),
+                ('document_hash', models.CharField(max_length=255)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='searchdocumenthash',
+            constraint=models.UniqueConstraint(fields=('search_app', 'object_id'), name='search_document_hash_unique_app_object'),
+        ),
+    ]
@@ -1,7 +1,9 @@
+from functools import lru_cache
 from hashlib import blake2b
 from logging import getLogger
 
 from django.conf import settings
+from django.db import models
 from elasticsearch_dsl import Document, Keyword, MetaField
 
 from datahub.core.exceptions import DataHubError
@@ -17,6 +19,36 @@ from datahub.search.utils import get_model_non_mapped_field_names, serialise_map
 
 logger = getLogger(__name__)
 
+MAX_LENGTH = settings.CHAR_FIELD_MAX_LENGTH
+
+
+class SearchDocumentHash(models.Model):
+    """
+    A hash of the last version of a document written to Elasticsearch for an object.
+
+    This is used to avoid rewriting documents that haven't changed.
+
+    The hash covers the name of the index the document was written to, so that documents are
+    always written when a new index is created during a mapping migration.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    search_app = models.CharField(max_length=MAX_LENGTH)
+    object_id = models.CharField(max_length=MAX_LENGTH)
+    document_hash = models.CharField(max_length=MAX_LENGTH)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['search_app', 'object_id'],
+                name='search_document_hash_unique_app_object',
+            ),
+        ]
+
+    def __str__(self):
+        """Human-readable representation."""
+        return f'{self.search_app}: {self.object_id}'
+
 
 class BaseESModel(Document):
     """Helps convert Django models to dictionaries."""
@@ -123,6 +155,10 @@ class BaseESModel(Document):
     def set_up_index_and_aliases(cls):
         """Creates the index and aliases for this model if they don't already exist."""
         if not alias_exists(cls.get_write_alias()):
+            if settings.SEARCH_SKIP_UNCHANGED_DOCUMENTS:
+                # Any stored hashes are for documents in an index that no longer exists
+                SearchDocumentHash.objects.filter(search_app=cls.get_app_name()).delete()
+
             index_name = cls.get_target_index_name()
             alias_names = (cls.get_write_alias(), cls.get_read_alias())
             create_index(index_name, cls._doc_type.mapping, alias_names=alias_names)
@@ -160,19 +196,7 @@ class BaseESModel(Document):
     @classmethod
     def db_object_to_dict(cls, db_object):
         """Converts a DB model object to a dictionary suitable for Elasticsearch."""
-        mapped_values = (
-            (col, fn, getattr(db_object, col)) for col, fn in cls.MAPPINGS.items()
-        )
-        fields = get_model_non_mapped_field_names(cls)
-
-        result = {
-            **{col: fn(val) if val is not None else None for col, fn, val in mapped_values},
-            **{col: fn(db_object) for col, fn in cls.COMPUTED_MAPPINGS.items()},
-            **{field: getattr(db_object, field) for field in fields},
-            '_document_type': cls.get_app_name(),
-        }
-
-        return result
+        return get_document_serialiser(cls)(db_object)
 
     @classmethod
     def db_objects_to_es_documents(cls, db_objects, index=None):
@@ -181,6 +205,38 @@ class BaseESModel(Document):
             yield cls.es_document(db_object, index=index)
 
 
+@lru_cache(maxsize=None)
+def get_document_serialiser(es_model):
+    """
+    Builds a function that converts a DB model object to a dictionary for a search model.
+
+    The field names, mapping functions and app name are looked up once (per search model)
+    rather than for every object serialised.
+    """
+    mappings = tuple(es_model.MAPPINGS.items())
+    computed_mappings = tuple(es_model.COMPUTED_MAPPINGS.items())
+    field_names = tuple(get_model_non_mapped_field_names(es_model))
+    app_name = es_model.get_app_name()
+
+    def db_object_to_dict(db_object):
+        result = {}
+
+        for field_name, fn in mappings:
+            value = getattr(db_object, field_name)
+            result[field_name] = fn(value) if value is not None else None
+
+        for field_name, fn in computed_mappings:
+            result[field_name] = fn(db_object)
+
+        for field_name in field_names:
+            result[field_name] = getattr(db_object, field_name)
+
+        result['_document_type'] = app_name
+        return result
+
+    return db_object_to_dict
+
+
 def _get_write_index(indices):
     if len(indices) != 1:
         raise DataHubError(
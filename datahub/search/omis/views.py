@@ -74,6 +74,7 @@ class SearchOrderAPIViewMixin:
 class SearchOrderAPIView(SearchOrderAPIViewMixin, SearchAPIView):
     """Filtered order search view."""
 
+    cache_aggregations = True
     subtotal_cost_field = 'subtotal_cost'
 
     def get_base_query(self, request, validated_data):
@@ -0,0 +1,206 @@
+import json
+from hashlib import blake2b
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.timezone import now
+
+from datahub.core import statsd
+
+SLOW_QUERY_LOG_CACHE_KEY = 'search-slow-query-log'
+SLOW_QUERY_LOG_CACHE_TIMEOUT = 24 * 60 * 60  # seconds
+FINGERPRINT_PLACEHOLDER = '?'
+
+
+def get_query_fingerprint(query_dict):
+    """
+    Gets a fingerprint for an Elasticsearch query that ignores the values being searched for.
+
+    Leaf values (search terms, IDs, dates, offsets etc.) are replaced with placeholders and the
+    order of clauses is normalised, so that queries that use the same combination of filters
+    (and hence take a similar shape) have the same fingerprint.
+    """
+    return _get_fingerprint_of_shape(get_query_shape(query_dict))
+
+
+def _get_fingerprint_of_shape(query_shape):
+    data = json.dumps(query_shape, sort_keys=True).encode('utf-8')
+    return blake2b(data, digest_size=8).hexdigest()
+
+
+def _normalise_query_value(value):
+    if isinstance(value, dict):
+        return {key: _normalise_query_value(item) for key, item in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        normalised_items = {
+            json.dumps(_normalise_query_value(item), sort_keys=True) for item in value
+        }
+        return [json.loads(item) for item in sorted(normalised_items)]
+
+    return FINGERPRINT_PLACEHOLDER
+
+
+def get_query_shape(query_dict):
+    """
+    Gets the shape of an Elasticsearch query (the query with its leaf values replaced with
+    placeholders and its clauses in a normalised order).
+
+    This is what get_query_fingerprint() is derived from.
+    """
+    return _normalise_query_value(query_dict)
+
+
+def record_search_query(query, response, round_trip_time, search_app_name, endpoint, indices):
+    """
+    Records profiling information for a search query that has been executed.
+
+    This:
+    - emits StatsD metrics for the query (broken down by search app and endpoint)
+    - adds the query to the slow query log (if it was slow enough)
+
+    Only the fingerprint and shape of the query are logged (and not the query itself), so that
+    search terms are not retained in the slow query log.
+
+    :param query: the elasticsearch_dsl Search object that was executed
+    :param response: the response from Elasticsearch
+    :param round_trip_time: the time taken to execute the query, including network and
+        (de)serialisation overhead (in milliseconds)
+    :param search_app_name: the name of the search app being searched (or 'global' for
+        global search)
+    :param endpoint: the name of the view that executed the query
+    :param indices: the names of the indices (or aliases) that were searched
+    """
+    query_dict = query.to_dict()
+    query_shape = get_query_shape(query_dict)
+    hit_count = response.hits.total.value
+    aggregation_count = len(query_dict.get('aggs', {}))
+    stat_prefix = f'search.query.{search_app_name}.{endpoint}'
+
+    with statsd.statsd().pipeline() as pipeline:
+        pipeline.incr(f'{stat_prefix}.count')
+        pipeline.timing(f'{stat_prefix}.took', response.took)
+        pipeline.timing(f'{stat_prefix}.round_trip', round_trip_time)
+        pipeline.gauge(f'{stat_prefix}.hits', hit_count)
+        pipeline.gauge(f'{stat_prefix}.aggregations', aggregation_count)
+
+    if response.took < settings.SEARCH_SLOW_QUERY_LOG_THRESHOLD:
+        return
+
+    entry = {
+        'id': str(uuid4()),
+        'timestamp': now().isoformat(),
+        'search_app': search_app_name,
+        'endpoint': endpoint,
+        'fingerprint': _get_fingerprint_of_shape(query_shape),
+        'took': response.took,
+        'round_trip_time': round_trip_time,
+        'hits': hit_count,
+        'aggregations': aggregation_count,
+        'timed_out': response.timed_out,
+        'indices': list(indices),
+        'query_shape': query_shape,
+        'profile': None,
+    }
+    is_logged = add_to_slow_query_log(entry)
+
+    if is_logged and settings.SEARCH_PROFILE_SLOW_QUERIES:
+        # Imported here to avoid a circular import
+        from datahub.search.tasks import profile_slow_search_query
+
+        # The query is passed to the task (rather than being read from the log) as only its
+        # shape is logged
+        profile_slow_search_query.apply_async(args=(entry['id'], entry['indices'], query_dict))
+
+
+def get_slow_query_log():
+    """Gets the logged slow queries, slowest first."""
+    return cache.get(SLOW_QUERY_LOG_CACHE_KEY, [])
+
+
+def add_to_slow_query_log(entry):
+    """
+    Adds a query to the slow query log, if it's one of the slowest
+    SEARCH_SLOW_QUERY_LOG_SIZE queries logged.
+
+    The log is stored in the cache (so that it is shared between processes) and expires a day
+    after the last query was added to it. Concurrent updates may occasionally overwrite each
+    other, which is acceptable for diagnostic data.
+
+    :returns: whether the query was added to the log
+    """
+    entries = get_slow_query_log()
+    max_size = settings.SEARCH_SLOW_QUERY_LOG_SIZE
+
+    if len(entries) >= max_size and entries[-1]['took'] >= entry['took']:
+        return False
+
+    entries = sorted([*entries, entry], key=lambda item: item['took'], reverse=True)
+    cache.set(SLOW_QUERY_LOG_CACHE_KEY, entries[:max_size], SLOW_QUERY_LOG_CACHE_TIMEOUT)
+    return True
+
+
+def update_slow_query_log_entry(entry_id, **values):
+    """
+    Updates a logged slow query.
+
+    Nothing happens if the query is no longer in the log.
+    """
+    entries = get_slow_query_log()
+
+    for entry in entries:
+        if entry['id'] == entry_id:
+            entry.update(values)
+            cache.set(SLOW_QUERY_LOG_CACHE_KEY, entries, SLOW_QUERY_LOG_CACHE_TIMEOUT)
+            return
+
+
+def clear_slow_query_log():
+    """Removes all queries from the slow query log."""
+    cache.delete(SLOW_QUERY_LOG_CACHE_KEY)
+
+
+def summarise_profile(profile):
+    """
+    Summarises the output of the Elasticsearch profile API for the slow query log.
+
+    Only the top two levels of the query tree of each shard (and the top level of each
+    aggregation) are kept, as the full output is very large.
+
+    The descriptions of query nodes are not kept, as they contain the values searched for.
+    (The descriptions of aggregation nodes are the names of the aggregations, so they are.)
+    """
+    return [
+        {
+            'shard': shard['id'],
+            'queries': [
+                _summarise_profile_node(query, depth=2, include_description=False)
+                for search in shard.get('searches', [])
+                for query in search.get('query', [])
+            ],
+            'aggregations': [
+                _summarise_profile_node(aggregation, depth=1, include_description=True)
+                for aggregation in shard.get('aggregations', [])
+            ],
+        }
+        for shard in profile.get('shards', [])
+    ]
+
+
+def _summarise_profile_node(node, depth, include_description):
+    summary = {
+        'type': node['type'],
+        'time_in_nanos': node['time_in_nanos'],
+    }
+
+    if include_description:
+        summary['description'] = node['description']
+
+    if depth > 1 and node.get('children'):
+        summary['children'] = [
+            _summarise_profile_node(child, depth - 1, include_description)
+            for child in node['children']
+        ]
+
+    return summary
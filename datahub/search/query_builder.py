@@ -24,6 +24,11 @@ class MatchNone(Query):
     name = 'match_none'
 
 
+def get_basic_search_indices():
+    """Gets the names of the aliases searched by get_basic_search_query()."""
+    return [app.es_model.get_read_alias() for app in get_global_search_apps_as_mapping().values()]
+
+
 def get_basic_search_query(
         entity,
         term,
@@ -44,7 +49,7 @@ def get_basic_search_query(
     limit = _clip_limit(offset, limit)
 
     search_apps = tuple(get_global_search_apps_as_mapping().values())
-    indices = [app.es_model.get_read_alias() for app in search_apps]
+    indices = get_basic_search_indices()
     fields = set(chain.from_iterable(app.es_model.SEARCH_FIELDS for app in search_apps))
 
     # Sort the fields so that this function is deterministic
@@ -0,0 +1,249 @@
+from django.contrib.postgres.aggregates import JSONBAgg, StringAgg
+from django.db.models import Case, Func, OuterRef, Subquery, TextField, Value, When
+from django.db.models.fields.json import JSONField
+from django.db.models.functions import Cast, Coalesce
+
+from datahub.core.query_utils import (
+    get_aggregate_subquery,
+    get_bracketed_concat_expression,
+    JSONBBuildObject,
+)
+
+# PostgreSQL functions accept at most 100 arguments, so large documents are built from
+# multiple jsonb_build_object() calls concatenated together
+MAX_KEYS_PER_JSONB_BUILD_OBJECT = 50
+
+
+class JSONBConcat(Func):
+    """Concatenates (merges) JSONB objects."""
+
+    template = '%(expressions)s'
+    arg_joiner = ' || '
+    output_field = JSONField()
+
+
+class SQLDocumentBuilder:
+    """
+    Builds search documents as JSON in the database, as an alternative to loading model
+    instances and converting them using BaseESModel.db_object_to_dict().
+
+    This is opt-in, and enabled for a search app by setting SearchApp.sql_document_builder to a
+    subclass of this class.
+
+    Subclasses must set es_model and implement get_document_fields(). The documents they
+    produce must be equivalent to those produced by es_model.db_object_to_dict() (this is
+    checked by the tests for each search app that uses a SQL document builder).
+    """
+
+    es_model = None
+
+    @classmethod
+    def get_document_fields(cls):
+        """
+        Returns a dict of field names and expressions (relative to the search app's model) used
+        to build documents.
+        """
+        raise NotImplementedError()
+
+    @classmethod
+    def get_document_expression(cls):
+        """Gets an expression that builds a complete document as a JSONB object."""
+        fields = {
+            **cls.get_document_fields(),
+            '_document_type': Value(cls.es_model.get_app_name()),
+        }
+        items = list(fields.items())
+        build_object_expressions = [
+            JSONBBuildObject(**dict(items[index:index + MAX_KEYS_PER_JSONB_BUILD_OBJECT]))
+            for index in range(0, len(items), MAX_KEYS_PER_JSONB_BUILD_OBJECT)
+        ]
+
+        if len(build_object_expressions) == 1:
+            return build_object_expressions[0]
+
+        return JSONBConcat(*build_object_expressions)
+
+    @classmethod
+    def get_document_queryset(cls, queryset):
+        """
+        Returns a query set of (primary key, JSON document) tuples.
+
+        The document is returned as a JSON string (rather than being decoded) so that it can be
+        passed to Elasticsearch as is.
+        """
+        return queryset.select_related(None).prefetch_related(None).annotate(
+            _document=Cast(cls.get_document_expression(), TextField()),
+        ).values_list('pk', '_document')
+
+    @classmethod
+    def iter_es_documents(cls, queryset, index, chunk_size):
+        """
+        Streams Elasticsearch index actions for the objects in a query set (using a server-side
+        cursor).
+        """
+        document_queryset = cls.get_document_queryset(queryset)
+
+        for pk, document in document_queryset.iterator(chunk_size=chunk_size):
+            yield {
+                '_index': index,
+                '_id': pk,
+                '_source': document,
+            }
+
+
+def nullable_object_expression(field_name, **expressions):
+    """
+    Gets an expression for a JSON object for a to-one relation, which is NULL if the relation is
+    NULL.
+
+    Usage example:
+        nullable_object_expression('company', id='company__id', name='company__name')
+    """
+    return Case(
+        When(
+            **{f'{field_name}__isnull': False},
+            then=JSONBBuildObject(**expressions),
+        ),
+        default=None,
+        output_field=JSONField(),
+    )
+
+
+def id_name_object_expression(field_name):
+    """
+    Gets an expression for a JSON object with id and name keys for a to-one relation.
+
+    Equivalent to dict_utils.id_name_dict().
+    """
+    return nullable_object_expression(
+        field_name,
+        id=f'{field_name}__id',
+        name=f'{field_name}__name',
+    )
+
+
+def person_object_expression(field_name):
+    """
+    Gets an expression for a JSON object for a contact or adviser.
+
+    Equivalent to dict_utils.contact_or_adviser_dict().
+    """
+    return nullable_object_expression(
+        field_name,
+        id=f'{field_name}__id',
+        first_name=f'{field_name}__first_name',
+        last_name=f'{field_name}__last_name',
+        name=get_bracketed_concat_expression(
+            f'{field_name}__first_name',
+            f'{field_name}__last_name',
+        ),
+    )
+
+
+def mptt_name_expression(model, field_name):
+    """
+    Gets an expression for the name of an object in an MPTT tree (such as a sector or service)
+    in the form of a path.
+
+    Equivalent to the name property of objects using _MPTTObjectName.
+    """
+    queryset = model.objects.filter(
+        tree_id=OuterRef(f'{field_name}__tree_id'),
+        lft__lte=OuterRef(f'{field_name}__lft'),
+        rght__gte=OuterRef(f'{field_name}__rght'),
+    ).order_by(
+    ).values(
+        'tree_id',
+    ).annotate(
+        _annotated_value=StringAgg(
+            'segment',
+            model.PATH_SEPARATOR,
+            ordering=('lft',),
+        ),
+    ).values(
+        '_annotated_value',
+    )
+    return Subquery(queryset)
+
+
+def sector_object_expression(model, field_name):
+    """
+    Gets an expression for a JSON object for a sector.
+
+    Equivalent to dict_utils.sector_dict().
+    """
+    ancestors_queryset = model.objects.filter(
+        tree_id=OuterRef(f'{field_name}__tree_id'),
+        lft__lt=OuterRef(f'{field_name}__lft'),
+        rght__gt=OuterRef(f'{field_name}__rght'),
+    ).order_by(
+    ).values(
+        'tree_id',
+    ).annotate(
+        _annotated_value=JSONBAgg(JSONBBuildObject(id='id'), ordering=('lft',)),
+    ).values(
+        '_annotated_value',
+    )
+
+    return nullable_object_expression(
+        field_name,
+        id=f'{field_name}__id',
+        name=mptt_name_expression(model, field_name),
+        ancestors=_coalesce_to_empty_array(Subquery(ancestors_queryset)),
+    )
+
+
+def related_object_array_expression(model, join_field_name, ordering=(), **expressions):
+    """
+    Gets an expression for an array of JSON objects for a to-many relation.
+
+    Can be used with a many-to-many through model, or any other model with a foreign key to the
+    model being annotated. An empty array is returned if there are no related objects.
+
+    Usage example:
+        related_object_array_expression(
+            Interaction.contacts.through,
+            'interaction',
+            id='contact__id',
+            first_name='contact__first_name',
+        )
+    """
+    subquery = get_aggregate_subquery(
+        model,
+        JSONBAgg(JSONBBuildObject(**expressions), ordering=ordering),
+        join_field_name=join_field_name,
+    )
+    return _coalesce_to_empty_array(subquery)
+
+
+def m2m_object_array_expression(m2m_field, ordering=(), **expressions):
+    """
+    Gets an expression for an array of JSON objects for a many-to-many field.
+
+    Expressions are relative to the target model of the field.
+
+    Usage example:
+        m2m_object_array_expression(Interaction.policy_areas.field, id='id', name='name')
+    """
+    target_field_name = m2m_field.m2m_reverse_field_name()
+
+    def _prefix(expression):
+        if isinstance(expression, str):
+            return f'{target_field_name}__{expression}'
+        return expression
+
+    prefixed_ordering = tuple(
+        f'-{_prefix(field[1:])}' if field.startswith('-') else _prefix(field)
+        for field in ordering
+    )
+
+    return related_object_array_expression(
+        m2m_field.remote_field.through,
+        m2m_field.m2m_field_name(),
+        ordering=prefixed_ordering,
+        **{key: _prefix(expression) for key, expression in expressions.items()},
+    )
+
+
+def _coalesce_to_empty_array(expression):
+    return Coalesce(expression, Value([], output_field=JSONField()), output_field=JSONField())
@@ -1,8 +1,9 @@
 from logging import getLogger
 
+from datahub.core.utils import slice_iterable_into_chunks
 from datahub.search.bulk_sync import sync_objects
 from datahub.search.migrate_utils import delete_from_secondary_indices_callback
-from datahub.search.tasks import sync_object_task, sync_related_objects_task
+from datahub.search.tasks import sync_object_task, sync_objects_task, sync_related_objects_task
 
 logger = getLogger(__name__)
 
@@ -27,6 +28,26 @@ def sync_object(search_app, pk):
     )
 
 
+def sync_objects_by_pk(search_app, pks):
+    """
+    Syncs multiple objects (specified by primary key) to Elasticsearch in a single bulk request.
+
+    Like sync_object(), this function is migration-safe. Objects that no longer exist are
+    ignored.
+    """
+    es_model = search_app.es_model
+    read_indices, write_index = es_model.get_read_and_write_indices()
+
+    objs = search_app.queryset.filter(pk__in=pks)
+    sync_objects(
+        es_model,
+        objs,
+        read_indices,
+        write_index,
+        post_batch_callback=delete_from_secondary_indices_callback,
+    )
+
+
 def sync_object_async(search_app, pk):
     """
     Syncs a single object to Elasticsearch asynchronously (by scheduling a Celery task).
@@ -44,6 +65,23 @@ def sync_object_async(search_app, pk):
     )
 
 
+def sync_objects_async(search_app, pks):
+    """
+    Syncs multiple objects to Elasticsearch asynchronously.
+
+    This schedules one Celery task per batch of search_app.bulk_batch_size objects (rather than
+    one task per object), and is intended for code that modifies objects in bulk (and hence
+    does not trigger the usual signal receivers).
+    """
+    for batch in slice_iterable_into_chunks(pks, search_app.bulk_batch_size):
+        batch = [str(pk) for pk in batch]
+        result = sync_objects_task.apply_async(args=(search_app.name, batch))
+        logger.info(
+            f'Task {result.id} scheduled to synchronise {len(batch)} objects for search app '
+            f'{search_app.name}',
+        )
+
+
 def sync_related_objects_async(related_obj, related_obj_field_name, related_obj_filter=None):
     """
     Syncs objects related to another object via a specified field.
@@ -1,24 +1,31 @@
 from celery import shared_task
 from celery.utils.log import get_task_logger
 from django.apps import apps
+from django.conf import settings
 from django_pglocks import advisory_lock
 
+from datahub.core.task_routing import TASK_ROUTES
+from datahub.search.aggregation_cache import refresh_aggregation_rollups
 from datahub.search.apps import get_search_app, get_search_app_by_model, get_search_apps
 from datahub.search.bulk_sync import sync_app
+from datahub.search.elasticsearch import get_client
 from datahub.search.migrate_utils import resync_after_migrate
+from datahub.search.profiling import (
+    get_slow_query_log,
+    summarise_profile,
+    update_slow_query_log_entry,
+)
 
 
 logger = get_task_logger(__name__)
 
 
-@shared_task(acks_late=True, priority=9)
+@shared_task(acks_late=True)
 def sync_all_models():
     """
     Task that starts sub-tasks to sync all models to Elasticsearch.
 
     acks_late is set to True so that the task restarts if interrupted.
-
-    priority is set to the lowest priority (for Redis, 0 is the highest priority).
     """
     for search_app in get_search_apps():
         sync_model.apply_async(
@@ -26,17 +33,17 @@ def sync_all_models():
         )
 
 
-@shared_task(acks_late=True, priority=9, queue='long-running')
-def sync_model(search_app_name):
+@shared_task(acks_late=True)
+def sync_model(search_app_name, force=False):
     """
     Task that syncs a single model to Elasticsearch.
 
-    acks_late is set to True so that the task restarts if interrupted.
+    If force is True, unchanged documents are also written (see sync_app()).
 
-    priority is set to the lowest priority (for Redis, 0 is the highest priority).
+    acks_late is set to True so that the task restarts if interrupted.
     """
     search_app = get_search_app(search_app_name)
-    sync_app(search_app)
+    sync_app(search_app, force=force)
 
 
 @shared_task(acks_late=True, max_retries=15, autoretry_for=(Exception,), retry_backoff=1)
@@ -56,11 +63,23 @@ def sync_object_task(search_app_name, pk):
     sync_object(search_app, pk)
 
 
+@shared_task(acks_late=True, max_retries=15, autoretry_for=(Exception,), retry_backoff=1)
+def sync_objects_task(search_app_name, pks):
+    """
+    Syncs multiple objects (of the same search app) to Elasticsearch using a single bulk request.
+
+    If an error occurs, the task will be automatically retried with an exponential back-off.
+    """
+    from datahub.search.sync_object import sync_objects_by_pk
+
+    search_app = get_search_app(search_app_name)
+    sync_objects_by_pk(search_app, pks)
+
+
 @shared_task(
     bind=True,
     acks_late=True,
     max_retries=15,
-    priority=6,
     autoretry_for=(Exception,),
     retry_backoff=1,
 )
@@ -80,8 +99,9 @@ def sync_related_objects_task(
         related_obj_pk=company.pk
         related_obj_field_name='interactions'
 
-    Note that a lower priority (higher number) is used for syncing related objects, as syncing
-    them is less important than syncing the primary object that was modified.
+    Note that a lower priority (higher number) is used for syncing related objects (and the
+    objects synced by this task), as syncing them is less important than syncing the primary
+    object that was modified.
 
     If an error occurs, the task will be automatically retried with an exponential back-off.
     The wait between attempts is approximately 2 ** attempt_num seconds (with some jitter
@@ -95,17 +115,17 @@ def sync_related_objects_task(
     queryset = manager.values_list('pk', flat=True)
     search_app = get_search_app_by_model(manager.model)
 
+    priority = TASK_ROUTES[self.name].priority
+
     for pk in queryset:
-        sync_object_task.apply_async(args=(search_app.name, pk), priority=self.priority)
+        sync_object_task.apply_async(args=(search_app.name, pk), priority=priority)
 
 
 @shared_task(
     bind=True,
     acks_late=True,
-    priority=7,
     max_retries=5,
     default_retry_delay=60,
-    queue='long-running',
 )
 def complete_model_migration(self, search_app_name, new_mapping_hash):
     """
@@ -131,3 +151,33 @@ Rescheduling the {search_app_name} search app migration to attempt to resolve th
             return
 
         resync_after_migrate(search_app)
+
+
+@shared_task(acks_late=True)
+def profile_slow_search_query(slow_query_id, indices, query):
+    """
+    Re-runs a query in the slow query log with profiling enabled, and adds a summary of the
+    profile to the slow query log entry.
+
+    (The query is passed to this task as only the shape of the query is logged.)
+    """
+    is_logged = any(entry['id'] == slow_query_id for entry in get_slow_query_log())
+    if not is_logged:
+        logger.info(f'Slow query {slow_query_id} is no longer logged, not profiling it')
+        return
+
+    response = get_client().search(
+        index=indices,
+        body={**query, 'profile': True},
+        request_timeout=settings.ES_SEARCH_REQUEST_TIMEOUT,
+    )
+    update_slow_query_log_entry(slow_query_id, profile=summarise_profile(response['profile']))
+
+
+@shared_task(acks_late=True)
+def refresh_search_aggregation_rollups():
+    """
+    Refreshes the search aggregation rollups used for search queries that are not filtered by
+    the user.
+    """
+    refresh_aggregation_rollups()
@@ -0,0 +1,40 @@
+import pytest
+from django.test import Client
+from django.urls import reverse
+from rest_framework import status
+
+from datahub.core.test_utils import AdminTestMixin, create_test_user
+from datahub.search.profiling import add_to_slow_query_log
+
+slow_query_log_url = reverse('admin_search:slow-query-log')
+
+
+@pytest.mark.usefixtures('local_memory_cache')
+class TestSlowQueryLogAdminView(AdminTestMixin):
+    """Tests for the slow query log admin view."""
+
+    def test_redirects_to_login_page_if_not_logged_in(self):
+        """The view should redirect to the login page if the user isn't authenticated."""
+        client = Client()
+        response = client.get(slow_query_log_url)
+        assert response.status_code == status.HTTP_302_FOUND
+        assert response['Location'] == self.login_url_with_redirect(slow_query_log_url)
+
+    def test_permission_denied_if_staff_and_not_superuser(self):
+        """The view should return a 403 response if the user isn't a superuser."""
+        user = create_test_user(is_staff=True, password=self.PASSWORD)
+        client = self.create_client(user=user)
+
+        response = client.get(slow_query_log_url)
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+
+    def test_returns_slow_query_log(self):
+        """The logged slow queries should be returned to superusers."""
+        entry = {'id': 'entry-id', 'took': 2000, 'query_shape': {'query': {'match_all': {}}}}
+        add_to_slow_query_log(entry)
+        user = create_test_user(is_staff=True, is_superuser=True, password=self.PASSWORD)
+        client = self.create_client(user=user)
+
+        response = client.get(slow_query_log_url)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {'results': [entry]}
@@ -66,6 +66,26 @@ def test_sync_synchronously(sync_model_mock):
     assert not sync_model_mock.apply_async.called
 
 
+@pytest.mark.parametrize('force', (True, False))
+@mock.patch('datahub.search.management.commands.sync_es.sync_model')
+@mock.patch(
+    'datahub.search.apps.index_exists',
+    mock.Mock(return_value=True),
+)
+def test_sync_force(sync_model_mock, force):
+    """
+    Test that --force is passed to the sync_model task (so that unchanged documents are
+    also written).
+    """
+    app = get_search_apps()[0]
+    management.call_command(sync_es.Command(), model=[app.name], force=force)
+
+    sync_model_mock.apply_async.assert_called_once_with(
+        args=(app.name,),
+        kwargs={'force': force},
+    )
+
+
 @mock.patch('datahub.search.management.commands.sync_es.sync_model')
 @mock.patch(
     'datahub.search.apps.index_exists',
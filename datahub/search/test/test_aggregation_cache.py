@@ -0,0 +1,164 @@
+from unittest.mock import Mock
+
+import pytest
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.response import Response
+
+from datahub.search.aggregation_cache import (
+    bump_aggregation_generation,
+    execute_search_query_with_cached_aggregations,
+    get_aggregation_cache_key,
+    get_aggregation_generation,
+    refresh_aggregation_rollups,
+)
+from datahub.search.bulk_sync import sync_documents
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+
+AGGREGATIONS = {'stage': {'buckets': [{'key': 'stage-id', 'doc_count': 3}]}}
+
+
+def _make_query(term='term', offset=0, limit=10):
+    query = Search(index='test-alias').query('match', name=term)[offset:offset + limit]
+    query.aggs.bucket('stage', 'terms', field='stage.id')
+    return query
+
+
+@pytest.fixture
+def mock_execute_search_query(monkeypatch):
+    """Patches execute_search_query() to return a response with aggregations for any query."""
+    def _execute_search_query(query, **kwargs):
+        response = {'took': 1, 'hits': {'total': {'value': 3}, 'hits': []}}
+        if query.aggs.aggs:
+            response['aggregations'] = AGGREGATIONS
+        return Response(query, response)
+
+    mock_execute = Mock(side_effect=_execute_search_query)
+    monkeypatch.setattr('datahub.search.aggregation_cache.execute_search_query', mock_execute)
+    return mock_execute
+
+
+@pytest.fixture(autouse=True)
+def aggregation_cache_settings(settings, local_memory_cache):
+    """Enables the aggregation cache."""
+    settings.SEARCH_AGGREGATION_CACHE_TIMEOUT = 300
+    settings.SEARCH_AGGREGATION_ROLLUPS_ENABLED = False
+
+
+def test_bump_aggregation_generation():
+    """Test that bumping the generation of a search app increments it."""
+    assert get_aggregation_generation('app') == 0
+
+    bump_aggregation_generation('app')
+    bump_aggregation_generation('app')
+
+    assert get_aggregation_generation('app') == 2
+    assert get_aggregation_generation('other-app') == 0
+
+
+class TestGetAggregationCacheKey:
+    """Tests for get_aggregation_cache_key()."""
+
+    def test_ignores_pagination(self):
+        """Queries for different pages should have the same key."""
+        assert get_aggregation_cache_key(_make_query(offset=0)) == get_aggregation_cache_key(
+            _make_query(offset=10),
+        )
+
+    def test_depends_on_filters(self):
+        """Queries with different filters should have different keys."""
+        assert get_aggregation_cache_key(_make_query('a')) != get_aggregation_cache_key(
+            _make_query('b'),
+        )
+
+    def test_depends_on_index(self):
+        """Queries for different indices should have different keys."""
+        query = _make_query()
+        assert get_aggregation_cache_key(query) != get_aggregation_cache_key(
+            query.index('other-alias'),
+        )
+
+
+class TestExecuteSearchQueryWithCachedAggregations:
+    """Tests for execute_search_query_with_cached_aggregations()."""
+
+    def _execute(self, query, **kwargs):
+        return execute_search_query_with_cached_aggregations(
+            query,
+            search_app_name='app',
+            endpoint='View',
+            indices=['test-alias'],
+            **kwargs,
+        )
+
+    def test_caches_aggregations(self, mock_execute_search_query):
+        """
+        Aggregations should be cached, and subsequent queries executed without aggregations.
+        """
+        first_response = self._execute(_make_query(offset=0))
+        second_response = self._execute(_make_query(offset=10))
+
+        executed_queries = [call[0][0] for call in mock_execute_search_query.call_args_list]
+        assert executed_queries[0].aggs.aggs
+        assert not executed_queries[1].aggs.aggs
+        assert executed_queries[1].to_dict()['from'] == 10
+
+        for response in (first_response, second_response):
+            assert response.hits.total.value == 3
+            assert response.aggs['stage'].buckets[0]['doc_count'] == 3
+
+    def test_invalidated_when_generation_bumped(self, mock_execute_search_query):
+        """Cached aggregations should not be used after the generation is bumped."""
+        self._execute(_make_query())
+        bump_aggregation_generation('app')
+        self._execute(_make_query())
+
+        executed_queries = [call[0][0] for call in mock_execute_search_query.call_args_list]
+        assert all(query.aggs.aggs for query in executed_queries)
+
+    def test_not_cached_when_disabled(self, settings, mock_execute_search_query):
+        """Aggregations should not be cached if the timeout is 0."""
+        settings.SEARCH_AGGREGATION_CACHE_TIMEOUT = 0
+
+        self._execute(_make_query())
+        self._execute(_make_query())
+
+        executed_queries = [call[0][0] for call in mock_execute_search_query.call_args_list]
+        assert all(query.aggs.aggs for query in executed_queries)
+
+    def test_uses_rollup(self, settings, monkeypatch, mock_execute_search_query):
+        """
+        Rollups should be registered and refreshed, and not be invalidated by bumping the
+        generation.
+        """
+        settings.SEARCH_AGGREGATION_ROLLUPS_ENABLED = True
+        mock_client = Mock()
+        mock_client.search.return_value = {
+            'aggregations': {'stage': {'buckets': [{'key': 'stage-id', 'doc_count': 5}]}},
+        }
+        monkeypatch.setattr(
+            'datahub.search.aggregation_cache.get_client',
+            Mock(return_value=mock_client),
+        )
+
+        self._execute(_make_query(), use_rollup=True)
+        refresh_aggregation_rollups()
+        bump_aggregation_generation('app')
+        response = self._execute(_make_query(), use_rollup=True)
+
+        assert mock_client.search.call_args.kwargs['index'] == ['test-alias']
+        assert mock_client.search.call_args.kwargs['body']['size'] == 0
+        assert 'aggs' in mock_client.search.call_args.kwargs['body']
+        assert not mock_execute_search_query.call_args_list[1][0][0].aggs.aggs
+        assert response.aggs['stage'].buckets[0]['doc_count'] == 5
+
+
+def test_sync_documents_bumps_generation(monkeypatch):
+    """Test that writing documents to Elasticsearch invalidates cached aggregations."""
+    monkeypatch.setattr('datahub.search.bulk_sync.bulk', Mock())
+    app_name = SimpleModelSearchApp.es_model.get_app_name()
+    generation = get_aggregation_generation(app_name)
+    actions = [{'_index': 'index', '_id': 1, '_source': {}}]
+
+    sync_documents(SimpleModelSearchApp.es_model, actions, ['index'], 'index')
+
+    assert get_aggregation_generation(app_name) == generation + 1
@@ -64,6 +64,39 @@ def test_sync_app_logic(monkeypatch):
     assert bulk_mock.call_count == 1
 
 
+def test_sync_app_using_sql_document_builder(monkeypatch):
+    """
+    Tests syncing an app to Elasticsearch in batches using documents from a SQL document
+    builder.
+    """
+    bulk_mock = Mock()
+    monkeypatch.setattr('datahub.search.bulk_sync.bulk', bulk_mock)
+
+    actions = [
+        {'_index': 'index1', '_id': 1, '_source': '{}'},
+        {'_index': 'index1', '_id': 2, '_source': '{}'},
+        {'_index': 'index1', '_id': 3, '_source': '{}'},
+    ]
+    sql_document_builder = Mock(iter_es_documents=Mock(return_value=iter(actions)))
+    search_app = create_mock_search_app(
+        write_index='index1',
+        queryset=MockQuerySet([Mock(id=1), Mock(id=2), Mock(id=3)]),
+        sql_document_builder=sql_document_builder,
+    )
+    sync_app(search_app, batch_size=2)
+
+    sql_document_builder.iter_es_documents.assert_called_once_with(
+        search_app.queryset,
+        'index1',
+        chunk_size=2,
+    )
+    assert not search_app.es_model.db_objects_to_es_documents.called
+    assert [call_args[1]['actions'] for call_args in bulk_mock.call_args_list] == [
+        actions[:2],
+        actions[2:],
+    ]
+
+
 @pytest.mark.django_db
 @disable_search_signal_receivers(Company)
 def test_sync_app_uses_latest_data(monkeypatch, es):
@@ -0,0 +1,141 @@
+from unittest.mock import Mock
+
+import pytest
+
+from datahub.search.bulk_sync import sync_objects, SyncResult
+from datahub.search.document_hashes import delete_document_hashes, get_document_hash
+from datahub.search.models import SearchDocumentHash
+from datahub.search.test.search_support.models import SimpleModel
+from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
+
+
+class TestGetDocumentHash:
+    """Tests for get_document_hash()."""
+
+    def test_is_independent_of_key_order(self):
+        """Test that the order of keys in a document doesn't affect the hash."""
+        action_1 = {'_index': 'index', '_id': 1, '_source': {'a': 1, 'b': 2}}
+        action_2 = {'_index': 'index', '_id': 1, '_source': {'b': 2, 'a': 1}}
+
+        assert get_document_hash(action_1) == get_document_hash(action_2)
+
+    @pytest.mark.parametrize(
+        'other_action',
+        (
+            {'_index': 'index', '_id': 1, '_source': {'a': 2}},
+            {'_index': 'other-index', '_id': 1, '_source': {'a': 1}},
+        ),
+    )
+    def test_changes_with_source_and_index(self, other_action):
+        """Test that the hash changes if the document or index changes."""
+        action = {'_index': 'index', '_id': 1, '_source': {'a': 1}}
+
+        assert get_document_hash(action) != get_document_hash(other_action)
+
+    def test_supports_json_sources(self):
+        """Test that sources that are already serialised as JSON are supported."""
+        action = {'_index': 'index', '_id': 1, '_source': '{"a": 1}'}
+
+        assert get_document_hash(action) != get_document_hash({**action, '_source': '{}'})
+
+    def test_json_and_dict_sources_have_same_hash(self):
+        """Test that a JSON source and the equivalent dict source have the same hash."""
+        dict_action = {
+            '_index': 'index',
+            '_id': 1,
+            '_source': {'b': [1, 2], 'a': {'d': None, 'c': 'text'}},
+        }
+        json_action = {
+            **dict_action,
+            '_source': '{"a":{"c":"text","d":null},"b":[1,2]}',
+        }
+
+        assert get_document_hash(dict_action) == get_document_hash(json_action)
+
+
+@pytest.mark.django_db
+class TestSyncObjectsSkipsUnchangedDocuments:
+    """Tests for skipping unchanged documents in sync_objects()."""
+
+    @pytest.fixture(autouse=True)
+    def skip_unchanged_documents(self, settings):
+        """Enables skipping of unchanged documents."""
+        settings.SEARCH_SKIP_UNCHANGED_DOCUMENTS = True
+
+    @pytest.fixture(autouse=True)
+    def mock_bulk(self, monkeypatch):
+        """Mocks the Elasticsearch bulk helper used by sync_objects()."""
+        mock_bulk = Mock()
+        monkeypatch.setattr('datahub.search.bulk_sync.bulk', mock_bulk)
+        return mock_bulk
+
+    def _sync(self, objs, write_index='index', force=False):
+        return sync_objects(
+            SimpleModelSearchApp.es_model,
+            objs,
+            {write_index},
+            write_index,
+            post_batch_callback=self.post_batch_callback,
+            force=force,
+        )
+
+    def setup_method(self):
+        """Sets up a mock post-batch callback."""
+        self.post_batch_callback = Mock()
+
+    def test_skips_unchanged_documents(self, mock_bulk):
+        """Test that unchanged documents are only written once."""
+        obj_1 = SimpleModel.objects.create(name='obj 1')
+        obj_2 = SimpleModel.objects.create(name='obj 2')
+
+        assert self._sync([obj_1, obj_2]) == SyncResult(written=2, skipped=0)
+        assert len(mock_bulk.call_args[1]['actions']) == 2
+        assert SearchDocumentHash.objects.filter(search_app='simplemodel').count() == 2
+
+        mock_bulk.reset_mock()
+        self.post_batch_callback.reset_mock()
+        obj_2.name = 'new name'
+
+        assert self._sync([obj_1, obj_2]) == SyncResult(written=1, skipped=1)
+        actions = mock_bulk.call_args[1]['actions']
+        assert [action['_id'] for action in actions] == [obj_2.pk]
+        self.post_batch_callback.assert_called_once_with({'index'}, 'index', actions)
+
+        mock_bulk.reset_mock()
+        self.post_batch_callback.reset_mock()
+
+        assert self._sync([obj_1, obj_2]) == SyncResult(written=0, skipped=2)
+        assert not mock_bulk.called
+        assert not self.post_batch_callback.called
+
+    def test_writes_documents_to_new_index(self, mock_bulk):
+        """Test that documents are written if the write index has changed (e.g. on migration)."""
+        obj = SimpleModel.objects.create(name='obj')
+
+        self._sync([obj], write_index='old-index')
+
+        assert self._sync([obj], write_index='new-index') == SyncResult(written=1, skipped=0)
+
+    def test_writes_documents_after_hashes_deleted(self, mock_bulk):
+        """Test that documents are written again after their hashes are deleted."""
+        obj = SimpleModel.objects.create(name='obj')
+
+        self._sync([obj])
+        delete_document_hashes('simplemodel', [obj.pk])
+
+        assert self._sync([obj]) == SyncResult(written=1, skipped=0)
+
+    def test_writes_unchanged_documents_if_forced(self, mock_bulk):
+        """Test that unchanged documents are written (and their hashes saved) if forced."""
+        obj_1 = SimpleModel.objects.create(name='obj 1')
+        obj_2 = SimpleModel.objects.create(name='obj 2')
+
+        self._sync([obj_1])
+        mock_bulk.reset_mock()
+
+        assert self._sync([obj_1, obj_2], force=True) == SyncResult(written=2, skipped=0)
+        assert len(mock_bulk.call_args[1]['actions']) == 2
+        assert SearchDocumentHash.objects.filter(search_app='simplemodel').count() == 2
+
+        # The saved hashes are still used by later (unforced) syncs
+        assert self._sync([obj_1, obj_2]) == SyncResult(written=0, skipped=2)
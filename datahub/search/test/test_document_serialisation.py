@@ -0,0 +1,100 @@
+"""
+Tests and benchmarks for search document serialisation.
+
+Benchmarks are disabled by default (each benchmarked function is only run once, as a normal
+test). To collect timings, run:
+
+    pytest --benchmark-enable datahub/search/test/test_document_serialisation.py
+"""
+import pytest
+
+from datahub.company.test.factories import CompanyFactory
+from datahub.interaction.test.factories import CompanyInteractionFactory
+from datahub.search.company import CompanySearchApp
+from datahub.search.interaction import InteractionSearchApp
+from datahub.search.utils import get_model_non_mapped_field_names
+
+pytestmark = pytest.mark.django_db
+
+# Number of distinct objects created in the database for each benchmark
+NUM_DISTINCT_OBJECTS = 20
+# Number of objects serialised in each benchmark round (the distinct objects are repeated)
+NUM_OBJECTS_TO_SERIALISE = 2000
+
+
+def _uncompiled_db_object_to_dict(es_model, db_object):
+    """
+    The original (uncompiled) implementation of BaseESModel.db_object_to_dict(), used as a
+    reference for correctness and performance.
+    """
+    mapped_values = (
+        (col, fn, getattr(db_object, col)) for col, fn in es_model.MAPPINGS.items()
+    )
+    fields = get_model_non_mapped_field_names(es_model)
+
+    return {
+        **{col: fn(val) if val is not None else None for col, fn, val in mapped_values},
+        **{col: fn(db_object) for col, fn in es_model.COMPUTED_MAPPINGS.items()},
+        **{field: getattr(db_object, field) for field in fields},
+        '_document_type': es_model.get_app_name(),
+    }
+
+
+def _serialise_compiled(es_model, db_objects):
+    return [es_model.db_object_to_dict(db_object) for db_object in db_objects]
+
+
+def _serialise_uncompiled(es_model, db_objects):
+    return [_uncompiled_db_object_to_dict(es_model, db_object) for db_object in db_objects]
+
+
+@pytest.fixture(
+    params=(
+        (CompanySearchApp, CompanyFactory),
+        (InteractionSearchApp, CompanyInteractionFactory),
+    ),
+    ids=('company', 'interaction'),
+)
+def search_app_and_db_objects(request):
+    """
+    Creates objects for a search app and returns the search app and a list of
+    NUM_OBJECTS_TO_SERIALISE objects (fetched using the search app's query set).
+    """
+    search_app, factory = request.param
+    factory.create_batch(NUM_DISTINCT_OBJECTS)
+    db_objects = list(search_app.queryset.all())
+    repeats = NUM_OBJECTS_TO_SERIALISE // len(db_objects)
+    return search_app, db_objects * repeats
+
+
+def test_compiled_serialiser_matches_uncompiled(search_app_and_db_objects):
+    """Test that the compiled serialiser produces the same documents as the original one."""
+    search_app, db_objects = search_app_and_db_objects
+    es_model = search_app.es_model
+    distinct_db_objects = db_objects[:NUM_DISTINCT_OBJECTS]
+
+    compiled_docs = _serialise_compiled(es_model, distinct_db_objects)
+    uncompiled_docs = _serialise_uncompiled(es_model, distinct_db_objects)
+
+    assert compiled_docs == uncompiled_docs
+    assert [list(doc) for doc in compiled_docs] == [list(doc) for doc in uncompiled_docs]
+
+
+@pytest.mark.benchmark(group='search-document-serialisation')
+def test_benchmark_compiled_serialiser(benchmark, search_app_and_db_objects):
+    """Benchmark serialising objects using BaseESModel.db_object_to_dict()."""
+    search_app, db_objects = search_app_and_db_objects
+
+    docs = benchmark(_serialise_compiled, search_app.es_model, db_objects)
+
+    assert len(docs) == len(db_objects)
+
+
+@pytest.mark.benchmark(group='search-document-serialisation')
+def test_benchmark_uncompiled_serialiser(benchmark, search_app_and_db_objects):
+    """Benchmark serialising objects using the original (uncompiled) implementation."""
+    search_app, db_objects = search_app_and_db_objects
+
+    docs = benchmark(_serialise_uncompiled, search_app.es_model, db_objects)
+
+    assert len(docs) == len(db_objects)
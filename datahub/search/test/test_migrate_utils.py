@@ -145,6 +145,7 @@ class TestResyncAfterMigrate:
         sync_app_mock.assert_called_once_with(
             mock_app,
             post_batch_callback=delete_from_secondary_indices_callback,
+            force=True,
         )
 
         mock_client.indices.update_aliases.assert_called_once_with(
@@ -219,4 +220,5 @@ class TestResyncAfterMigrate:
         sync_app_mock.assert_called_once_with(
             mock_app,
             post_batch_callback=delete_from_secondary_indices_callback,
+            force=True,
         )
@@ -0,0 +1,268 @@
+from unittest.mock import MagicMock, Mock
+
+import pytest
+from elasticsearch_dsl import Search
+from elasticsearch_dsl.query import Term
+
+from datahub.search.execute_query import execute_search_query
+from datahub.search.profiling import (
+    add_to_slow_query_log,
+    get_query_fingerprint,
+    get_query_shape,
+    get_slow_query_log,
+    record_search_query,
+    summarise_profile,
+)
+
+
+def _make_search(term, *filter_values):
+    search = Search(index='test-index').query('match', name=term)
+    for field, value in filter_values:
+        search = search.filter(Term(**{field: value}))
+    return search
+
+
+def _make_response(took=10, hits=5):
+    response = Mock(took=took, timed_out=False)
+    response.hits.total.value = hits
+    return response
+
+
+def _make_log_entry(entry_id, took):
+    return {'id': entry_id, 'took': took}
+
+
+@pytest.fixture
+def mock_statsd_pipeline(monkeypatch):
+    """Patches the StatsD client used by the profiling module and returns the mock pipeline."""
+    mock_statsd = MagicMock()
+    monkeypatch.setattr('datahub.search.profiling.statsd.statsd', mock_statsd)
+    return mock_statsd.return_value.pipeline.return_value.__enter__.return_value
+
+
+@pytest.fixture(autouse=True)
+def slow_query_log_settings(settings, local_memory_cache):
+    """Sets the slow query log settings used by these tests."""
+    settings.SEARCH_SLOW_QUERY_LOG_THRESHOLD = 1000
+    settings.SEARCH_SLOW_QUERY_LOG_SIZE = 3
+    settings.SEARCH_PROFILE_SLOW_QUERIES = False
+
+
+class TestGetQueryFingerprint:
+    """Tests for get_query_fingerprint()."""
+
+    def test_ignores_values(self):
+        """Queries that only differ in the values searched for should have the same fingerprint."""
+        query_a = _make_search('term a', ('sector.id', 'sector-a'), ('uk_based', True))
+        query_b = _make_search('term b', ('sector.id', 'sector-b'), ('uk_based', False))
+
+        assert get_query_fingerprint(query_a.to_dict()) == get_query_fingerprint(
+            query_b.to_dict(),
+        )
+
+    def test_ignores_order_of_clauses(self):
+        """The order that filters were applied in should not affect the fingerprint."""
+        query_a = _make_search('term', ('sector.id', 'sector'), ('uk_based', True))
+        query_b = _make_search('term', ('uk_based', True), ('sector.id', 'sector'))
+
+        assert get_query_fingerprint(query_a.to_dict()) == get_query_fingerprint(
+            query_b.to_dict(),
+        )
+
+    def test_depends_on_filters_used(self):
+        """Queries using different filters should have different fingerprints."""
+        query_a = _make_search('term', ('sector.id', 'sector'))
+        query_b = _make_search('term', ('uk_region.id', 'region'))
+
+        assert get_query_fingerprint(query_a.to_dict()) != get_query_fingerprint(
+            query_b.to_dict(),
+        )
+
+
+class TestRecordSearchQuery:
+    """Tests for record_search_query()."""
+
+    def test_emits_metrics(self, mock_statsd_pipeline):
+        """Metrics should be emitted for the search app and endpoint."""
+        query = _make_search('term').extra(aggs={'count_by_type': {'terms': {'field': 'x'}}})
+
+        record_search_query(
+            query,
+            _make_response(took=15, hits=7),
+            20.5,
+            'company',
+            'View',
+            ['test-index'],
+        )
+
+        prefix = 'search.query.company.View'
+        mock_statsd_pipeline.incr.assert_called_once_with(f'{prefix}.count')
+        assert mock_statsd_pipeline.timing.call_args_list == [
+            ((f'{prefix}.took', 15),),
+            ((f'{prefix}.round_trip', 20.5),),
+        ]
+        assert mock_statsd_pipeline.gauge.call_args_list == [
+            ((f'{prefix}.hits', 7),),
+            ((f'{prefix}.aggregations', 1),),
+        ]
+
+    @pytest.mark.parametrize('took,expected_logged', ((999, False), (1000, True)))
+    def test_logs_slow_queries(self, mock_statsd_pipeline, took, expected_logged):
+        """Queries that took at least SEARCH_SLOW_QUERY_LOG_THRESHOLD ms should be logged."""
+        query = _make_search('search term')
+
+        record_search_query(
+            query,
+            _make_response(took=took),
+            1200,
+            'company',
+            'View',
+            ('test-index',),
+        )
+
+        slow_query_log = get_slow_query_log()
+        assert bool(slow_query_log) == expected_logged
+
+        if expected_logged:
+            assert 'query' not in slow_query_log[0]
+            assert slow_query_log[0]['query_shape'] == get_query_shape(query.to_dict())
+            assert 'search term' not in str(slow_query_log[0])
+            assert slow_query_log[0]['fingerprint'] == get_query_fingerprint(query.to_dict())
+            assert slow_query_log[0]['indices'] == ['test-index']
+            assert slow_query_log[0]['took'] == took
+            assert slow_query_log[0]['search_app'] == 'company'
+            assert slow_query_log[0]['endpoint'] == 'View'
+
+    @pytest.mark.parametrize('profiling_enabled', (True, False))
+    def test_schedules_profiling(
+        self,
+        monkeypatch,
+        settings,
+        mock_statsd_pipeline,
+        profiling_enabled,
+    ):
+        """A profiling task should be scheduled for slow queries if profiling is enabled."""
+        settings.SEARCH_PROFILE_SLOW_QUERIES = profiling_enabled
+        mock_task = Mock()
+        monkeypatch.setattr('datahub.search.tasks.profile_slow_search_query', mock_task)
+
+        query = _make_search('term')
+
+        record_search_query(query, _make_response(took=2000), 1, 'company', 'View', ['index'])
+
+        if profiling_enabled:
+            entry_id = get_slow_query_log()[0]['id']
+            mock_task.apply_async.assert_called_once_with(
+                args=(entry_id, ['index'], query.to_dict()),
+            )
+        else:
+            mock_task.apply_async.assert_not_called()
+
+
+class TestAddToSlowQueryLog:
+    """Tests for add_to_slow_query_log()."""
+
+    def test_keeps_slowest_queries(self):
+        """Only the slowest SEARCH_SLOW_QUERY_LOG_SIZE queries should be kept, slowest first."""
+        for entry_id, took in (('a', 1500), ('b', 3000), ('c', 1100), ('d', 2000)):
+            add_to_slow_query_log(_make_log_entry(entry_id, took))
+
+        assert [entry['id'] for entry in get_slow_query_log()] == ['b', 'd', 'a']
+
+    def test_does_not_add_faster_queries_when_full(self):
+        """A query faster than all logged queries should not be added when the log is full."""
+        for entry_id in ('a', 'b', 'c'):
+            assert add_to_slow_query_log(_make_log_entry(entry_id, 2000))
+
+        assert not add_to_slow_query_log(_make_log_entry('d', 1500))
+        assert [entry['id'] for entry in get_slow_query_log()] == ['a', 'b', 'c']
+
+
+def test_summarise_profile():
+    """
+    Test that only the top levels of query profiles are kept (without the descriptions of
+    query nodes).
+    """
+    leaf = {'type': 'TermQuery', 'description': 'leaf', 'time_in_nanos': 1}
+    child = {
+        'type': 'BooleanQuery',
+        'description': 'child',
+        'time_in_nanos': 2,
+        'children': [leaf],
+    }
+    profile = {
+        'shards': [
+            {
+                'id': 'shard-1',
+                'searches': [
+                    {
+                        'query': [
+                            {
+                                'type': 'BooleanQuery',
+                                'description': 'root',
+                                'time_in_nanos': 3,
+                                'children': [child],
+                            },
+                        ],
+                    },
+                ],
+                'aggregations': [
+                    {
+                        'type': 'GlobalOrdinalsStringTermsAggregator',
+                        'description': 'count_by_type',
+                        'time_in_nanos': 4,
+                        'children': [leaf],
+                    },
+                ],
+            },
+        ],
+    }
+
+    assert summarise_profile(profile) == [
+        {
+            'shard': 'shard-1',
+            'queries': [
+                {
+                    'type': 'BooleanQuery',
+                    'time_in_nanos': 3,
+                    'children': [
+                        {'type': 'BooleanQuery', 'time_in_nanos': 2},
+                    ],
+                },
+            ],
+            'aggregations': [
+                {
+                    'type': 'GlobalOrdinalsStringTermsAggregator',
+                    'description': 'count_by_type',
+                    'time_in_nanos': 4,
+                },
+            ],
+        },
+    ]
+
+
+@pytest.mark.parametrize(
+    'kwargs,expected_recorded',
+    (
+        ({}, False),
+        ({'search_app_name': 'company', 'endpoint': 'View', 'indices': ['index']}, True),
+    ),
+)
+def test_execute_search_query_records_query(monkeypatch, kwargs, expected_recorded):
+    """Test that execute_search_query() records queries when a search app and endpoint is given."""
+    mock_record_search_query = Mock()
+    monkeypatch.setattr(
+        'datahub.search.execute_query.record_search_query',
+        mock_record_search_query,
+    )
+    query = Mock()
+    response = query.params.return_value.execute.return_value
+    response.took = 10
+
+    assert execute_search_query(query, **kwargs) is response
+    assert mock_record_search_query.called == expected_recorded
+
+    if expected_recorded:
+        args = mock_record_search_query.call_args[0]
+        assert args[:2] == (query, response)
+        assert args[3:] == ('company', 'View', ['index'])
@@ -0,0 +1,92 @@
+from unittest.mock import Mock
+
+import pytest
+from django.db.models import Value
+
+from datahub.core.query_utils import JSONBBuildObject
+from datahub.search.apps import get_search_apps
+from datahub.search.sql_documents import JSONBConcat, SQLDocumentBuilder
+from datahub.search.utils import get_model_field_names
+
+
+@pytest.mark.parametrize(
+    'search_app_with_builder',
+    [search_app for search_app in get_search_apps() if search_app.sql_document_builder],
+    ids=lambda search_app: search_app.name,
+)
+def test_sql_document_builder_fields_match_es_model(search_app_with_builder):
+    """Test that SQL document builders produce all (and only) the fields in the search model."""
+    es_model = search_app_with_builder.es_model
+    sql_document_builder = search_app_with_builder.sql_document_builder
+
+    assert sql_document_builder.es_model is es_model
+    assert sql_document_builder.get_document_fields().keys() == (
+        get_model_field_names(es_model) - {'_document_type'}
+    )
+
+
+class TestSQLDocumentBuilder:
+    """Tests for SQLDocumentBuilder."""
+
+    @pytest.mark.parametrize(
+        'num_fields,expected_num_build_object_expressions',
+        (
+            (10, 1),
+            (49, 1),
+            (50, 2),
+            (120, 3),
+        ),
+    )
+    def test_get_document_expression_splits_large_documents(
+        self,
+        num_fields,
+        expected_num_build_object_expressions,
+    ):
+        """
+        Test that documents with more than 50 keys (including _document_type) are built using
+        multiple jsonb_build_object() calls (as PostgreSQL functions can have at most 100
+        arguments).
+        """
+        class _Builder(SQLDocumentBuilder):
+            es_model = Mock(get_app_name=Mock(return_value='test-app'))
+
+            @classmethod
+            def get_document_fields(cls):
+                return {f'field{index}': Value(index) for index in range(num_fields)}
+
+        expression = _Builder.get_document_expression()
+
+        if expected_num_build_object_expressions == 1:
+            build_object_expressions = [expression]
+        else:
+            assert isinstance(expression, JSONBConcat)
+            build_object_expressions = expression.get_source_expressions()
+
+        assert len(build_object_expressions) == expected_num_build_object_expressions
+        assert all(
+            isinstance(build_object_expression, JSONBBuildObject)
+            # Each key is an argument, followed by its value
+            and len(build_object_expression.get_source_expressions()) <= 100
+            for build_object_expression in build_object_expressions
+        )
+
+    def test_iter_es_documents(self, monkeypatch):
+        """Test that iter_es_documents() yields index actions with the documents as is."""
+        document_queryset = Mock(
+            iterator=Mock(return_value=iter([(1, '{"a": 1}'), (2, '{"a": 2}')])),
+        )
+        monkeypatch.setattr(
+            SQLDocumentBuilder,
+            'get_document_queryset',
+            Mock(return_value=document_queryset),
+        )
+
+        actions = list(
+            SQLDocumentBuilder.iter_es_documents(Mock(), 'test-index', chunk_size=10),
+        )
+
+        assert actions == [
+            {'_index': 'test-index', '_id': 1, '_source': '{"a": 1}'},
+            {'_index': 'test-index', '_id': 2, '_source': '{"a": 2}'},
+        ]
+        document_queryset.iterator.assert_called_once_with(chunk_size=10)
@@ -1,6 +1,10 @@
 import pytest
 
-from datahub.search.sync_object import sync_object_async, sync_related_objects_async
+from datahub.search.sync_object import (
+    sync_object_async,
+    sync_objects_async,
+    sync_related_objects_async,
+)
 from datahub.search.test.search_support.models import RelatedModel, SimpleModel
 from datahub.search.test.search_support.relatedmodel import RelatedModelSearchApp
 from datahub.search.test.search_support.simplemodel import SimpleModelSearchApp
@@ -17,6 +21,22 @@ def test_sync_object_task_syncs_using_celery(es):
     assert doc_exists(es, SimpleModelSearchApp, obj.pk)
 
 
+@pytest.mark.django_db
+def test_sync_objects_async_syncs_using_celery(es, monkeypatch):
+    """Test that multiple objects can be synced to Elasticsearch in batches using Celery."""
+    monkeypatch.setattr(SimpleModelSearchApp, 'bulk_batch_size', 2)
+    objs = [SimpleModel.objects.create() for _ in range(3)]
+    unsynced_obj = SimpleModel.objects.create()
+
+    sync_objects_async(SimpleModelSearchApp, [obj.pk for obj in objs])
+    es.indices.refresh()
+
+    for obj in objs:
+        assert doc_exists(es, SimpleModelSearchApp, obj.pk)
+
+    assert not doc_exists(es, SimpleModelSearchApp, unsynced_obj.pk)
+
+
 @pytest.mark.django_db
 def test_sync_related_objects_syncs_using_celery(es):
     """Test that related objects can be synced to Elasticsearch using Celery."""
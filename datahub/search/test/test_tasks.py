@@ -4,8 +4,10 @@ from uuid import uuid4
 import pytest
 
 from datahub.search.apps import get_search_apps
+from datahub.search.profiling import add_to_slow_query_log, get_slow_query_log
 from datahub.search.tasks import (
     complete_model_migration,
+    profile_slow_search_query,
     sync_all_models,
     sync_model,
     sync_object_task,
@@ -29,7 +31,21 @@ def test_sync_model(monkeypatch):
     sync_model.apply(args=(search_app.name,))
 
     get_search_app_mock.assert_called_once_with(search_app.name)
-    sync_app_mock.assert_called_once_with(get_search_app_mock.return_value)
+    sync_app_mock.assert_called_once_with(get_search_app_mock.return_value, force=False)
+
+
+def test_sync_model_with_force(monkeypatch):
+    """Test that the sync_model task passes force to sync_app()."""
+    get_search_app_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.get_search_app', get_search_app_mock)
+
+    sync_app_mock = Mock()
+    monkeypatch.setattr('datahub.search.tasks.sync_app', sync_app_mock)
+
+    search_app = next(iter(get_search_apps()))
+    sync_model.apply(args=(search_app.name,), kwargs={'force': True})
+
+    sync_app_mock.assert_called_once_with(get_search_app_mock.return_value, force=True)
 
 
 def test_sync_all_models(monkeypatch):
@@ -169,3 +185,44 @@ def test_complete_model_migration_with_mapping_hash_mismatch(monkeypatch):
     retry_mock.assert_called_once()
 
     resync_after_migrate_mock.assert_not_called()
+
+
+@pytest.mark.usefixtures('local_memory_cache')
+class TestProfileSlowSearchQuery:
+    """Tests for the profile_slow_search_query task."""
+
+    def test_adds_profile_to_log_entry(self, monkeypatch):
+        """Test that the query is re-run with profiling and the profile summary is logged."""
+        mock_client = Mock()
+        mock_client.search.return_value = {'profile': {'shards': []}}
+        monkeypatch.setattr('datahub.search.tasks.get_client', Mock(return_value=mock_client))
+        entry = {
+            'id': 'entry-id',
+            'took': 2000,
+            'indices': ['test-index'],
+            'query_shape': {'query': {'match_all': {}}},
+            'profile': None,
+        }
+        add_to_slow_query_log(entry)
+
+        profile_slow_search_query.apply(
+            args=('entry-id', ['test-index'], {'query': {'match_all': {}}}),
+        )
+
+        assert mock_client.search.call_args.kwargs['index'] == ['test-index']
+        assert mock_client.search.call_args.kwargs['body'] == {
+            'query': {'match_all': {}},
+            'profile': True,
+        }
+        assert get_slow_query_log()[0]['profile'] == []
+
+    def test_does_nothing_if_not_logged(self, monkeypatch):
+        """Test that nothing happens if the query is no longer in the slow query log."""
+        mock_get_client = Mock()
+        monkeypatch.setattr('datahub.search.tasks.get_client', mock_get_client)
+
+        profile_slow_search_query.apply(
+            args=('entry-id', ['test-index'], {'query': {'match_all': {}}}),
+        )
+
+        mock_get_client.assert_not_called()
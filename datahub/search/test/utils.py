@@ -1,5 +1,12 @@
+import json
+import re
 from unittest.mock import Mock
 
+from dateutil.parser import isoparse
+from elasticsearch.serializer import JSONSerializer
+
+ISO_DATETIME_REGEX = re.compile(r'^\d{4}-\d{2}-\d{2}T')
+
 
 def create_mock_search_app(
         current_mapping_hash='mapping-hash',
@@ -8,6 +15,7 @@ def create_mock_search_app(
         write_index='test-index',
         bulk_batch_size=1000,
         queryset=None,
+        sql_document_builder=None,
 ):
     """Creates a mock search app."""
     mock = Mock()
@@ -21,6 +29,7 @@ def create_mock_search_app(
         ),
         bulk_batch_size=bulk_batch_size,
         queryset=queryset,
+        sql_document_builder=sql_document_builder,
     )
     return mock
 
@@ -78,3 +87,51 @@ def get_documents_by_ids(es_client, app, ids):
             'ids': ids,
         },
     )
+
+
+def get_sql_document_differences(search_app, pks=None):
+    """
+    Compares the documents built by the SQL document builder of a search app with those built by
+    es_model.db_object_to_dict().
+
+    Documents are compared in their serialised (JSON) form, with datetimes normalised and lists
+    sorted (as these are not ordered consistently by db_object_to_dict()).
+
+    :returns: dict of {pk: (document from db_object_to_dict, document from SQL)} for objects
+        with differing documents
+    """
+    queryset = search_app.queryset
+    if pks is not None:
+        queryset = queryset.filter(pk__in=pks)
+
+    serializer = JSONSerializer()
+    python_documents = {
+        str(obj.pk): _normalise_document(
+            json.loads(serializer.dumps(search_app.es_model.db_object_to_dict(obj))),
+        )
+        for obj in queryset
+    }
+    sql_documents = {
+        str(pk): _normalise_document(json.loads(document))
+        for pk, document in search_app.sql_document_builder.get_document_queryset(queryset)
+    }
+
+    return {
+        pk: (python_documents.get(pk), sql_documents.get(pk))
+        for pk in python_documents.keys() | sql_documents.keys()
+        if python_documents.get(pk) != sql_documents.get(pk)
+    }
+
+
+def _normalise_document(value):
+    if isinstance(value, dict):
+        return {key: _normalise_document(item) for key, item in value.items()}
+
+    if isinstance(value, list):
+        normalised_items = [_normalise_document(item) for item in value]
+        return sorted(normalised_items, key=lambda item: json.dumps(item, sort_keys=True))
+
+    if isinstance(value, str) and ISO_DATETIME_REGEX.match(value):
+        return isoparse(value).isoformat()
+
+    return value
@@ -12,6 +12,8 @@ from rest_framework.schemas.openapi import AutoSchema
 from rest_framework.views import APIView
 
 from datahub.core.csv import create_csv_response
+from datahub.core.replica import iterate_using_replica
+from datahub.search.aggregation_cache import execute_search_query_with_cached_aggregations
 from datahub.search.apps import get_global_search_apps_as_mapping
 from datahub.search.execute_query import execute_search_query
 from datahub.search.permissions import (
@@ -20,6 +22,7 @@ from datahub.search.permissions import (
     SearchPermissions,
 )
 from datahub.search.query_builder import (
+    get_basic_search_indices,
     get_basic_search_query,
     get_search_by_entities_query,
     limit_search_query,
@@ -134,7 +137,12 @@ class SearchBasicAPIView(APIView):
             fields_to_exclude=fields_to_exclude,
         )
 
-        results = execute_search_query(query)
+        results = execute_search_query(
+            query,
+            search_app_name='global',
+            endpoint=self.__class__.__name__,
+            indices=get_basic_search_indices(),
+        )
 
         response = {
             'count': results.hits.total.value,
@@ -181,6 +189,8 @@ class SearchAPIView(APIView):
     serializer_class = EntitySearchQuerySerializer
     fields_to_include = None
     fields_to_exclude = None
+    # Whether to cache the results of aggregations added by get_base_query()
+    cache_aggregations = False
 
     http_method_names = ('post',)
 
@@ -235,6 +245,14 @@ class SearchAPIView(APIView):
         """Get any extra filters to apply to the base query."""
         return None
 
+    def is_filtered(self, validated_data):
+        """Returns whether the search term or any filters were specified by the user."""
+        filter_data = self._get_filter_data(validated_data)
+        return bool(
+            validated_data['original_query']
+            or any(value not in (None, '', []) for value in filter_data.values()),
+        )
+
     def post(self, request, format=None):
         """Performs search."""
         data = request.data.copy()
@@ -253,8 +271,23 @@ class SearchAPIView(APIView):
             offset=validated_data['offset'],
             limit=validated_data['limit'],
         )
-
-        results = execute_search_query(limited_query)
+        indices = [entity.get_read_alias() for entity in self.get_entities()]
+
+        if self.cache_aggregations:
+            results = execute_search_query_with_cached_aggregations(
+                limited_query,
+                search_app_name=self.search_app.name,
+                endpoint=self.__class__.__name__,
+                indices=indices,
+                use_rollup=not self.is_filtered(validated_data),
+            )
+        else:
+            results = execute_search_query(
+                limited_query,
+                search_app_name=self.search_app.name,
+                endpoint=self.__class__.__name__,
+                indices=indices,
+            )
 
         response = {
             'count': results.hits.total.value,
@@ -342,16 +375,19 @@ class SearchExportAPIView(SearchAPIView):
 
         At the moment, all rows are fetched in one query (using a server-side cursor) as
         settings.SEARCH_EXPORT_MAX_RESULTS is set to a (relatively) low value.
+
+        Rows are read from the replica database (if one is configured).
         """
         db_ordering = self._translate_search_ordering_to_django_ordering(search_ordering)
 
-        return self.queryset.filter(
+        rows = self.queryset.filter(
             pk__in=ids,
         ).order_by(
             *db_ordering,
         ).values(
             *self.field_titles.keys(),
         ).iterator()
+        return iterate_using_replica(rows)
 
     def _translate_search_ordering_to_django_ordering(self, ordering):
         """
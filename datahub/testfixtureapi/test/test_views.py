@@ -2,11 +2,14 @@ import pytest
 from django.core.cache import cache
 from django.test import Client
 from django.urls import reverse
+from django.utils.timezone import now
+from freezegun import freeze_time
 from rest_framework import status
 
 from datahub.company.models import Advisor
 from datahub.company.test.factories import AdviserFactory
 from datahub.core.constants import Team
+from datahub.testfixtureapi.views import TEST_USER_TOKEN_TIMEOUT
 
 pytestmark = pytest.mark.django_db
 
@@ -128,13 +131,17 @@ def test_create_user_endpoint_creates_user(caplog):
 @pytest.mark.usefixtures('local_memory_cache')
 def test_created_user_has_token_in_cache():
     """Test that created user has token in the cache."""
-    _request_create_user(SEED_USER_DATA)
+    frozen_time = now()
+    with freeze_time(frozen_time):
+        _request_create_user(SEED_USER_DATA)
+
     token = SEED_USER_DATA['token']
     cache_key = f'access_token:{token}'
 
     expected_data = {
         'email': SEED_USER_DATA['email'],
         'sso_email_user_id': SEED_USER_DATA['sso_email_user_id'],
+        'expires_at': frozen_time.timestamp() + TEST_USER_TOKEN_TIMEOUT,
     }
     assert cache.get(cache_key) == expected_data
 
@@ -1,4 +1,7 @@
+import atexit
+
 from django.apps import AppConfig
+from django.core.signals import request_finished
 
 
 class UserEventLogConfig(AppConfig):
@@ -6,3 +9,23 @@ class UserEventLogConfig(AppConfig):
 
     name = 'datahub.user_event_log'
     verbose_name = 'User event log'
+
+    def ready(self):
+        """
+        Connects a signal receiver that flushes buffered user events at the end of each request
+        (if they are old enough), and registers an atexit handler that flushes any remaining
+        buffered user events.
+        """
+        from datahub.user_event_log.buffer import user_event_buffer
+
+        request_finished.connect(
+            _schedule_user_event_flush,
+            dispatch_uid='schedule_user_event_flush',
+        )
+        atexit.register(user_event_buffer.flush)
+
+
+def _schedule_user_event_flush(**kwargs):
+    from datahub.user_event_log.buffer import user_event_buffer
+
+    user_event_buffer.schedule_flush_if_due()
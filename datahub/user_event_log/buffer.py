@@ -0,0 +1,171 @@
+"""
+Buffering of user events, so that they can be written to the database in batches (outside of
+the request that recorded them).
+
+Events are flushed (using the thread pool) when MAX_BATCH_SIZE events are buffered, or when
+an event is recorded (or a request finishes) and the oldest buffered event is older than
+MAX_BUFFER_AGE seconds. Any remaining events are flushed when the process exits.
+
+Every buffered event is written to the database at least once (as long as the process exits
+cleanly):
+
+- if a flush fails because the database can't be reached, the events are returned to the
+  buffer and retried in the next flush
+- if a flush fails for any other reason (e.g. an event for an adviser that has since been
+  deleted, or with data that can't be serialised), the events are instead saved one at a
+  time, and only the events that can't be saved are discarded (and logged)
+- if the buffer holds MAX_BUFFERED_EVENTS events (e.g. because the database is unavailable),
+  new events are saved immediately instead (and so any errors are raised to the caller)
+"""
+import logging
+from collections import deque
+from threading import Lock
+from time import monotonic
+
+from django.db import InterfaceError, OperationalError, transaction
+
+from datahub.core import statsd
+from datahub.core.thread_pool import submit_to_thread_pool
+from datahub.user_event_log.models import UserEvent
+
+logger = logging.getLogger(__name__)
+
+# A flush is started once this many events are buffered...
+MAX_BATCH_SIZE = 100
+# ...or when the oldest buffered event is older than this
+MAX_BUFFER_AGE = 10  # seconds
+# Events are saved immediately (instead of being buffered) once this many events are buffered
+MAX_BUFFERED_EVENTS = 10000
+
+
+class UserEventBuffer:
+    """Process-wide buffer of unsaved UserEvent instances."""
+
+    def __init__(
+        self,
+        max_batch_size=MAX_BATCH_SIZE,
+        max_buffer_age=MAX_BUFFER_AGE,
+        max_buffered_events=MAX_BUFFERED_EVENTS,
+    ):
+        """Initialises the buffer."""
+        self._max_batch_size = max_batch_size
+        self._max_buffer_age = max_buffer_age
+        self._max_buffered_events = max_buffered_events
+
+        self._lock = Lock()
+        self._events = deque()
+        self._buffer_started_at = None
+        self._flush_scheduled = False
+
+    def __len__(self):
+        """Returns the number of buffered events."""
+        return len(self._events)
+
+    def add(self, user_event):
+        """
+        Adds an unsaved user event to the buffer (or saves it immediately if the buffer is
+        full).
+        """
+        with self._lock:
+            is_full = len(self._events) >= self._max_buffered_events
+
+            if not is_full:
+                if not self._events:
+                    self._buffer_started_at = monotonic()
+                self._events.append(user_event)
+
+        if is_full:
+            statsd.incr('user_event_log.unbuffered_saves')
+            user_event.save()
+            return
+
+        self.schedule_flush_if_due()
+
+    def schedule_flush_if_due(self):
+        """Starts a flush in the thread pool if the buffer is large or old enough."""
+        with self._lock:
+            is_due = self._events and not self._flush_scheduled and (
+                len(self._events) >= self._max_batch_size
+                or monotonic() - self._buffer_started_at >= self._max_buffer_age
+            )
+            if is_due:
+                self._flush_scheduled = True
+
+        if is_due:
+            submit_to_thread_pool(self.flush)
+
+    def flush(self):
+        """
+        Writes all buffered events to the database.
+
+        If this fails because the database can't be reached, the events are returned to the
+        buffer (to be written in the next flush). If it fails for any other reason, the events
+        are saved individually (see _save_individually()).
+        """
+        with self._lock:
+            events = list(self._events)
+            self._events.clear()
+            self._buffer_started_at = monotonic()
+            self._flush_scheduled = False
+
+        if not events:
+            return
+
+        try:
+            # bulk_create() uses a transaction, so either all or none of the events are saved
+            UserEvent.objects.bulk_create(events, batch_size=self._max_batch_size)
+        except (InterfaceError, OperationalError):
+            logger.exception('Failed to write buffered user events, they will be retried')
+            statsd.incr('user_event_log.flush_failures')
+            self._requeue(events)
+            return
+        except Exception:
+            logger.exception('Failed to write buffered user events, saving them individually')
+            statsd.incr('user_event_log.flush_failures')
+            self._save_individually(events)
+            return
+
+        statsd.incr('user_event_log.flushed', len(events))
+
+    def _save_individually(self, events):
+        """
+        Saves events one at a time, so that events that can't be saved don't stop other events
+        from being saved.
+
+        If the database can't be reached, the unsaved events are returned to the buffer.
+        Events that fail for any other reason are discarded.
+        """
+        for index, user_event in enumerate(events):
+            try:
+                with transaction.atomic():
+                    user_event.save()
+            except (InterfaceError, OperationalError):
+                logger.exception('Failed to write buffered user events, they will be retried')
+                self._requeue(events[index:])
+                return
+            except Exception:
+                logger.exception(
+                    'Discarding user event that could not be saved',
+                    extra={
+                        'adviser_id': user_event.adviser_id,
+                        'type': user_event.type,
+                        'api_url_path': user_event.api_url_path,
+                    },
+                )
+                statsd.incr('user_event_log.discarded')
+            else:
+                statsd.incr('user_event_log.flushed')
+
+    def _requeue(self, events):
+        with self._lock:
+            # Older events go back to the front of the buffer
+            self._events.extendleft(reversed(events))
+
+    def clear(self):
+        """Discards all buffered events (for use in tests)."""
+        with self._lock:
+            self._events.clear()
+            self._flush_scheduled = False
+
+
+user_event_buffer = UserEventBuffer()
@@ -0,0 +1,204 @@
+from unittest import mock
+
+import pytest
+from django.core.signals import request_finished
+from django.db import IntegrityError, OperationalError
+
+from datahub.company.test.factories import AdviserFactory
+from datahub.user_event_log.buffer import user_event_buffer, UserEventBuffer
+from datahub.user_event_log.constants import UserEventType
+from datahub.user_event_log.models import UserEvent
+from datahub.user_event_log.utils import record_user_event
+
+
+@pytest.fixture
+def global_user_event_buffer(settings):
+    """Enables buffering using the global buffer (and clears it afterwards)."""
+    settings.USER_EVENT_BUFFER_ENABLED = True
+    yield user_event_buffer
+    user_event_buffer.clear()
+
+
+def _make_user_events(num_events, adviser=None):
+    adviser = adviser or AdviserFactory.build()
+    return [
+        UserEvent(adviser=adviser, type=UserEventType.SEARCH_EXPORT, api_url_path=f'/path/{i}')
+        for i in range(num_events)
+    ]
+
+
+@mock.patch('datahub.user_event_log.buffer.submit_to_thread_pool')
+class TestFlushScheduling:
+    """Tests for when flushes are started."""
+
+    def test_does_not_flush_small_recent_buffer(self, mocked_submit_to_thread_pool):
+        """Test that no flush is started while the buffer is below both thresholds."""
+        buffer = UserEventBuffer(max_batch_size=3)
+
+        for user_event in _make_user_events(2):
+            buffer.add(user_event)
+
+        assert len(buffer) == 2
+        assert not mocked_submit_to_thread_pool.called
+
+    def test_flushes_when_batch_size_reached(self, mocked_submit_to_thread_pool):
+        """Test that a single flush is started once the batch size is reached."""
+        buffer = UserEventBuffer(max_batch_size=3)
+
+        for user_event in _make_user_events(5):
+            buffer.add(user_event)
+
+        mocked_submit_to_thread_pool.assert_called_once_with(buffer.flush)
+
+    def test_flushes_when_buffer_old(self, mocked_submit_to_thread_pool):
+        """Test that a flush is started once the oldest buffered event is old enough."""
+        buffer = UserEventBuffer(max_batch_size=100, max_buffer_age=0)
+
+        buffer.add(_make_user_events(1)[0])
+
+        mocked_submit_to_thread_pool.assert_called_once_with(buffer.flush)
+
+    def test_flushes_old_buffer_at_end_of_request(
+        self,
+        mocked_submit_to_thread_pool,
+        global_user_event_buffer,
+        monkeypatch,
+    ):
+        """Test that an old buffer is flushed when a request finishes."""
+        global_user_event_buffer.add(_make_user_events(1)[0])
+        assert not mocked_submit_to_thread_pool.called
+
+        monkeypatch.setattr(global_user_event_buffer, '_max_buffer_age', 0)
+        request_finished.send(sender=None)
+
+        mocked_submit_to_thread_pool.assert_called_once_with(global_user_event_buffer.flush)
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('synchronous_thread_pool')
+class TestFlush:
+    """Tests for writing buffered events to the database."""
+
+    def test_writes_events_in_batch(self):
+        """Test that buffered events are written to the database when the batch is full."""
+        adviser = AdviserFactory()
+        buffer = UserEventBuffer(max_batch_size=3)
+
+        for user_event in _make_user_events(3, adviser=adviser):
+            buffer.add(user_event)
+
+        assert len(buffer) == 0
+        assert set(UserEvent.objects.values_list('api_url_path', flat=True)) == {
+            '/path/0',
+            '/path/1',
+            '/path/2',
+        }
+
+    def test_retries_failed_flush(self):
+        """
+        Test that events are kept in the buffer if a flush fails, and written (once) by the
+        next flush.
+        """
+        adviser = AdviserFactory()
+        buffer = UserEventBuffer(max_batch_size=100)
+        user_events = _make_user_events(3, adviser=adviser)
+        for user_event in user_events:
+            buffer.add(user_event)
+
+        with mock.patch.object(
+            UserEvent.objects,
+            'bulk_create',
+            side_effect=OperationalError('connection lost'),
+        ):
+            buffer.flush()
+
+        assert len(buffer) == 3
+        assert not UserEvent.objects.exists()
+
+        buffer.add(_make_user_events(1, adviser=adviser)[0])
+        buffer.flush()
+
+        assert len(buffer) == 0
+        # The events are written in the order they were recorded
+        assert list(
+            UserEvent.objects.order_by('pk').values_list('api_url_path', flat=True),
+        ) == ['/path/0', '/path/1', '/path/2', '/path/0']
+
+    def test_discards_events_that_cannot_be_serialised(self):
+        """
+        Test that if a flush fails because an event can't be serialised, the other events are
+        saved and the event is discarded (rather than being retried indefinitely).
+        """
+        adviser = AdviserFactory()
+        buffer = UserEventBuffer(max_batch_size=100)
+        user_events = _make_user_events(3, adviser=adviser)
+        user_events[1].data = {'value': object()}
+        for user_event in user_events:
+            buffer.add(user_event)
+
+        # bulk_create() is mocked as a failure inside it would break the test transaction
+        with mock.patch.object(
+            UserEvent.objects,
+            'bulk_create',
+            side_effect=TypeError('Object of type object is not JSON serializable'),
+        ):
+            buffer.flush()
+
+        assert len(buffer) == 0
+        assert list(
+            UserEvent.objects.order_by('pk').values_list('api_url_path', flat=True),
+        ) == ['/path/0', '/path/2']
+
+    def test_saves_events_individually_if_flush_fails_with_invalid_data(self):
+        """
+        Test that if a flush fails because of invalid data, the valid events are saved and the
+        invalid ones are discarded (rather than being retried indefinitely).
+        """
+        adviser = AdviserFactory()
+        buffer = UserEventBuffer(max_batch_size=100)
+        user_events = _make_user_events(3, adviser=adviser)
+        # Too long for the column
+        user_events[1].api_url_path = 'x' * 5001
+        for user_event in user_events:
+            buffer.add(user_event)
+
+        with mock.patch.object(
+            UserEvent.objects,
+            'bulk_create',
+            side_effect=IntegrityError('constraint violated'),
+        ):
+            buffer.flush()
+
+        assert len(buffer) == 0
+        assert list(
+            UserEvent.objects.order_by('pk').values_list('api_url_path', flat=True),
+        ) == ['/path/0', '/path/2']
+
+    def test_saves_immediately_when_buffer_full(self):
+        """Test that events are saved immediately (without buffering) once the buffer is full."""
+        adviser = AdviserFactory()
+        buffer = UserEventBuffer(max_batch_size=100, max_buffered_events=2)
+        user_events = _make_user_events(3, adviser=adviser)
+
+        for user_event in user_events:
+            buffer.add(user_event)
+
+        assert len(buffer) == 2
+        assert list(UserEvent.objects.all()) == [user_events[2]]
+
+    def test_record_user_event_buffers_event(self, global_user_event_buffer):
+        """Test that record_user_event() buffers events when buffering is enabled."""
+        adviser = AdviserFactory()
+        request = mock.Mock(user=adviser, path='test-path')
+
+        record_user_event(request, UserEventType.OAUTH_TOKEN_INTROSPECTION)
+
+        assert not UserEvent.objects.exists()
+        assert len(global_user_event_buffer) == 1
+
+        global_user_event_buffer.flush()
+
+        user_event = UserEvent.objects.get()
+        assert user_event.adviser == adviser
+        assert user_event.type == UserEventType.OAUTH_TOKEN_INTROSPECTION
+        assert user_event.api_url_path == 'test-path'
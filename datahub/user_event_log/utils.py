@@ -1,11 +1,26 @@
+from django.conf import settings
+
+from datahub.user_event_log.buffer import user_event_buffer
 from datahub.user_event_log.models import UserEvent
 
 
 def record_user_event(request, type_, adviser=None, data=None):
-    """Records a user event in the database."""
-    return UserEvent.objects.create(
+    """
+    Records a user event.
+
+    If settings.USER_EVENT_BUFFER_ENABLED is True, the event is added to a buffer and written to
+    the database later (in a batch with other events). Otherwise, it's saved immediately.
+    """
+    user_event = UserEvent(
         adviser=adviser or request.user,
         type=type_,
         api_url_path=request.path,
         data=data,
     )
+
+    if settings.USER_EVENT_BUFFER_ENABLED:
+        user_event_buffer.add(user_event)
+    else:
+        user_event.save()
+
+    return user_event